@@ -0,0 +1,240 @@
+"""
+Kinetic Anomaly Detection Engine System (KADES)
+Analyze Endpoint Load Test
+
+Drives POST /analyze with concurrent clients and reports p50/p99 latency and
+throughput. By default the handler runs in-process with simulated upstream
+fetch latency and an in-memory cache, and the number of upstream fetches is
+reported so request coalescing can be compared with --no-coalesce. With
+--url the same load is sent over HTTP to a running server.
+
+With --batch-size each request scans that many tokens, either through
+POST /analyze/batch or, with --per-token, as concurrent POST /analyze calls;
+time to the first streamed result and to the whole batch are reported.
+
+Usage:
+    python -m benchmarks.bench_analyze --clients 50 --requests 20 --tokens 5
+    python -m benchmarks.bench_analyze --url http://localhost:8000 --clients 100
+    python -m benchmarks.bench_analyze --batch-size 100 --tokens 300 --clients 5
+
+Author: KADES Team
+License: Proprietary
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from collections import Counter
+from typing import Dict, List
+
+import numpy as np
+
+UPSTREAM_FETCHES = [
+    '_fetch_token_transactions',
+    '_fetch_x_data',
+    '_fetch_telegram_data',
+    '_fetch_price_data',
+    '_fetch_volume_data',
+]
+
+class _MemoryRedis:
+    """Dict-backed stand-in for the async Redis client used by AnalysisCache"""
+
+    def __init__(self):
+        self.store: Dict[str, bytes] = {}
+        self.round_trips = 0
+
+    async def mget(self, keys: List[str]) -> List:
+        self.round_trips += 1
+        return [self.store.get(key) for key in keys]
+
+    def pipeline(self, transaction: bool = True) -> '_MemoryRedis._Pipeline':
+        self.round_trips += 1
+        return self._Pipeline(self.store)
+
+    async def close(self) -> None:
+        pass
+
+    class _Pipeline:
+        def __init__(self, store: Dict[str, bytes]):
+            self.store = store
+            self.writes = []
+
+        def set(self, key: str, value: bytes, ex: int = None) -> None:
+            self.writes.append((key, value))
+
+        async def execute(self) -> List[bool]:
+            self.store.update(self.writes)
+            return [True] * len(self.writes)
+
+def install_simulated_upstreams(routes, latency: float, fetches: Counter) -> None:
+    """Replace upstream fetches with fixed-latency fakes that count calls."""
+    from src.api.cache import AnalysisCache
+
+    def make_fetch(name: str):
+        async def fetch(token_address: str, timeframe: int) -> List[Dict]:
+            fetches[name] += 1
+            await asyncio.sleep(latency * random.uniform(0.5, 1.5))
+            return [
+                {'amount': random.random() * 1000, 'from': f'wallet{i % 7}', 'text': 'gm'}
+                for i in range(20)
+            ]
+        return fetch
+
+    for name in UPSTREAM_FETCHES:
+        setattr(routes, name, make_fetch(name))
+    routes.cache = AnalysisCache(_MemoryRedis(), ttls={'analysis_cache': 3600, 'alerts': 300})
+
+async def run_in_process(args: argparse.Namespace) -> List[float]:
+    """Call the /analyze handler directly from concurrent clients."""
+    from fastapi import BackgroundTasks
+    from src.api import routes
+
+    fetches: Counter = Counter()
+    install_simulated_upstreams(routes, args.upstream_latency, fetches)
+    if args.no_coalesce:
+        routes._get_analysis_data = routes._compute_analysis_data
+
+    async def request(token: str) -> None:
+        background_tasks = BackgroundTasks()
+        await routes.analyze_token(
+            routes.TokenAnalysisRequest(token_address=token, timeframe=3600),
+            background_tasks
+        )
+        await background_tasks()
+
+    latencies = await drive(request, args)
+    total = sum(fetches.values())
+    print(f"upstream fetches: {total} ({total / len(latencies):.2f} per request)")
+    print(f"coalesced:        {routes.analysis_flights.stats}")
+    return latencies
+
+async def run_batch_in_process(args: argparse.Namespace) -> List[float]:
+    """Scan batches of tokens through the batch stream or per-token handlers."""
+    from fastapi import BackgroundTasks
+    from src.api import routes
+
+    fetches: Counter = Counter()
+    install_simulated_upstreams(routes, args.upstream_latency, fetches)
+    first_results: List[float] = []
+
+    async def scan(tokens: List[str]) -> None:
+        began = time.perf_counter()
+        first = []
+
+        async def one(token: str) -> None:
+            background_tasks = BackgroundTasks()
+            await routes.analyze_token(
+                routes.TokenAnalysisRequest(token_address=token, timeframe=3600),
+                background_tasks
+            )
+            first.append(time.perf_counter() - began)
+            await background_tasks()
+
+        if args.per_token:
+            await asyncio.gather(*(one(token) for token in tokens))
+        else:
+            async for _ in routes._stream_batch_analysis(tokens, 3600):
+                first.append(time.perf_counter() - began)
+        first_results.append(first[0])
+
+    latencies = await drive_batches(scan, args)
+    total = sum(fetches.values())
+    tokens_scanned = len(latencies) * args.batch_size
+    print(f"upstream fetches: {total} ({total / tokens_scanned:.2f} per token)")
+    print(f"cache round trips: {routes.cache.client.round_trips} "
+          f"({routes.cache.client.round_trips / tokens_scanned:.2f} per token)")
+    first = np.array(first_results) * 1e3
+    print(f"first result p50: {np.percentile(first, 50):.1f} ms")
+    return latencies
+
+async def run_http(args: argparse.Namespace) -> List[float]:
+    """Send the load to a running server."""
+    import aiohttp
+
+    async with aiohttp.ClientSession() as session:
+        async def request(token: str) -> None:
+            async with session.post(
+                f"{args.url.rstrip('/')}/analyze",
+                json={'token_address': token, 'timeframe': 3600}
+            ) as response:
+                await response.read()
+
+        async def scan(tokens: List[str]) -> None:
+            if args.per_token:
+                await asyncio.gather(*(request(token) for token in tokens))
+                return
+            async with session.post(
+                f"{args.url.rstrip('/')}/analyze/batch",
+                json={'token_addresses': tokens, 'timeframe': 3600}
+            ) as response:
+                async for _ in response.content:
+                    pass
+
+        if args.batch_size:
+            return await drive_batches(scan, args)
+        return await drive(request, args)
+
+async def drive(request, args: argparse.Namespace) -> List[float]:
+    """Run `clients` concurrent loops of `requests` calls over a hot token set."""
+    tokens = [f"Token{i:04d}" for i in range(args.tokens)]
+    latencies: List[float] = []
+
+    async def client(seed: int) -> None:
+        rng = random.Random(seed)
+        for _ in range(args.requests):
+            began = time.perf_counter()
+            await request(rng.choice(tokens))
+            latencies.append(time.perf_counter() - began)
+
+    began = time.perf_counter()
+    await asyncio.gather(*(client(i) for i in range(args.clients)))
+    elapsed = time.perf_counter() - began
+    print(f"requests:         {len(latencies)} in {elapsed:.2f}s ({len(latencies) / elapsed:.0f} req/s)")
+    return latencies
+
+async def drive_batches(scan, args: argparse.Namespace) -> List[float]:
+    """Run `clients` concurrent loops of `requests` batch scans."""
+    tokens = [f"Token{i:04d}" for i in range(args.tokens)]
+    latencies: List[float] = []
+
+    async def client(seed: int) -> None:
+        rng = random.Random(seed)
+        for _ in range(args.requests):
+            began = time.perf_counter()
+            await scan(rng.sample(tokens, min(args.batch_size, len(tokens))))
+            latencies.append(time.perf_counter() - began)
+
+    began = time.perf_counter()
+    await asyncio.gather(*(client(i) for i in range(args.clients)))
+    elapsed = time.perf_counter() - began
+    print(f"batches:          {len(latencies)} x {args.batch_size} tokens in {elapsed:.2f}s "
+          f"({len(latencies) * args.batch_size / elapsed:.0f} tokens/s)")
+    return latencies
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="/analyze load test")
+    parser.add_argument('--clients', type=int, default=50, help="Concurrent clients")
+    parser.add_argument('--requests', type=int, default=20, help="Requests per client")
+    parser.add_argument('--tokens', type=int, default=5, help="Distinct (hot) tokens")
+    parser.add_argument('--upstream-latency', type=float, default=0.05, help="Mean simulated fetch latency (s)")
+    parser.add_argument('--no-coalesce', action='store_true', help="Bypass single-flight coalescing")
+    parser.add_argument('--url', default=None, help="Base URL of a running server")
+    parser.add_argument('--batch-size', type=int, default=0, help="Tokens per batch scan (0: single-token requests)")
+    parser.add_argument('--per-token', action='store_true', help="Scan batches with concurrent /analyze calls")
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    if args.url:
+        runner = run_http
+    else:
+        runner = run_batch_in_process if args.batch_size else run_in_process
+    latencies = np.array(asyncio.run(runner(args))) * 1e3
+    print(f"latency p50:      {np.percentile(latencies, 50):.1f} ms")
+    print(f"latency p99:      {np.percentile(latencies, 99):.1f} ms")
+    print(f"latency max:      {latencies.max():.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Kinetic Anomaly Detection Engine System (KADES)
+WebSocket Broadcast Load Test
+
+Fans anomaly alerts out to thousands of simulated WebSocket clients and
+reports fan-out latency (publish to client send completing) for the fast
+clients, the time the publisher is blocked per alert, and how the
+slow-consumer policy treated the slow clients. The previous broadcast loop
+(serialize, then await each client's send in turn) can be run for
+comparison with --legacy.
+
+Usage:
+    python -m benchmarks.bench_broadcast --clients 5000 --events 50
+    python -m benchmarks.bench_broadcast --policy coalesce --slow-fraction 0.05
+    python -m benchmarks.bench_broadcast --clients 1000 --events 5 --legacy
+
+Author: KADES Team
+License: Proprietary
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from src.api.broadcast import BroadcastEngine, encode_frame
+
+class SimulatedClient:
+    """WebSocket stand-in whose sends take a fixed simulated time"""
+
+    def __init__(self, send_latency: float, slow: bool):
+        self.send_latency = send_latency
+        self.slow = slow
+        self.received: List[Tuple[str, float]] = []
+
+    async def send_text(self, frame: str) -> None:
+        if self.send_latency:
+            await asyncio.sleep(self.send_latency)
+        else:
+            await asyncio.sleep(0)
+        self.received.append((frame, time.perf_counter()))
+
+def make_clients(args: argparse.Namespace) -> List[SimulatedClient]:
+    rng = random.Random(args.seed)
+    clients = []
+    for _ in range(args.clients):
+        slow = rng.random() < args.slow_fraction
+        latency = args.slow_ms / 1e3 if slow else rng.uniform(0, args.fast_ms) / 1e3
+        clients.append(SimulatedClient(latency, slow))
+    return clients
+
+def alert(index: int, tokens: int) -> Dict:
+    return {
+        "type": "anomaly_alert",
+        "data": {
+            "token_address": f"Token{index % tokens:04d}",
+            "risk_score": 0.9,
+            "anomaly_type": "volume_spike",
+            "timestamp": int(time.time()),
+            "details": {"volume_zscore": 4.2, "sequence": index}
+        }
+    }
+
+async def legacy_broadcast(clients: List[SimulatedClient], message: Dict) -> None:
+    """The previous loop: one json.dumps, then each send awaited in turn."""
+    frame = json.dumps(message)
+    for client in clients:
+        await client.send_text(frame)
+
+async def run(args: argparse.Namespace) -> None:
+    clients = make_clients(args)
+    published: Dict[str, float] = {}
+    blocked: List[float] = []
+
+    engine = BroadcastEngine(max_queue=args.queue_size, policy=args.policy)
+    if not args.legacy:
+        for client in clients:
+            engine.register(client)
+
+    began = time.perf_counter()
+    for index in range(args.events):
+        message = alert(index, args.tokens)
+        start = time.perf_counter()
+        if args.legacy:
+            published[json.dumps(message)] = start
+            await legacy_broadcast(clients, message)
+        else:
+            frame = encode_frame(message)
+            published[frame] = start
+            engine.publish_frame(frame, key=message['data']['token_address'])
+        blocked.append(time.perf_counter() - start)
+        await asyncio.sleep(args.interval_ms / 1e3)
+
+    # Let fast clients drain; slow ones keep whatever their policy left them
+    deadline = time.perf_counter() + args.drain_s
+    while time.perf_counter() < deadline:
+        if all(len(engine.channels.get(c, ())) == 0 for c in clients if not c.slow):
+            break
+        await asyncio.sleep(0.01)
+    elapsed = time.perf_counter() - began
+
+    fast_latency = np.array([
+        received - published[frame]
+        for client in clients if not client.slow
+        for frame, received in client.received if frame in published
+    ]) * 1e3
+    slow_received = [len(client.received) for client in clients if client.slow]
+
+    mode = 'legacy sequential' if args.legacy else f"engine ({args.policy}, queue {args.queue_size})"
+    print(f"mode:                {mode}")
+    print(f"clients:             {args.clients} ({len(slow_received)} slow at {args.slow_ms:.0f} ms/send)")
+    print(f"events:              {args.events} in {elapsed:.2f}s")
+    print(f"publisher blocked:   mean {np.mean(blocked) * 1e3:.2f} ms, max {np.max(blocked) * 1e3:.2f} ms per alert")
+    if len(fast_latency):
+        print(f"fan-out latency:     p50 {np.percentile(fast_latency, 50):.1f} ms, "
+              f"p99 {np.percentile(fast_latency, 99):.1f} ms, max {fast_latency.max():.1f} ms (fast clients)")
+    if slow_received:
+        print(f"slow clients:        {np.mean(slow_received):.1f} frames received on average")
+    if not args.legacy:
+        print(f"engine:              {engine.stats} {engine.channel_stats()}")
+    await engine.close()
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="WebSocket broadcast fan-out load test")
+    parser.add_argument('--clients', type=int, default=5000)
+    parser.add_argument('--events', type=int, default=50)
+    parser.add_argument('--tokens', type=int, default=10, help="Distinct tokens across alerts")
+    parser.add_argument('--interval-ms', type=float, default=100.0, help="Gap between alerts")
+    parser.add_argument('--fast-ms', type=float, default=1.0, help="Max send time of fast clients")
+    parser.add_argument('--slow-ms', type=float, default=250.0, help="Send time of slow clients")
+    parser.add_argument('--slow-fraction', type=float, default=0.02)
+    parser.add_argument('--queue-size', type=int, default=16)
+    parser.add_argument('--policy', default='drop_oldest', choices=['drop_oldest', 'coalesce', 'disconnect'])
+    parser.add_argument('--drain-s', type=float, default=5.0, help="Max wait for fast clients to drain")
+    parser.add_argument('--legacy', action='store_true', help="Run the previous sequential broadcast loop")
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+if __name__ == "__main__":
+    main()
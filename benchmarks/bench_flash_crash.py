@@ -0,0 +1,152 @@
+"""
+Kinetic Anomaly Detection Engine System (KADES)
+Flash Crash Detector Benchmark
+
+Streams synthetic ticks for many tokens through FlashCrashDetector.monitor_market
+and reports per-tick latency and throughput. Prices follow a random walk with
+occasional injected crashes so the alert path is exercised as well. With
+--batch, the same ticks are swept through monitor_markets in fixed-size batches.
+
+Usage:
+    python -m benchmarks.bench_flash_crash --ticks 1000000 --tokens 1000
+    python -m benchmarks.bench_flash_crash --ticks 100000 --history 10000
+    python -m benchmarks.bench_flash_crash --batch --batch-size 1000
+
+Author: KADES Team
+License: Proprietary
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import datetime
+from typing import Dict, Tuple
+
+import numpy as np
+
+from src.temporal_analysis.flash_crash_detector import FlashCrashDetector, MarketCondition
+from src.temporal_analysis.window_aggregates import MARKET_TICK_DTYPE
+
+def generate_ticks(args: argparse.Namespace) -> Tuple[np.ndarray, np.ndarray]:
+    """Generate the synthetic tick stream (MARKET_TICK_DTYPE) and sentiment scores."""
+    rng = np.random.default_rng(args.seed)
+    token_ids = rng.integers(0, args.tokens, size=args.ticks)
+    returns = rng.normal(0.0, 0.002, size=args.ticks)
+    crashes = rng.random(args.ticks) < args.crash_rate
+    returns[crashes] = -0.25
+    volumes = rng.lognormal(8.0, 1.0, size=args.ticks)
+    liquidity = rng.lognormal(12.0, 0.3, size=args.ticks)
+    sentiment = rng.normal(0.0, 0.3, size=args.ticks)
+
+    # Per-token random walk: cumulative product of returns within each token
+    order = np.argsort(token_ids, kind='stable')
+    log_returns = np.log1p(returns[order])
+    boundaries = np.r_[0, np.flatnonzero(np.diff(token_ids[order])) + 1]
+    cumulative = np.cumsum(log_returns)
+    offsets = np.repeat(cumulative[boundaries] - log_returns[boundaries], np.diff(np.r_[boundaries, len(order)]))
+    prices = np.empty(args.ticks)
+    prices[order] = 100.0 * np.exp(cumulative - offsets)
+
+    ticks = np.empty(args.ticks, dtype=MARKET_TICK_DTYPE)
+    ticks['token_id'] = token_ids
+    ticks['price'] = prices
+    ticks['volume'] = volumes
+    ticks['liquidity'] = liquidity
+    # Spread ticks over wall-clock time at the requested aggregate rate
+    ticks['ts'] = datetime(2024, 1, 1).timestamp() + np.arange(args.ticks) / args.tick_rate
+    return ticks, sentiment
+
+async def run_benchmark(args: argparse.Namespace) -> Dict:
+    """Replay synthetic ticks one at a time and collect timing statistics."""
+    ticks, sentiment = generate_ticks(args)
+    detector = FlashCrashDetector(min_data_points=args.min_points, history_size=args.history)
+    tokens = [f"Token{i:05d}" for i in range(args.tokens)]
+
+    alerts = 0
+    sampled = []
+    began = time.perf_counter()
+    for i, tick in enumerate(ticks.tolist()):
+        token, price, volume, liquidity, ts = tick
+        condition = MarketCondition(
+            price=price,
+            volume=volume,
+            liquidity=liquidity,
+            volatility=0.2,
+            sentiment_score=float(sentiment[i]),
+            timestamp=datetime.fromtimestamp(ts)
+        )
+
+        if i % args.sample_every == 0:
+            tick_start = time.perf_counter()
+            alert = await detector.monitor_market(tokens[token], condition)
+            sampled.append(time.perf_counter() - tick_start)
+        else:
+            alert = await detector.monitor_market(tokens[token], condition)
+
+        if alert:
+            alerts += 1
+
+    elapsed = time.perf_counter() - began
+    return {
+        'mode': 'per-tick',
+        'ticks': args.ticks,
+        'tokens': args.tokens,
+        'alerts': alerts,
+        'elapsed_seconds': elapsed,
+        'ticks_per_second': args.ticks / elapsed if elapsed > 0 else 0.0,
+        'p50_us': float(np.percentile(sampled, 50) * 1e6),
+        'p99_us': float(np.percentile(sampled, 99) * 1e6),
+    }
+
+async def run_batch_benchmark(args: argparse.Namespace) -> Dict:
+    """Sweep synthetic ticks through monitor_markets in fixed-size batches."""
+    ticks, _ = generate_ticks(args)
+    detector = FlashCrashDetector(min_data_points=args.min_points, batch_slots=args.slots)
+    detector.register_tokens([f"Token{i:05d}" for i in range(args.tokens)])
+
+    alerts = 0
+    sampled = []
+    began = time.perf_counter()
+    for offset in range(0, args.ticks, args.batch_size):
+        batch_start = time.perf_counter()
+        alerts += len(await detector.monitor_markets(ticks[offset:offset + args.batch_size]))
+        sampled.append(time.perf_counter() - batch_start)
+
+    elapsed = time.perf_counter() - began
+    return {
+        'mode': f"batch of {args.batch_size}",
+        'ticks': args.ticks,
+        'tokens': args.tokens,
+        'alerts': alerts,
+        'elapsed_seconds': elapsed,
+        'ticks_per_second': args.ticks / elapsed if elapsed > 0 else 0.0,
+        'p50_us': float(np.percentile(sampled, 50) * 1e6),
+        'p99_us': float(np.percentile(sampled, 99) * 1e6),
+    }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Flash crash detector throughput benchmark")
+    parser.add_argument('--ticks', type=int, default=1_000_000, help="Total ticks to stream")
+    parser.add_argument('--tokens', type=int, default=1000, help="Number of distinct tokens")
+    parser.add_argument('--history', type=int, default=10000, help="Ticks retained per token")
+    parser.add_argument('--min-points', type=int, default=100, help="Minimum ticks before detection")
+    parser.add_argument('--tick-rate', type=float, default=2000.0, help="Aggregate ticks per simulated second")
+    parser.add_argument('--crash-rate', type=float, default=1e-4, help="Probability a tick is a crash")
+    parser.add_argument('--sample-every', type=int, default=100, help="Time every Nth tick individually")
+    parser.add_argument('--batch', action='store_true', help="Use monitor_markets batches")
+    parser.add_argument('--batch-size', type=int, default=1000, help="Ticks per monitor_markets call")
+    parser.add_argument('--slots', type=int, default=512, help="Ring slots per token in batch mode")
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    stats = asyncio.run(run_batch_benchmark(args) if args.batch else run_benchmark(args))
+
+    print(f"mode:             {stats['mode']}")
+    print(f"ticks:            {stats['ticks']} across {stats['tokens']} tokens")
+    print(f"alerts:           {stats['alerts']}")
+    print(f"elapsed:          {stats['elapsed_seconds']:.2f}s")
+    print(f"throughput:       {stats['ticks_per_second']:.0f} ticks/s")
+    print(f"latency p50/p99:  {stats['p50_us']:.1f} / {stats['p99_us']:.1f} us per call")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""
+Kinetic Anomaly Detection Engine System (KADES)
+Import Time Benchmark
+
+Imports each target in a fresh interpreter under `python -X importtime` and
+reports its cumulative import time and heaviest dependencies. A target
+fails if it exceeds its time threshold or loads any of the heavy modules
+(deep learning, NLP, chain clients) that must only be imported on first
+use, and the benchmark exits non-zero so it can gate CI.
+
+Usage:
+    python -m benchmarks.bench_import_time
+    python -m benchmarks.bench_import_time --target src.api.routes --repeat 5
+    python -m benchmarks.bench_import_time --threshold src.api=20 --top 10
+
+Author: KADES Team
+License: Proprietary
+"""
+
+import argparse
+import re
+import subprocess
+import sys
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+# Cumulative import time thresholds in milliseconds
+DEFAULT_THRESHOLDS = {
+    'src.api': 50.0,
+    'src.chain_analysis': 50.0,
+    'src.score_aggregator': 50.0,
+    'src.sentiment_analysis': 50.0,
+    'src.temporal_analysis': 50.0,
+    'src.whale_detection': 50.0,
+    'src.api.routes': 1500.0,
+}
+
+# Top-level modules no target may import eagerly
+FORBIDDEN_MODULES = ['torch', 'transformers', 'spacy', 'textblob', 'web3', 'sklearn', 'tensorflow']
+
+IMPORT_TIME_LINE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$')
+
+@dataclass
+class ImportProfile:
+    """Parsed -X importtime output for one import"""
+    target: str
+    cumulative_ms: float = 0.0
+    # (name, self ms, cumulative ms, nesting depth) in completion order
+    modules: List[Tuple[str, float, float, int]] = field(default_factory=list)
+    error: Optional[str] = None
+
+    def subtree(self) -> List[Tuple[str, float, float, int]]:
+        """Imports made while importing the target (interpreter startup excluded)."""
+        for index in range(len(self.modules) - 1, -1, -1):
+            name, _, _, depth = self.modules[index]
+            if name == self.target:
+                start = index
+                while start > 0 and self.modules[start - 1][3] > depth:
+                    start -= 1
+                return self.modules[start:index]
+        return self.modules
+
+    def heaviest(self, count: int) -> List[Tuple[str, float]]:
+        """Direct dependencies of the target by cumulative time."""
+        subtree = self.subtree()
+        if not subtree:
+            return []
+        depth = min(module[3] for module in subtree)
+        children = [(name, cumulative) for name, _, cumulative, level in subtree if level == depth]
+        return sorted(children, key=lambda item: -item[1])[:count]
+
+    def forbidden(self) -> List[str]:
+        return sorted({module[0].split('.')[0] for module in self.subtree()} & set(FORBIDDEN_MODULES))
+
+def profile_import(target: str) -> ImportProfile:
+    """Import `target` in a fresh interpreter and parse the timings."""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {target}'],
+        capture_output=True,
+        text=True
+    )
+    profile = ImportProfile(target)
+    for line in result.stderr.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            profile.modules.append((name, int(self_us) / 1e3, int(cumulative_us) / 1e3, len(indent)))
+            if name == target:
+                profile.cumulative_ms = int(cumulative_us) / 1e3
+    if result.returncode != 0:
+        errors = [line for line in result.stderr.splitlines() if not line.startswith('import time:')]
+        profile.error = errors[-1] if errors else f"exit status {result.returncode}"
+    return profile
+
+def best_of(target: str, repeat: int) -> ImportProfile:
+    """Fastest of `repeat` cold imports, to damp scheduler noise."""
+    profiles = [profile_import(target) for _ in range(repeat)]
+    failed = [profile for profile in profiles if profile.error]
+    if failed:
+        return failed[0]
+    return min(profiles, key=lambda profile: profile.cumulative_ms)
+
+def parse_thresholds(overrides: List[str]) -> Dict[str, float]:
+    thresholds = dict(DEFAULT_THRESHOLDS)
+    for override in overrides:
+        target, _, value = override.partition('=')
+        if not value:
+            raise ValueError(f"Threshold '{override}' must be module=milliseconds")
+        thresholds[target] = float(value)
+    return thresholds
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Import time regression check")
+    parser.add_argument('--target', action='append', default=[],
+                        help="Module to import (repeatable; default: every module with a threshold)")
+    parser.add_argument('--threshold', action='append', default=[],
+                        help="Override a threshold, module=milliseconds (repeatable)")
+    parser.add_argument('--repeat', type=int, default=3, help="Cold imports per target; the fastest counts")
+    parser.add_argument('--top', type=int, default=5, help="Heaviest dependencies listed per target")
+    args = parser.parse_args()
+
+    thresholds = parse_thresholds(args.threshold)
+    targets = args.target or list(DEFAULT_THRESHOLDS)
+    failures = 0
+
+    width = max(len(target) for target in targets) + 2
+    print(f"{'target':<{width}}{'import ms':>11}{'limit ms':>10}  status")
+    for target in targets:
+        profile = best_of(target, args.repeat)
+        limit = thresholds.get(target)
+        if profile.error:
+            status = f"FAIL import error: {profile.error}"
+        elif profile.forbidden():
+            status = f"FAIL loads {', '.join(profile.forbidden())}"
+        elif limit is not None and profile.cumulative_ms > limit:
+            status = "FAIL over threshold"
+        else:
+            status = "ok"
+        failures += status != "ok"
+        limit_text = f"{limit:.0f}" if limit is not None else '-'
+        print(f"{target:<{width}}{profile.cumulative_ms:>11.1f}{limit_text:>10}  {status}")
+        for name, cumulative in profile.heaviest(args.top):
+            print(f"    {name:<{width - 4}}{cumulative:>11.1f}")
+
+    if failures:
+        print(f"{failures} of {len(targets)} targets regressed")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Kinetic Anomaly Detection Engine System (KADES)
+Embedding Inference Backend Benchmark
+
+Measures single-text latency (p50/p99) and throughput of CryptoEmbeddingModel
+on each CPU inference backend, with and without int8 dynamic quantization,
+and reports drift against the eager fp32 embeddings.
+
+Usage:
+    python -m benchmarks.bench_inference_backends --texts 200
+    python -m benchmarks.bench_inference_backends --backends eager onnx
+
+Author: KADES Team
+License: Proprietary
+"""
+
+import argparse
+import time
+from typing import Dict, List
+
+import numpy as np
+import torch
+
+from src.sentiment_analysis.embedding_models import CryptoEmbeddingModel
+from src.sentiment_analysis.model_registry import ModelRegistry
+
+SAMPLE_TEXTS = [
+    "Bullish on $SOL! 🚀 The memecoin ecosystem is growing fast",
+    "Massive whale movement detected in BONK. Watch out for dumps",
+    "New Solana memecoin launching tomorrow. Don't miss this gem! 💎",
+    "Liquidity pulled from the $WEN pool, looks like a rug",
+    "gm frens, charts looking healthy after the retest, wagmi",
+    "Team wallet unlock next week, supply overhang worth watching",
+]
+
+def run_backend(model_name: str, backend: str, quantize: bool, texts: List[str]) -> Dict:
+    """Benchmark a single backend configuration."""
+    started = time.perf_counter()
+    # A fresh registry per configuration, so load time is not a cache hit
+    model = CryptoEmbeddingModel(model_name=model_name, device="cpu",
+                                 backend=backend, quantize=quantize,
+                                 model_registry=ModelRegistry())
+    load_seconds = time.perf_counter() - started
+
+    # Warm up
+    for text in SAMPLE_TEXTS:
+        model.get_embedding(text + " warmup")
+
+    latencies = []
+    embeddings = []
+    for i, text in enumerate(texts):
+        unique_text = f"{text} #{i}"  # bypass the embedding cache
+        start = time.perf_counter()
+        result = model.get_embedding(unique_text)
+        latencies.append(time.perf_counter() - start)
+        embeddings.append(result.embedding.reshape(-1))
+
+    total = sum(latencies)
+    return {
+        'load_seconds': load_seconds,
+        'p50_ms': float(np.percentile(latencies, 50) * 1000),
+        'p99_ms': float(np.percentile(latencies, 99) * 1000),
+        'texts_per_second': len(texts) / total if total > 0 else 0.0,
+        'embeddings': np.stack(embeddings),
+    }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="CPU inference backend benchmark")
+    parser.add_argument('--model', default="distilbert-base-uncased")
+    parser.add_argument('--texts', type=int, default=200, help="Texts per configuration")
+    parser.add_argument('--threads', type=int, default=None, help="torch intra-op threads")
+    parser.add_argument('--backends', nargs='+', default=['eager', 'torchscript', 'onnx'])
+    args = parser.parse_args()
+
+    if args.threads:
+        torch.set_num_threads(args.threads)
+
+    texts = [SAMPLE_TEXTS[i % len(SAMPLE_TEXTS)] for i in range(args.texts)]
+    results = {}
+    for backend in args.backends:
+        for quantize in (False, True):
+            # Adapter heads are randomly initialized; seed so every backend
+            # wraps identical parameters and drift is meaningful
+            torch.manual_seed(0)
+            label = f"{backend}{'+int8' if quantize else ''}"
+            try:
+                results[label] = run_backend(args.model, backend, quantize, texts)
+            except ImportError as e:
+                print(f"{label:<18} skipped: {e}")
+
+    reference = results.get('eager', {}).get('embeddings')
+    print(f"{'backend':<18}{'load s':>8}{'p50 ms':>9}{'p99 ms':>9}{'texts/s':>10}{'min cos':>9}")
+    for label, result in results.items():
+        drift = ''
+        if reference is not None:
+            cosine = np.sum(reference * result['embeddings'], axis=1) / (
+                np.linalg.norm(reference, axis=1) * np.linalg.norm(result['embeddings'], axis=1)
+            )
+            drift = f"{cosine.min():.4f}"
+        print(f"{label:<18}{result['load_seconds']:>8.1f}{result['p50_ms']:>9.2f}"
+              f"{result['p99_ms']:>9.2f}{result['texts_per_second']:>10.1f}{drift:>9}")
+
+if __name__ == "__main__":
+    main()
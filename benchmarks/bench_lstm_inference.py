@@ -0,0 +1,102 @@
+"""
+Kinetic Anomaly Detection Engine System (KADES)
+LSTM Volatility Inference Benchmark
+
+Measures VolatilityPredictor throughput (tokens/s) for batched multi-token
+inference at several token counts on each CPU backend, with and without int8
+dynamic quantization, against one forward pass per token.
+
+Usage:
+    python -m benchmarks.bench_lstm_inference --tokens 1 100 1000
+    python -m benchmarks.bench_lstm_inference --backends eager torchscript --threads 4
+
+Author: KADES Team
+License: Proprietary
+"""
+
+import argparse
+import time
+from typing import Dict, List
+
+import numpy as np
+import torch
+
+from src.temporal_analysis.lstm_predictor import INPUT_SIZE, VolatilityPredictor
+
+def time_call(fn, repeats: int) -> float:
+    """Best-of-repeats wall time of fn in seconds."""
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def run_backend(backend: str, quantize: bool, token_counts: List[int],
+                features: Dict[str, np.ndarray], args: argparse.Namespace) -> Dict:
+    """Benchmark one backend configuration across token counts."""
+    # Seed so every backend wraps identical weights and drift is meaningful
+    torch.manual_seed(0)
+    predictor = VolatilityPredictor(sequence_length=args.sequence_length,
+                                    backend=backend, quantize=quantize)
+    tokens = list(features)
+
+    # Warm up
+    predictor.predict_batch({token: features[token] for token in tokens[:2]})
+
+    results = {'per_count': {}}
+    for count in token_counts:
+        subset = {token: features[token] for token in tokens[:count]}
+        seconds = time_call(lambda: predictor.predict_batch(subset), args.repeats)
+        results['per_count'][count] = count / seconds
+
+    # Reference: one forward pass per token
+    subset = [features[token] for token in tokens[:args.loop_tokens]]
+    seconds = time_call(lambda: [predictor._make_prediction(X) for X in subset], args.repeats)
+    results['loop_tokens_per_second'] = len(subset) / seconds
+    results['predictions'] = np.array(list(predictor.predict_batch(
+        {token: features[token] for token in tokens[:args.loop_tokens]}
+    ).values()))
+    return results
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Batched LSTM volatility inference benchmark")
+    parser.add_argument('--tokens', type=int, nargs='+', default=[1, 100, 1000])
+    parser.add_argument('--sequence-length', type=int, default=100)
+    parser.add_argument('--backends', nargs='+', default=['eager', 'torchscript', 'onnx'])
+    parser.add_argument('--loop-tokens', type=int, default=100, help="Tokens in the per-token loop baseline")
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--threads', type=int, default=None, help="torch intra-op threads")
+    parser.add_argument('--seed', type=int, default=5)
+    args = parser.parse_args()
+
+    if args.threads:
+        torch.set_num_threads(args.threads)
+
+    rng = np.random.default_rng(args.seed)
+    features = {
+        f"Token{i:05d}": rng.random((args.sequence_length, INPUT_SIZE)).astype(np.float32)
+        for i in range(max(max(args.tokens), args.loop_tokens))
+    }
+
+    results = {}
+    for backend in args.backends:
+        for quantize in (False, True):
+            label = f"{backend}{'+int8' if quantize else ''}"
+            try:
+                results[label] = run_backend(backend, quantize, args.tokens, features, args)
+            except ImportError as e:
+                print(f"{label:<18} skipped: {e}")
+
+    reference = results.get('eager', {}).get('predictions')
+    header = ''.join(f"{f'N={count}':>12}" for count in args.tokens)
+    print(f"{'backend':<18}{header}{'loop':>12}{'max drift':>11}   (tokens/s)")
+    for label, result in results.items():
+        row = ''.join(f"{result['per_count'][count]:>12.0f}" for count in args.tokens)
+        drift = ''
+        if reference is not None:
+            drift = f"{np.max(np.abs(result['predictions'] - reference)):.2e}"
+        print(f"{label:<18}{row}{result['loop_tokens_per_second']:>12.0f}{drift:>11}")
+
+if __name__ == "__main__":
+    main()
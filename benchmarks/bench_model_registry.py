@@ -0,0 +1,141 @@
+"""
+Kinetic Anomaly Detection Engine System (KADES)
+Model Registry Worker Memory Benchmark
+
+Starts a pool of spawned worker processes that each need the same model and
+compares two setups: every worker loading its own copy, and the parent
+loading the model once through the ModelRegistry and handing the shared
+weights to the workers. Reports per-model load time and resident bytes in
+the parent, and per worker the time until the model is ready, its private
+memory and its proportional set size (PSS), where shared pages are split
+between the processes mapping them.
+
+By default the model is a synthetic stack of Linear layers of --size-mb
+megabytes, so the benchmark runs without downloading weights; --model runs
+a Hugging Face encoder (e.g. distilbert-base-uncased) instead.
+
+Usage:
+    python -m benchmarks.bench_model_registry --workers 8 --size-mb 256
+    python -m benchmarks.bench_model_registry --model distilbert-base-uncased
+
+Author: KADES Team
+License: Proprietary
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import torch
+import torch.multiprocessing as mp
+import torch.nn as nn
+
+from src.sentiment_analysis.model_registry import ModelRegistry, get_model_registry, install_models
+
+MODEL_KEY = 'bench:encoder'
+HIDDEN = 1024
+
+def build_synthetic(size_mb: int) -> nn.Module:
+    """Stack of HIDDEN x HIDDEN Linear layers holding about size_mb of fp32 weights."""
+    torch.manual_seed(0)
+    layers = max(1, size_mb * 2**20 // (HIDDEN * HIDDEN * 4))
+    return nn.Sequential(*[nn.Linear(HIDDEN, HIDDEN) for _ in range(layers)]).eval()
+
+def build_pretrained(model_name: str) -> nn.Module:
+    from transformers import AutoModel
+    return AutoModel.from_pretrained(model_name).eval()
+
+def warm(model: nn.Module) -> torch.Tensor:
+    """Dummy batch through the model; also the output compared across workers."""
+    if isinstance(model, nn.Sequential):
+        torch.manual_seed(1)
+        return model(torch.randn(4, HIDDEN))
+    input_ids = torch.arange(1, 33).reshape(2, 16)
+    return model(input_ids=input_ids, attention_mask=torch.ones_like(input_ids)).last_hidden_state
+
+def memory_footprint() -> Dict[str, int]:
+    """RSS, PSS and private bytes of this process from /proc/self/smaps_rollup."""
+    fields = {}
+    try:
+        with open('/proc/self/smaps_rollup') as rollup:
+            for line in rollup:
+                parts = line.split()
+                if len(parts) == 3 and parts[2] == 'kB':
+                    fields[parts[0].rstrip(':')] = int(parts[1]) * 1024
+    except OSError:
+        pass
+    return {
+        'rss': fields.get('Rss', 0),
+        'pss': fields.get('Pss', 0),
+        'private': fields.get('Private_Clean', 0) + fields.get('Private_Dirty', 0),
+    }
+
+def init_worker(exported: Optional[Dict]) -> None:
+    torch.set_num_threads(1)
+    if exported is not None:
+        install_models(exported)
+
+def worker_task(loader: Optional[Callable[[], nn.Module]]) -> Dict:
+    """Get the model (installed or loaded here), run it and measure this process."""
+    checksum = None
+    if loader is not None:
+        model = get_model_registry().get(MODEL_KEY, loader, warmup=warm)
+        with torch.no_grad():
+            checksum = float(warm(model).sum())
+    ready_at = time.time()
+    time.sleep(0.5)  # hold every worker alive so no two tasks share a process
+    return {'pid': os.getpid(), 'ready_at': ready_at, 'checksum': checksum, **memory_footprint()}
+
+def run_pool(workers: int, loader: Optional[Callable[[], nn.Module]], exported: Optional[Dict]) -> List[Dict]:
+    """Run one task per spawned worker; ready_seconds counts from pool start (interpreter and imports included)."""
+    context = mp.get_context('spawn')
+    started = time.time()
+    with ProcessPoolExecutor(workers, mp_context=context, initializer=init_worker,
+                             initargs=(exported,)) as pool:
+        results = list(pool.map(worker_task, [loader] * workers))
+    for result in results:
+        result['ready_seconds'] = result['ready_at'] - started
+    return results
+
+def summarize(label: str, results: List[Dict]) -> None:
+    mib = 2**20
+    print(f"{label:<22}{len({r['pid'] for r in results}):>8}"
+          f"{np.mean([r['ready_seconds'] for r in results]):>11.2f}"
+          f"{np.mean([r['private'] for r in results]) / mib:>14.1f}"
+          f"{np.mean([r['pss'] for r in results]) / mib:>10.1f}"
+          f"{sum(r['pss'] for r in results) / mib:>14.1f}")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Per-worker model memory with and without the shared registry")
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--size-mb', type=int, default=256, help="Synthetic model size")
+    parser.add_argument('--model', default=None, help="Hugging Face encoder to load instead of the synthetic model")
+    args = parser.parse_args()
+
+    loader = partial(build_pretrained, args.model) if args.model else partial(build_synthetic, args.size_mb)
+
+    registry = ModelRegistry()
+    with torch.no_grad():
+        reference = float(warm(registry.get(MODEL_KEY, loader, warmup=warm)).sum())
+    exported = registry.export()
+    for stats in registry.report():
+        print(f"parent: {stats['key']} loaded in {stats['load_seconds']:.2f}s "
+              f"(warmup {stats['warmup_seconds']:.2f}s), {stats['resident_bytes'] / 2**20:.1f} MiB resident, "
+              f"{stats['tensor_bytes'] / 2**20:.1f} MiB weights, shared={stats['shared']}")
+
+    print(f"\n{'setup':<22}{'workers':>8}{'ready s':>11}{'private MiB':>14}{'PSS MiB':>10}{'total PSS MiB':>14}")
+    summarize('no model (baseline)', run_pool(args.workers, None, None))
+    per_worker = run_pool(args.workers, loader, None)
+    summarize('load per worker', per_worker)
+    shared = run_pool(args.workers, loader, exported)
+    summarize('shared from parent', shared)
+
+    mismatched = [r for r in per_worker + shared if not np.isclose(r['checksum'], reference)]
+    print(f"\noutputs match parent: {not mismatched}")
+
+if __name__ == "__main__":
+    main()
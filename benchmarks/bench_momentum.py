@@ -0,0 +1,127 @@
+"""
+Kinetic Anomaly Detection Engine System (KADES)
+Momentum Tracker Benchmark
+
+Compares the per-tick cost of streaming indicator updates against recomputing
+every indicator from the retained history with the batch functions, as the
+tracker used to on each tick, and reports end-to-end update_momentum cost
+and the memory held by OHLCV bars versus per-timeframe raw tick deques.
+
+Usage:
+    python -m benchmarks.bench_momentum --ticks 5000 --tokens 10
+
+Author: KADES Team
+License: Proprietary
+"""
+
+import argparse
+import asyncio
+import math
+import time
+import tracemalloc
+from collections import defaultdict, deque
+from datetime import datetime, timedelta
+from typing import List, Tuple
+
+import numpy as np
+
+from src.temporal_analysis.momentum_tracker import MomentumTracker
+
+def generate_ticks(args: argparse.Namespace) -> List[Tuple[str, float, float, datetime]]:
+    """Random-walk prices and lognormal volumes for each token."""
+    rng = np.random.default_rng(args.seed)
+    token_ids = rng.integers(0, args.tokens, size=args.ticks)
+    returns = rng.normal(0.0, 0.01, size=args.ticks)
+    volumes = rng.lognormal(8.0, 1.0, size=args.ticks)
+
+    prices = [100.0] * args.tokens
+    start = datetime(2024, 1, 1)
+    ticks = []
+    for i, (token, ret, volume) in enumerate(zip(token_ids.tolist(), returns.tolist(), volumes.tolist())):
+        prices[token] *= math.exp(ret)
+        ticks.append((f"Token{token}", prices[token], volume,
+                      start + timedelta(seconds=i * args.interval)))
+    return ticks
+
+def time_streaming_indicators(ticks: List, tracker: MomentumTracker) -> float:
+    """Seconds spent updating and reading streaming indicators for every timeframe."""
+    elapsed = 0.0
+    for token_address, price, volume, _ in ticks:
+        states = tracker.indicator_state[token_address]
+        began = time.perf_counter()
+        for timeframe in tracker.timeframes:
+            states[timeframe].update(price, volume)
+            states[timeframe].snapshot()
+        elapsed += time.perf_counter() - began
+    return elapsed
+
+def time_batch_indicators(ticks: List, tracker: MomentumTracker) -> float:
+    """Seconds spent recomputing every timeframe's indicators from history."""
+    price_history = defaultdict(
+        lambda: {tf: deque(maxlen=tracker.history_size) for tf in tracker.timeframes}
+    )
+    elapsed = 0.0
+    for token_address, price, volume, timestamp in ticks:
+        histories = price_history[token_address]
+        began = time.perf_counter()
+        for timeframe in tracker.timeframes:
+            histories[timeframe].append({'price': price, 'volume': volume, 'timestamp': timestamp})
+            tracker._calculate_indicators_batch(
+                [p['price'] for p in histories[timeframe]],
+                [p['volume'] for p in histories[timeframe]]
+            )
+        elapsed += time.perf_counter() - began
+    return elapsed
+
+def measure_history_bytes(ticks: List, tracker: MomentumTracker) -> Tuple[int, int]:
+    """Allocated bytes for raw tick deques per timeframe vs the bar store."""
+    tracemalloc.start()
+    price_history = defaultdict(
+        lambda: {tf: deque(maxlen=tracker.history_size) for tf in tracker.timeframes}
+    )
+    for token_address, price, volume, timestamp in ticks:
+        for timeframe in tracker.timeframes:
+            price_history[token_address][timeframe].append(
+                {'price': price, 'volume': volume, 'timestamp': timestamp}
+            )
+    raw_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    for token_address, price, volume, timestamp in ticks:
+        tracker._update_price_history(token_address, price, volume, timestamp)
+    bar_bytes = sum(aggregator.nbytes for aggregator in tracker.bars.values())
+    return raw_bytes, bar_bytes
+
+async def time_update_momentum(ticks: List, tracker: MomentumTracker) -> float:
+    """Seconds spent in end-to-end update_momentum calls."""
+    began = time.perf_counter()
+    for token_address, price, volume, timestamp in ticks:
+        await tracker.update_momentum(token_address, price, volume, timestamp)
+    return time.perf_counter() - began
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Streaming vs batch momentum indicators")
+    parser.add_argument('--ticks', type=int, default=5000, help="Ticks to replay")
+    parser.add_argument('--tokens', type=int, default=10, help="Number of distinct tokens")
+    parser.add_argument('--interval', type=float, default=1.0, help="Seconds between ticks")
+    parser.add_argument('--seed', type=int, default=11)
+    args = parser.parse_args()
+
+    ticks = generate_ticks(args)
+    per_tick = lambda seconds: seconds / len(ticks) * 1e6
+
+    streaming = per_tick(time_streaming_indicators(ticks, MomentumTracker()))
+    batch = per_tick(time_batch_indicators(ticks, MomentumTracker()))
+    end_to_end = per_tick(asyncio.run(time_update_momentum(ticks, MomentumTracker())))
+    raw_bytes, bar_bytes = measure_history_bytes(ticks, MomentumTracker())
+
+    print(f"ticks:                {args.ticks} across {args.tokens} tokens")
+    print(f"streaming indicators: {streaming:.1f} us/tick")
+    print(f"batch indicators:     {batch:.1f} us/tick")
+    print(f"speedup:              {batch / streaming:.1f}x")
+    print(f"update_momentum:      {end_to_end:.1f} us/tick")
+    print(f"raw tick deques:      {raw_bytes / args.tokens / 1024:.1f} KiB/token")
+    print(f"OHLCV bars:           {bar_bytes / args.tokens / 1024:.1f} KiB/token")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Kinetic Anomaly Detection Engine System (KADES)
+Rate Limit Strategy Micro-benchmark
+
+Reports decisions per second for each rate limiting strategy on each
+backend. The memory backend runs in-process; the Redis backend runs against
+the in-process stand-in from bench_rate_limiter (zero round-trip time by
+default, so the figure is client-side overhead), or against a real server
+with --redis-url, where each decision executes the strategy's Lua script.
+
+Usage:
+    python -m benchmarks.bench_rate_limit_strategies --decisions 200000
+    python -m benchmarks.bench_rate_limit_strategies --redis-url redis://localhost:6379/15
+
+Author: KADES Team
+License: Proprietary
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Dict
+
+from benchmarks.bench_rate_limiter import LocalRedis
+from src.api.rate_limiter import STRATEGIES, MemoryBackend, RedisBackend, get_strategy
+
+LIMITS = {'rate': 20.0, 'burst': 50}
+
+async def make_backend(name: str, args: argparse.Namespace):
+    if name == 'memory':
+        return MemoryBackend()
+    if args.redis_url:
+        from redis.asyncio import Redis
+        client = Redis.from_url(args.redis_url, decode_responses=True)
+        await client.flushdb()
+        return RedisBackend(client)
+    return RedisBackend(LocalRedis(args.rtt_ms / 1e3))
+
+async def measure(backend, strategy_name: str, args: argparse.Namespace) -> Dict[str, float]:
+    """Decide `decisions` requests round-robin over `keys` keys."""
+    strategy = get_strategy(strategy_name)
+    keys = [f"bucket:key{i}:/analyze:{strategy_name}" for i in range(args.keys)]
+    # Arrivals at twice each key's rate, so roughly half are denied
+    step = 1 / (2 * LIMITS['rate'] * args.keys)
+
+    granted = 0
+    now = time.time()
+    began = time.perf_counter()
+    for i in range(args.decisions):
+        decision = await backend.acquire(strategy, keys[i % args.keys], LIMITS, now + i * step)
+        granted += decision.granted
+    elapsed = time.perf_counter() - began
+    return {'rate': args.decisions / elapsed, 'us': elapsed / args.decisions * 1e6, 'admitted': granted / args.decisions}
+
+async def run(args: argparse.Namespace) -> None:
+    print(f"{'strategy':<26}{'backend':<9}{'decisions/s':>13}{'us/decision':>13}{'admitted':>10}")
+    for strategy_name in STRATEGIES:
+        for backend_name in ('memory', 'redis'):
+            backend = await make_backend(backend_name, args)
+            result = await measure(backend, strategy_name, args)
+            print(f"{strategy_name:<26}{backend_name:<9}{result['rate']:>13,.0f}"
+                  f"{result['us']:>13.2f}{result['admitted']:>10.2f}")
+            if backend_name == 'redis':
+                await backend.client.close()
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Rate limit decisions/s per strategy and backend")
+    parser.add_argument('--decisions', type=int, default=100000, help="Decisions per run")
+    parser.add_argument('--keys', type=int, default=100, help="Distinct API keys")
+    parser.add_argument('--rtt-ms', type=float, default=0.0, help="Round-trip time of the Redis stand-in")
+    parser.add_argument('--redis-url', default=None, help="Benchmark a real Redis server instead (flushes the db)")
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""
+Kinetic Anomaly Detection Engine System (KADES)
+Rate Limiter Latency Benchmark
+
+Measures the latency RateLimiter.check_rate_limit adds to each request
+against an in-process Redis stand-in that charges a fixed round-trip time per
+command (or pipeline). Compares the previous three-round-trip flow (tier GET,
+pipelined bucket GETs, pipelined SETs) with the atomic script call, with and
+without local pre-admission.
+
+Usage:
+    python -m benchmarks.bench_rate_limiter --requests 2000 --rtt-ms 0.5
+    python -m benchmarks.bench_rate_limiter --local-batch 10 --clients 20
+
+Author: KADES Team
+License: Proprietary
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Dict, List
+
+import numpy as np
+
+from src.api.rate_limiter import STRATEGIES, RateLimiter
+
+class LocalRedis:
+    """In-process Redis stand-in charging one round trip per command"""
+
+    def __init__(self, rtt: float):
+        self.rtt = rtt
+        self.store: Dict[str, str] = {}
+        self.states: Dict[str, object] = {}
+        self.round_trips = 0
+
+    async def _hop(self) -> None:
+        self.round_trips += 1
+        await asyncio.sleep(self.rtt)
+
+    async def ping(self) -> bool:
+        await self._hop()
+        return True
+
+    async def get(self, key: str):
+        await self._hop()
+        return self.store.get(key)
+
+    async def set(self, key: str, value) -> None:
+        await self._hop()
+        self.store[key] = value
+
+    def pipeline(self) -> 'LocalPipeline':
+        return LocalPipeline(self)
+
+    def register_script(self, source: str):
+        """Run the matching strategy's Python twin in place of its script."""
+        strategy = next(cls() for cls in STRATEGIES.values() if cls.script == source)
+
+        async def run(keys: List[str], args: List) -> List:
+            await self._hop()
+            decision, self.states[keys[0]] = strategy.step(
+                self.states.get(keys[0]), {'rate': args[0], 'burst': args[1]}, args[2], args[3]
+            )
+            return [decision.granted, str(decision.remaining), str(decision.reset_after),
+                    str(decision.retry_after)]
+        return run
+
+    async def close(self) -> None:
+        pass
+
+class LocalPipeline:
+    def __init__(self, redis: LocalRedis):
+        self.redis = redis
+        self.ops = []
+
+    def get(self, key: str) -> None:
+        self.ops.append(('get', key, None))
+
+    def set(self, key: str, value) -> None:
+        self.ops.append(('set', key, value))
+
+    async def execute(self) -> List:
+        await self.redis._hop()
+        results = []
+        for op, key, value in self.ops:
+            if op == 'get':
+                results.append(self.redis.store.get(key))
+            else:
+                self.redis.store[key] = value
+                results.append(True)
+        return results
+
+async def legacy_check(limiter: RateLimiter, api_key: str, endpoint: str) -> bool:
+    """The previous flow: tier GET, then GET and SET pipelines."""
+    tier = await limiter.redis.get(f"tier:{api_key}") or "basic"
+    limits = limiter.rate_limits[tier].get(endpoint, limiter.rate_limits[tier]["default"])
+    now = time.time()
+    bucket_key = f"bucket:{api_key}:{endpoint}"
+    last_update_key = f"last_update:{api_key}:{endpoint}"
+
+    pipeline = limiter.redis.pipeline()
+    pipeline.get(bucket_key)
+    pipeline.get(last_update_key)
+    current, last = await pipeline.execute()
+    current = float(current) if current else limits["burst"]
+    last = float(last) if last else now
+    tokens = min(current + (now - last) * limits["rate"], limits["burst"])
+    allowed = tokens >= 1
+    if allowed:
+        tokens -= 1
+
+    pipeline = limiter.redis.pipeline()
+    pipeline.set(bucket_key, tokens)
+    pipeline.set(last_update_key, now)
+    await pipeline.execute()
+    return allowed
+
+async def measure(check, args: argparse.Namespace) -> np.ndarray:
+    """Per-request latency (ms) of `check` across concurrent clients."""
+    latencies: List[float] = []
+
+    async def client(index: int) -> None:
+        for _ in range(args.requests // args.clients):
+            began = time.perf_counter()
+            await check(f"key{index}", "/api/v1/patterns")
+            latencies.append(time.perf_counter() - began)
+
+    await asyncio.gather(*(client(i) for i in range(args.clients)))
+    return np.array(latencies) * 1e3
+
+async def run(args: argparse.Namespace) -> None:
+    rtt = args.rtt_ms / 1e3
+    configs = [('legacy (3 round trips)', None), ('script', 1)]
+    if args.local_batch > 1:
+        configs.append((f'script + local batch {args.local_batch}', args.local_batch))
+
+    print(f"{'flow':<28}{'mean ms':>9}{'p50 ms':>9}{'p99 ms':>9}{'hops/req':>10}")
+    for label, batch in configs:
+        redis = LocalRedis(rtt)
+        limiter = RateLimiter(
+            "redis://localhost:6379/0", args.config, local_batch=batch or 1, strategy='token_bucket'
+        )
+        await limiter.initialize(redis)
+        for i in range(args.clients):
+            await redis.set(f"tier:key{i}", "enterprise")
+        redis.round_trips = 0
+
+        if batch is None:
+            check = lambda key, endpoint: legacy_check(limiter, key, endpoint)
+        else:
+            check = limiter.check_rate_limit
+        latencies = await measure(check, args)
+        print(f"{label:<28}{latencies.mean():>9.3f}{np.percentile(latencies, 50):>9.3f}"
+              f"{np.percentile(latencies, 99):>9.3f}{redis.round_trips / len(latencies):>10.2f}")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Rate limiter added latency per request")
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--clients', type=int, default=10, help="Concurrent clients (one API key each)")
+    parser.add_argument('--rtt-ms', type=float, default=0.5, help="Simulated Redis round-trip time")
+    parser.add_argument('--local-batch', type=int, default=10, help="Tokens per local reservation")
+    parser.add_argument('--config', default="config/default.yml")
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+if __name__ == "__main__":
+    main()
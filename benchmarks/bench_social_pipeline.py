@@ -0,0 +1,127 @@
+"""
+Kinetic Anomaly Detection Engine System (KADES)
+Social Scraping Pipeline Benchmark
+
+Replays recorded posts from tests/fixtures/mock_social_posts.json through the
+streaming scraper pipeline (producers -> filter -> dedup -> NLP) with simulated
+API latency and reports end-to-end throughput.
+
+Usage:
+    python -m benchmarks.bench_social_pipeline --posts 20000 --keywords 20
+    python -m benchmarks.bench_social_pipeline --nlp   # include model scoring
+
+Author: KADES Team
+License: Proprietary
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+from pathlib import Path
+from typing import Dict, List
+
+from src.sentiment_analysis.social_scraper import ScrapingConfig, SocialMediaScraper
+
+FIXTURE_PATH = Path(__file__).resolve().parents[1] / 'tests' / 'fixtures' / 'mock_social_posts.json'
+
+class ReplayXClient:
+    """Stand-in for the Twitter client that replays fixture tweets."""
+
+    def __init__(self, tweets: List[Dict], total_posts: int, latency: float):
+        self._source = itertools.cycle(tweets)
+        self._remaining = total_posts
+        self._serial = itertools.count()
+        self.latency = latency
+
+    async def search_recent_tweets(self, query: str, max_results: int, tweet_fields: List[str]):
+        # One simulated network round trip per result page
+        await asyncio.sleep(self.latency)
+        while self._remaining > 0 and max_results > 0:
+            tweet = dict(next(self._source))
+            tweet['id'] = f"{tweet['id']}-{next(self._serial)}"
+            self._remaining -= 1
+            max_results -= 1
+            yield tweet
+
+class ReplayScraper(SocialMediaScraper):
+    """Scraper wired to replay clients instead of live platform APIs."""
+
+    def __init__(self, x_client: ReplayXClient, config: ScrapingConfig):
+        self._replay_x_client = x_client
+        super().__init__({}, {}, {}, config)
+
+    def _init_x_client(self, credentials: Dict):
+        return self._replay_x_client
+
+    def _init_telegram_client(self, credentials: Dict):
+        return None
+
+    def _init_discord_client(self, credentials: Dict):
+        return None
+
+    def _build_x_query(self, keyword: str) -> str:
+        return keyword
+
+    async def _parse_telegram_message(self, message) -> None:
+        return None
+
+    async def _parse_discord_message(self, message) -> None:
+        return None
+
+async def run_benchmark(args: argparse.Namespace) -> Dict:
+    """Run the replay benchmark and return pipeline statistics."""
+    tweets = json.loads(FIXTURE_PATH.read_text(encoding='utf-8'))['tweets']
+
+    keywords = [f"kw{i}" for i in range(args.keywords)]
+    config = ScrapingConfig(
+        keywords=keywords,
+        token_symbols=["SOL", "BONK", "WEN"],
+        platforms=["x"],
+        min_engagement=0,
+        max_posts_per_query=max(1, args.posts // max(1, args.keywords)),
+        rate_limits={"x": args.rate},
+        blacklisted_sources=set(),
+        language_filter=["en"],
+        burst_limits={"x": args.burst},
+        shard_size=args.shard_size,
+        queue_size=args.queue_size,
+        nlp_workers=args.nlp_workers
+    )
+
+    scraper = ReplayScraper(ReplayXClient(tweets, args.posts, args.latency), config)
+
+    nlp_processor = None
+    if args.nlp:
+        from src.sentiment_analysis.nlp_processor import SocialMediaNLPProcessor
+        nlp_processor = SocialMediaNLPProcessor()
+
+    stats = await scraper.run_pipeline(nlp_processor=nlp_processor)
+    stats['deduplication'] = scraper.deduplicator.get_stats()
+    return stats
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Replay benchmark for the social scraping pipeline")
+    parser.add_argument('--posts', type=int, default=20000, help="Total posts to replay")
+    parser.add_argument('--keywords', type=int, default=20, help="Number of search keywords")
+    parser.add_argument('--shard-size', type=int, default=2, help="Keywords per producer task")
+    parser.add_argument('--queue-size', type=int, default=1000, help="Bounded queue size per stage")
+    parser.add_argument('--latency', type=float, default=0.05, help="Simulated API latency per query (s)")
+    parser.add_argument('--rate', type=float, default=50.0, help="X requests per second")
+    parser.add_argument('--burst', type=int, default=20, help="X token bucket burst")
+    parser.add_argument('--nlp', action='store_true', help="Include the NLP processor stage")
+    parser.add_argument('--nlp-workers', type=int, default=1, help="Concurrent NLP stage workers")
+    args = parser.parse_args()
+
+    stats = asyncio.run(run_benchmark(args))
+
+    print(f"producers:        {stats['producers']}")
+    print(f"posts scraped:    {stats['posts_scraped']}")
+    print(f"posts filtered:   {stats['posts_filtered']}")
+    print(f"posts emitted:    {stats['posts_emitted']}")
+    print(f"duplicate rate:   {stats['deduplication']['duplicate_rate']:.1%}")
+    print(f"elapsed:          {stats['elapsed_seconds']:.3f}s")
+    print(f"throughput:       {stats['posts_per_second']:.0f} posts/s")
+
+if __name__ == "__main__":
+    main()
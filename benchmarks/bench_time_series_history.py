@@ -0,0 +1,123 @@
+"""
+Kinetic Anomaly Detection Engine System (KADES)
+Time Series History Benchmark
+
+Appends RiskAssessment-shaped records for many tokens and compares the
+previous per-token list, trimmed with `history[-capacity:]` after every
+append, against TimeSeriesHistory. Reports the cost per append, a
+timestamp range query (list comprehension over the records against binary
+search on the timestamp column), rebuilding the last 100 records, a
+one-minute downsample, and the memory a full history of distinct records
+keeps alive per token.
+
+Usage:
+    python -m benchmarks.bench_time_series_history --tokens 200 --records 5000
+
+Author: KADES Team
+License: Proprietary
+"""
+
+import argparse
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+import numpy as np
+
+from src.score_aggregator.risk_scorer import RiskAssessment
+from src.temporal_analysis.time_series_history import TimeSeriesHistory
+
+def make_records(rng: np.random.Generator, count: int) -> List[RiskAssessment]:
+    start = datetime(2026, 1, 1)
+    return [
+        RiskAssessment(
+            token_address='Token',
+            timestamp=start + timedelta(seconds=i),
+            risk_scores={'market': 0.4, 'chain': 0.3},
+            overall_risk=float(risk),
+            warning_signals=[],
+            risk_factors={'liquidity': float(risk), 'volatility': 0.5},
+            confidence=0.9
+        )
+        for i, risk in enumerate(rng.random(count))
+    ]
+
+def fill_lists(records: List[RiskAssessment], tokens: int, capacity: int) -> Dict[int, List]:
+    histories = {token: [] for token in range(tokens)}
+    for record in records:
+        for token in range(tokens):
+            histories[token].append(record)
+            if len(histories[token]) > capacity:
+                histories[token] = histories[token][-capacity:]
+    return histories
+
+def fill_rings(records: List[RiskAssessment], tokens: int, capacity: int) -> Dict[int, TimeSeriesHistory]:
+    histories = {
+        token: TimeSeriesHistory.for_dataclass(RiskAssessment, capacity=capacity) for token in range(tokens)
+    }
+    for record in records:
+        for token in range(tokens):
+            histories[token].append_record(record)
+    return histories
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+def retained_bytes(fill, records: int, capacity: int, seed: int) -> int:
+    """Memory still allocated after filling one token's history with fresh records."""
+    tracemalloc.start()
+    history = fill(make_records(np.random.default_rng(seed), records), 1, capacity)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del history
+    return size
+
+def per_call(function, repeats: int = 200) -> float:
+    start = time.perf_counter()
+    for _ in range(repeats):
+        function()
+    return (time.perf_counter() - start) / repeats
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Trimmed list vs ring time-series history")
+    parser.add_argument('--tokens', type=int, default=200)
+    parser.add_argument('--records', type=int, default=5000)
+    parser.add_argument('--capacity', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    records = make_records(np.random.default_rng(args.seed), args.records)
+    appends = args.tokens * args.records
+
+    lists, list_seconds = timed(fill_lists, records, args.tokens, args.capacity)
+    rings, ring_seconds = timed(fill_rings, records, args.tokens, args.capacity)
+    history, ring = lists[0], rings[0]
+    assert ring[:] == history
+
+    # Last ten minutes of one token
+    end = records[-1].timestamp
+    start = end - timedelta(minutes=10)
+    window = [r.overall_risk for r in history if start <= r.timestamp <= end]
+    assert np.array_equal(window, ring.range(start, end)['overall_risk'])
+
+    list_range = per_call(lambda: [r.overall_risk for r in history if start <= r.timestamp <= end])
+    ring_range = per_call(lambda: ring.range(start, end)['overall_risk'])
+    list_tail = per_call(lambda: history[-100:])
+    ring_tail = per_call(lambda: ring[-100:])
+    downsample = per_call(lambda: ring.downsample(60, how={'overall_risk': 'max', 'confidence': 'mean'}))
+    list_bytes = retained_bytes(fill_lists, args.records, args.capacity, args.seed)
+    ring_bytes = retained_bytes(fill_rings, args.records, args.capacity, args.seed)
+
+    print(f"tokens: {args.tokens}, records: {args.records}, capacity: {args.capacity}")
+    print(f"{'history':<16}{'us/append':>11}{'range us':>10}{'[-100:] us':>12}{'KiB/token':>11}")
+    print(f"{'trimmed list':<16}{list_seconds / appends * 1e6:>11.2f}{list_range * 1e6:>10.1f}"
+          f"{list_tail * 1e6:>12.1f}{list_bytes / 1024:>11.1f}")
+    print(f"{'ring':<16}{ring_seconds / appends * 1e6:>11.2f}{ring_range * 1e6:>10.1f}"
+          f"{ring_tail * 1e6:>12.1f}{ring_bytes / 1024:>11.1f}")
+    print(f"ring downsample to 1m bars: {downsample * 1e6:.1f} us")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""Kinetic Anomaly Detection Engine System (KADES)
+
+Lazy Exports Module
+
+This module implements PEP 562 lazy attribute exports for the KADES packages,
+so importing a package does not import its submodules (and their heavy
+dependencies) until an exported name is first used.
+
+Author: KADES Team
+License: Proprietary"""
+
+import sys
+from importlib import import_module
+from typing import Any, Callable, Dict, List, Tuple
+
+def lazy_exports(
+    package: str,
+    lazy_imports: Dict[str, List[str]]
+) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """
+    Build the module-level __getattr__ and __dir__ of a package.
+
+    Args:
+        package: The package's __name__
+        lazy_imports: Relative submodule name -> names exported from it
+
+    Returns:
+        Tuple of (__getattr__, __dir__) for the package namespace
+    """
+    attribute_modules = {name: module for module, names in lazy_imports.items() for name in names}
+
+    def __getattr__(name: str) -> Any:
+        module = attribute_modules.get(name)
+        if module is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(import_module(module, package), name)
+        # Cache on the package so later lookups skip __getattr__
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(vars(sys.modules[package])) | set(attribute_modules))
+
+    return __getattr__, __dir__
@@ -8,9 +8,26 @@ providing real-time access to analysis and detection capabilities.
 Author: KADES Team
 License: Proprietary"""
 
-from .routes import app
-from .middleware import SecurityMiddleware, RateLimiter
-from .websocket import WSManager
+from typing import TYPE_CHECKING
+from src._lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .routes import app
+    from .middleware import SecurityMiddleware, RateLimiter
+    from .websocket import WSManager
+    from .request_coalescing import SingleFlight
+    from .cache import AnalysisCache
+    from .broadcast import BroadcastEngine
+
+_LAZY_IMPORTS = {
+    '.routes': ['app'],
+    '.middleware': ['SecurityMiddleware', 'RateLimiter'],
+    '.websocket': ['WSManager'],
+    '.request_coalescing': ['SingleFlight'],
+    '.cache': ['AnalysisCache'],
+    '.broadcast': ['BroadcastEngine'],
+}
+__getattr__, __dir__ = lazy_exports(__name__, _LAZY_IMPORTS)
 
 __version__ = '1.0.0'
 __author__ = 'KADES Team'
@@ -21,6 +38,9 @@ __all__ = [
     'SecurityMiddleware',
     'RateLimiter',
     'WSManager',
+    'SingleFlight',
+    'AnalysisCache',
+    'BroadcastEngine',
 ]
 
 # API configuration
@@ -47,5 +67,10 @@ WS_CONFIG = {
     'ping_interval': 30,
     'ping_timeout': 10,
     'max_message_size': 1024 * 1024,  # 1MB
-    'compression': True
+    'compression': True,  # permessage-deflate
+    'send_queue_size': 256,  # frames buffered per client
+    'slow_consumer_policy': 'drop_oldest',  # or 'coalesce' (by token), 'disconnect'
+    'replay_size': 1000,  # recent events kept for resume after reconnect
+    'reply_reserve': 256,  # reply and replay frames buffered per client
+    'replay_interval': 1.0  # minimum seconds between replays per client
 }
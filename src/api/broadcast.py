@@ -0,0 +1,298 @@
+"""
+Kinetic Anomaly Detection Engine System (KADES)
+Broadcast Module
+
+This module implements the fan-out engine behind WebSocket broadcasts. Each
+message is serialized once into a frame that is pushed into a bounded queue
+per connection, and one writer task per connection drains its queue, so a
+slow client only ever delays its own frames. When a queue is full the
+configured slow-consumer policy drops the oldest frame, coalesces frames for
+the same token, or disconnects the client. Frames sent to one client in
+reply to its own requests (acknowledgements, replays) go through a second,
+smaller queue that the writer drains first; when it is full further
+replies are rejected, so a client cannot grow its queue by asking.
+
+Author: KADES Team
+License: Proprietary
+"""
+
+import asyncio
+import logging
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Hashable, Iterable, List, Optional, Set
+
+import orjson
+from . import WS_CONFIG
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+SLOW_CONSUMER_POLICIES = ['drop_oldest', 'coalesce', 'disconnect']
+
+def encode_frame(message: Dict) -> str:
+    """Serialize a message once for every recipient."""
+    return orjson.dumps(message, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS).decode()
+
+class ClientChannel:
+    """
+    Bounded send queue and writer task for one connection.
+
+    Queue entries are [key, frame]. Under the 'coalesce' policy a frame whose
+    key is already queued replaces the queued frame in place, so a backed-up
+    client receives only the latest frame per key; when the queue is full
+    the oldest frame is dropped as with 'drop_oldest'. Replies are queued
+    separately, up to `reply_reserve` frames, and sent before broadcasts.
+    """
+
+    def __init__(
+        self,
+        websocket: Any,
+        max_queue: int,
+        policy: str,
+        on_close: Callable[['ClientChannel'], None],
+        reply_reserve: int
+    ):
+        self.websocket = websocket
+        self.max_queue = max_queue
+        self.policy = policy
+        self.reply_reserve = reply_reserve
+        self.closed = False
+        self.stats = {'sent': 0, 'dropped': 0, 'coalesced': 0, 'rejected': 0}
+
+        self._queue: Deque[List] = deque()
+        self._replies: Deque[str] = deque()
+        self._pending: Dict[Hashable, List] = {}  # coalesce key -> queued entry
+        self._ready = asyncio.Event()
+        self._on_close = on_close
+        self._writer = asyncio.ensure_future(self._write_loop())
+
+    def __len__(self) -> int:
+        return len(self._queue) + len(self._replies)
+
+    @property
+    def reply_room(self) -> int:
+        """Reply frames that can still be queued."""
+        return 0 if self.closed else self.reply_reserve - len(self._replies)
+
+    def offer(self, frame: str, key: Optional[Hashable] = None) -> bool:
+        """
+        Queue a broadcast frame without waiting for the client.
+
+        Args:
+            frame: Encoded frame
+            key: Coalescing key
+
+        Returns:
+            False if the channel is closed (or was closed by the policy)
+        """
+        if self.closed:
+            return False
+
+        coalesce = self.policy == 'coalesce' and key is not None
+        if coalesce:
+            entry = self._pending.get(key)
+            if entry is not None:
+                entry[1] = frame
+                self.stats['coalesced'] += 1
+                return True
+
+        if len(self._queue) >= self.max_queue:
+            if self.policy == 'disconnect':
+                logger.warning(f"Disconnecting slow consumer with {len(self._queue)} queued frames")
+                self.close()
+                return False
+            self._pop()
+            self.stats['dropped'] += 1
+
+        entry = [key, frame]
+        self._queue.append(entry)
+        if coalesce:
+            self._pending[key] = entry
+        self._ready.set()
+        return True
+
+    def offer_reply(self, frame: str) -> bool:
+        """
+        Queue a reply to this client ahead of broadcasts.
+
+        Returns:
+            False if the channel is closed or the reply reserve is full
+        """
+        if self.closed:
+            return False
+        if len(self._replies) >= self.reply_reserve:
+            self.stats['rejected'] += 1
+            return False
+        self._replies.append(frame)
+        self._ready.set()
+        return True
+
+    def _pop(self) -> List:
+        entry = self._queue.popleft()
+        if entry[0] is not None and self._pending.get(entry[0]) is entry:
+            del self._pending[entry[0]]
+        return entry
+
+    async def _write_loop(self) -> None:
+        try:
+            while True:
+                if self._replies:
+                    frame = self._replies.popleft()
+                elif self._queue:
+                    _, frame = self._pop()
+                else:
+                    self._ready.clear()
+                    await self._ready.wait()
+                    continue
+                await self.websocket.send_text(frame)
+                self.stats['sent'] += 1
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.info(f"Client send failed, closing channel: {e}")
+            self.close()
+
+    def close(self, notify: bool = True) -> None:
+        """Stop the writer and drop queued frames."""
+        if self.closed:
+            return
+        self.closed = True
+        self._queue.clear()
+        self._replies.clear()
+        self._pending.clear()
+        if self._writer is not asyncio.current_task():
+            self._writer.cancel()
+        if notify:
+            self._on_close(self)
+
+    async def wait_closed(self) -> None:
+        await asyncio.gather(self._writer, return_exceptions=True)
+
+class BroadcastEngine:
+    """Serialize-once fan-out to per-connection queues"""
+
+    def __init__(
+        self,
+        max_queue: int = WS_CONFIG['send_queue_size'],
+        policy: str = WS_CONFIG['slow_consumer_policy'],
+        on_disconnect: Optional[Callable[[Any], Awaitable[None]]] = None,
+        reply_reserve: int = WS_CONFIG['reply_reserve']
+    ):
+        """
+        Initialize the engine.
+
+        Args:
+            max_queue: Frames buffered per connection
+            policy: Slow-consumer policy, one of SLOW_CONSUMER_POLICIES
+            on_disconnect: Coroutine called with a websocket whose channel
+                was closed by the policy or a failed send
+            reply_reserve: Reply frames (acknowledgements, replays) buffered
+                per connection on top of max_queue
+        """
+        if policy not in SLOW_CONSUMER_POLICIES:
+            raise ValueError(f"Unknown slow consumer policy '{policy}', expected one of {SLOW_CONSUMER_POLICIES}")
+
+        self.max_queue = max_queue
+        self.policy = policy
+        self.on_disconnect = on_disconnect
+        self.reply_reserve = reply_reserve
+        self.channels: Dict[Any, ClientChannel] = {}
+        self.stats = {'published': 0, 'frames': 0, 'disconnected': 0}
+        self._tasks: Set[asyncio.Task] = set()
+
+    def __len__(self) -> int:
+        return len(self.channels)
+
+    def register(self, websocket: Any) -> ClientChannel:
+        """Start a send queue and writer for an accepted connection."""
+        channel = ClientChannel(
+            websocket, self.max_queue, self.policy, self._channel_closed, self.reply_reserve
+        )
+        self.channels[websocket] = channel
+        return channel
+
+    async def unregister(self, websocket: Any) -> None:
+        """Stop a connection's writer, discarding unsent frames."""
+        channel = self.channels.pop(websocket, None)
+        if channel is not None:
+            channel.close(notify=False)
+            await channel.wait_closed()
+
+    def publish(self, message: Dict, key: Optional[Hashable] = None) -> int:
+        """
+        Serialize a message once and queue it for every connection.
+
+        Args:
+            message: JSON-serializable message
+            key: Coalescing key (e.g. the token address)
+
+        Returns:
+            Number of connections the frame was queued for
+        """
+        return self.publish_frame(encode_frame(message), key)
+
+    def publish_frame(
+        self,
+        frame: str,
+        key: Optional[Hashable] = None,
+        targets: Optional[Iterable[Any]] = None
+    ) -> int:
+        """
+        Queue a pre-encoded frame for every connection, or only `targets`.
+
+        Returns:
+            Number of connections the frame was queued for
+        """
+        self.stats['published'] += 1
+        if targets is None:
+            channels = list(self.channels.values())
+        else:
+            channels = [channel for channel in map(self.channels.get, targets) if channel is not None]
+
+        queued = 0
+        for channel in channels:
+            queued += channel.offer(frame, key)
+        self.stats['frames'] += queued
+        return queued
+
+    def send(self, websocket: Any, frame: str) -> bool:
+        """Queue a reply for one connection within its reply reserve."""
+        channel = self.channels.get(websocket)
+        return channel is not None and channel.offer_reply(frame)
+
+    def reply_room(self, websocket: Any) -> int:
+        """Reply frames that can still be queued for a connection."""
+        channel = self.channels.get(websocket)
+        return 0 if channel is None else channel.reply_room
+
+    def channel_stats(self) -> Dict[str, int]:
+        """Totals over open connections."""
+        totals = {
+            'clients': len(self.channels), 'queued': 0, 'sent': 0, 'dropped': 0, 'coalesced': 0, 'rejected': 0
+        }
+        for channel in self.channels.values():
+            totals['queued'] += len(channel)
+            for name, value in channel.stats.items():
+                totals[name] += value
+        return totals
+
+    async def close(self) -> None:
+        """Stop every writer and wait for pending disconnect callbacks."""
+        for websocket in list(self.channels):
+            await self.unregister(websocket)
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def _channel_closed(self, channel: ClientChannel) -> None:
+        if self.channels.get(channel.websocket) is not channel:
+            return
+        del self.channels[channel.websocket]
+        self.stats['disconnected'] += 1
+        if self.on_disconnect is not None:
+            task = asyncio.ensure_future(self.on_disconnect(channel.websocket))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
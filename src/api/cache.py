@@ -0,0 +1,308 @@
+"""
+Kinetic Anomaly Detection Engine System (KADES)
+API Cache Module
+
+This module implements the non-blocking Redis cache used by the API routes.
+Values are stored as orjson (or msgpack) envelopes carrying their write time,
+connections come from a shared async connection pool, multi-key reads are
+pipelined into a single MGET, and entries are served stale-while-revalidate:
+once past their key family's TTL (from `cache.ttl` in the config) they are
+still returned for a grace period while one background task refreshes them.
+
+Author: KADES Team
+License: Proprietary
+"""
+
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+import orjson
+import yaml
+from redis.asyncio import ConnectionPool, Redis
+
+from .request_coalescing import SingleFlight
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+SERIALIZERS = ['orjson', 'msgpack']
+
+def _to_builtin(value: Any) -> Any:
+    """Fallback encoder for NumPy scalars/arrays and datetimes."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+class CacheCodec:
+    """Encodes cache envelopes {'v': value, 't': write time} as bytes"""
+
+    def __init__(self, serializer: str = 'orjson'):
+        if serializer not in SERIALIZERS:
+            raise ValueError(f"Unknown cache serializer '{serializer}', expected one of {SERIALIZERS}")
+
+        self.serializer = serializer
+        if serializer == 'msgpack':
+            try:
+                import msgpack
+            except ImportError as e:
+                raise ImportError(
+                    "The 'msgpack' cache serializer requires msgpack; "
+                    "install it or select the 'orjson' serializer"
+                ) from e
+            self._msgpack = msgpack
+
+    def encode(self, value: Any, stored_at: float) -> bytes:
+        envelope = {'v': value, 't': stored_at}
+        if self.serializer == 'msgpack':
+            return self._msgpack.packb(envelope, default=_to_builtin)
+        return orjson.dumps(
+            envelope,
+            default=_to_builtin,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        )
+
+    def decode(self, payload: bytes) -> Tuple[Any, float]:
+        if self.serializer == 'msgpack':
+            envelope = self._msgpack.unpackb(payload)
+        else:
+            envelope = orjson.loads(payload)
+        return envelope['v'], envelope['t']
+
+class AnalysisCache:
+    """
+    Async Redis cache with per-family TTLs and stale-while-revalidate reads.
+
+    Keys are `<family>:<key>`. An entry is fresh for its family's TTL and
+    is kept in Redis for a further `stale_ttl` seconds, during which reads
+    return it immediately and trigger a single background revalidation.
+    """
+
+    def __init__(
+        self,
+        client: Redis,
+        ttls: Optional[Dict[str, int]] = None,
+        stale_ttl: int = 60,
+        serializer: str = 'orjson',
+        clock: Callable[[], float] = time.time
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            client: Async Redis client (normally backed by a shared pool)
+            ttls: Fresh TTL in seconds per key family, with a 'default' entry
+            stale_ttl: Seconds an expired entry may still be served
+            serializer: One of SERIALIZERS
+            clock: Time source (seconds)
+        """
+        self.client = client
+        self.ttls = {'default': 300, **(ttls or {})}
+        self.stale_ttl = stale_ttl
+        self.codec = CacheCodec(serializer)
+        self.clock = clock
+
+        self._flights = SingleFlight()
+        self._refreshes: Set[asyncio.Task] = set()
+        self.stats = {'hits': 0, 'stale_hits': 0, 'misses': 0, 'refreshes': 0}
+
+    @classmethod
+    def from_config(cls, config_path: str = "config/default.yml") -> 'AnalysisCache':
+        """Build a pooled cache from the `cache` section of a YAML config."""
+        config = {}
+        try:
+            with open(config_path, 'r') as f:
+                config = (yaml.safe_load(f) or {}).get('cache', {})
+        except Exception as e:
+            logger.error(f"Error loading cache config: {e}")
+
+        connection = config.get('connection', {})
+        pool = ConnectionPool(
+            host=connection.get('host', 'localhost'),
+            port=connection.get('port', 6379),
+            db=connection.get('db', 0),
+            password=connection.get('password'),
+            max_connections=connection.get('max_connections', 50)
+        )
+        return cls(
+            Redis(connection_pool=pool),
+            ttls=config.get('ttl'),
+            stale_ttl=config.get('stale_while_revalidate', 60),
+            serializer=config.get('serializer', 'orjson')
+        )
+
+    async def close(self) -> None:
+        """Wait for pending refreshes and release the connection pool."""
+        if self._refreshes:
+            await asyncio.gather(*self._refreshes, return_exceptions=True)
+        await self.client.close()
+
+    def ttl(self, family: str) -> int:
+        return self.ttls.get(family, self.ttls['default'])
+
+    async def get(self, family: str, key: str) -> Optional[Any]:
+        """Cached value (fresh or stale) or None."""
+        return (await self.get_many(family, [key])).get(key)
+
+    async def get_many(self, family: str, keys: Iterable[str]) -> Dict[str, Any]:
+        """
+        Read several keys of a family in one pipelined MGET.
+
+        Returns:
+            Cached values (fresh or stale) by key; misses are omitted
+        """
+        values, _ = await self._read(family, list(keys))
+        return values
+
+    async def set(self, family: str, key: str, value: Any) -> None:
+        await self.set_many(family, {key: value})
+
+    async def set_many(self, family: str, values: Dict[str, Any]) -> None:
+        """Write several keys of a family in one pipeline."""
+        if not values:
+            return
+
+        now = self.clock()
+        expiry = self.ttl(family) + self.stale_ttl
+        pipeline = self.client.pipeline(transaction=False)
+        for key, value in values.items():
+            pipeline.set(f"{family}:{key}", self.codec.encode(value, now), ex=expiry)
+        await pipeline.execute()
+
+    async def get_or_compute(
+        self,
+        family: str,
+        key: str,
+        compute: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """
+        Cached value, refreshing stale entries in the background and
+        computing misses (coalesced across concurrent callers).
+        """
+        results = await self.get_many_or_compute(family, [key], lambda _: compute())
+        return results[key]
+
+    async def get_many_or_compute(
+        self,
+        family: str,
+        keys: List[str],
+        compute: Callable[[str], Awaitable[Any]]
+    ) -> Dict[str, Any]:
+        """
+        Multi-key get_or_compute: one MGET, then concurrent computes for misses.
+
+        Args:
+            family: Key family (selects the TTL)
+            keys: Keys to read
+            compute: Coroutine factory producing the value for a key
+
+        Returns:
+            Values by key
+        """
+        values = await self.get_many_or_refresh(family, keys, compute)
+        misses = [key for key in dict.fromkeys(keys) if key not in values]
+        if misses:
+            computed = await asyncio.gather(*(
+                self.compute(family, key, lambda key=key: compute(key)) for key in misses
+            ))
+            values.update(zip(misses, computed))
+        return values
+
+    async def get_many_or_refresh(
+        self,
+        family: str,
+        keys: List[str],
+        compute: Callable[[str], Awaitable[Any]]
+    ) -> Dict[str, Any]:
+        """
+        One MGET that schedules background refreshes for stale entries and
+        leaves misses to the caller.
+
+        Returns:
+            Cached values (fresh or stale) by key; misses are omitted
+        """
+        values, stale = await self._read(family, keys)
+        for key in stale:
+            self._schedule_refresh(family, key, compute)
+        return values
+
+    async def compute(self, family: str, key: str, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """Compute and store a missed key, coalesced across concurrent callers."""
+        return await self._flights.do(
+            (family, key),
+            lambda: self._compute_and_store(family, key, lambda _: compute())
+        )
+
+    async def _read(self, family: str, keys: List[str]) -> Tuple[Dict[str, Any], List[str]]:
+        """Pipelined read returning (values, stale keys)."""
+        if not keys:
+            return {}, []
+
+        try:
+            payloads = await self.client.mget([f"{family}:{key}" for key in keys])
+        except Exception as e:
+            logger.error(f"Cache read error: {e}")
+            self.stats['misses'] += len(keys)
+            return {}, []
+
+        now = self.clock()
+        fresh_ttl = self.ttl(family)
+        values, stale = {}, []
+        for key, payload in zip(keys, payloads):
+            if payload is None:
+                self.stats['misses'] += 1
+                continue
+            try:
+                value, stored_at = self.codec.decode(payload)
+            except Exception as e:
+                logger.error(f"Cache decode error for {family}:{key}: {e}")
+                self.stats['misses'] += 1
+                continue
+
+            values[key] = value
+            if now - stored_at >= fresh_ttl:
+                self.stats['stale_hits'] += 1
+                stale.append(key)
+            else:
+                self.stats['hits'] += 1
+        return values, stale
+
+    async def _compute_and_store(
+        self,
+        family: str,
+        key: str,
+        compute: Callable[[str], Awaitable[Any]]
+    ) -> Any:
+        value = await compute(key)
+        try:
+            await self.set(family, key, value)
+        except Exception as e:
+            logger.error(f"Cache write error for {family}:{key}: {e}")
+        return value
+
+    def _schedule_refresh(self, family: str, key: str, compute: Callable[[str], Awaitable[Any]]) -> None:
+        """Start one background revalidation per stale key."""
+        if self._flights.in_flight((family, key)):
+            return
+
+        async def refresh():
+            try:
+                await self._flights.do((family, key), lambda: self._compute_and_store(family, key, compute))
+                self.stats['refreshes'] += 1
+            except Exception as e:
+                logger.error(f"Cache refresh error for {family}:{key}: {e}")
+
+        task = asyncio.ensure_future(refresh())
+        self._refreshes.add(task)
+        task.add_done_callback(self._refreshes.discard)
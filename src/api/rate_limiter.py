@@ -2,8 +2,13 @@
 Kinetic Anomaly Detection Engine System (KADES)
 Rate Limiter Module
 
-This module implements rate limiting functionality for the API endpoints
-using a token bucket algorithm and Redis for distributed rate limiting.
+This module implements rate limiting functionality for the API endpoints.
+Strategies (token bucket, GCRA, sliding-window log and sliding-window
+counter) run either in-process for single-node deployments or in Redis for
+distributed rate limiting, where each decision is one atomic server-side
+Lua call. API-key tiers are cached in-process, and an optional local
+pre-admission lease lets a node admit requests from a batch reserved in a
+single call.
 
 Author: KADES Team
 License: Proprietary
@@ -11,13 +16,15 @@ License: Proprietary
 
 import time
 import logging
-from typing import Optional, Tuple, Dict
-from datetime import datetime
+import math
+from abc import ABC, abstractmethod
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Optional, Tuple, Dict, List, Type
 import asyncio
 import yaml
 from redis.asyncio import Redis
 from fastapi import HTTPException, Request
-import orjson
 
 # Configure logging
 logging.basicConfig(
@@ -26,25 +33,450 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# All strategy scripts take KEYS[1] = state key and
+# ARGV = {rate, burst, now, requested}, and return
+# {granted, remaining, reset_after, retry_after} with the floats as strings.
+
+# Lua 5.1 tostring, and Redis converting number arguments of redis.call,
+# keep only 14 significant digits, which rounds epoch timestamps to 0.1 ms.
+# Floats are written with 17, enough to round-trip a double.
+LUA_NUMBER_FORMAT = """
+local function num(x)
+    return string.format('%.17g', x)
+end
+"""
+
+# Refill, take up to ARGV[4] whole tokens and set the expiry in one atomic step.
+# The bucket is a hash {tokens, ts}; its TTL is the time to refill completely,
+# after which a missing bucket is equivalent to a full one.
+TOKEN_BUCKET_SCRIPT = LUA_NUMBER_FORMAT + """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local requested = tonumber(ARGV[4])
+
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1])
+local ts = tonumber(state[2])
+if tokens == nil or ts == nil then
+    tokens = burst
+    ts = now
+end
+
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+local granted = math.min(requested, math.floor(tokens))
+tokens = tokens - granted
+
+redis.call('HSET', KEYS[1], 'tokens', num(tokens), 'ts', num(math.max(ts, now)))
+redis.call('PEXPIRE', KEYS[1], math.ceil((burst - tokens) / rate * 1000) + 1000)
+return {granted, num(tokens), num((burst - tokens) / rate),
+        num(math.max(0, 1 - tokens) / rate)}
+"""
+
+# GCRA keeps only the theoretical arrival time (TAT) of the next request:
+# each admission pushes it 1/rate further, and a request is admitted while
+# the TAT is at most burst/rate ahead of now.
+GCRA_SCRIPT = LUA_NUMBER_FORMAT + """
+local interval = 1 / tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local requested = tonumber(ARGV[4])
+
+local tat = math.max(tonumber(redis.call('GET', KEYS[1])) or now, now)
+local available = burst - (tat - now) / interval
+local granted = math.max(0, math.min(requested, math.floor(available + 1e-9)))
+tat = tat + granted * interval
+
+redis.call('SET', KEYS[1], num(tat), 'PX', math.ceil((tat - now) * 1000) + 1000)
+return {granted, num(available - granted), num(tat - now),
+        num(math.max(0, tat - now - (burst - 1) * interval))}
+"""
+
+# The log is a sorted set of admission timestamps within the last
+# burst/rate seconds. KEYS[2] is a counter keeping members unique.
+SLIDING_WINDOW_LOG_SCRIPT = LUA_NUMBER_FORMAT + """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local requested = tonumber(ARGV[4])
+local window = burst / rate
+
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', num(now - window))
+local count = redis.call('ZCARD', KEYS[1])
+local granted = math.max(0, math.min(requested, burst - count))
+if granted > 0 then
+    local seq = redis.call('INCRBY', KEYS[2], granted)
+    for i = 1, granted do
+        redis.call('ZADD', KEYS[1], num(now), num(now) .. ':' .. (seq - i))
+    end
+end
+count = count + granted
+
+local reset_after = 0
+local retry_after = 0
+if count > 0 then
+    local newest = redis.call('ZRANGE', KEYS[1], -1, -1, 'WITHSCORES')
+    reset_after = math.max(0, tonumber(newest[2]) + window - now)
+    redis.call('PEXPIRE', KEYS[1], math.ceil(reset_after * 1000) + 1000)
+    redis.call('PEXPIRE', KEYS[2], math.ceil(reset_after * 1000) + 1000)
+end
+if count >= burst then
+    local oldest = redis.call('ZRANGE', KEYS[1], count - burst, count - burst, 'WITHSCORES')
+    retry_after = math.max(0, tonumber(oldest[2]) + window - now)
+end
+return {granted, num(burst - count), num(reset_after), num(retry_after)}
+"""
+
+# Two fixed windows of burst/rate seconds; the previous window's count is
+# weighted by how much of it still overlaps the sliding window. Windows are
+# stored by index, which survives the string round trip exactly.
+SLIDING_WINDOW_COUNTER_SCRIPT = LUA_NUMBER_FORMAT + """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local requested = tonumber(ARGV[4])
+local window = burst / rate
+local index = math.floor(now / window)
+
+local state = redis.call('HMGET', KEYS[1], 'index', 'current', 'previous')
+local stored_index = tonumber(state[1])
+local current = tonumber(state[2]) or 0
+local previous = tonumber(state[3]) or 0
+if stored_index == nil or stored_index < index - 1 then
+    current, previous = 0, 0
+elseif stored_index < index then
+    current, previous = 0, current
+else
+    index = stored_index
+end
+local start = index * window
+
+local estimate = previous * math.max(0, 1 - (now - start) / window) + current
+local granted = math.max(0, math.min(requested, math.floor(burst - estimate + 1e-9)))
+current = current + granted
+
+local retry_after = 0
+if granted < requested then
+    if current <= burst - 1 and previous > 0 then
+        retry_after = start + window * (1 - (burst - 1 - current) / previous) - now
+    else
+        retry_after = start + window * (2 - (burst - 1) / current) - now
+    end
+end
+local reset_after = start + window - now
+if current > 0 then
+    reset_after = reset_after + window
+end
+
+redis.call('HSET', KEYS[1], 'index', index, 'current', current, 'previous', previous)
+redis.call('PEXPIRE', KEYS[1], math.ceil(2 * window * 1000) + 1000)
+return {granted, num(math.max(0, burst - estimate - granted)), num(math.max(0, reset_after)),
+        num(math.max(0, retry_after))}
+"""
+
+def token_bucket_step(
+    tokens: Optional[float],
+    ts: Optional[float],
+    rate: float,
+    burst: float,
+    now: float,
+    requested: int = 1
+) -> Tuple[int, float, float]:
+    """
+    In-process equivalent of TOKEN_BUCKET_SCRIPT.
+
+    Args:
+        tokens: Stored token level, None for a new bucket
+        ts: Stored timestamp, None for a new bucket
+        rate: Tokens per second
+        burst: Bucket capacity
+        now: Current time in seconds
+        requested: Whole tokens to take
+
+    Returns:
+        (granted tokens, new token level, new timestamp)
+    """
+    if tokens is None or ts is None:
+        tokens, ts = burst, now
+    tokens = min(burst, tokens + max(0.0, now - ts) * rate)
+    granted = min(requested, math.floor(tokens))
+    return granted, tokens - granted, max(ts, now)
+
+@dataclass
+class RateLimitDecision:
+    """Outcome of one rate limit step"""
+    granted: int  # Requests admitted (0 when denied)
+    remaining: float  # Requests still admissible right now
+    reset_after: float  # Seconds until the limit is fully replenished
+    retry_after: float  # Seconds until the next request can be admitted
+
+class RateLimitStrategy(ABC):
+    """
+    A rate limiting algorithm: a Lua script for the Redis backend and its
+    in-process twin for the memory backend.
+
+    Limits are the `rate` (requests per second) and `burst` entries of the
+    rate_limits config; window strategies admit `burst` requests per
+    `burst / rate` seconds.
+    """
+
+    name = ''
+    script = ''
+
+    def keys(self, key: str) -> List[str]:
+        """Redis keys the script touches for a limiter key."""
+        return [key]
+
+    @abstractmethod
+    def step(self, state: Any, limits: Dict, now: float, requested: int) -> Tuple[RateLimitDecision, Any]:
+        """
+        Apply one decision to in-process state.
+
+        Args:
+            state: State from the previous step, None for a new key
+            limits: Endpoint limits {'rate', 'burst'}
+            now: Current time in seconds
+            requested: Requests to admit
+
+        Returns:
+            (decision, new state)
+        """
+
+    def ttl(self, limits: Dict) -> float:
+        """Seconds after which idle state is equivalent to a new key."""
+        return limits["burst"] / limits["rate"] * 2
+
+class TokenBucketStrategy(RateLimitStrategy):
+    name = 'token_bucket'
+    script = TOKEN_BUCKET_SCRIPT
+
+    def step(self, state: Any, limits: Dict, now: float, requested: int) -> Tuple[RateLimitDecision, Any]:
+        rate, burst = limits["rate"], limits["burst"]
+        granted, tokens, ts = token_bucket_step(*(state or (None, None)), rate, burst, now, requested)
+        decision = RateLimitDecision(granted, tokens, (burst - tokens) / rate, max(0.0, 1 - tokens) / rate)
+        return decision, (tokens, ts)
+
+class GCRAStrategy(RateLimitStrategy):
+    name = 'gcra'
+    script = GCRA_SCRIPT
+
+    def step(self, state: Any, limits: Dict, now: float, requested: int) -> Tuple[RateLimitDecision, Any]:
+        interval, burst = 1 / limits["rate"], limits["burst"]
+        tat = max(state if state is not None else now, now)
+        available = burst - (tat - now) / interval
+        granted = max(0, min(requested, math.floor(available + 1e-9)))
+        tat += granted * interval
+        decision = RateLimitDecision(
+            granted, available - granted, tat - now, max(0.0, tat - now - (burst - 1) * interval)
+        )
+        return decision, tat
+
+class SlidingWindowLogStrategy(RateLimitStrategy):
+    name = 'sliding_window_log'
+    script = SLIDING_WINDOW_LOG_SCRIPT
+
+    def keys(self, key: str) -> List[str]:
+        return [key, f"{key}:seq"]
+
+    def step(self, state: Any, limits: Dict, now: float, requested: int) -> Tuple[RateLimitDecision, Any]:
+        burst = limits["burst"]
+        window = burst / limits["rate"]
+        log = state if state is not None else deque()
+        while log and log[0] <= now - window:
+            log.popleft()
+
+        granted = max(0, min(requested, math.floor(burst - len(log))))
+        log.extend([now] * granted)
+        count = len(log)
+        reset_after = max(0.0, log[-1] + window - now) if log else 0.0
+        retry_after = max(0.0, log[count - int(burst)] + window - now) if count >= burst else 0.0
+        return RateLimitDecision(granted, burst - count, reset_after, retry_after), log
+
+class SlidingWindowCounterStrategy(RateLimitStrategy):
+    name = 'sliding_window_counter'
+    script = SLIDING_WINDOW_COUNTER_SCRIPT
+
+    def step(self, state: Any, limits: Dict, now: float, requested: int) -> Tuple[RateLimitDecision, Any]:
+        burst = limits["burst"]
+        window = burst / limits["rate"]
+        index = math.floor(now / window)
+        stored_index, current, previous = state or (None, 0, 0)
+        if stored_index is None or stored_index < index - 1:
+            current, previous = 0, 0
+        elif stored_index < index:
+            current, previous = 0, current
+        else:
+            index = stored_index
+        start = index * window
+
+        estimate = previous * max(0.0, 1 - (now - start) / window) + current
+        granted = max(0, min(requested, math.floor(burst - estimate + 1e-9)))
+        current += granted
+
+        retry_after = 0.0
+        if granted < requested:
+            if current <= burst - 1 and previous > 0:
+                retry_after = start + window * (1 - (burst - 1 - current) / previous) - now
+            else:
+                retry_after = start + window * (2 - (burst - 1) / current) - now
+        reset_after = start + window - now + (window if current > 0 else 0.0)
+        decision = RateLimitDecision(
+            granted, max(0.0, burst - estimate - granted), max(0.0, reset_after), max(0.0, retry_after)
+        )
+        return decision, (index, current, previous)
+
+STRATEGIES: Dict[str, Type[RateLimitStrategy]] = {
+    cls.name: cls for cls in (
+        TokenBucketStrategy, GCRAStrategy, SlidingWindowLogStrategy, SlidingWindowCounterStrategy
+    )
+}
+# Config spellings accepted for a strategy
+STRATEGY_ALIASES = {'sliding_window': 'sliding_window_counter'}
+
+def get_strategy(name: str) -> RateLimitStrategy:
+    """Instantiate a strategy by name (or alias)."""
+    name = STRATEGY_ALIASES.get(name, name)
+    if name not in STRATEGIES:
+        raise ValueError(f"Unknown rate limit strategy '{name}', expected one of {sorted(STRATEGIES)}")
+    return STRATEGIES[name]()
+
+class MemoryBackend:
+    """
+    In-process state for single-node deployments: decisions never leave the
+    event loop. Idle keys are swept every `sweep_interval` decisions.
+    """
+
+    name = 'memory'
+
+    def __init__(self, sweep_interval: int = 10000):
+        self.sweep_interval = sweep_interval
+        self._state: Dict[str, Tuple[Any, float]] = {}  # key -> (state, expires_at)
+        self._decisions = 0
+
+    def __len__(self) -> int:
+        return len(self._state)
+
+    async def acquire(
+        self,
+        strategy: RateLimitStrategy,
+        key: str,
+        limits: Dict,
+        now: float,
+        requested: int = 1
+    ) -> RateLimitDecision:
+        # No await between read and write, so steps on one loop are atomic
+        state, expires_at = self._state.get(key, (None, 0.0))
+        decision, state = strategy.step(state if expires_at > now else None, limits, now, requested)
+        self._state[key] = (state, now + strategy.ttl(limits))
+
+        self._decisions += 1
+        if self._decisions % self.sweep_interval == 0:
+            self.sweep(now)
+        return decision
+
+    def sweep(self, now: float) -> None:
+        """Drop state that has been idle past its strategy TTL."""
+        expired = [key for key, (_, expires_at) in self._state.items() if expires_at <= now]
+        for key in expired:
+            del self._state[key]
+
+    def reset(self, prefix: str) -> None:
+        for key in [key for key in self._state if key.startswith(prefix)]:
+            del self._state[key]
+
+class RedisBackend:
+    """Shared state for clusters: one atomic script call per decision."""
+
+    name = 'redis'
+
+    def __init__(self, client: Redis):
+        self.client = client
+        self._scripts: Dict[str, Any] = {}
+
+    async def acquire(
+        self,
+        strategy: RateLimitStrategy,
+        key: str,
+        limits: Dict,
+        now: float,
+        requested: int = 1
+    ) -> RateLimitDecision:
+        script = self._scripts.get(strategy.name)
+        if script is None:
+            script = self._scripts[strategy.name] = self.client.register_script(strategy.script)
+
+        granted, remaining, reset_after, retry_after = await script(
+            keys=strategy.keys(key),
+            args=[limits["rate"], limits["burst"], now, requested]
+        )
+        return RateLimitDecision(int(granted), float(remaining), float(reset_after), float(retry_after))
+
+BACKENDS = ['memory', 'redis']
+
+@dataclass
+class _Lease:
+    """Tokens reserved from the shared limiter for local pre-admission"""
+    reserved: int
+    expires_at: float
+    remaining: float  # Shared remaining after the reservation
+    retry_at: float  # When a denied key may ask the backend again
+    reset_at: float
+
 class RateLimiter:
     """
-    Implements token bucket algorithm for rate limiting with Redis backend.
+    Implements pluggable rate limiting strategies (token bucket, GCRA,
+    sliding-window log and counter) over an in-memory or Redis backend.
     Supports multiple rate limit tiers and dynamic rate adjustments.
+    Expired local leases and cached tiers are swept every `sweep_interval`
+    decisions.
     """
     
-    def __init__(self, redis_url: str, config_path: str = "config/default.yml"):
+    def __init__(
+        self,
+        redis_url: Optional[str],
+        config_path: str = "config/default.yml",
+        tier_cache_ttl: Optional[float] = None,
+        local_batch: Optional[int] = None,
+        local_lease: Optional[float] = None,
+        strategy: Optional[str] = None,
+        backend: Optional[str] = None,
+        sweep_interval: int = 10000
+    ):
         """
         Initialize rate limiter with Redis connection and config.
         
         Args:
-            redis_url: Redis connection URL
+            redis_url: Redis connection URL (None for a memory backend
+                without Redis, where every key uses the basic tier)
             config_path: Path to configuration YAML file
+            tier_cache_ttl: Seconds an API key's tier is cached in-process
+            local_batch: Requests reserved per backend call for local
+                pre-admission (1 disables pre-admission)
+            local_lease: Seconds a local reservation stays usable
+            strategy: One of STRATEGIES (or an alias)
+            backend: One of BACKENDS
+            sweep_interval: Decisions between sweeps of expired in-process state
         """
         self.redis: Optional[Redis] = None
         self.redis_url = redis_url
         self.config = self._load_config(config_path)
         self.rate_limits = self.config.get('rate_limits', {})
         
+        settings = self.config.get('security', {}).get('rate_limiting', {})
+        self.tier_cache_ttl = settings.get('tier_cache_ttl', 30) if tier_cache_ttl is None else tier_cache_ttl
+        self.local_batch = settings.get('local_batch', 1) if local_batch is None else local_batch
+        self.local_lease = settings.get('local_lease', 1.0) if local_lease is None else local_lease
+        self.strategy = get_strategy(strategy or settings.get('strategy', 'token_bucket'))
+        self.backend_name = backend or settings.get('backend', 'redis')
+        if self.backend_name not in BACKENDS:
+            raise ValueError(f"Unknown rate limit backend '{self.backend_name}', expected one of {BACKENDS}")
+        
+        self.sweep_interval = sweep_interval
+        self.backend: Optional[Any] = MemoryBackend(sweep_interval) if self.backend_name == 'memory' else None
+        self._tier_cache: Dict[str, Tuple[str, float]] = {}  # api key -> (tier, monotonic expiry)
+        self._leases: Dict[str, _Lease] = {}
+        self._decisions = 0
+        
     def _load_config(self, config_path: str) -> Dict:
         """Load rate limit configuration from YAML file."""
         try:
@@ -54,15 +486,32 @@ class RateLimiter:
             logger.error(f"Error loading config: {e}")
             return {}
             
-    async def initialize(self) -> None:
-        """Initialize Redis connection pool."""
+    @property
+    def initialized(self) -> bool:
+        return self.backend is not None and (self.redis is not None or self.redis_url is None)
+            
+    async def initialize(self, client: Optional[Redis] = None) -> None:
+        """
+        Initialize the Redis connection (used for tiers, and for state with
+        the Redis backend).
+        
+        Args:
+            client: Existing async Redis client to use instead of redis_url
+        """
+        if client is None and self.redis_url is None:
+            if self.backend_name == 'redis':
+                raise ValueError("The Redis rate limit backend requires a Redis URL")
+            return
+            
         try:
-            self.redis = Redis.from_url(
+            self.redis = client or Redis.from_url(
                 self.redis_url,
                 decode_responses=True,
                 encoding='utf-8'
             )
             await self.redis.ping()
+            if self.backend_name == 'redis':
+                self.backend = RedisBackend(self.redis)
             logger.info("Successfully connected to Redis")
         except Exception as e:
             logger.error(f"Failed to connect to Redis: {e}")
@@ -75,12 +524,40 @@ class RateLimiter:
             
     async def _get_tier_limits(self, api_key: str) -> Dict:
         """Get rate limit configuration for API key tier."""
-        # Check tier from configuration or Redis
-        tier_key = f"tier:{api_key}"
-        tier = await self.redis.get(tier_key) or "basic"
+        if self.redis is None:
+            return self.rate_limits["basic"]
+            
+        # Serve the tier from the in-process cache while it is fresh
+        now = time.monotonic()
+        cached = self._tier_cache.get(api_key)
+        if cached and cached[1] > now:
+            tier = cached[0]
+        else:
+            tier = await self.redis.get(f"tier:{api_key}") or "basic"
+            if isinstance(tier, bytes):
+                tier = tier.decode()
+            self._tier_cache[api_key] = (tier, now + self.tier_cache_ttl)
         
         return self.rate_limits.get(tier, self.rate_limits["basic"])
         
+    def invalidate_tier(self, api_key: str) -> None:
+        """Drop a cached tier so the next request reads it from Redis."""
+        self._tier_cache.pop(api_key, None)
+        
+    def sweep(self, now: float) -> None:
+        """Drop local leases that can no longer admit or deny, and expired tiers."""
+        expired = [
+            key for key, lease in self._leases.items()
+            if lease.expires_at <= now and lease.retry_at <= now
+        ]
+        for key in expired:
+            del self._leases[key]
+        
+        monotonic_now = time.monotonic()
+        expired = [key for key, (_, expires_at) in self._tier_cache.items() if expires_at <= monotonic_now]
+        for key in expired:
+            del self._tier_cache[key]
+        
     async def check_rate_limit(
         self,
         api_key: str,
@@ -108,56 +585,74 @@ class RateLimiter:
                 
             # Current timestamp
             now = time.time()
+            bucket_key = f"bucket:{api_key}:{endpoint}:{self.strategy.name}"
             
-            # Keys for rate limiting
-            bucket_key = f"bucket:{api_key}:{endpoint}"
-            last_update_key = f"last_update:{api_key}:{endpoint}"
+            self._decisions += 1
+            if self._decisions % self.sweep_interval == 0:
+                self.sweep(now)
             
-            # Get current bucket level and last update time
-            pipeline = self.redis.pipeline()
-            pipeline.get(bucket_key)
-            pipeline.get(last_update_key)
-            current_tokens, last_update = await pipeline.execute()
+            if self.local_batch > 1 and self.backend_name == 'redis':
+                return await self._check_local(bucket_key, endpoint_limits, now)
             
-            # Initialize if not exists
-            current_tokens = float(current_tokens) if current_tokens else endpoint_limits["burst"]
-            last_update = float(last_update) if last_update else now
-            
-            # Calculate token refill
-            time_passed = now - last_update
-            token_refill = time_passed * endpoint_limits["rate"]
-            new_tokens = min(
-                current_tokens + token_refill,
-                endpoint_limits["burst"]
+            # One atomic step: a script call in Redis, or in-process
+            decision = await self.backend.acquire(self.strategy, bucket_key, endpoint_limits, now, 1)
+            return decision.granted >= 1, self._limit_info(
+                endpoint_limits, decision.remaining, now + decision.reset_after, decision.retry_after
             )
             
-            # Check if request can be processed
-            if new_tokens >= 1:
-                new_tokens -= 1
-                is_allowed = True
-            else:
-                is_allowed = False
-                
-            # Update bucket and timestamp
-            pipeline = self.redis.pipeline()
-            pipeline.set(bucket_key, new_tokens)
-            pipeline.set(last_update_key, now)
-            await pipeline.execute()
-            
-            # Prepare limit info
-            limit_info = {
-                "limit": endpoint_limits["burst"],
-                "remaining": int(new_tokens),
-                "reset": int(now + (endpoint_limits["burst"] - new_tokens) / endpoint_limits["rate"])
-            }
-            
-            return is_allowed, limit_info
-            
         except Exception as e:
             logger.error(f"Error checking rate limit: {e}")
             # Fail open - allow request if rate limiting fails
             return True, {}
             
+    async def _check_local(self, bucket_key: str, limits: Dict, now: float) -> Tuple[bool, Dict]:
+        """
+        Admit from a local reservation, refilling it with one backend call.
+        
+        Requests reserved but not used before the lease expires are dropped,
+        so a node never admits more than it reserved from the shared limiter.
+        After a denied reservation, requests are denied locally until the
+        shared limiter can admit one again.
+        """
+        lease = self._leases.get(bucket_key)
+        if lease:
+            if lease.reserved >= 1 and now < lease.expires_at:
+                lease.reserved -= 1
+                return True, self._limit_info(limits, lease.remaining + lease.reserved, lease.reset_at, 0.0)
+            if lease.reserved < 1 and now < lease.retry_at:
+                return False, self._limit_info(limits, lease.remaining, lease.reset_at, lease.retry_at - now)
+        
+        decision = await self.backend.acquire(self.strategy, bucket_key, limits, now, self.local_batch)
+        lease = _Lease(
+            reserved=max(0, decision.granted - 1),
+            expires_at=now + self.local_lease,
+            remaining=decision.remaining,
+            retry_at=now + decision.retry_after,
+            reset_at=now + decision.reset_after
+        )
+        self._leases[bucket_key] = lease
+        if decision.granted < 1:
+            return False, self._limit_info(limits, lease.remaining, lease.reset_at, decision.retry_after)
+        return True, self._limit_info(limits, lease.remaining + lease.reserved, lease.reset_at, 0.0)
+        
+    @staticmethod
+    def _limit_info(limits: Dict, remaining: float, reset_at: float, retry_after: float) -> Dict:
+        return {
+            "limit": limits["burst"],
+            "remaining": max(0, int(remaining)),
+            "reset": int(reset_at),
+            "retry_after": math.ceil(retry_after)
+        }
+            
+    @staticmethod
+    def rate_limit_headers(limit_info: Dict) -> Dict[str, str]:
+        """Rate limit headers for a limit_info returned by check_rate_limit."""
+        return {
+            "X-RateLimit-Limit": str(limit_info.get("limit", "")),
+            "X-RateLimit-Remaining": str(limit_info.get("remaining", "")),
+            "X-RateLimit-Reset": str(limit_info.get("reset", ""))
+        }
+            
     async def get_rate_limit_headers(
         self,
         api_key: str,
@@ -166,12 +661,7 @@ class RateLimiter:
         """Generate rate limit headers for response."""
         try:
             _, limit_info = await self.check_rate_limit(api_key, endpoint)
-            
-            return {
-                "X-RateLimit-Limit": str(limit_info.get("limit", "")),
-                "X-RateLimit-Remaining": str(limit_info.get("remaining", "")),
-                "X-RateLimit-Reset": str(limit_info.get("reset", ""))
-            }
+            return self.rate_limit_headers(limit_info)
         except Exception as e:
             logger.error(f"Error generating rate limit headers: {e}")
             return {}
@@ -186,7 +676,7 @@ class RateLimitMiddleware:
         """Process request with rate limiting."""
         try:
             # Initialize rate limiter if needed
-            if not self.rate_limiter.redis:
+            if not self.rate_limiter.initialized:
                 await self.rate_limiter.initialize()
                 
             # Extract API key from request
@@ -206,17 +696,14 @@ class RateLimitMiddleware:
                 raise HTTPException(
                     status_code=429,
                     detail="Rate limit exceeded",
-                    headers={"Retry-After": str(limit_info.get("reset", 60))}
+                    headers={"Retry-After": str(limit_info.get("retry_after", 60))}
                 )
                 
             # Process request
             response = await call_next(request)
             
-            # Add rate limit headers
-            headers = await self.rate_limiter.get_rate_limit_headers(
-                api_key, endpoint
-            )
-            response.headers.update(headers)
+            # Add rate limit headers from the decision already made
+            response.headers.update(self.rate_limiter.rate_limit_headers(limit_info))
             
             return response
             
@@ -263,6 +750,7 @@ async def manage_rate_limits(
             if not tier:
                 raise ValueError("Tier required for set_tier action")
             await rate_limiter.redis.set(f"tier:{api_key}", tier)
+            rate_limiter.invalidate_tier(api_key)
             print(f"Set tier {tier} for API key {api_key}")
             
         elif action == "get_tier":
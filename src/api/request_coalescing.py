@@ -0,0 +1,81 @@
+"""
+Kinetic Anomaly Detection Engine System (KADES)
+Request Coalescing Module
+
+This module implements single-flight request coalescing for the API: while a
+computation for a key is in flight, concurrent callers for the same key await
+the same task instead of starting their own upstream fetches.
+
+Author: KADES Team
+License: Proprietary
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+class SingleFlight:
+    """
+    Deduplicates concurrent calls per key.
+
+    The first caller for a key starts the computation as a task; callers
+    arriving before it finishes share its result or exception. The entry is
+    dropped on completion, so later calls compute afresh. Cancelling one
+    waiter does not cancel the shared task while others still await it;
+    cancelling the last waiter cancels the task.
+    """
+
+    def __init__(self):
+        self._flights: Dict[Hashable, asyncio.Task] = {}
+        self._waiters: Dict[asyncio.Task, int] = {}
+        self.stats = {'calls': 0, 'executions': 0}
+
+    def __len__(self) -> int:
+        return len(self._flights)
+
+    async def do(self, key: Hashable, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run `compute()` for `key`, or join the in-flight run for it.
+
+        Args:
+            key: Coalescing key
+            compute: Zero-argument coroutine factory
+
+        Returns:
+            Result of the shared computation
+        """
+        self.stats['calls'] += 1
+        task = self._flights.get(key)
+        if task is None:
+            self.stats['executions'] += 1
+            task = asyncio.ensure_future(compute())
+            self._flights[key] = task
+            task.add_done_callback(lambda _: self._forget(key, task))
+
+        self._waiters[task] = self._waiters.get(task, 0) + 1
+        try:
+            return await asyncio.shield(task)
+        finally:
+            self._waiters[task] -= 1
+            if not self._waiters[task]:
+                del self._waiters[task]
+                # Every waiter was cancelled, so nobody needs the result
+                if not task.done():
+                    task.cancel()
+
+    def in_flight(self, key: Hashable) -> bool:
+        return key in self._flights
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._flights.get(key) is task:
+            del self._flights[key]
+        # Mark the exception retrieved when every waiter was cancelled
+        if not task.cancelled() and task.exception() is not None:
+            logger.debug(f"Coalesced call for {key} failed: {task.exception()}")
@@ -11,29 +11,55 @@ License: Proprietary
 
 from fastapi import FastAPI, HTTPException, Depends, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import Dict, List, Optional
+from typing import AsyncIterator, Awaitable, Dict, List, Optional
 import logging
 from datetime import datetime
 import asyncio
-import aiohttp
-import json
-from web3 import Web3
-from redis import Redis
 import numpy as np
-from sklearn.preprocessing import StandardScaler
-from textblob import TextBlob
+import orjson
+from .request_coalescing import SingleFlight
+from .cache import AnalysisCache
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Initialize connections
-redis_client = Redis(host='localhost', port=6379, db=0)
-w3 = Web3(Web3.HTTPProvider('https://api.mainnet.solana.com'))
+# Connections are opened by the startup hook, not at import, so importing
+# the routes (e.g. from workers or tests) stays cheap and side-effect free
+cache: Optional[AnalysisCache] = None
+w3 = None
 
 app = FastAPI(title="KADES API", version="1.0.0")
 
+# Concurrent analyses of the same (token, timeframe) share one upstream fetch
+analysis_flights = SingleFlight()
+
+# Timeframe of the cached analysis snapshot
+CACHE_TIMEFRAME = 3600
+
+# POST /analyze/batch limits: distinct tokens per request, and tokens
+# analyzed concurrently per request
+BATCH_MAX_TOKENS = 500
+BATCH_CONCURRENCY = 16
+
+@app.on_event("startup")
+async def startup():
+    """Open the cache connection pool and the chain RPC client."""
+    global cache, w3
+    from web3 import Web3
+
+    if cache is None:
+        cache = AnalysisCache.from_config("config/default.yml")
+    w3 = Web3(Web3.HTTPProvider('https://api.mainnet.solana.com'))
+
+@app.on_event("shutdown")
+async def shutdown():
+    """Release the cache connection pool."""
+    if cache is not None:
+        await cache.close()
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -48,6 +74,10 @@ class TokenAnalysisRequest(BaseModel):
     token_address: str
     timeframe: Optional[int] = 3600  # 1 hour default
 
+class BatchAnalysisRequest(BaseModel):
+    token_addresses: List[str]
+    timeframe: Optional[int] = 3600  # 1 hour default
+
 class AnalysisResponse(BaseModel):
     token_address: str
     timestamp: datetime
@@ -81,59 +111,54 @@ async def analyze_token(
 ):
     """Analyze a specific token."""
     try:
-        # Start analysis tasks
-        background_tasks.add_task(
-            _update_analysis_cache,
-            request.token_address
-        )
-        
-        # Get chain analysis
-        chain_data = await _get_chain_analysis(
+        # Chain, sentiment and market analyses, shared with concurrent requests
+        analysis = await _get_analysis_data(
             request.token_address,
             request.timeframe
         )
-        
-        # Get sentiment analysis
-        sentiment_data = await _get_sentiment_analysis(
-            request.token_address,
-            request.timeframe
-        )
-        
-        # Get market analysis
-        market_data = await _get_market_analysis(
+        # Refresh the cache from the results just computed when they cover
+        # the cached timeframe
+        background_tasks.add_task(
+            _update_analysis_cache,
             request.token_address,
-            request.timeframe
+            analysis if request.timeframe == CACHE_TIMEFRAME else None
         )
         
         # Calculate metrics and risks
-        metrics = await _calculate_metrics(
-            chain_data,
-            sentiment_data,
-            market_data
-        )
-        
-        risk_assessment = await _assess_risks(
-            metrics,
-            market_data
-        )
-        
-        # Get any active alerts
-        alerts = await _get_active_alerts(
-            request.token_address
-        )
-        
-        return AnalysisResponse(
-            token_address=request.token_address,
-            timestamp=datetime.now(),
-            metrics=metrics,
-            risk_assessment=risk_assessment,
-            alerts=alerts
+        return await _build_analysis_response(
+            request.token_address,
+            analysis,
+            _get_active_alerts(request.token_address)
         )
         
     except Exception as e:
         logger.error(f"Analysis error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/analyze/batch")
+async def analyze_tokens_batch(request: BatchAnalysisRequest):
+    """
+    Analyze many tokens in one request.
+    
+    Tokens are deduplicated, cached alerts are read with one pipelined
+    MGET, and up to BATCH_CONCURRENCY tokens are analyzed at a time. Results
+    stream back as NDJSON in completion order, one AnalysisResponse (or
+    {"token_address", "error"}) per line.
+    """
+    tokens = list(dict.fromkeys(request.token_addresses))
+    if not tokens:
+        raise HTTPException(status_code=400, detail="No tokens provided")
+    if len(tokens) > BATCH_MAX_TOKENS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {BATCH_MAX_TOKENS} distinct tokens per batch"
+        )
+    
+    return StreamingResponse(
+        _stream_batch_analysis(tokens, request.timeframe),
+        media_type="application/x-ndjson"
+    )
+
 @app.post("/monitor")
 async def monitor_tokens(request: MonitoringRequest):
     """Start monitoring tokens."""
@@ -163,28 +188,118 @@ async def monitor_tokens(request: MonitoringRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 # Utility functions
-async def _update_analysis_cache(token_address: str):
-    """Update analysis cache for token."""
+async def _build_analysis_response(
+    token_address: str,
+    analysis: Dict,
+    alerts: Awaitable[List[Dict]]
+) -> AnalysisResponse:
+    """Metrics and risk assessment for fetched analysis data, gathered with alerts."""
+    metrics = await _calculate_metrics(
+        analysis["chain_data"],
+        analysis["sentiment_data"],
+        analysis["market_data"]
+    )
+    
+    risk_assessment, alerts = await asyncio.gather(
+        _assess_risks(metrics, analysis["market_data"]),
+        alerts
+    )
+    
+    return AnalysisResponse(
+        token_address=token_address,
+        timestamp=datetime.now(),
+        metrics=metrics,
+        risk_assessment=risk_assessment,
+        alerts=alerts
+    )
+
+async def _stream_batch_analysis(tokens: List[str], timeframe: int) -> AsyncIterator[bytes]:
+    """Analyze tokens with bounded concurrency, yielding NDJSON lines as each finishes."""
+    # Cached alerts for the whole batch in one round trip; stale entries
+    # refresh in the background and misses are generated per token below
+    prefetched_alerts = await cache.get_many_or_refresh("alerts", tokens, _generate_alerts)
+    semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+    fresh_analyses: Dict[str, Dict] = {}
+    
+    async def analyze(token_address: str) -> bytes:
+        async with semaphore:
+            try:
+                # Coalesced with concurrent /analyze calls for the same token
+                analysis = await _get_analysis_data(token_address, timeframe)
+                if timeframe == CACHE_TIMEFRAME:
+                    fresh_analyses[token_address] = analysis
+                
+                response = await _build_analysis_response(
+                    token_address,
+                    analysis,
+                    _get_batch_alerts(token_address, prefetched_alerts)
+                )
+                line = response.model_dump()
+            except Exception as e:
+                logger.error(f"Batch analysis error for {token_address}: {e}")
+                line = {"token_address": token_address, "error": str(e)}
+        return orjson.dumps(line, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_APPEND_NEWLINE)
+    
+    tasks = [asyncio.ensure_future(analyze(token)) for token in tokens]
     try:
-        # Get latest data
-        chain_data = await _get_chain_analysis(token_address, 3600)
-        sentiment_data = await _get_sentiment_analysis(token_address, 3600)
-        market_data = await _get_market_analysis(token_address, 3600)
-        
-        # Combine data
-        cache_data = {
-            "chain_data": chain_data,
-            "sentiment_data": sentiment_data,
-            "market_data": market_data,
-            "timestamp": datetime.now().timestamp()
-        }
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        # Stop outstanding work if the client disconnects mid-stream
+        for task in tasks:
+            task.cancel()
+    
+    # Refresh the analysis cache for the batch in one pipeline
+    try:
+        await cache.set_many("analysis_cache", fresh_analyses)
+    except Exception as e:
+        logger.error(f"Cache update error: {e}")
+
+async def _get_batch_alerts(token_address: str, prefetched: Dict[str, List[Dict]]) -> List[Dict]:
+    """Alerts from the batch prefetch, generating (and caching) misses."""
+    if token_address in prefetched:
+        return prefetched[token_address]
+    try:
+        return await cache.compute("alerts", token_address, lambda: _generate_alerts(token_address))
+    except Exception as e:
+        logger.error(f"Alerts error: {e}")
+        return []
+
+async def _get_analysis_data(token_address: str, timeframe: int) -> Dict:
+    """Get chain, sentiment and market analyses, coalescing concurrent calls."""
+    return await analysis_flights.do(
+        (token_address, timeframe),
+        lambda: _compute_analysis_data(token_address, timeframe)
+    )
+
+async def _compute_analysis_data(token_address: str, timeframe: int) -> Dict:
+    """Run the chain, sentiment and market analyses concurrently."""
+    chain_data, sentiment_data, market_data = await asyncio.gather(
+        _get_chain_analysis(token_address, timeframe),
+        _get_sentiment_analysis(token_address, timeframe),
+        _get_market_analysis(token_address, timeframe)
+    )
+    return {
+        "chain_data": chain_data,
+        "sentiment_data": sentiment_data,
+        "market_data": market_data,
+        "timestamp": datetime.now().timestamp()
+    }
+
+async def _update_analysis_cache(token_address: str, analysis: Optional[Dict] = None):
+    """
+    Update analysis cache for token.
+    
+    Args:
+        token_address: Token to cache
+        analysis: Freshly computed analysis for CACHE_TIMEFRAME to store as is
+    """
+    try:
+        # Get latest data unless the request just computed it
+        cache_data = analysis or await _get_analysis_data(token_address, CACHE_TIMEFRAME)
         
-        # Store in Redis with 1-hour expiry
-        redis_client.setex(
-            f"analysis_cache:{token_address}",
-            3600,
-            json.dumps(cache_data)
-        )
+        # Store with the analysis_cache family TTL
+        await cache.set("analysis_cache", token_address, cache_data)
         
     except Exception as e:
         logger.error(f"Cache update error: {e}")
@@ -225,8 +340,10 @@ async def _get_sentiment_analysis(
     """Get sentiment analysis data."""
     try:
         # Fetch social media data
-        x_data = await _fetch_x_data(token_address, timeframe)
-        telegram_data = await _fetch_telegram_data(token_address, timeframe)
+        x_data, telegram_data = await asyncio.gather(
+            _fetch_x_data(token_address, timeframe),
+            _fetch_telegram_data(token_address, timeframe)
+        )
         
         # Analyze sentiment
         x_sentiment = _analyze_sentiment(x_data)
@@ -259,8 +376,10 @@ async def _get_market_analysis(
     """Get market analysis data."""
     try:
         # Fetch market data
-        price_data = await _fetch_price_data(token_address, timeframe)
-        volume_data = await _fetch_volume_data(token_address, timeframe)
+        price_data, volume_data = await asyncio.gather(
+            _fetch_price_data(token_address, timeframe),
+            _fetch_volume_data(token_address, timeframe)
+        )
         
         # Calculate market metrics
         volatility = _calculate_volatility(price_data)
@@ -361,37 +480,33 @@ async def _assess_risks(metrics: Dict, market_data: Dict) -> Dict:
         return {}
 
 async def _get_active_alerts(token_address: str) -> List[Dict]:
-    """Get active alerts for token."""
+    """Get active alerts for token, served stale-while-revalidate from cache."""
     try:
-        alerts = []
-        
-        # Check Redis for cached alerts
-        cached_alerts = redis_client.get(f"alerts:{token_address}")
-        if cached_alerts:
-            return json.loads(cached_alerts)
-        
-        # Generate new alerts
-        metrics = await _get_latest_metrics(token_address)
-        if metrics:
-            alerts.extend(_generate_metric_alerts(metrics))
-        
-        risk_assessment = await _assess_risks(metrics, {})
-        if risk_assessment:
-            alerts.extend(_generate_risk_alerts(risk_assessment))
-        
-        # Cache alerts
-        redis_client.setex(
-            f"alerts:{token_address}",
-            300,  # 5 minute cache
-            json.dumps(alerts)
+        return await cache.get_or_compute(
+            "alerts",
+            token_address,
+            lambda: _generate_alerts(token_address)
         )
         
-        return alerts
-        
     except Exception as e:
         logger.error(f"Alerts error: {e}")
         return []
 
+async def _generate_alerts(token_address: str) -> List[Dict]:
+    """Generate alerts for token from its latest metrics."""
+    alerts = []
+    
+    # Generate new alerts
+    metrics = await _get_latest_metrics(token_address)
+    if metrics:
+        alerts.extend(_generate_metric_alerts(metrics))
+    
+    risk_assessment = await _assess_risks(metrics, {})
+    if risk_assessment:
+        alerts.extend(_generate_risk_alerts(risk_assessment))
+    
+    return alerts
+
 # Helper functions for data analysis
 def _analyze_volume_patterns(transactions: List[Dict]) -> Dict:
     """Analyze transaction volume patterns."""
@@ -417,6 +532,8 @@ def _analyze_whale_movements(transactions: List[Dict]) -> Dict:
 
 def _analyze_sentiment(social_data: List[Dict]) -> Dict:
     """Analyze sentiment from social media data."""
+    from textblob import TextBlob
+
     sentiments = []
     for post in social_data:
         blob = TextBlob(post['text'])
@@ -456,4 +573,6 @@ def _get_risk_level(risk_score: float) -> str:
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    from src.api import WS_CONFIG
+    from src.api.websocket import uvicorn_ws_options
+    uvicorn.run(app, host="0.0.0.0", port=8000, **uvicorn_ws_options(WS_CONFIG))
\ No newline at end of file
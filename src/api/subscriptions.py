@@ -0,0 +1,188 @@
+"""
+Kinetic Anomaly Detection Engine System (KADES)
+Subscriptions Module
+
+This module implements server-side filtering for WebSocket alerts. Clients
+subscribe by token address, anomaly type and minimum risk score; an inverted
+index from (token, anomaly type) topics to subscribers, each kept sorted by
+minimum risk, routes an event to exactly its matching subscribers. A bounded
+replay buffer of recent encoded events lets a reconnecting client resume
+from the last event id it saw.
+
+Author: KADES Team
+License: Proprietary
+"""
+
+import logging
+from bisect import bisect_right
+from collections import deque
+from dataclasses import dataclass
+from itertools import islice, product
+from typing import Any, Deque, Dict, FrozenSet, List, Optional, Tuple
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+WILDCARD = '*'
+
+def _string_set(message: Dict, field: str) -> Optional[FrozenSet[str]]:
+    values = message.get(field)
+    if values is None:
+        return None
+    if isinstance(values, str):
+        values = [values]
+    if not isinstance(values, list) or not all(isinstance(v, str) and v for v in values):
+        raise ValueError(f"'{field}' must be a list of non-empty strings")
+    if WILDCARD in values:
+        return None
+    return frozenset(values)
+
+@dataclass(frozen=True)
+class Subscription:
+    """Alert filter; None for tokens or anomaly_types matches any"""
+    tokens: Optional[FrozenSet[str]] = None
+    anomaly_types: Optional[FrozenSet[str]] = None
+    min_risk: float = 0.0
+
+    @classmethod
+    def from_message(cls, message: Dict) -> 'Subscription':
+        """
+        Parse a client subscribe message.
+
+        Args:
+            message: {'tokens': [...], 'anomaly_types': [...], 'min_risk': float}
+                (all optional)
+
+        Raises:
+            ValueError: On malformed fields
+        """
+        min_risk = message.get('min_risk', 0.0)
+        if isinstance(min_risk, bool) or not isinstance(min_risk, (int, float)) or not 0.0 <= min_risk <= 1.0:
+            raise ValueError("'min_risk' must be a number between 0 and 1")
+        return cls(
+            tokens=_string_set(message, 'tokens'),
+            anomaly_types=_string_set(message, 'anomaly_types'),
+            min_risk=float(min_risk)
+        )
+
+    def matches(self, token_address: str, anomaly_type: str, risk_score: float) -> bool:
+        return (
+            risk_score >= self.min_risk
+            and (self.tokens is None or token_address in self.tokens)
+            and (self.anomaly_types is None or anomaly_type in self.anomaly_types)
+        )
+
+    def topics(self) -> List[Tuple[str, str]]:
+        """(token, anomaly type) index keys, WILDCARD for unfiltered fields."""
+        return list(product(
+            sorted(self.tokens) if self.tokens is not None else [WILDCARD],
+            sorted(self.anomaly_types) if self.anomaly_types is not None else [WILDCARD]
+        ))
+
+    def to_dict(self) -> Dict:
+        return {
+            'tokens': sorted(self.tokens) if self.tokens is not None else None,
+            'anomaly_types': sorted(self.anomaly_types) if self.anomaly_types is not None else None,
+            'min_risk': self.min_risk
+        }
+
+class SubscriptionIndex:
+    """
+    Inverted index from topics to subscribers.
+
+    Every subscriber is listed under each (token, anomaly type) pair of its
+    subscription, with WILDCARD standing in for an unfiltered field, and
+    each topic keeps its subscribers sorted by minimum risk. An event looks
+    up its four candidate topics and takes the prefix whose minimum risk it
+    meets, so routing costs O(log n + matching subscribers).
+    """
+
+    def __init__(self):
+        # topic -> (ascending min risks, subscribers in the same order)
+        self._topics: Dict[Tuple[str, str], Tuple[List[float], List[Any]]] = {}
+        self.subscriptions: Dict[Any, Subscription] = {}
+
+    def __len__(self) -> int:
+        return len(self.subscriptions)
+
+    def subscribe(self, subscriber: Any, subscription: Subscription) -> None:
+        """Set (replace) a subscriber's subscription."""
+        self.unsubscribe(subscriber)
+        self.subscriptions[subscriber] = subscription
+        for topic in subscription.topics():
+            risks, subscribers = self._topics.setdefault(topic, ([], []))
+            position = bisect_right(risks, subscription.min_risk)
+            risks.insert(position, subscription.min_risk)
+            subscribers.insert(position, subscriber)
+
+    def unsubscribe(self, subscriber: Any) -> Optional[Subscription]:
+        subscription = self.subscriptions.pop(subscriber, None)
+        if subscription is None:
+            return None
+        for topic in subscription.topics():
+            risks, subscribers = self._topics[topic]
+            position = subscribers.index(subscriber)
+            del risks[position], subscribers[position]
+            if not subscribers:
+                del self._topics[topic]
+        return subscription
+
+    def match(self, token_address: str, anomaly_type: str, risk_score: float) -> List[Any]:
+        """Subscribers whose subscription matches an event."""
+        matched: List[Any] = []
+        for topic in (
+            (token_address, anomaly_type),
+            (token_address, WILDCARD),
+            (WILDCARD, anomaly_type),
+            (WILDCARD, WILDCARD)
+        ):
+            entry = self._topics.get(topic)
+            if entry is not None:
+                matched.extend(entry[1][:bisect_right(entry[0], risk_score)])
+        return matched
+
+@dataclass
+class BufferedEvent:
+    """Encoded event kept for replay"""
+    event_id: int
+    token_address: str
+    anomaly_type: str
+    risk_score: float
+    frame: str
+
+class ReplayBuffer:
+    """Bounded buffer of recent events with consecutive ids"""
+
+    def __init__(self, capacity: int = 1000):
+        self._events: Deque[BufferedEvent] = deque(maxlen=capacity)
+        self.last_id = 0
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def next_id(self) -> int:
+        return self.last_id + 1
+
+    def append(self, event: BufferedEvent) -> None:
+        if event.event_id != self.last_id + 1:
+            raise ValueError(f"Expected event id {self.last_id + 1}, got {event.event_id}")
+        self._events.append(event)
+        self.last_id = event.event_id
+
+    def since(self, last_event_id: int) -> Tuple[List[BufferedEvent], bool]:
+        """
+        Events after `last_event_id`.
+
+        Returns:
+            (events, gap). gap is True if events the client missed are no
+            longer buffered, or the id is from before a restart; every
+            buffered event is returned then.
+        """
+        first_id = self._events[0].event_id if self._events else self.last_id + 1
+        if first_id - 1 <= last_event_id <= self.last_id:
+            return list(islice(self._events, last_event_id - first_id + 1, None)), False
+        return list(self._events), True
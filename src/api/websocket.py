@@ -3,21 +3,41 @@
 WebSocket Module
 This module implements real-time WebSocket functionality for the KADES system,
 handling live anomaly detection updates and Solana blockchain monitoring.
+Broadcasts go through a BroadcastEngine: each alert is serialized once and
+queued per connection, with a writer task per client. Clients filter alerts
+server-side through subscriptions and resume after a reconnect from a
+replay buffer of recent events.
+
+Client protocol (JSON text messages):
+    {"action": "subscribe", "tokens": [...], "anomaly_types": [...],
+     "min_risk": 0.5, "last_event_id": 42}
+        Replace the connection's filter (omitted fields match anything) and,
+        with last_event_id, replay matching buffered events after it
+    {"action": "resume", "last_event_id": 42}
+        Replay matching buffered events after an event id
+Replays are limited to one per connection per replay_interval and to the
+connection's reply reserve; a replay cut short keeps the newest events and
+reports a gap.
+    {"action": "unsubscribe"}
+        Stop receiving alerts
+New connections receive every alert until they subscribe.
 
 Author: KADES Team
 License: Proprietary
 """
 
 import asyncio
-import json
 import logging
+import time
 from dataclasses import dataclass
-from typing import Dict, Set, Optional
+from typing import Any, Dict, Set, Optional
 from fastapi import WebSocket, WebSocketDisconnect
 from fastapi.websockets import WebSocketState
 from solana.rpc.websocket_api import connect
-from src.chain_analysis.blockchain_listener import BlockchainEvent
-from src.score_aggregator.risk_scorer import RiskScore
+import orjson
+from . import WS_CONFIG
+from .broadcast import BroadcastEngine, encode_frame
+from .subscriptions import BufferedEvent, ReplayBuffer, Subscription, SubscriptionIndex
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -31,33 +51,148 @@ class AnomalyEvent:
     timestamp: int
     details: Dict
 
+@dataclass
+class ProgramEvent:
+    """Token program account notification from the Solana WebSocket API"""
+    token_address: str
+    timestamp: int
+    slot: int
+    account: Dict
+
+    @classmethod
+    def from_solana_event(cls, result: Dict) -> 'ProgramEvent':
+        """Build from the `result` of a programNotification."""
+        value = result.get('value', {})
+        return cls(
+            token_address=value.get('pubkey', ''),
+            timestamp=int(time.time()),
+            slot=result.get('context', {}).get('slot', 0),
+            account=value.get('account', {})
+        )
+
+@dataclass
+class EventRiskScore:
+    """Risk of a single program event"""
+    score: float
+    primary_factor: str
+    factor_breakdown: Dict[str, float]
+
+def uvicorn_ws_options(ws_config: Dict) -> Dict:
+    """
+    Map WS_CONFIG onto uvicorn's WebSocket server settings.
+    
+    permessage-deflate is negotiated by the server during the handshake, so
+    `compression` is honoured here rather than per message.
+    """
+    return {
+        'ws_per_message_deflate': ws_config.get('compression', True),
+        'ws_ping_interval': ws_config.get('ping_interval', 20),
+        'ws_ping_timeout': ws_config.get('ping_timeout', 20),
+        'ws_max_size': ws_config.get('max_message_size', 16 * 1024 * 1024),
+    }
+
 class WebSocketManager:
     """Manages WebSocket connections and real-time updates"""
     
-    def __init__(self, solana_ws_url: str):
+    def __init__(
+        self,
+        solana_ws_url: str,
+        send_queue_size: int = WS_CONFIG['send_queue_size'],
+        slow_consumer_policy: str = WS_CONFIG['slow_consumer_policy'],
+        replay_size: int = WS_CONFIG['replay_size'],
+        reply_reserve: int = WS_CONFIG['reply_reserve'],
+        replay_interval: float = WS_CONFIG['replay_interval']
+    ):
+        """
+        Initialize the manager.
+        
+        Args:
+            solana_ws_url: Solana RPC WebSocket URL
+            send_queue_size: Frames buffered per client (WS_CONFIG['send_queue_size'])
+            slow_consumer_policy: 'drop_oldest', 'coalesce' (by token) or
+                'disconnect' (WS_CONFIG['slow_consumer_policy'])
+            replay_size: Recent events kept for resume (WS_CONFIG['replay_size'])
+            reply_reserve: Reply and replay frames buffered per client
+                (WS_CONFIG['reply_reserve'])
+            replay_interval: Minimum seconds between replays for one client
+                (WS_CONFIG['replay_interval'])
+        """
         self.active_connections: Set[WebSocket] = set()
         self.solana_ws_url = solana_ws_url
         self.subscription_ids: Dict[str, int] = {}
+        self.broadcaster = BroadcastEngine(
+            max_queue=send_queue_size,
+            policy=slow_consumer_policy,
+            on_disconnect=self.disconnect,
+            reply_reserve=reply_reserve
+        )
+        self.subscriptions = SubscriptionIndex()
+        self.replay = ReplayBuffer(replay_size)
+        self.replay_interval = replay_interval
+        self._last_replay: Dict[WebSocket, float] = {}
         self._running = False
+
+    # WS_CONFIG keys that map onto constructor arguments of the same name
+    CONFIG_KEYS = (
+        'send_queue_size', 'slow_consumer_policy',
+        'replay_size', 'reply_reserve', 'replay_interval'
+    )
+
+    @classmethod
+    def from_config(
+        cls,
+        solana_ws_url: str,
+        ws_config: Optional[Dict] = None,
+        **kwargs
+    ) -> 'WebSocketManager':
+        """
+        Create a manager with its per-client settings taken from WS_CONFIG.
+        
+        Args:
+            solana_ws_url: Solana RPC WebSocket URL
+            ws_config: WebSocket configuration, defaults to WS_CONFIG
+            **kwargs: Constructor arguments overriding the configuration
+        """
+        ws_config = WS_CONFIG if ws_config is None else ws_config
+        for key in cls.CONFIG_KEYS:
+            if key in ws_config:
+                kwargs.setdefault(key, ws_config[key])
+        return cls(solana_ws_url, **kwargs)
         
     async def connect(self, websocket: WebSocket):
         """Handle new WebSocket connection"""
         await websocket.accept()
         self.active_connections.add(websocket)
+        self.broadcaster.register(websocket)
+        self.subscriptions.subscribe(websocket, Subscription())
         logger.info(f"New connection established. Active connections: {len(self.active_connections)}")
         
     async def disconnect(self, websocket: WebSocket):
         """Handle WebSocket disconnection"""
-        self.active_connections.remove(websocket)
+        if websocket not in self.active_connections:
+            return
+        self.active_connections.discard(websocket)
+        self._last_replay.pop(websocket, None)
+        self.subscriptions.unsubscribe(websocket)
+        await self.broadcaster.unregister(websocket)
         if websocket.client_state != WebSocketState.DISCONNECTED:
-            await websocket.close()
+            try:
+                await websocket.close()
+            except Exception as e:
+                logger.debug(f"Error closing WebSocket: {e}")
         logger.info(f"Connection closed. Remaining connections: {len(self.active_connections)}")
         
-    async def broadcast_anomaly(self, event: AnomalyEvent):
-        """Broadcast anomaly event to all connected clients"""
-        disconnected = set()
-        message = json.dumps({
+    async def broadcast_anomaly(self, event: AnomalyEvent) -> int:
+        """
+        Broadcast anomaly event to the clients subscribed to it.
+        
+        The frame is queued for every matching client without waiting on
+        any of them; returns the number of clients it was queued for.
+        """
+        event_id = self.replay.next_id()
+        frame = encode_frame({
             "type": "anomaly_alert",
+            "event_id": event_id,
             "data": {
                 "token_address": event.token_address,
                 "risk_score": event.risk_score,
@@ -66,18 +201,71 @@ class WebSocketManager:
                 "details": event.details
             }
         })
+        self.replay.append(BufferedEvent(
+            event_id, event.token_address, event.anomaly_type, event.risk_score, frame
+        ))
         
-        for connection in self.active_connections:
-            try:
-                await connection.send_text(message)
-            except WebSocketDisconnect:
-                disconnected.add(connection)
-            except Exception as e:
-                logger.error(f"Error broadcasting message: {e}")
-                disconnected.add(connection)
+        subscribers = self.subscriptions.match(event.token_address, event.anomaly_type, event.risk_score)
+        return self.broadcaster.publish_frame(frame, key=event.token_address, targets=subscribers)
+        
+    async def handle_client_message(self, websocket: WebSocket, text: str) -> None:
+        """Apply a subscribe/resume/unsubscribe message and queue the reply."""
+        try:
+            message = orjson.loads(text)
+            if not isinstance(message, dict):
+                raise ValueError("Expected a JSON object")
+            action = message.get("action")
+            
+            if action == "subscribe":
+                subscription = Subscription.from_message(message)
+                self.subscriptions.subscribe(websocket, subscription)
+                self._reply(websocket, {"type": "subscribed", "subscription": subscription.to_dict()})
+                if message.get("last_event_id") is not None:
+                    self._replay(websocket, message["last_event_id"])
+            elif action == "resume":
+                self._replay(websocket, message.get("last_event_id"))
+            elif action == "unsubscribe":
+                self.subscriptions.unsubscribe(websocket)
+                self._reply(websocket, {"type": "unsubscribed"})
+            else:
+                raise ValueError(f"Unknown action '{action}'")
                 
-        for connection in disconnected:
-            await self.disconnect(connection)
+        except (orjson.JSONDecodeError, ValueError) as e:
+            self._reply(websocket, {"type": "error", "detail": str(e)})
+            
+    def _replay(self, websocket: WebSocket, last_event_id: Any) -> None:
+        """Queue buffered events after last_event_id that match the subscription."""
+        if isinstance(last_event_id, bool) or not isinstance(last_event_id, int):
+            raise ValueError("'last_event_id' must be an integer")
+        now = time.monotonic()
+        last = self._last_replay.get(websocket)
+        if last is not None and now - last < self.replay_interval:
+            raise ValueError(f"Replay rate limited, retry after {last + self.replay_interval - now:.2f}s")
+        self._last_replay[websocket] = now
+        
+        # No await until every frame is queued, so nothing is missed or repeated
+        events, gap = self.replay.since(last_event_id)
+        subscription = self.subscriptions.subscriptions.get(websocket)
+        matching = [
+            e for e in events
+            if subscription and subscription.matches(e.token_address, e.anomaly_type, e.risk_score)
+        ]
+        # Keep the newest events that fit the reply reserve after the header
+        room = max(0, self.broadcaster.reply_room(websocket) - 1)
+        if len(matching) > room:
+            matching = matching[len(matching) - room:]
+            gap = True
+        self._reply(websocket, {
+            "type": "replay",
+            "gap": gap,
+            "count": len(matching),
+            "last_event_id": self.replay.last_id
+        })
+        for e in matching:
+            self.broadcaster.send(websocket, e.frame)
+            
+    def _reply(self, websocket: WebSocket, message: Dict) -> None:
+        self.broadcaster.send(websocket, encode_frame(message))
             
     async def start_solana_listener(self):
         """Initialize Solana WebSocket connection and event processing"""
@@ -103,10 +291,10 @@ class WebSocketManager:
                 return
                 
             data = event["params"]["result"]
-            blockchain_event = BlockchainEvent.from_solana_event(data)
+            blockchain_event = ProgramEvent.from_solana_event(data)
             risk_score = await self._calculate_risk_score(blockchain_event)
             
-            if risk_score.score >= 0.8:  # High-risk threshold
+            if risk_score is not None and risk_score.score >= 0.8:  # High-risk threshold
                 anomaly = AnomalyEvent(
                     token_address=blockchain_event.token_address,
                     risk_score=risk_score.score,
@@ -119,7 +307,7 @@ class WebSocketManager:
         except Exception as e:
             logger.error(f"Error processing Solana event: {e}")
             
-    async def _calculate_risk_score(self, event: BlockchainEvent) -> RiskScore:
+    async def _calculate_risk_score(self, event: ProgramEvent) -> Optional[EventRiskScore]:
         """Calculate risk score for blockchain event"""
         # Risk scoring logic implementation
         pass
@@ -129,6 +317,7 @@ class WebSocketManager:
         self._running = False
         for connection in self.active_connections.copy():
             await self.disconnect(connection)
+        await self.broadcaster.close()
 
 # FastAPI WebSocket endpoint handler
 async def websocket_endpoint(websocket: WebSocket, manager: WebSocketManager):
@@ -138,7 +327,7 @@ async def websocket_endpoint(websocket: WebSocket, manager: WebSocketManager):
         while True:
             try:
                 data = await websocket.receive_text()
-                # Handle client messages if needed
+                await manager.handle_client_message(websocket, data)
             except WebSocketDisconnect:
                 await manager.disconnect(websocket)
                 break
@@ -149,7 +338,7 @@ async def websocket_endpoint(websocket: WebSocket, manager: WebSocketManager):
 if __name__ == "__main__":
     # Example usage
     async def main():
-        manager = WebSocketManager("wss://api.mainnet-beta.solana.com")
+        manager = WebSocketManager.from_config("wss://api.mainnet-beta.solana.com")
         await manager.start_solana_listener()
         
     asyncio.run(main())
\ No newline at end of file
@@ -8,10 +8,22 @@ including transaction monitoring, pattern detection, and liquidity tracking.
 Author: KADES Team
 License: Proprietary"""
 
-from .blockchain_listener import BlockchainListener
-from .transaction_analyzer import TransactionAnalyzer
-from .liquidity_tracker import LiquidityTracker
-from .wallet_profiler import WalletProfiler
+from typing import TYPE_CHECKING
+from src._lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .blockchain_listener import BlockchainListener
+    from .transaction_analyzer import TransactionAnalyzer
+    from .liquidity_tracker import LiquidityTracker
+    from .wallet_profiler import WalletProfiler
+
+_LAZY_IMPORTS = {
+    '.blockchain_listener': ['BlockchainListener'],
+    '.transaction_analyzer': ['TransactionAnalyzer'],
+    '.liquidity_tracker': ['LiquidityTracker'],
+    '.wallet_profiler': ['WalletProfiler'],
+}
+__getattr__, __dir__ = lazy_exports(__name__, _LAZY_IMPORTS)
 
 __version__ = '1.0.0'
 __author__ = 'KADES Team'
@@ -8,9 +8,22 @@ combining signals from all other modules into actionable metrics.
 Author: KADES Team
 License: Proprietary"""
 
-from .metric_calculator import MetricCalculator
-from .risk_scorer import RiskScorer
-from .index_generator import IndexGenerator
+from typing import TYPE_CHECKING
+from src._lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .metric_calculator import MetricCalculator
+    from .metric_store import MetricStore
+    from .risk_scorer import RiskScorer
+    from .index_generator import IndexGenerator
+
+_LAZY_IMPORTS = {
+    '.metric_calculator': ['MetricCalculator'],
+    '.metric_store': ['MetricStore'],
+    '.risk_scorer': ['RiskScorer'],
+    '.index_generator': ['IndexGenerator'],
+}
+__getattr__, __dir__ = lazy_exports(__name__, _LAZY_IMPORTS)
 
 __version__ = '1.0.0'
 __author__ = 'KADES Team'
@@ -18,6 +31,7 @@ __email__ = 'contact@kades.ai'
 
 __all__ = [
     'MetricCalculator',
+    'MetricStore',
     'RiskScorer',
     'IndexGenerator',
 ]
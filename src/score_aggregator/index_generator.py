@@ -18,6 +18,8 @@ from collections import defaultdict
 import logging
 from dataclasses import dataclass, field
 
+from src.temporal_analysis.time_series_history import TimeSeriesHistory
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -47,7 +49,8 @@ class IndexGenerator:
         self,
         max_components: int = 10,
         rebalance_interval: int = 86400,  # 24 hours
-        risk_threshold: float = 0.7
+        risk_threshold: float = 0.7,
+        history_size: int = 1440  # Performance points retained per index
     ):
         """Initialize the index generator."""
         self.max_components = max_components
@@ -57,7 +60,10 @@ class IndexGenerator:
         # Index tracking
         self.indices = {}
         self.last_rebalance = {}
-        self.performance_history = defaultdict(list)
+        self.history_size = history_size
+        self.performance_history: Dict[str, TimeSeriesHistory] = defaultdict(
+            lambda: TimeSeriesHistory({'value': np.float64}, capacity=self.history_size)
+        )
 
     async def generate_index(
         self,
@@ -225,22 +231,18 @@ class IndexGenerator:
             
             if name in self.performance_history:
                 history = self.performance_history[name]
-                if history:
-                    returns = np.diff(
-                        [h['value'] for h in history + [{'value': current_value}]]
-                    )
+                if len(history):
+                    values = history.column('value')
+                    returns = np.diff(np.append(values, current_value))
                     metrics.update({
                         'returns_mean': float(np.mean(returns)),
                         'returns_std': float(np.std(returns)),
                         'total_return': float(
-                            (current_value - history[0]['value']) / history[0]['value']
+                            (current_value - values[0]) / values[0]
                         )
                     })
             
-            self.performance_history[name].append({
-                'value': current_value,
-                'timestamp': datetime.now()
-            })
+            self.performance_history[name].append(datetime.now(), value=current_value)
             
             return metrics
             
@@ -15,7 +15,10 @@ from typing import Dict, List, Optional, Tuple
 import numpy as np
 import logging
 from collections import defaultdict
-from scipy.stats import pearsonr
+
+from src.temporal_analysis.time_series_history import TimeSeriesHistory
+
+from .metric_store import MetricStore
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -42,6 +45,31 @@ class AggregatedMetrics:
     confidence: float
     trend_analysis: Optional[TrendAnalysis] = None
 
+# Metric columns per category, in store column order
+METRIC_CATEGORIES = {
+    'chain': ['transaction_volume', 'whale_activity', 'liquidity_score'],
+    'sentiment': ['sentiment_score', 'social_volume', 'sentiment_change'],
+    'market': ['volatility', 'price_momentum', 'volume_profile'],
+}
+
+# (input key, scale, capped at 1.0) for each metric column
+METRIC_SOURCES = {
+    'transaction_volume': ('transaction_volume', 1_000_000, True),
+    'whale_activity': ('whale_activity', 1, True),
+    'liquidity_score': ('liquidity', 500_000, True),
+    'sentiment_score': ('sentiment_score', 1, False),
+    'social_volume': ('social_volume', 1000, True),
+    'sentiment_change': ('sentiment_change', 1, False),
+    'volatility': ('volatility', 1, True),
+    'price_momentum': ('price_momentum', 1, False),
+    'volume_profile': ('volume_profile', 1, True),
+}
+
+# Previous composite scores used for trends, correlations and consistency
+TREND_WINDOW = 10
+CORRELATION_WINDOW = 20
+CONSISTENCY_WINDOW = 5
+
 class MetricCalculator:
     """Aggregates and calculates metrics from various analysis modules."""
     
@@ -49,7 +77,8 @@ class MetricCalculator:
         self,
         update_interval: int = 60,
         metric_weights: Optional[Dict[str, float]] = None,
-        smoothing_factor: float = 0.2  # New parameter for exponential smoothing
+        smoothing_factor: float = 0.2,  # New parameter for exponential smoothing
+        history_size: int = 1000  # Aggregated metrics retained per token
     ):
         """Initialize the metric calculator."""
         self.update_interval = update_interval
@@ -61,8 +90,36 @@ class MetricCalculator:
         self.smoothing_factor = smoothing_factor
         
         # Tracking
-        self.metric_history = defaultdict(list)
-        self.smoothed_metrics = defaultdict(dict)  # New tracking for smoothed values
+        self.history_size = history_size
+        self.metric_history: Dict[str, TimeSeriesHistory] = defaultdict(
+            lambda: TimeSeriesHistory.for_dataclass(AggregatedMetrics, capacity=self.history_size)
+        )
+        
+        # Columnar per-token state: smoothed metrics and rolling windows of
+        # the composite score (series 0) and category scores
+        self.categories = list(METRIC_CATEGORIES)
+        self.columns = [name for names in METRIC_CATEGORIES.values() for name in names]
+        self.metric_store = MetricStore(
+            columns=self.columns,
+            series=['composite'] + self.categories,
+            window=CORRELATION_WINDOW
+        )
+        
+        # Column -> category averaging matrix and category weights
+        self._category_means = np.zeros((len(self.columns), len(self.categories)))
+        for j, category in enumerate(self.categories):
+            for name in METRIC_CATEGORIES[category]:
+                self._category_means[self.columns.index(name), j] = 1 / len(METRIC_CATEGORIES[category])
+        self._category_weights = np.array([self.metric_weights[category] for category in self.categories])
+        
+        sources = [METRIC_SOURCES[name] for name in self.columns]
+        self._source_keys = [key for key, _, _ in sources]
+        self._source_scales = np.array([scale for _, scale, _ in sources], dtype=float)
+        self._source_caps = np.array([1.0 if capped else np.inf for _, _, capped in sources])
+        self._column_category = [
+            self.categories.index(category)
+            for category, names in METRIC_CATEGORIES.items() for _ in names
+        ]
 
     async def calculate_metrics(
         self,
@@ -72,321 +129,224 @@ class MetricCalculator:
         market_data: Dict
     ) -> AggregatedMetrics:
         """Calculate aggregated metrics."""
-        try:
-            # Calculate individual metrics
-            chain_metrics = self._calculate_chain_metrics(chain_data)
-            sentiment_metrics = self._calculate_sentiment_metrics(sentiment_data)
-            market_metrics = self._calculate_market_metrics(market_data)
-            
-            # Apply exponential smoothing
-            chain_metrics = self._apply_smoothing(token_address, 'chain', chain_metrics)
-            sentiment_metrics = self._apply_smoothing(token_address, 'sentiment', sentiment_metrics)
-            market_metrics = self._apply_smoothing(token_address, 'market', market_metrics)
-            
-            # Calculate composite score
-            composite_score = self._calculate_composite_score(
-                chain_metrics,
-                sentiment_metrics,
-                market_metrics
-            )
-            
-            # Calculate confidence with improved checks
-            confidence = self._calculate_confidence(
-                chain_data,
-                sentiment_data,
-                market_data,
-                composite_score  # Added composite score as a factor
-            )
-            
-            # Calculate trend analysis
-            trend_analysis = self._analyze_trends(
-                token_address,
-                chain_metrics,
-                sentiment_metrics,
-                market_metrics
-            )
-            
-            # Create result
-            metrics = AggregatedMetrics(
-                token_address=token_address,
-                timestamp=datetime.now(),
-                chain_metrics=chain_metrics,
-                sentiment_metrics=sentiment_metrics,
-                market_metrics=market_metrics,
-                composite_score=composite_score,
-                confidence=confidence,
-                trend_analysis=trend_analysis
-            )
-            
-            # Update history
-            self._update_history(token_address, metrics)
-            
-            return metrics
-            
-        except Exception as e:
-            logger.error(f"Error calculating metrics: {e}")
-            raise
-
-    def _apply_smoothing(
-        self,
-        token_address: str,
-        metric_type: str,
-        current_metrics: Dict[str, float]
-    ) -> Dict[str, float]:
-        """Apply exponential smoothing to metrics."""
-        smoothed = {}
-        for key, value in current_metrics.items():
-            prev_value = self.smoothed_metrics[token_address].get(f"{metric_type}_{key}", value)
-            smoothed[key] = (self.smoothing_factor * value + 
-                           (1 - self.smoothing_factor) * prev_value)
-            self.smoothed_metrics[token_address][f"{metric_type}_{key}"] = smoothed[key]
-        return smoothed
-
-    def _analyze_trends(
-        self,
-        token_address: str,
-        chain_metrics: Dict[str, float],
-        sentiment_metrics: Dict[str, float],
-        market_metrics: Dict[str, float]
-    ) -> Optional[TrendAnalysis]:
-        """Analyze trends in metrics."""
-        try:
-            history = self.metric_history[token_address]
-            if len(history) < 2:
-                return None
-
-            # Calculate trend direction and strength
-            recent_scores = [h.composite_score for h in history[-10:]]
-            direction = 'up' if recent_scores[-1] > recent_scores[0] else 'down'
-            if abs(recent_scores[-1] - recent_scores[0]) < 0.05:
-                direction = 'sideways'
-
-            # Calculate momentum
-            momentum = np.mean(np.diff(recent_scores))
-
-            # Calculate acceleration
-            acceleration = np.mean(np.diff(np.diff(recent_scores))) if len(recent_scores) > 2 else 0
-
-            # Calculate correlations
-            correlations = self._calculate_metric_correlations(history[-20:])
-
-            return TrendAnalysis(
-                direction=direction,
-                strength=abs(recent_scores[-1] - recent_scores[0]),
-                momentum=momentum,
-                acceleration=acceleration,
-                correlation=correlations
-            )
-
-        except Exception as e:
-            logger.error(f"Error analyzing trends: {e}")
-            return None
+        results = await self.calculate_metrics_batch(
+            [token_address], [chain_data], [sentiment_data], [market_data]
+        )
+        return results[0]
 
-    def _calculate_metric_correlations(
+    async def calculate_metrics_batch(
         self,
-        history: List[AggregatedMetrics]
-    ) -> Dict[str, float]:
-        """Calculate correlations between different metrics."""
-        try:
-            if len(history) < 2:
-                return {}
-
-            composite_scores = [h.composite_score for h in history]
-            correlations = {}
-
-            # Chain metrics correlation
-            chain_scores = [np.mean(list(h.chain_metrics.values())) for h in history]
-            correlations['chain'] = pearsonr(composite_scores, chain_scores)[0]
+        token_addresses: List[str],
+        chain_data: List[Dict],
+        sentiment_data: List[Dict],
+        market_data: List[Dict]
+    ) -> List[AggregatedMetrics]:
+        """
+        Calculate aggregated metrics for many tokens in vectorized passes.
 
-            # Sentiment metrics correlation
-            sentiment_scores = [np.mean(list(h.sentiment_metrics.values())) for h in history]
-            correlations['sentiment'] = pearsonr(composite_scores, sentiment_scores)[0]
+        Equivalent to calling calculate_metrics for each token in order; a
+        token listed more than once is updated once per occurrence.
 
-            # Market metrics correlation
-            market_scores = [np.mean(list(h.market_metrics.values())) for h in history]
-            correlations['market'] = pearsonr(composite_scores, market_scores)[0]
-
-            return correlations
-
-        except Exception as e:
-            logger.error(f"Error calculating correlations: {e}")
-            return {}
+        Args:
+            token_addresses: Tokens to update
+            chain_data: Chain data per token
+            sentiment_data: Sentiment data per token
+            market_data: Market data per token
 
-    def _calculate_confidence(
-        self,
-        chain_data: Dict,
-        sentiment_data: Dict,
-        market_data: Dict,
-        composite_score: float
-    ) -> float:
-        """Calculate confidence score with improved checks."""
+        Returns:
+            AggregatedMetrics per token, in input order
+        """
         try:
-            confidence_factors = []
-            
-            # Data quantity confidence
-            if chain_data.get('data_points', 0) > 0:
-                confidence_factors.append(
-                    min(1.0, chain_data['data_points'] / 100)
+            if not len(token_addresses) == len(chain_data) == len(sentiment_data) == len(market_data):
+                raise ValueError("Token addresses and chain, sentiment and market data must have equal lengths")
+            
+            # Split repeated tokens into successive rounds of distinct tokens
+            occurrences = defaultdict(int)
+            rounds: List[List[int]] = []
+            for i, token_address in enumerate(token_addresses):
+                occurrence = occurrences[token_address]
+                occurrences[token_address] += 1
+                if occurrence == len(rounds):
+                    rounds.append([])
+                rounds[occurrence].append(i)
+            
+            timestamp = datetime.now()
+            results: List[Optional[AggregatedMetrics]] = [None] * len(token_addresses)
+            for indices in rounds:
+                batch = self._calculate_round(
+                    [token_addresses[i] for i in indices],
+                    [chain_data[i] for i in indices],
+                    [sentiment_data[i] for i in indices],
+                    [market_data[i] for i in indices],
+                    timestamp
                 )
+                for i, metrics in zip(indices, batch):
+                    results[i] = metrics
+                    self._update_history(metrics.token_address, metrics)
             
-            # Sentiment confidence
-            if 'confidence' in sentiment_data:
-                confidence_factors.append(sentiment_data['confidence'])
-            
-            # Market data quality
-            if 'data_quality' in market_data:
-                confidence_factors.append(market_data['data_quality'])
-            
-            # New: Historical consistency check
-            if self.metric_history:
-                recent_scores = [m.composite_score for m in self.metric_history[-5:]]
-                if recent_scores:
-                    consistency = 1 - np.std(recent_scores)
-                    confidence_factors.append(consistency)
-            
-            # New: Composite score reasonableness check
-            if 0 <= composite_score <= 1:
-                score_confidence = 1 - abs(0.5 - composite_score)
-                confidence_factors.append(score_confidence)
-            
-            return float(np.mean(confidence_factors)) if confidence_factors else 0.0
+            return results
             
         except Exception as e:
-            logger.error(f"Error calculating confidence: {e}")
-            return 0.0
+            logger.error(f"Error calculating metrics: {e}")
+            raise
 
-    def _calculate_chain_metrics(self, chain_data: Dict) -> Dict[str, float]:
-        """Calculate on-chain metrics."""
-        try:
-            metrics = {}
-            
-            # Transaction metrics
-            metrics['transaction_volume'] = min(
-                1.0,
-                chain_data.get('transaction_volume', 0) / 1_000_000
-            )
-            
-            # Wallet metrics
-            metrics['whale_activity'] = min(
-                1.0,
-                chain_data.get('whale_activity', 0)
-            )
-            
-            # Liquidity metrics
-            metrics['liquidity_score'] = min(
-                1.0,
-                chain_data.get('liquidity', 0) / 500_000
-            )
-            
-            return metrics
-            
-        except Exception as e:
-            logger.error(f"Error calculating chain metrics: {e}")
-            return {}
+    def _calculate_round(
+        self,
+        token_addresses: List[str],
+        chain_data: List[Dict],
+        sentiment_data: List[Dict],
+        market_data: List[Dict],
+        timestamp: datetime
+    ) -> List[AggregatedMetrics]:
+        """Update distinct tokens: smoothing, scores, trends, then the rolling windows."""
+        store = self.metric_store
+        rows = store.rows_for(token_addresses)
+        
+        # Normalized metrics with exponential smoothing
+        raw = self._extract_metrics(chain_data, sentiment_data, market_data)
+        smoothed = store.smooth(rows, raw, self.smoothing_factor)
+        
+        # Category means and composite score
+        category_scores = smoothed @ self._category_means
+        composite_scores = category_scores @ self._category_weights
+        
+        # Confidence and trends look at the token's previous scores only
+        confidence = self._calculate_confidence(
+            chain_data, sentiment_data, market_data, composite_scores, rows
+        )
+        trends = self._analyze_trends(rows)
+        
+        store.append(rows, np.column_stack([composite_scores, category_scores]))
+        
+        results = []
+        for i, token_address in enumerate(token_addresses):
+            grouped = [{} for _ in self.categories]
+            for name, category, value in zip(self.columns, self._column_category, smoothed[i].tolist()):
+                grouped[category][name] = value
+            results.append(AggregatedMetrics(
+                token_address=token_address,
+                timestamp=timestamp,
+                chain_metrics=grouped[0],
+                sentiment_metrics=grouped[1],
+                market_metrics=grouped[2],
+                composite_score=float(composite_scores[i]),
+                confidence=float(confidence[i]),
+                trend_analysis=trends[i]
+            ))
+        return results
 
-    def _calculate_sentiment_metrics(self, sentiment_data: Dict) -> Dict[str, float]:
-        """Calculate sentiment metrics."""
-        try:
-            metrics = {}
-            
-            # Overall sentiment
-            metrics['sentiment_score'] = sentiment_data.get('sentiment_score', 0)
-            
-            # Social volume
-            metrics['social_volume'] = min(
-                1.0,
-                sentiment_data.get('social_volume', 0) / 1000
-            )
-            
-            # Sentiment momentum
-            metrics['sentiment_change'] = sentiment_data.get('sentiment_change', 0)
-            
-            return metrics
-            
-        except Exception as e:
-            logger.error(f"Error calculating sentiment metrics: {e}")
-            return {}
+    def _extract_metrics(
+        self,
+        chain_data: List[Dict],
+        sentiment_data: List[Dict],
+        market_data: List[Dict]
+    ) -> np.ndarray:
+        """Normalized chain, sentiment and market metrics, one row per token."""
+        sources = [
+            (chain_data, sentiment_data, market_data)[category]
+            for category in self._column_category
+        ]
+        raw = np.array(
+            [[data[i].get(key, 0) for data, key in zip(sources, self._source_keys)]
+             for i in range(len(chain_data))],
+            dtype=float
+        ).reshape(len(chain_data), len(self.columns))
+        return np.minimum(raw / self._source_scales, self._source_caps)
 
-    def _calculate_market_metrics(self, market_data: Dict) -> Dict[str, float]:
-        """Calculate market metrics."""
+    def _analyze_trends(self, rows: np.ndarray) -> List[Optional[TrendAnalysis]]:
+        """Analyze trends over each token's previous composite scores."""
         try:
-            metrics = {}
-            
-            # Volatility
-            metrics['volatility'] = min(
-                1.0,
-                market_data.get('volatility', 0)
+            store = self.metric_store
+            scores, available = store.recent(rows, TREND_WINDOW)
+            if not np.any(available >= 2):
+                return [None] * len(rows)
+            
+            index = np.arange(len(rows))
+            oldest = TREND_WINDOW - np.maximum(available, 1)
+            first = scores[index, oldest]
+            second = scores[index, np.minimum(oldest + 1, TREND_WINDOW - 1)]
+            last = scores[:, -1]
+            change = last - first
+            
+            # Mean first and second differences telescope to endpoint differences
+            momentum = change / np.maximum(available - 1, 1)
+            acceleration = np.where(
+                available > 2,
+                ((last - scores[:, -2]) - (second - first)) / np.maximum(available - 2, 1),
+                0.0
             )
-            
-            # Price momentum
-            metrics['price_momentum'] = market_data.get('price_momentum', 0)
-            
-            # Volume profile
-            metrics['volume_profile'] = min(
-                1.0,
-                market_data.get('volume_profile', 0)
-            )
-            
-            return metrics
-            
-        except Exception as e:
-            logger.error(f"Error calculating market metrics: {e}")
-            return {}
+            direction = np.where(np.abs(change) < 0.05, 'sideways', np.where(change > 0, 'up', 'down'))
+            correlations = store.correlations(rows)
+            
+            trends: List[Optional[TrendAnalysis]] = []
+            for i in range(len(rows)):
+                if available[i] < 2:
+                    trends.append(None)
+                    continue
+                trends.append(TrendAnalysis(
+                    direction=str(direction[i]),
+                    strength=float(abs(change[i])),
+                    momentum=float(momentum[i]),
+                    acceleration=float(acceleration[i]),
+                    correlation=dict(zip(self.categories, correlations[i].tolist()))
+                ))
+            return trends
 
-    def _calculate_composite_score(
-        self,
-        chain_metrics: Dict[str, float],
-        sentiment_metrics: Dict[str, float],
-        market_metrics: Dict[str, float]
-    ) -> float:
-        """Calculate composite score from all metrics."""
-        try:
-            scores = {
-                'chain': np.mean(list(chain_metrics.values())),
-                'sentiment': np.mean(list(sentiment_metrics.values())),
-                'market': np.mean(list(market_metrics.values()))
-            }
-            
-            composite = sum(
-                scores[key] * self.metric_weights[key]
-                for key in scores
-            )
-            
-            return float(composite)
-            
         except Exception as e:
-            logger.error(f"Error calculating composite score: {e}")
-            return 0.0
+            logger.error(f"Error analyzing trends: {e}")
+            return [None] * len(rows)
 
     def _calculate_confidence(
         self,
-        chain_data: Dict,
-        sentiment_data: Dict,
-        market_data: Dict
-    ) -> float:
-        """Calculate confidence score for metrics."""
+        chain_data: List[Dict],
+        sentiment_data: List[Dict],
+        market_data: List[Dict],
+        composite_scores: np.ndarray,
+        rows: np.ndarray
+    ) -> np.ndarray:
+        """Calculate confidence scores with improved checks."""
         try:
-            confidences = []
+            n = len(rows)
+            factors = np.zeros((n, 5))
+            present = np.zeros((n, 5), dtype=bool)
             
-            # Chain data confidence
-            if chain_data.get('data_points', 0) > 0:
-                confidences.append(
-                    min(1.0, chain_data['data_points'] / 100)
-                )
+            # Data quantity confidence
+            data_points = np.array([data.get('data_points', 0) for data in chain_data], dtype=float)
+            present[:, 0] = data_points > 0
+            factors[:, 0] = np.minimum(1.0, data_points / 100)
             
             # Sentiment confidence
-            if 'confidence' in sentiment_data:
-                confidences.append(sentiment_data['confidence'])
+            for i, data in enumerate(sentiment_data):
+                if 'confidence' in data:
+                    present[i, 1] = True
+                    factors[i, 1] = data['confidence']
             
-            # Market confidence
-            if 'data_quality' in market_data:
-                confidences.append(market_data['data_quality'])
-            
-            return float(np.mean(confidences)) if confidences else 0.0
+            # Market data quality
+            for i, data in enumerate(market_data):
+                if 'data_quality' in data:
+                    present[i, 2] = True
+                    factors[i, 2] = data['data_quality']
+            
+            # Historical consistency of the token's recent composite scores
+            recent, available = self.metric_store.recent(rows, CONSISTENCY_WINDOW)
+            valid = np.arange(-recent.shape[1], 0) >= -available[:, None]
+            counts = np.maximum(available, 1)
+            mean = recent.sum(axis=1) / counts
+            std = np.sqrt((((recent - mean[:, None]) ** 2) * valid).sum(axis=1) / counts)
+            present[:, 3] = available > 0
+            factors[:, 3] = 1 - std
+            
+            # Composite score reasonableness check
+            present[:, 4] = (composite_scores >= 0) & (composite_scores <= 1)
+            factors[:, 4] = 1 - np.abs(0.5 - composite_scores)
+            
+            totals = np.where(present, factors, 0.0).sum(axis=1)
+            counts = present.sum(axis=1)
+            return np.where(counts > 0, totals / np.maximum(counts, 1), 0.0)
             
         except Exception as e:
             logger.error(f"Error calculating confidence: {e}")
-            return 0.0
+            return np.zeros(len(rows))
 
     def _update_history(
         self,
@@ -395,13 +355,7 @@ class MetricCalculator:
     ) -> None:
         """Update metric history."""
         try:
-            self.metric_history[token_address].append(metrics)
-            
-            # Keep last 1000 entries
-            if len(self.metric_history[token_address]) > 1000:
-                self.metric_history[token_address] = \
-                    self.metric_history[token_address][-1000:]
-                    
+            self.metric_history[token_address].append_record(metrics)
         except Exception as e:
             logger.error(f"Error updating history: {e}")
 
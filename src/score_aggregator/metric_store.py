@@ -0,0 +1,186 @@
+"""
+Kinetic Anomaly Detection Engine System (KADES)
+Metric Store Module
+
+This module implements the columnar per-token state behind MetricCalculator.
+Tokens are rows and metrics are columns of NumPy arrays, so smoothing,
+scoring and trend statistics for a whole batch of tokens run as vectorized
+passes. Rolling correlations between the composite score and the category
+scores are kept as running co-moment sums over a fixed window, updated in
+O(1) per observation instead of being recomputed from the history.
+
+Author: KADES Team
+License: Proprietary
+"""
+
+import logging
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Variance (per observation) below which a series is treated as constant
+# and its correlation is undefined
+_CONSTANT_VARIANCE = 1e-12
+
+class MetricStore:
+    """
+    Columnar per-token metric state.
+
+    Each row holds a token's exponentially smoothed metric columns and a
+    ring of its last `window` observations of the tracked series (series 0
+    is the composite score the others are correlated against). The running
+    sums S_i, S_ii and S_0i of the ring are updated as observations enter
+    and leave it, and recomputed exactly once per pass around the ring to
+    bound rounding drift. Series are stored relative to each token's first
+    observation, which keeps the sums small and the variance well
+    conditioned for slowly moving, smoothed series.
+    """
+
+    def __init__(
+        self,
+        columns: List[str],
+        series: List[str],
+        window: int = 20,
+        capacity: int = 256
+    ):
+        """
+        Initialize the store.
+
+        Args:
+            columns: Metric column names
+            series: Names of the windowed series; the first is correlated
+                against the rest
+            window: Observations kept per token for rolling statistics
+            capacity: Initial number of token rows
+        """
+        if window < 2:
+            raise ValueError(f"Window must hold at least 2 observations, got {window}")
+
+        self.columns = list(columns)
+        self.series = list(series)
+        self.window = window
+        self.rows: Dict[str, int] = {}
+        self.tokens: List[str] = []
+
+        n_columns, n_series = len(self.columns), len(self.series)
+        self.smoothed = np.zeros((capacity, n_columns))
+        self.count = np.zeros(capacity, dtype=np.int64)  # observations ever appended
+        self._ring = np.zeros((capacity, window, n_series))
+        self._shift = np.zeros((capacity, n_series))
+        self._sum = np.zeros((capacity, n_series))
+        self._sum_sq = np.zeros((capacity, n_series))
+        self._cross = np.zeros((capacity, n_series))  # sum of series 0 times series i
+
+    def __len__(self) -> int:
+        return len(self.tokens)
+
+    def rows_for(self, tokens: Iterable[str]) -> np.ndarray:
+        """Row index of each token, adding rows for new tokens."""
+        rows = []
+        for token in tokens:
+            row = self.rows.get(token)
+            if row is None:
+                row = len(self.tokens)
+                self.rows[token] = row
+                self.tokens.append(token)
+            rows.append(row)
+        if len(self.tokens) > len(self.count):
+            self._grow(len(self.tokens))
+        return np.asarray(rows, dtype=np.int64)
+
+    def smooth(self, rows: np.ndarray, values: np.ndarray, alpha: float) -> np.ndarray:
+        """
+        Exponentially smooth new metric values into the rows.
+
+        A token's first observation is taken as is.
+
+        Returns:
+            Smoothed values, shape (len(rows), len(columns))
+        """
+        previous = np.where((self.count[rows] > 0)[:, None], self.smoothed[rows], values)
+        smoothed = alpha * values + (1 - alpha) * previous
+        self.smoothed[rows] = smoothed
+        return smoothed
+
+    def append(self, rows: np.ndarray, values: np.ndarray) -> None:
+        """
+        Add one observation of every series for each row.
+
+        Args:
+            rows: Distinct row indices
+            values: Series values, shape (len(rows), len(series))
+        """
+        count = self.count[rows]
+        first = count == 0
+        self._shift[rows[first]] = values[first]
+        shifted = values - self._shift[rows]
+
+        position = count % self.window
+        full = count >= self.window
+        evicted = np.where(full[:, None], self._ring[rows, position], 0.0)
+
+        self._sum[rows] += shifted - evicted
+        self._sum_sq[rows] += shifted ** 2 - evicted ** 2
+        self._cross[rows] += shifted * shifted[:, :1] - evicted * evicted[:, :1]
+        self._ring[rows, position] = shifted
+        self.count[rows] = count + 1
+
+        wrapped = rows[(count + 1) % self.window == 0]
+        if len(wrapped):
+            ring = self._ring[wrapped]
+            self._sum[wrapped] = ring.sum(axis=1)
+            self._sum_sq[wrapped] = (ring ** 2).sum(axis=1)
+            self._cross[wrapped] = (ring * ring[:, :, :1]).sum(axis=1)
+
+    def correlations(self, rows: np.ndarray) -> np.ndarray:
+        """
+        Pearson correlation of series 0 with each other series over the window.
+
+        Returns:
+            Shape (len(rows), len(series) - 1); NaN where fewer than two
+            observations are buffered or either series is constant
+        """
+        n = np.minimum(self.count[rows], self.window).astype(float)
+        safe_n = np.maximum(n, 1.0)[:, None]
+        total = self._sum[rows]
+        variance = self._sum_sq[rows] - total ** 2 / safe_n
+        covariance = self._cross[rows] - total * total[:, :1] / safe_n
+
+        defined = (
+            (n >= 2)[:, None]
+            & (variance[:, :1] > _CONSTANT_VARIANCE * safe_n)
+            & (variance[:, 1:] > _CONSTANT_VARIANCE * safe_n)
+        )
+        with np.errstate(invalid='ignore', divide='ignore'):
+            correlation = covariance[:, 1:] / np.sqrt(variance[:, :1] * variance[:, 1:])
+        return np.where(defined, np.clip(correlation, -1.0, 1.0), np.nan)
+
+    def recent(self, rows: np.ndarray, length: int, series: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Last `length` observations of one series, oldest first.
+
+        Returns:
+            (values, available): values has shape (len(rows), length) and is
+            right-aligned, so row i's observations are values[i, -available[i]:]
+            (the unused left part is zero)
+        """
+        length = min(length, self.window)
+        count = self.count[rows]
+        available = np.minimum(count, length)
+        offsets = np.arange(-length, 0)
+        positions = (count[:, None] + offsets) % self.window
+        values = self._ring[rows[:, None], positions, series] + self._shift[rows, series][:, None]
+        valid = offsets >= -available[:, None]
+        return np.where(valid, values, 0.0), available
+
+    def _grow(self, needed: int) -> None:
+        capacity = max(needed, 2 * len(self.count))
+        for name in ('smoothed', 'count', '_ring', '_shift', '_sum', '_sum_sq', '_cross'):
+            current = getattr(self, name)
+            grown = np.zeros((capacity,) + current.shape[1:], dtype=current.dtype)
+            grown[:len(current)] = current
+            setattr(self, name, grown)
@@ -16,6 +16,8 @@ import numpy as np
 import logging
 from collections import defaultdict
 
+from src.temporal_analysis.time_series_history import TimeSeriesHistory
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -37,7 +39,8 @@ class RiskScorer:
     def __init__(
         self,
         risk_thresholds: Optional[Dict[str, float]] = None,
-        risk_weights: Optional[Dict[str, float]] = None
+        risk_weights: Optional[Dict[str, float]] = None,
+        history_size: int = 1000  # Assessments retained per token
     ):
         """Initialize the risk scorer."""
         self.risk_thresholds = risk_thresholds or {
@@ -55,7 +58,10 @@ class RiskScorer:
         }
         
         # Risk history tracking
-        self.risk_history = defaultdict(list)
+        self.history_size = history_size
+        self.risk_history: Dict[str, TimeSeriesHistory] = defaultdict(
+            lambda: TimeSeriesHistory.for_dataclass(RiskAssessment, capacity=self.history_size)
+        )
 
     async def assess_risk(
         self,
@@ -253,16 +259,44 @@ class RiskScorer:
             logger.error(f"Error identifying risk factors: {e}")
             return {}
 
+    def get_risk_history(
+        self,
+        token_address: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        interval: Optional[float] = None
+    ) -> np.ndarray:
+        """
+        Overall risk and confidence of a token over time.
+
+        Args:
+            token_address: Token address
+            start: Earliest assessment time (inclusive)
+            end: Latest assessment time (inclusive)
+            interval: Downsample to this many seconds per point, keeping the
+                peak risk and mean confidence of each interval
+
+        Returns:
+            Structured array with timestamp (epoch seconds), overall_risk and
+            confidence (plus count when downsampled), oldest first
+        """
+        if token_address not in self.risk_history:
+            return np.zeros(0, dtype=[('timestamp', np.float64), ('overall_risk', np.float64),
+                                      ('confidence', np.float64)])
+        history = self.risk_history[token_address]
+        if interval is None:
+            return history.range(start, end)
+        return history.downsample(
+            interval,
+            how={'overall_risk': 'max', 'confidence': 'mean'},
+            start=start,
+            end=end
+        )
+
     def _update_history(self, token_address: str, assessment: RiskAssessment) -> None:
         """Update risk assessment history."""
         try:
-            self.risk_history[token_address].append(assessment)
-            
-            # Keep last 1000 entries
-            if len(self.risk_history[token_address]) > 1000:
-                self.risk_history[token_address] = \
-                    self.risk_history[token_address][-1000:]
-                    
+            self.risk_history[token_address].append_record(assessment)
         except Exception as e:
             logger.error(f"Error updating history: {e}")
 
@@ -8,10 +8,30 @@ for detecting market manipulation and crowd sentiment in memecoin communities.
 Author: KADES Team
 License: Proprietary"""
 
-from .social_scraper import SocialScraper
-from .nlp_processor import NLPProcessor
-from .embedding_models import EmbeddingModel
-from .sentiment_scorer import SentimentScorer
+from typing import TYPE_CHECKING
+from src._lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .social_scraper import SocialScraper
+    from .nlp_processor import NLPProcessor
+    from .embedding_models import EmbeddingModel
+    from .sentiment_scorer import SentimentScorer, SentimentBatchResult
+    from .deduplicator import PostDeduplicator
+    from .mention_index import TokenMentionIndex
+    from .inference_backends import create_backend, build_sentiment_pipeline, load_inference_config
+    from .model_registry import ModelRegistry, get_model_registry, install_models
+
+_LAZY_IMPORTS = {
+    '.social_scraper': ['SocialScraper'],
+    '.nlp_processor': ['NLPProcessor'],
+    '.embedding_models': ['EmbeddingModel'],
+    '.sentiment_scorer': ['SentimentScorer', 'SentimentBatchResult'],
+    '.deduplicator': ['PostDeduplicator'],
+    '.mention_index': ['TokenMentionIndex'],
+    '.inference_backends': ['create_backend', 'build_sentiment_pipeline', 'load_inference_config'],
+    '.model_registry': ['ModelRegistry', 'get_model_registry', 'install_models'],
+}
+__getattr__, __dir__ = lazy_exports(__name__, _LAZY_IMPORTS)
 
 __version__ = '1.0.0'
 __author__ = 'KADES Team'
@@ -22,6 +42,15 @@ __all__ = [
     'NLPProcessor',
     'EmbeddingModel',
     'SentimentScorer',
+    'SentimentBatchResult',
+    'PostDeduplicator',
+    'TokenMentionIndex',
+    'create_backend',
+    'build_sentiment_pipeline',
+    'load_inference_config',
+    'ModelRegistry',
+    'get_model_registry',
+    'install_models',
 ]
 
 # Default NLP configuration
@@ -0,0 +1,313 @@
+"""
+Kinetic Anomaly Detection Engine System (KADES)
+Post Deduplication Module
+
+This module implements exact and near-duplicate detection for social media
+posts using MinHash signatures and an LSH band index over a sliding time window,
+so coordinated spam waves are analyzed once and counted many times.
+
+Author: KADES Team
+License: Proprietary
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set, Tuple
+import numpy as np
+from collections import defaultdict, deque
+import hashlib
+import logging
+import re
+import zlib
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Mersenne prime used for the universal hash family; keeping it below 2**32
+# lets (a * x + b) be evaluated in uint64 without overflow.
+_MERSENNE_PRIME = np.uint64((1 << 31) - 1)
+
+@dataclass
+class DuplicateMatch:
+    """Result of observing a post in the deduplicator"""
+    cluster_id: int
+    cluster_size: int
+    is_duplicate: bool
+    is_exact: bool
+    similarity: float
+    payload: Optional[Any] = None
+
+@dataclass
+class _Cluster:
+    """Group of posts sharing (near-)identical content within the window"""
+    signature: np.ndarray
+    band_keys: List[Tuple[int, bytes]]
+    exact_keys: Set[str] = field(default_factory=set)
+    size: int = 0
+    payload: Optional[Any] = None
+
+class PostDeduplicator:
+    """
+    Sliding-window near-duplicate detector for social media text.
+    Exact matches are resolved through a content digest, near matches through
+    MinHash signatures bucketed by LSH bands and verified against the cluster
+    representative.
+    """
+
+    def __init__(
+        self,
+        num_perm: int = 64,
+        bands: int = 8,
+        threshold: float = 0.8,
+        shingle_size: int = 3,
+        window_seconds: int = 3600,
+        max_observations: int = 100000,
+        seed: int = 42
+    ):
+        """
+        Initialize the deduplicator.
+
+        Args:
+            num_perm: Number of MinHash permutations per signature
+            bands: Number of LSH bands (must divide num_perm)
+            threshold: Minimum estimated Jaccard similarity for a near duplicate
+            shingle_size: Word shingle length used for signatures
+            window_seconds: Sliding window after which posts stop matching
+            max_observations: Hard cap on observations held in the window
+            seed: Seed for the permutation coefficients
+        """
+        if num_perm % bands != 0:
+            raise ValueError("num_perm must be divisible by bands")
+
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+        self.window_seconds = window_seconds
+        self.max_observations = max_observations
+
+        # Universal hash coefficients (a * x + b) mod p
+        rng = np.random.RandomState(seed)
+        self._perm_a = rng.randint(1, int(_MERSENNE_PRIME), size=num_perm).astype(np.uint64)
+        self._perm_b = rng.randint(0, int(_MERSENNE_PRIME), size=num_perm).astype(np.uint64)
+
+        # Index structures
+        self._clusters: Dict[int, _Cluster] = {}
+        self._exact_index: Dict[str, int] = {}
+        self._band_index: Dict[Tuple[int, bytes], Set[int]] = defaultdict(set)
+        self._observations: deque = deque()
+        self._next_cluster_id = 0
+
+        # Tracking metrics
+        self.metrics = defaultdict(int)
+
+    def observe(self, text: str, timestamp: Optional[datetime] = None) -> DuplicateMatch:
+        """
+        Register a post and resolve the duplicate cluster it belongs to.
+
+        Args:
+            text: Post content (ideally already preprocessed)
+            timestamp: Post timestamp, defaults to now
+
+        Returns:
+            DuplicateMatch describing the cluster and any cached payload
+        """
+        ts = (timestamp or datetime.now()).timestamp()
+        self._evict_expired(ts)
+        self.metrics['observed'] += 1
+
+        normalized = self._normalize(text)
+        exact_key = hashlib.blake2b(normalized.encode('utf-8'), digest_size=16).hexdigest()
+
+        # Exact duplicate
+        cluster_id = self._exact_index.get(exact_key)
+        if cluster_id is not None:
+            self.metrics['exact_duplicates'] += 1
+            return self._join_cluster(cluster_id, ts, is_exact=True, similarity=1.0)
+
+        # Near duplicate
+        signature = self.signature(normalized)
+        cluster_id, similarity = self._query_candidates(signature)
+        if cluster_id is not None:
+            self.metrics['near_duplicates'] += 1
+            self._clusters[cluster_id].exact_keys.add(exact_key)
+            self._exact_index[exact_key] = cluster_id
+            return self._join_cluster(cluster_id, ts, is_exact=False, similarity=similarity)
+
+        # New cluster
+        cluster_id = self._create_cluster(signature, exact_key)
+        self.metrics['unique'] += 1
+        return self._join_cluster(cluster_id, ts, is_exact=False, similarity=1.0, is_new=True)
+
+    def store(self, cluster_id: int, payload: Any) -> None:
+        """Cache the analysis payload for a cluster so duplicates can reuse it."""
+        cluster = self._clusters.get(cluster_id)
+        if cluster is not None:
+            cluster.payload = payload
+
+    def cluster_size(self, cluster_id: int) -> int:
+        """Number of posts in a cluster within the current window."""
+        cluster = self._clusters.get(cluster_id)
+        return cluster.size if cluster else 0
+
+    def cached_payload(self, cluster_id: int) -> Optional[Any]:
+        """Analysis payload cached for a cluster, if any."""
+        cluster = self._clusters.get(cluster_id)
+        return cluster.payload if cluster else None
+
+    def signature(self, text: str) -> np.ndarray:
+        """Compute the MinHash signature of a (normalized) text."""
+        shingles = self._shingles(text)
+        if not shingles:
+            return np.full(self.num_perm, _MERSENNE_PRIME, dtype=np.uint64)
+
+        hashes = np.fromiter(
+            (zlib.crc32(s.encode('utf-8')) for s in shingles),
+            dtype=np.uint64,
+            count=len(shingles)
+        ) % _MERSENNE_PRIME
+
+        # (num_perm x num_shingles) permuted hashes, minimum per permutation
+        permuted = (
+            np.outer(self._perm_a, hashes) + self._perm_b[:, None]
+        ) % _MERSENNE_PRIME
+        return permuted.min(axis=1)
+
+    @staticmethod
+    def estimate_similarity(sig1: np.ndarray, sig2: np.ndarray) -> float:
+        """Estimate Jaccard similarity from two MinHash signatures."""
+        return float(np.mean(sig1 == sig2))
+
+    def get_stats(self) -> Dict:
+        """Get current deduplication statistics."""
+        observed = self.metrics['observed']
+        duplicates = self.metrics['exact_duplicates'] + self.metrics['near_duplicates']
+        return {
+            'observed': observed,
+            'unique': self.metrics['unique'],
+            'exact_duplicates': self.metrics['exact_duplicates'],
+            'near_duplicates': self.metrics['near_duplicates'],
+            'duplicate_rate': duplicates / observed if observed else 0.0,
+            'active_clusters': len(self._clusters),
+            'window_size': len(self._observations),
+            'largest_cluster': max(
+                (c.size for c in self._clusters.values()), default=0
+            )
+        }
+
+    def _join_cluster(
+        self,
+        cluster_id: int,
+        ts: float,
+        is_exact: bool,
+        similarity: float,
+        is_new: bool = False
+    ) -> DuplicateMatch:
+        """Add an observation to a cluster and build the match result."""
+        cluster = self._clusters[cluster_id]
+        cluster.size += 1
+        self._observations.append((ts, cluster_id))
+
+        if len(self._observations) > self.max_observations:
+            self._evict_oldest()
+
+        return DuplicateMatch(
+            cluster_id=cluster_id,
+            cluster_size=cluster.size,
+            is_duplicate=not is_new,
+            is_exact=is_exact,
+            similarity=similarity,
+            payload=cluster.payload
+        )
+
+    def _query_candidates(self, signature: np.ndarray) -> Tuple[Optional[int], float]:
+        """Find the most similar cluster sharing at least one LSH band."""
+        candidates: Set[int] = set()
+        for key in self._band_keys(signature):
+            candidates.update(self._band_index.get(key, ()))
+
+        best_id, best_similarity = None, 0.0
+        for cluster_id in candidates:
+            similarity = self.estimate_similarity(
+                signature, self._clusters[cluster_id].signature
+            )
+            if similarity >= self.threshold and similarity > best_similarity:
+                best_id, best_similarity = cluster_id, similarity
+
+        return best_id, best_similarity
+
+    def _create_cluster(self, signature: np.ndarray, exact_key: str) -> int:
+        """Create a new cluster with the given representative signature."""
+        cluster_id = self._next_cluster_id
+        self._next_cluster_id += 1
+
+        band_keys = self._band_keys(signature)
+        self._clusters[cluster_id] = _Cluster(
+            signature=signature,
+            band_keys=band_keys,
+            exact_keys={exact_key}
+        )
+        self._exact_index[exact_key] = cluster_id
+        for key in band_keys:
+            self._band_index[key].add(cluster_id)
+
+        return cluster_id
+
+    def _band_keys(self, signature: np.ndarray) -> List[Tuple[int, bytes]]:
+        """Split a signature into LSH band keys."""
+        return [
+            (band, signature[band * self.rows:(band + 1) * self.rows].tobytes())
+            for band in range(self.bands)
+        ]
+
+    def _evict_expired(self, now: float) -> None:
+        """Drop observations that fell out of the sliding window."""
+        cutoff = now - self.window_seconds
+        while self._observations and self._observations[0][0] < cutoff:
+            self._evict_oldest()
+
+    def _evict_oldest(self) -> None:
+        """Drop the oldest observation and retire its cluster when empty."""
+        _, cluster_id = self._observations.popleft()
+        cluster = self._clusters.get(cluster_id)
+        if cluster is None:
+            return
+
+        cluster.size -= 1
+        if cluster.size > 0:
+            return
+
+        # Remove cluster from all indexes
+        for key in cluster.band_keys:
+            bucket = self._band_index.get(key)
+            if bucket is not None:
+                bucket.discard(cluster_id)
+                if not bucket:
+                    del self._band_index[key]
+        for exact_key in cluster.exact_keys:
+            self._exact_index.pop(exact_key, None)
+        del self._clusters[cluster_id]
+
+    def _shingles(self, text: str) -> Set[str]:
+        """Build word shingles, falling back to the whole text for short posts."""
+        words = text.split()
+        if len(words) < self.shingle_size:
+            return {text} if text else set()
+        return {
+            ' '.join(words[i:i + self.shingle_size])
+            for i in range(len(words) - self.shingle_size + 1)
+        }
+
+    @staticmethod
+    def _normalize(text: str) -> str:
+        """Normalize text so trivial variations hash identically."""
+        text = text.lower()
+        text = re.sub(r'http\S+|www\S+', ' ', text)
+        text = re.sub(r'[@#]\w+', ' ', text)
+        text = re.sub(r'[^\w\s$]', ' ', text)
+        return ' '.join(text.split())
@@ -20,6 +20,9 @@ from dataclasses import dataclass
 from collections import defaultdict
 import json
 
+from .inference_backends import create_backend, load_inference_config
+from .model_registry import WARMUP_TEXTS, ModelRegistry, get_model_registry
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -47,7 +50,11 @@ class CryptoEmbeddingModel:
         model_name: str = "distilbert-base-uncased",
         embedding_dim: int = 768,
         max_length: int = 512,
-        device: str = "cuda" if torch.cuda.is_available() else "cpu"
+        device: str = "cuda" if torch.cuda.is_available() else "cpu",
+        backend: str = "eager",
+        quantize: bool = False,
+        export_dir: Optional[str] = None,
+        model_registry: Optional[ModelRegistry] = None
     ):
         """
         Initialize the embedding model.
@@ -57,14 +64,34 @@ class CryptoEmbeddingModel:
             embedding_dim: Dimension of embeddings
             max_length: Maximum sequence length
             device: Device to run model on
+            backend: Inference backend ('eager', 'torchscript' or 'onnx')
+            quantize: Run with int8 dynamic quantization (CPU only)
+            export_dir: Directory for exported TorchScript/ONNX graphs
+            model_registry: Registry the tokenizer and transformer are loaded
+                through (the process-wide registry by default)
         """
+        if (backend != "eager" or quantize) and device != "cpu":
+            logger.warning(f"Backend '{backend}' (quantize={quantize}) runs on CPU only, ignoring device {device}")
+            device = "cpu"
+        
         self.device = device
         self.embedding_dim = embedding_dim
         self.max_length = max_length
         
-        # Initialize tokenizer and model
-        self.tokenizer = AutoTokenizer.from_pretrained(model_name)
-        self.base_model = AutoModel.from_pretrained(model_name).to(device)
+        # Initialize tokenizer and model, loaded and warmed once per process
+        registry = model_registry or get_model_registry()
+        self.tokenizer = registry.get(
+            f"tokenizer:{model_name}",
+            lambda: AutoTokenizer.from_pretrained(model_name)
+        )
+        self.base_model = registry.get(
+            f"encoder:{model_name}:{device}",
+            lambda: AutoModel.from_pretrained(model_name).to(device),
+            warmup=lambda model: model(**self.tokenizer(
+                WARMUP_TEXTS, padding=True, truncation=True,
+                max_length=max_length, return_tensors="pt"
+            ).to(device))
+        )
         
         # Initialize domain adaptation layer
         self.domain_adapter = nn.Sequential(
@@ -82,13 +109,34 @@ class CryptoEmbeddingModel:
             nn.Linear(128, 1)
         ).to(device)
         
+        # Build inference backend over the transformer and adapter heads
+        self.backend = create_backend(
+            backend,
+            base_model=self.base_model,
+            token_scorer=self.token_scorer,
+            domain_adapter=self.domain_adapter,
+            embedding_dim=embedding_dim,
+            quantize=quantize,
+            export_dir=export_dir
+        )
+        
         # Initialize crypto-specific vocabulary
         self.crypto_vocab = self._initialize_crypto_vocab()
+        self.crypto_weight_table = self._build_crypto_weight_table()
         
         # Tracking metrics
         self.embedding_cache = {}
         self.performance_metrics = defaultdict(list)
 
+    @classmethod
+    def from_config(cls, config_path: str = "config/default.yml", **kwargs) -> 'CryptoEmbeddingModel':
+        """Build with the inference backend, quantization and export directory of a YAML config; kwargs override."""
+        settings = load_inference_config(config_path)
+        kwargs.setdefault('backend', settings['backend'])
+        kwargs.setdefault('quantize', settings['quantize'])
+        kwargs.setdefault('export_dir', settings['export_dir'])
+        return cls(**kwargs)
+
     def _initialize_crypto_vocab(self) -> Dict[str, float]:
         """Initialize crypto-specific vocabulary with importance weights."""
         return {
@@ -155,53 +203,7 @@ class CryptoEmbeddingModel:
             if cache_key in self.embedding_cache:
                 return self.embedding_cache[cache_key]
             
-            # Tokenize text
-            inputs = self.tokenizer(
-                text,
-                max_length=self.max_length,
-                padding=True,
-                truncation=True,
-                return_tensors="pt"
-            ).to(self.device)
-            
-            # Get base embeddings
-            outputs = self.base_model(**inputs)
-            token_embeddings = outputs.last_hidden_state
-            
-            # Calculate token importance scores
-            token_scores = self.token_scorer(token_embeddings).squeeze(-1)
-            
-            # Apply crypto-specific token weighting
-            weighted_scores = self._apply_crypto_weights(
-                token_scores,
-                inputs['input_ids']
-            )
-            
-            # Calculate attention weights
-            attention_weights = torch.softmax(weighted_scores, dim=-1)
-            
-            # Get weighted embedding
-            weighted_embedding = torch.sum(
-                token_embeddings * attention_weights.unsqueeze(-1),
-                dim=1
-            )
-            
-            # Apply domain adaptation
-            final_embedding = self.domain_adapter(weighted_embedding)
-            
-            # Create embedding result
-            result = TextEmbedding(
-                text=text,
-                embedding=final_embedding.cpu().numpy(),
-                token_embeddings=token_embeddings.cpu().numpy(),
-                attention_weights=attention_weights.cpu().numpy(),
-                metadata={
-                    'timestamp': datetime.now().isoformat(),
-                    'model_version': '1.0',
-                    'text_length': len(text),
-                    'token_count': inputs['input_ids'].size(1)
-                }
-            )
+            result = self._embed_texts([text])[0]
             
             # Update cache
             self.embedding_cache[cache_key] = result
@@ -215,20 +217,50 @@ class CryptoEmbeddingModel:
             logger.error(f"Error generating embedding: {e}")
             raise
 
+    @torch.no_grad()
     def get_batch_embeddings(
         self,
         texts: List[str],
         batch_size: int = 32
     ) -> List[TextEmbedding]:
-        """Generate embeddings for a batch of texts."""
+        """
+        Generate embeddings for a batch of texts.
+        
+        Uncached texts are padded into batches of `batch_size` and run through
+        the backend in a single forward pass per batch.
+        
+        Args:
+            texts: Input texts to embed
+            batch_size: Maximum texts per forward pass
+            
+        Returns:
+            TextEmbedding per input text, in input order
+        """
         try:
-            results = []
-            for i in range(0, len(texts), batch_size):
-                batch = texts[i:i + batch_size]
+            results: List[Optional[TextEmbedding]] = [None] * len(texts)
+            
+            # Resolve cache hits and collapse repeated texts
+            pending: Dict[int, List[int]] = {}
+            for idx, text in enumerate(texts):
+                cache_key = hash(text)
+                cached = self.embedding_cache.get(cache_key)
+                if cached is not None:
+                    results[idx] = cached
+                else:
+                    pending.setdefault(cache_key, []).append(idx)
+            
+            keys = list(pending)
+            for i in range(0, len(keys), batch_size):
+                batch_keys = keys[i:i + batch_size]
+                batch_texts = [texts[pending[key][0]] for key in batch_keys]
                 
                 # Process batch
-                batch_results = [self.get_embedding(text) for text in batch]
-                results.extend(batch_results)
+                batch_results = self._embed_texts(batch_texts)
+                for key, result in zip(batch_keys, batch_results):
+                    self.embedding_cache[key] = result
+                    for idx in pending[key]:
+                        results[idx] = result
+                    self._update_metrics('embedding_count')
                 
                 # Update metrics
                 self._update_metrics('batch_count')
@@ -239,6 +271,68 @@ class CryptoEmbeddingModel:
             logger.error(f"Error processing batch embeddings: {e}")
             raise
 
+    def _embed_texts(self, texts: List[str]) -> List[TextEmbedding]:
+        """Embed texts in one padded forward pass (no caching)."""
+        # Tokenize texts
+        inputs = self.tokenizer(
+            texts,
+            max_length=self.max_length,
+            padding=True,
+            truncation=True,
+            return_tensors="pt"
+        ).to(self.device)
+        attention_mask = inputs['attention_mask']
+        
+        # Get base embeddings and token importance scores
+        token_embeddings, token_scores = self.backend.encode(
+            inputs['input_ids'],
+            attention_mask
+        )
+        
+        # Apply crypto-specific token weighting
+        weighted_scores = self._apply_crypto_weights(
+            token_scores,
+            inputs['input_ids']
+        )
+        
+        # Calculate attention weights, ignoring padding positions
+        weighted_scores = weighted_scores.masked_fill(
+            attention_mask.to(weighted_scores.device) == 0,
+            float('-inf')
+        )
+        attention_weights = torch.softmax(weighted_scores, dim=-1)
+        
+        # Get weighted embedding
+        weighted_embedding = torch.sum(
+            token_embeddings * attention_weights.unsqueeze(-1),
+            dim=1
+        )
+        
+        # Apply domain adaptation
+        final_embeddings = self.backend.adapt(weighted_embedding).cpu().numpy()
+        token_embeddings = token_embeddings.cpu().numpy()
+        attention_weights = attention_weights.cpu().numpy()
+        lengths = attention_mask.sum(dim=1).tolist()
+        
+        # Create embedding results, trimmed to each text's own tokens
+        timestamp = datetime.now().isoformat()
+        return [
+            TextEmbedding(
+                text=text,
+                embedding=final_embeddings[i:i + 1],
+                token_embeddings=token_embeddings[i:i + 1, :length],
+                attention_weights=attention_weights[i:i + 1, :length],
+                metadata={
+                    'timestamp': timestamp,
+                    'model_version': '1.0',
+                    'backend': self.backend.name,
+                    'text_length': len(text),
+                    'token_count': int(length)
+                }
+            )
+            for i, (text, length) in enumerate(zip(texts, lengths))
+        ]
+
     def _apply_crypto_weights(
         self,
         token_scores: torch.Tensor,
@@ -246,19 +340,11 @@ class CryptoEmbeddingModel:
     ) -> torch.Tensor:
         """Apply crypto-specific token weights to importance scores."""
         try:
-            # Get token strings
-            tokens = self.tokenizer.convert_ids_to_tokens(
-                input_ids.squeeze().tolist()
-            )
-            
-            # Calculate crypto weights
-            crypto_weights = torch.ones_like(token_scores)
-            for idx, token in enumerate(tokens):
-                if token in self.crypto_vocab:
-                    crypto_weights[0, idx] = self.crypto_vocab[token]
+            # Gather per-token weights from the vocabulary lookup table
+            crypto_weights = self.crypto_weight_table[input_ids.to(self.crypto_weight_table.device)]
             
             # Apply weights
-            weighted_scores = token_scores * crypto_weights
+            weighted_scores = token_scores * crypto_weights.to(token_scores.device)
             
             return weighted_scores
             
@@ -266,6 +352,16 @@ class CryptoEmbeddingModel:
             logger.error(f"Error applying crypto weights: {e}")
             raise
 
+    def _build_crypto_weight_table(self) -> torch.Tensor:
+        """Map every vocabulary id to its crypto importance weight (1.0 by default)."""
+        table = torch.ones(len(self.tokenizer))
+        vocab = self.tokenizer.get_vocab()
+        for token, weight in self.crypto_vocab.items():
+            token_id = vocab.get(token)
+            if token_id is not None:
+                table[token_id] = weight
+        return table.to(self.device)
+
     def calculate_similarity(
         self,
         embedding1: Union[TextEmbedding, np.ndarray],
@@ -338,7 +434,7 @@ if __name__ == "__main__":
     # Example usage
     def main():
         # Initialize model
-        model = CryptoEmbeddingModel()
+        model = CryptoEmbeddingModel.from_config()
         
         # Example texts
         texts = [
@@ -0,0 +1,412 @@
+"""
+Kinetic Anomaly Detection Engine System (KADES)
+Inference Backends Module
+
+This module implements pluggable CPU inference backends for the crypto embedding
+model and the transformer sentiment pipeline. The base transformer plus the
+token importance head and the domain adapter can run eagerly, as TorchScript
+graphs or through ONNX Runtime, optionally with int8 dynamic quantization.
+The backend is selected by the `models.sentiment.inference` config section.
+
+Author: KADES Team
+License: Proprietary
+"""
+
+import torch
+import torch.nn as nn
+from abc import ABC, abstractmethod
+from typing import Dict, Optional, Tuple
+import numpy as np
+import inspect
+import logging
+import os
+import tempfile
+import yaml
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+SUPPORTED_BACKENDS = ['eager', 'torchscript', 'onnx']
+
+class EmbeddingEncoder(nn.Module):
+    """Base transformer plus token importance head, exported as one graph"""
+
+    def __init__(self, base_model: nn.Module, token_scorer: nn.Module):
+        super().__init__()
+        self.base_model = base_model
+        self.token_scorer = token_scorer
+
+    def forward(
+        self,
+        input_ids: torch.Tensor,
+        attention_mask: torch.Tensor
+    ) -> Tuple[torch.Tensor, torch.Tensor]:
+        token_embeddings = self.base_model(
+            input_ids=input_ids,
+            attention_mask=attention_mask,
+            return_dict=False
+        )[0]
+        token_scores = self.token_scorer(token_embeddings).squeeze(-1)
+        return token_embeddings, token_scores
+
+class InferenceBackend(ABC):
+    """
+    Interface shared by all embedding inference backends.
+    `encode` runs the transformer and token scorer, `adapt` runs the
+    domain adaptation head on pooled embeddings.
+    """
+
+    name = 'base'
+
+    @abstractmethod
+    def encode(
+        self,
+        input_ids: torch.Tensor,
+        attention_mask: torch.Tensor
+    ) -> Tuple[torch.Tensor, torch.Tensor]:
+        """Token embeddings and token importance scores."""
+
+    @abstractmethod
+    def adapt(self, pooled: torch.Tensor) -> torch.Tensor:
+        """Domain-adapted pooled embeddings."""
+
+    def describe(self) -> Dict:
+        """Describe the backend configuration."""
+        return {'backend': self.name, 'quantized': getattr(self, 'quantize', False)}
+
+class EagerBackend(InferenceBackend):
+    """Eager PyTorch execution, optionally with int8 dynamic quantization"""
+
+    name = 'eager'
+
+    def __init__(
+        self,
+        encoder: EmbeddingEncoder,
+        domain_adapter: nn.Module,
+        quantize: bool = False
+    ):
+        self.quantize = quantize
+        self.encoder = encoder.eval()
+        self.domain_adapter = domain_adapter.eval()
+
+        if quantize:
+            self.encoder = quantize_linear_layers(self.encoder)
+            self.domain_adapter = quantize_linear_layers(self.domain_adapter)
+
+    @torch.no_grad()
+    def encode(
+        self,
+        input_ids: torch.Tensor,
+        attention_mask: torch.Tensor
+    ) -> Tuple[torch.Tensor, torch.Tensor]:
+        return self.encoder(input_ids, attention_mask)
+
+    @torch.no_grad()
+    def adapt(self, pooled: torch.Tensor) -> torch.Tensor:
+        return self.domain_adapter(pooled)
+
+class TorchScriptBackend(InferenceBackend):
+    """Traced TorchScript graphs for CPU inference"""
+
+    name = 'torchscript'
+
+    def __init__(
+        self,
+        encoder: EmbeddingEncoder,
+        domain_adapter: nn.Module,
+        embedding_dim: int,
+        quantize: bool = False,
+        export_dir: Optional[str] = None
+    ):
+        self.quantize = quantize
+        encoder = encoder.eval().cpu()
+        domain_adapter = domain_adapter.eval().cpu()
+
+        if quantize:
+            encoder = quantize_linear_layers(encoder)
+            domain_adapter = quantize_linear_layers(domain_adapter)
+
+        example_ids, example_mask = _example_inputs()
+        with torch.no_grad():
+            self.encoder = torch.jit.trace(encoder, (example_ids, example_mask), strict=False)
+            self.domain_adapter = torch.jit.trace(
+                domain_adapter,
+                torch.zeros(2, embedding_dim)
+            )
+        self.encoder = torch.jit.freeze(self.encoder)
+        self.domain_adapter = torch.jit.freeze(self.domain_adapter)
+
+        if export_dir:
+            os.makedirs(export_dir, exist_ok=True)
+            suffix = '_int8' if quantize else ''
+            torch.jit.save(self.encoder, os.path.join(export_dir, f'encoder{suffix}.pt'))
+            torch.jit.save(self.domain_adapter, os.path.join(export_dir, f'domain_adapter{suffix}.pt'))
+
+    @torch.no_grad()
+    def encode(
+        self,
+        input_ids: torch.Tensor,
+        attention_mask: torch.Tensor
+    ) -> Tuple[torch.Tensor, torch.Tensor]:
+        return self.encoder(input_ids.cpu(), attention_mask.cpu())
+
+    @torch.no_grad()
+    def adapt(self, pooled: torch.Tensor) -> torch.Tensor:
+        return self.domain_adapter(pooled.cpu())
+
+class ONNXBackend(InferenceBackend):
+    """ONNX Runtime execution of the exported encoder and adapter graphs"""
+
+    name = 'onnx'
+
+    def __init__(
+        self,
+        encoder: EmbeddingEncoder,
+        domain_adapter: nn.Module,
+        embedding_dim: int,
+        quantize: bool = False,
+        export_dir: Optional[str] = None,
+        num_threads: Optional[int] = None
+    ):
+        try:
+            import onnxruntime as ort
+        except ImportError as e:
+            raise ImportError(
+                "The 'onnx' inference backend requires onnxruntime; "
+                "install it or select the 'eager' or 'torchscript' backend"
+            ) from e
+
+        self.quantize = quantize
+        self.export_dir = export_dir or tempfile.mkdtemp(prefix='kades_onnx_')
+        os.makedirs(self.export_dir, exist_ok=True)
+
+        encoder_path = os.path.join(self.export_dir, 'encoder.onnx')
+        adapter_path = os.path.join(self.export_dir, 'domain_adapter.onnx')
+        self._export(encoder.eval().cpu(), domain_adapter.eval().cpu(),
+                     embedding_dim, encoder_path, adapter_path)
+
+        if quantize:
+            encoder_path = quantize_onnx_model(encoder_path)
+            adapter_path = quantize_onnx_model(adapter_path)
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+
+        providers = ['CPUExecutionProvider']
+        self.encoder_session = ort.InferenceSession(encoder_path, options, providers=providers)
+        self.adapter_session = ort.InferenceSession(adapter_path, options, providers=providers)
+
+    def encode(
+        self,
+        input_ids: torch.Tensor,
+        attention_mask: torch.Tensor
+    ) -> Tuple[torch.Tensor, torch.Tensor]:
+        token_embeddings, token_scores = self.encoder_session.run(
+            None,
+            {
+                'input_ids': input_ids.cpu().numpy().astype(np.int64),
+                'attention_mask': attention_mask.cpu().numpy().astype(np.int64)
+            }
+        )
+        return torch.from_numpy(token_embeddings), torch.from_numpy(token_scores)
+
+    def adapt(self, pooled: torch.Tensor) -> torch.Tensor:
+        (adapted,) = self.adapter_session.run(
+            None,
+            {'pooled': pooled.detach().cpu().numpy().astype(np.float32)}
+        )
+        return torch.from_numpy(adapted)
+
+    @staticmethod
+    def _export(
+        encoder: EmbeddingEncoder,
+        domain_adapter: nn.Module,
+        embedding_dim: int,
+        encoder_path: str,
+        adapter_path: str
+    ) -> None:
+        """Export encoder and adapter graphs with dynamic batch/sequence axes."""
+        example_ids, example_mask = _example_inputs()
+        with torch.no_grad():
+            torch.onnx.export(
+                encoder,
+                (example_ids, example_mask),
+                encoder_path,
+                input_names=['input_ids', 'attention_mask'],
+                output_names=['token_embeddings', 'token_scores'],
+                dynamic_axes={
+                    'input_ids': {0: 'batch', 1: 'sequence'},
+                    'attention_mask': {0: 'batch', 1: 'sequence'},
+                    'token_embeddings': {0: 'batch', 1: 'sequence'},
+                    'token_scores': {0: 'batch', 1: 'sequence'}
+                },
+                opset_version=14,
+                **torchscript_exporter()
+            )
+            torch.onnx.export(
+                domain_adapter,
+                (torch.zeros(2, embedding_dim),),
+                adapter_path,
+                input_names=['pooled'],
+                output_names=['embedding'],
+                dynamic_axes={'pooled': {0: 'batch'}, 'embedding': {0: 'batch'}},
+                opset_version=14,
+                **torchscript_exporter()
+            )
+
+def quantize_linear_layers(
+    module: nn.Module,
+    layer_types: Tuple[type, ...] = (nn.Linear,)
+) -> nn.Module:
+    """Apply int8 dynamic quantization to the Linear (or given) layers of a CPU module."""
+    return torch.quantization.quantize_dynamic(
+        module.cpu(),
+        set(layer_types),
+        dtype=torch.qint8
+    )
+
+def quantize_onnx_model(model_path: str) -> str:
+    """Apply int8 dynamic weight quantization to an exported ONNX graph."""
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    quantized_path = model_path.replace('.onnx', '_int8.onnx')
+    quantize_dynamic(model_path, quantized_path, weight_type=QuantType.QInt8)
+    return quantized_path
+
+def torchscript_exporter() -> Dict:
+    """
+    Select the TorchScript-based ONNX exporter. Newer torch releases default
+    to the dynamo exporter, which needs onnxscript and emits a different graph.
+    """
+    if 'dynamo' in inspect.signature(torch.onnx.export).parameters:
+        return {'dynamo': False}
+    return {}
+
+def create_backend(
+    name: str,
+    base_model: nn.Module,
+    token_scorer: nn.Module,
+    domain_adapter: nn.Module,
+    embedding_dim: int,
+    quantize: bool = False,
+    export_dir: Optional[str] = None,
+    num_threads: Optional[int] = None
+) -> InferenceBackend:
+    """
+    Build an inference backend for the embedding model.
+
+    Args:
+        name: One of 'eager', 'torchscript' or 'onnx'
+        base_model: Transformer encoder
+        token_scorer: Token importance head
+        domain_adapter: Domain adaptation head
+        embedding_dim: Hidden size of the encoder
+        quantize: Apply int8 dynamic quantization (CPU only)
+        export_dir: Directory for exported graphs
+        num_threads: Intra-op threads for ONNX Runtime
+
+    Returns:
+        Configured InferenceBackend
+    """
+    if name not in SUPPORTED_BACKENDS:
+        raise ValueError(f"Unknown inference backend '{name}', expected one of {SUPPORTED_BACKENDS}")
+
+    encoder = EmbeddingEncoder(base_model, token_scorer)
+
+    if name == 'eager':
+        return EagerBackend(encoder, domain_adapter, quantize=quantize)
+    if name == 'torchscript':
+        return TorchScriptBackend(encoder, domain_adapter, embedding_dim,
+                                  quantize=quantize, export_dir=export_dir)
+    return ONNXBackend(encoder, domain_adapter, embedding_dim, quantize=quantize,
+                       export_dir=export_dir, num_threads=num_threads)
+
+def load_inference_config(config_path: str = "config/default.yml") -> Dict:
+    """
+    Inference settings from the `models.sentiment.inference` section of a YAML config.
+
+    Returns:
+        Dict with backend, quantize and export_dir; missing keys (or an
+        unreadable file) fall back to eager fp32 without export
+
+    Raises:
+        ValueError: If the configured backend is not supported
+    """
+    config = {}
+    try:
+        with open(config_path, 'r') as f:
+            models = (yaml.safe_load(f) or {}).get('models') or {}
+            config = (models.get('sentiment') or {}).get('inference') or {}
+    except Exception as e:
+        logger.error(f"Error loading inference config: {e}")
+
+    backend = config.get('backend', 'eager')
+    if backend not in SUPPORTED_BACKENDS:
+        raise ValueError(f"Unknown inference backend '{backend}', expected one of {SUPPORTED_BACKENDS}")
+    return {
+        'backend': backend,
+        'quantize': bool(config.get('quantize', False)),
+        'export_dir': config.get('export_dir')
+    }
+
+def build_sentiment_pipeline(
+    model_name: str,
+    backend: str = 'eager',
+    quantize: bool = False
+):
+    """
+    Build the transformer sentiment-analysis pipeline on the selected backend.
+
+    The eager and torchscript backends run the Hugging Face model in PyTorch
+    (int8 dynamically quantized when requested); the onnx backend loads the
+    model through optimum's ONNX Runtime integration.
+    """
+    from transformers import AutoTokenizer, pipeline
+
+    if backend not in SUPPORTED_BACKENDS:
+        raise ValueError(f"Unknown inference backend '{backend}', expected one of {SUPPORTED_BACKENDS}")
+
+    if backend == 'onnx':
+        try:
+            from optimum.onnxruntime import ORTModelForSequenceClassification
+        except ImportError as e:
+            raise ImportError(
+                "The 'onnx' sentiment backend requires optimum[onnxruntime]"
+            ) from e
+
+        model = ORTModelForSequenceClassification.from_pretrained(model_name, export=True)
+        if quantize:
+            model = _quantize_ort_model(model)
+        tokenizer = AutoTokenizer.from_pretrained(model_name)
+        return pipeline("sentiment-analysis", model=model, tokenizer=tokenizer)
+
+    sentiment_pipeline = pipeline("sentiment-analysis", model=model_name, device=-1)
+    sentiment_pipeline.model.eval()
+    if quantize:
+        sentiment_pipeline.model = quantize_linear_layers(sentiment_pipeline.model)
+    return sentiment_pipeline
+
+def _quantize_ort_model(model):
+    """Quantize an optimum ONNX Runtime model with dynamic int8 weights."""
+    from optimum.onnxruntime import ORTQuantizer
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig
+
+    output_dir = tempfile.mkdtemp(prefix='kades_ort_int8_')
+    quantizer = ORTQuantizer.from_pretrained(model)
+    quantizer.quantize(
+        save_dir=output_dir,
+        quantization_config=AutoQuantizationConfig.avx2(is_static=False, per_channel=False)
+    )
+    return type(model).from_pretrained(output_dir)
+
+def _example_inputs(batch_size: int = 2, seq_length: int = 16) -> Tuple[torch.Tensor, torch.Tensor]:
+    """Example inputs used for tracing and export."""
+    input_ids = torch.ones(batch_size, seq_length, dtype=torch.long)
+    attention_mask = torch.ones(batch_size, seq_length, dtype=torch.long)
+    return input_ids, attention_mask
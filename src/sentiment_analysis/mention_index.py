@@ -0,0 +1,367 @@
+"""
+Kinetic Anomaly Detection Engine System (KADES)
+Token Mention Index Module
+
+This module implements a time-bucketed index of token mentions. Each token keeps
+a ring of per-minute aggregates (mention count, engagement, signed influence and
+a HyperLogLog of authors) so trending queries cost O(buckets) instead of
+O(mentions), with an incrementally maintained top-K heap for the default window.
+
+Author: KADES Team
+License: Proprietary
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+import hashlib
+import heapq
+import logging
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+class HyperLogLog:
+    """
+    HyperLogLog cardinality sketch backed by a NumPy register array.
+    Sketches with the same precision merge with an element-wise max.
+    """
+
+    def __init__(self, precision: int = 10, registers: Optional[np.ndarray] = None):
+        """
+        Initialize the sketch.
+
+        Args:
+            precision: Number of index bits (2**precision registers)
+            registers: Existing register array to wrap
+        """
+        self.precision = precision
+        self.num_registers = 1 << precision
+        self.registers = (
+            registers if registers is not None
+            else np.zeros(self.num_registers, dtype=np.uint8)
+        )
+
+    def add(self, value: str) -> None:
+        """Add a value to the sketch."""
+        digest = hashlib.blake2b(value.encode('utf-8'), digest_size=8).digest()
+        hashed = int.from_bytes(digest, 'big')
+        index = hashed >> (64 - self.precision)
+        remainder = hashed & ((1 << (64 - self.precision)) - 1)
+        rank = (64 - self.precision) - remainder.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def merge(self, other: 'HyperLogLog') -> None:
+        """Merge another sketch into this one."""
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    def count(self) -> int:
+        """Estimate the number of distinct values added."""
+        return self.estimate(self.registers)
+
+    @staticmethod
+    def estimate(registers: np.ndarray) -> int:
+        """Estimate cardinality from a register array."""
+        m = registers.shape[-1]
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / np.sum(np.power(2.0, -registers.astype(np.float64)))
+
+        # Small range correction via linear counting
+        zeros = int(np.count_nonzero(registers == 0))
+        if raw <= 2.5 * m and zeros > 0:
+            return int(round(m * np.log(m / zeros)))
+        return int(round(raw))
+
+@dataclass
+class TokenWindowStats:
+    """Aggregated mention statistics for a token over a time window"""
+    token: str
+    mention_count: int
+    unique_authors: int
+    engagement_score: float
+    sentiment_score: float
+
+    @property
+    def trending_score(self) -> float:
+        """Trending score as used by the NLP processor."""
+        return (
+            self.mention_count * 0.4 +
+            self.engagement_score * 0.4 +
+            abs(self.sentiment_score) * 0.2
+        )
+
+class _TokenRing:
+    """Ring of per-minute aggregate buckets for a single token"""
+
+    def __init__(self, num_buckets: int, precision: int):
+        self.num_buckets = num_buckets
+        self.precision = precision
+        self.minutes = np.full(num_buckets, -1, dtype=np.int64)
+        self.counts = np.zeros(num_buckets, dtype=np.int64)
+        self.engagement = np.zeros(num_buckets, dtype=np.float64)
+        self.influence = np.zeros(num_buckets, dtype=np.float64)
+        self.magnitude = np.zeros(num_buckets, dtype=np.float64)  # Sum of |influence|
+        # Author sketches are allocated only for minutes that saw mentions
+        self.authors: Dict[int, HyperLogLog] = {}
+        self.last_minute = -1
+
+    def add(self, minute: int, author: str, engagement: float, influence: float) -> None:
+        slot = minute % self.num_buckets
+        if self.minutes[slot] != minute:
+            if minute < self.minutes[slot]:
+                # Older than the ring retains
+                return
+            self.minutes[slot] = minute
+            self.counts[slot] = 0
+            self.engagement[slot] = 0.0
+            self.influence[slot] = 0.0
+            self.magnitude[slot] = 0.0
+            self.authors.pop(slot, None)
+
+        self.counts[slot] += 1
+        self.engagement[slot] += engagement
+        self.influence[slot] += influence
+        self.magnitude[slot] += abs(influence)
+        sketch = self.authors.get(slot)
+        if sketch is None:
+            sketch = self.authors[slot] = HyperLogLog(self.precision)
+        sketch.add(author)
+        self.last_minute = max(self.last_minute, minute)
+
+    def _slots(self, end_minute: int, num_minutes: int) -> np.ndarray:
+        """Buckets for minutes in (end_minute - num_minutes, end_minute]."""
+        num_minutes = min(num_minutes, self.num_buckets)
+        return np.flatnonzero(
+            (self.minutes > end_minute - num_minutes) &
+            (self.minutes <= end_minute)
+        )
+
+    def window(self, end_minute: int, num_minutes: int) -> Tuple[int, float, float, int]:
+        """Aggregate buckets for minutes in (end_minute - num_minutes, end_minute]."""
+        slots = self._slots(end_minute, num_minutes)
+        if not len(slots):
+            return 0, 0.0, 0.0, 0
+
+        registers = np.zeros(1 << self.precision, dtype=np.uint8)
+        for slot in slots:
+            sketch = self.authors.get(int(slot))
+            if sketch is not None:
+                np.maximum(registers, sketch.registers, out=registers)
+
+        return (
+            int(self.counts[slots].sum()),
+            float(self.engagement[slots].sum()),
+            float(self.influence[slots].sum()),
+            HyperLogLog.estimate(registers)
+        )
+
+    def score_bound(self, end_minute: int, num_minutes: int) -> float:
+        """
+        Upper bound on the trending score of any num_minutes window ending at
+        or after end_minute, for end_minute at or after the latest bucket.
+        Such a window holds a subset of the buckets counted here, counts and
+        engagement are non-negative, and the absolute net influence of a
+        subset is at most its summed magnitude.
+        """
+        slots = self._slots(end_minute, num_minutes)
+        return float(
+            self.counts[slots].sum() * 0.4 +
+            self.engagement[slots].sum() * 0.4 +
+            self.magnitude[slots].sum() * 0.2
+        )
+
+class TokenMentionIndex:
+    """
+    Time-bucketed token mention index.
+    Keeps one ring of per-minute buckets per token covering `retention`
+    seconds and a lazily refreshed top-K heap for the default window.
+    """
+
+    SENTIMENT_SIGN = {
+        'very_bullish': 1,
+        'bullish': 1,
+        'very_bearish': -1,
+        'bearish': -1
+    }
+
+    def __init__(
+        self,
+        retention: int = 24 * 3600,
+        default_window: int = 3600,
+        hll_precision: int = 10
+    ):
+        """
+        Initialize the mention index.
+
+        Args:
+            retention: Longest supported query window in seconds
+            default_window: Window tracked by the incremental top-K heap
+            hll_precision: HyperLogLog precision for unique author counts
+        """
+        self.num_buckets = max(1, -(-retention // 60))
+        self.default_window = default_window
+        self.hll_precision = hll_precision
+
+        self._rings: Dict[str, _TokenRing] = {}
+
+        # Lazy max-heap of (-score bound, token, version) for the default window
+        self._heap: List[Tuple[float, str, int]] = []
+        self._versions: Dict[str, int] = {}
+        self._latest_minute = -1
+
+    def add_mention(
+        self,
+        token: str,
+        timestamp: datetime,
+        author: str,
+        engagement: Dict[str, int],
+        sentiment_class: str,
+        influence_score: float
+    ) -> None:
+        """
+        Record a single token mention. Negative engagement and influence are
+        clamped to zero, which the top-K heap bounds rely on.
+        """
+        try:
+            minute = int(timestamp.timestamp() // 60)
+            engagement_score = max(0, (
+                engagement.get('likes', 0) +
+                engagement.get('retweets', 0) * 2 +
+                engagement.get('replies', 0) * 3
+            ))
+            signed_influence = max(0.0, influence_score) * self.SENTIMENT_SIGN.get(sentiment_class, 0)
+
+            ring = self._rings.get(token)
+            if ring is None:
+                ring = self._rings[token] = _TokenRing(self.num_buckets, self.hll_precision)
+            ring.add(minute, author, engagement_score, signed_influence)
+            self._latest_minute = max(self._latest_minute, minute)
+
+            # Refresh this token's heap entry for the default window
+            bound = ring.score_bound(ring.last_minute, self._window_minutes(self.default_window))
+            version = self._versions.get(token, 0) + 1
+            self._versions[token] = version
+            heapq.heappush(self._heap, (-bound, token, version))
+
+            if len(self._heap) > 4 * len(self._rings) + 64:
+                self._compact_heap()
+
+        except Exception as e:
+            logger.error(f"Error indexing token mention: {e}")
+
+    def get_window_stats(
+        self,
+        token: str,
+        timeframe: int,
+        now: Optional[datetime] = None
+    ) -> Optional[TokenWindowStats]:
+        """Get aggregated statistics for a token over the last `timeframe` seconds."""
+        ring = self._rings.get(token)
+        if ring is None:
+            return None
+
+        stats = self._window_stats(token, ring, self._current_minute(now), timeframe)
+        return stats if stats.mention_count > 0 else None
+
+    def top_k(
+        self,
+        k: int = 10,
+        timeframe: Optional[int] = None,
+        now: Optional[datetime] = None
+    ) -> List[TokenWindowStats]:
+        """
+        Get the top-K trending tokens over a window.
+
+        For the default window, candidates are pulled from the incremental
+        heap and re-scored exactly until the remaining score bounds cannot
+        beat the current K-th result. Re-scored tokens go back with a bound
+        tightened to the latest indexed minute, and tokens with nothing left
+        in that window leave the heap until their next mention, so tokens
+        that were hot long ago are not re-scored on every query. The bounds
+        only hold for windows ending
+        at or after the latest indexed mention, so earlier windows, like
+        other window lengths, scan every token ring, which is
+        O(tokens x buckets) and independent of mention volume.
+        """
+        timeframe = timeframe or self.default_window
+        end_minute = self._current_minute(now)
+
+        if timeframe != self.default_window or end_minute < self._latest_minute:
+            results = [
+                self._window_stats(token, ring, end_minute, timeframe)
+                for token, ring in self._rings.items()
+            ]
+            results = [r for r in results if r.mention_count > 0]
+            return heapq.nlargest(k, results, key=lambda r: r.trending_score)
+
+        window_minutes = self._window_minutes(timeframe)
+        results: List[TokenWindowStats] = []
+        retained = []
+        while self._heap:
+            neg_score, token, version = self._heap[0]
+            if len(results) >= k and -neg_score <= results[-1].trending_score:
+                break
+            heapq.heappop(self._heap)
+            if version != self._versions.get(token):
+                # Superseded by a newer entry for the same token
+                continue
+
+            ring = self._rings[token]
+            bound = ring.score_bound(self._latest_minute, window_minutes)
+            if bound > 0:
+                retained.append((-bound, token, version))
+
+            stats = self._window_stats(token, ring, end_minute, timeframe)
+            if stats.mention_count > 0:
+                results.append(stats)
+                results.sort(key=lambda r: r.trending_score, reverse=True)
+                del results[k:]
+
+        for entry in retained:
+            heapq.heappush(self._heap, entry)
+
+        return results
+
+    @property
+    def tokens(self) -> List[str]:
+        """Tokens currently tracked by the index."""
+        return list(self._rings)
+
+    def _window_stats(
+        self,
+        token: str,
+        ring: _TokenRing,
+        end_minute: int,
+        timeframe: int
+    ) -> TokenWindowStats:
+        """Aggregate a token ring over a window ending at end_minute."""
+        count, engagement, influence, authors = ring.window(end_minute, self._window_minutes(timeframe))
+        return TokenWindowStats(
+            token=token,
+            mention_count=count,
+            unique_authors=min(authors, count),
+            engagement_score=engagement,
+            sentiment_score=influence
+        )
+
+    def _compact_heap(self) -> None:
+        """Drop superseded heap entries."""
+        self._heap = [
+            entry for entry in self._heap
+            if entry[2] == self._versions.get(entry[1])
+        ]
+        heapq.heapify(self._heap)
+
+    @staticmethod
+    def _window_minutes(timeframe: int) -> int:
+        return max(1, -(-timeframe // 60))
+
+    @staticmethod
+    def _current_minute(now: Optional[datetime]) -> int:
+        return int((now or datetime.now()).timestamp() // 60)
@@ -0,0 +1,251 @@
+"""
+Kinetic Anomaly Detection Engine System (KADES)
+Model Registry Module
+
+This module implements a process-wide registry for the NLP models (the
+transformer sentiment pipeline, the embedding encoder, spaCy and VADER).
+Each model is loaded once per key, warmed up with a dummy batch and its load
+time and memory recorded. A parent process can move the torch weights into
+shared memory before starting workers: forked workers inherit the loaded
+registry, and spawned workers receive the models through `export()` and
+`install_models`, where torch pickles shared tensors as handles to the
+parent's memory instead of copying them.
+
+Author: KADES Team
+License: Proprietary
+"""
+
+import logging
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass
+from itertools import chain
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import torch
+import torch.multiprocessing  # registers the shared-memory tensor reductions used when pickling to workers
+import torch.nn as nn
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Dummy batch run through each model at load so the first real request does
+# not pay for lazy initialization (allocator growth, kernel selection, caches)
+WARMUP_TEXTS = [
+    "Bullish on $SOL! 🚀 LFG, this memecoin is pumping",
+    "Liquidity pulled from the pool, devs dumped, looks like a rug",
+]
+
+@dataclass
+class ModelStats:
+    """Load statistics for one registered model"""
+    key: str
+    load_seconds: float = 0.0
+    warmup_seconds: float = 0.0
+    resident_bytes: int = 0  # growth of process RSS while loading and warming
+    tensor_bytes: int = 0    # torch parameter and buffer storage
+    shared: bool = False     # torch storage lives in shared memory
+    source_pid: int = 0      # process that loaded the weights
+
+def rss_bytes() -> int:
+    """Resident set size of this process, 0 where /proc is unavailable."""
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return 0
+
+def torch_modules(model: Any) -> List[nn.Module]:
+    """The model itself if it is an nn.Module, else its nn.Module attributes (e.g. a pipeline's .model)."""
+    if isinstance(model, nn.Module):
+        return [model]
+    return [value for value in getattr(model, '__dict__', {}).values() if isinstance(value, nn.Module)]
+
+def tensor_bytes(modules: Iterable[nn.Module]) -> int:
+    """Bytes of distinct parameter and buffer storages."""
+    seen = set()
+    total = 0
+    for module in modules:
+        for tensor in chain(module.parameters(), module.buffers()):
+            storage = tensor.untyped_storage()
+            if storage.data_ptr() not in seen:
+                seen.add(storage.data_ptr())
+                total += storage.nbytes()
+    return total
+
+class ModelRegistry:
+    """
+    Load-once cache of models keyed by configuration.
+
+    Keys name the model and everything that changes its weights, e.g.
+    'sentiment:<model>:<backend>:<precision>'. Models are shared by every
+    caller in the process, so they must be treated as read-only.
+    """
+
+    def __init__(self, share_memory: bool = False):
+        """
+        Initialize the registry.
+
+        Args:
+            share_memory: Move torch weights into shared memory as models
+                load (otherwise call share() before starting workers)
+        """
+        self.share_memory = share_memory
+        self.models: Dict[str, Any] = {}
+        self.stats: Dict[str, ModelStats] = {}
+        self._loaders: Dict[str, Tuple[Callable[[], Any], Optional[Callable[[Any], Any]]]] = {}
+        self._lock = threading.RLock()
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.models
+
+    def __len__(self) -> int:
+        return len(self.models)
+
+    def register(
+        self,
+        key: str,
+        loader: Callable[[], Any],
+        warmup: Optional[Callable[[Any], Any]] = None
+    ) -> None:
+        """Register a loader (and warmup) to run on first get() or preload()."""
+        self._loaders[key] = (loader, warmup)
+
+    def get(
+        self,
+        key: str,
+        loader: Optional[Callable[[], Any]] = None,
+        warmup: Optional[Callable[[Any], Any]] = None
+    ) -> Any:
+        """
+        Return the model under `key`, loading it on first use.
+
+        Args:
+            key: Model key
+            loader: Builds the model; registered under `key` if not yet known
+            warmup: Called once with the loaded model
+
+        Raises:
+            KeyError: If the key is neither loaded nor registered
+        """
+        model = self.models.get(key)
+        if model is not None:
+            return model
+
+        with self._lock:
+            if key in self.models:
+                return self.models[key]
+            if loader is not None:
+                self._loaders.setdefault(key, (loader, warmup))
+            if key not in self._loaders:
+                raise KeyError(f"No model registered under '{key}'")
+            self.models[key] = self._load(key, *self._loaders[key])
+            return self.models[key]
+
+    def preload(self, keys: Optional[Iterable[str]] = None) -> Dict[str, ModelStats]:
+        """Load and warm every registered model (or `keys`) now, e.g. at startup."""
+        for key in (list(self._loaders) if keys is None else keys):
+            self.get(key)
+        return dict(self.stats)
+
+    def share(self) -> None:
+        """Move the weights of every loaded model into shared memory."""
+        with self._lock:
+            for key, model in self.models.items():
+                modules = torch_modules(model)
+                for module in modules:
+                    module.share_memory()
+                self.stats[key].shared = bool(modules)
+
+    def export(self) -> Dict[str, Any]:
+        """
+        Loaded models and their stats, for passing to spawned workers.
+
+        Weights are moved to shared memory first, so pickling the result
+        through multiprocessing sends storage handles rather than copies.
+        Models without torch weights (spaCy, VADER) are pickled by value.
+        """
+        self.share()
+        return {'models': dict(self.models), 'stats': dict(self.stats)}
+
+    def install(self, exported: Dict[str, Any]) -> None:
+        """Adopt models exported by a parent process."""
+        with self._lock:
+            self.models.update(exported['models'])
+            self.stats.update(exported['stats'])
+
+    def report(self) -> List[Dict]:
+        """Per-model load time and memory, in load order."""
+        return [asdict(stats) for stats in self.stats.values()]
+
+    def _load(
+        self,
+        key: str,
+        loader: Callable[[], Any],
+        warmup: Optional[Callable[[Any], Any]]
+    ) -> Any:
+        rss_before = rss_bytes()
+        started = time.perf_counter()
+        try:
+            model = loader()
+        except Exception as e:
+            logger.error(f"Error loading model '{key}': {e}")
+            raise
+        loaded = time.perf_counter()
+
+        if warmup is not None:
+            with torch.no_grad():
+                warmup(model)
+        warmed = time.perf_counter()
+
+        modules = torch_modules(model)
+        if self.share_memory:
+            for module in modules:
+                module.share_memory()
+
+        stats = ModelStats(
+            key=key,
+            load_seconds=loaded - started,
+            warmup_seconds=warmed - loaded,
+            resident_bytes=max(0, rss_bytes() - rss_before),
+            tensor_bytes=tensor_bytes(modules),
+            shared=self.share_memory and bool(modules),
+            source_pid=os.getpid()
+        )
+        self.stats[key] = stats
+        logger.info(
+            f"Loaded model '{key}' in {stats.load_seconds:.2f}s (warmup {stats.warmup_seconds:.2f}s, "
+            f"{stats.resident_bytes / 2**20:.1f} MiB resident, {stats.tensor_bytes / 2**20:.1f} MiB weights)"
+        )
+        return model
+
+_registry: Optional[ModelRegistry] = None
+_registry_lock = threading.Lock()
+
+def get_model_registry() -> ModelRegistry:
+    """The process-wide registry used by the NLP components by default."""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = ModelRegistry()
+    return _registry
+
+def install_models(exported: Dict[str, Any]) -> None:
+    """
+    Worker initializer adopting the parent's models.
+
+    Example:
+        registry = get_model_registry()
+        SocialMediaNLPProcessor.from_config()  # loads and warms the models in the parent
+        context = torch.multiprocessing.get_context('spawn')
+        pool = ProcessPoolExecutor(8, mp_context=context,
+                                   initializer=install_models,
+                                   initargs=(registry.export(),))
+    """
+    get_model_registry().install(exported)
@@ -10,22 +10,26 @@ License: Proprietary
 """
 
 import asyncio
-from dataclasses import dataclass
+from concurrent.futures import Executor
+from dataclasses import dataclass, replace
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Set, Tuple
+from typing import Dict, List, Optional, Tuple
 import numpy as np
 from collections import defaultdict, deque
 import logging
-import json
 import re
 from enum import Enum
 
 # NLP-specific imports
-from transformers import pipeline
 from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
 import spacy
 from textblob import TextBlob
 
+from .deduplicator import DuplicateMatch, PostDeduplicator
+from .inference_backends import build_sentiment_pipeline, load_inference_config
+from .mention_index import TokenMentionIndex
+from .model_registry import WARMUP_TEXTS, ModelRegistry, get_model_registry
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -59,6 +63,23 @@ class SocialMediaPost:
     reply_to: Optional[str]
     raw_data: Dict
 
+    @classmethod
+    def from_scraped(cls, post) -> 'SocialMediaPost':
+        """Build from a scraper SocialPost."""
+        return cls(
+            platform=post.platform,
+            content=post.content,
+            timestamp=post.timestamp,
+            author=post.author,
+            engagement=post.engagement,
+            mentions=post.mentions,
+            hashtags=post.hashtags,
+            urls=post.urls,
+            is_reply=bool(post.metadata.get('is_reply', False)),
+            reply_to=post.metadata.get('reply_to'),
+            raw_data=post.raw_data
+        )
+
 @dataclass
 class SentimentAnalysis:
     """Results of sentiment analysis on a post"""
@@ -72,6 +93,7 @@ class SentimentAnalysis:
     shill_probability: float
     influence_score: float
     timestamp: datetime
+    duplicate_cluster_size: int = 1
 
 class SocialMediaNLPProcessor:
     """
@@ -84,7 +106,12 @@ class SocialMediaNLPProcessor:
         language_model: str = "finiteautomata/bertweet-base-sentiment-analysis",
         min_confidence: float = 0.75,
         cache_size: int = 10000,
-        update_interval: int = 60
+        update_interval: int = 60,
+        dedup_window: int = 3600,
+        dedup_threshold: float = 0.8,
+        inference_backend: str = "eager",
+        quantize: bool = False,
+        model_registry: Optional[ModelRegistry] = None
     ):
         """
         Initialize the NLP processor with specified models and parameters.
@@ -94,15 +121,46 @@ class SocialMediaNLPProcessor:
             min_confidence: Minimum confidence threshold for sentiment classification
             cache_size: Maximum size of post cache
             update_interval: Update interval in seconds
+            dedup_window: Sliding window in seconds for duplicate detection
+            dedup_threshold: Minimum similarity for near-duplicate posts
+            inference_backend: Backend for the transformer sentiment model
+            quantize: Run the transformer with int8 dynamic quantization
+            model_registry: Registry the models are loaded through (the
+                process-wide registry by default, so processors and worker
+                processes share one copy)
         """
         self.min_confidence = min_confidence
         self.update_interval = update_interval
         
-        # Initialize NLP models
+        # Duplicate detection in front of the model pipeline
+        self.deduplicator = PostDeduplicator(
+            threshold=dedup_threshold,
+            window_seconds=dedup_window,
+            max_observations=cache_size * 10
+        )
+        
+        # Initialize NLP models, loaded and warmed once per process
+        registry = model_registry or get_model_registry()
         try:
-            self.sentiment_analyzer = pipeline("sentiment-analysis", model=language_model)
-            self.vader_analyzer = SentimentIntensityAnalyzer()
-            self.nlp = spacy.load("en_core_web_sm")
+            self.sentiment_analyzer = registry.get(
+                f"sentiment:{language_model}:{inference_backend}:{'int8' if quantize else 'fp32'}",
+                lambda: build_sentiment_pipeline(
+                    language_model,
+                    backend=inference_backend,
+                    quantize=quantize
+                ),
+                warmup=lambda model: model(WARMUP_TEXTS)
+            )
+            self.vader_analyzer = registry.get(
+                "vader",
+                SentimentIntensityAnalyzer,
+                warmup=lambda model: [model.polarity_scores(text) for text in WARMUP_TEXTS]
+            )
+            self.nlp = registry.get(
+                "spacy:en_core_web_sm",
+                lambda: spacy.load("en_core_web_sm"),
+                warmup=lambda model: list(model.pipe(WARMUP_TEXTS))
+            )
             logger.info("Successfully loaded NLP models")
         except Exception as e:
             logger.error(f"Error loading NLP models: {e}")
@@ -112,7 +170,9 @@ class SocialMediaNLPProcessor:
         self.post_cache = deque(maxlen=cache_size)
         self.sentiment_history: Dict[str, List[SentimentAnalysis]] = defaultdict(list)
         self.author_profiles: Dict[str, Dict] = defaultdict(dict)
-        self.token_mentions: Dict[str, List[Dict]] = defaultdict(list)
+        
+        # Per-minute mention aggregates backing trending queries (up to 24h)
+        self.mention_index = TokenMentionIndex(retention=24 * 3600)
         
         # Specialized lexicons and patterns
         self.crypto_lexicon = self._load_crypto_lexicon()
@@ -124,69 +184,206 @@ class SocialMediaNLPProcessor:
             lambda: deque(maxlen=360)  # 1 hour of 10-second intervals
         )
 
-    def process_post(self, post: SocialMediaPost) -> Optional[SentimentAnalysis]:
+    @classmethod
+    def from_config(cls, config_path: str = "config/default.yml", **kwargs) -> 'SocialMediaNLPProcessor':
+        """Build with the inference backend and quantization of a YAML config; kwargs override."""
+        settings = load_inference_config(config_path)
+        kwargs.setdefault('inference_backend', settings['backend'])
+        kwargs.setdefault('quantize', settings['quantize'])
+        return cls(**kwargs)
+
+    def process_post(
+        self,
+        post: SocialMediaPost,
+        match: Optional[DuplicateMatch] = None
+    ) -> Optional[SentimentAnalysis]:
         """
         Process a single social media post for sentiment and other metrics.
         
         Args:
             post: Social media post to analyze
+            match: Duplicate match already resolved against this processor's
+                deduplicator (looked up here if None)
             
         Returns:
             Sentiment analysis results if processing successful
         """
         try:
-            # Preprocess text
-            cleaned_text = self._preprocess_text(post.content)
-            if not cleaned_text:
+            prepared = self._prepare_post(post, match)
+            if prepared is None:
                 return None
+            
+            return self._complete_post(post, prepared, self._run_models(*prepared))
+            
+        except Exception as e:
+            logger.error(f"Error processing post: {e}")
+            return None
 
-            # Extract key components
-            entities = self._extract_entities(cleaned_text)
-            key_phrases = self._extract_key_phrases(cleaned_text)
-            
-            # Perform sentiment analysis
-            sentiment_scores = self._analyze_sentiment(cleaned_text)
-            
-            # Classify sentiment
-            sentiment_class, confidence = self._classify_sentiment(
-                sentiment_scores,
-                post.engagement,
-                entities
-            )
+    async def process_post_async(
+        self,
+        post: SocialMediaPost,
+        executor: Optional[Executor] = None,
+        match: Optional[DuplicateMatch] = None
+    ) -> Optional[SentimentAnalysis]:
+        """
+        Process a post with model inference in an executor.
+        
+        Duplicate lookups and tracking updates run on the calling event loop
+        thread, so concurrent callers never mutate the processor state from
+        worker threads. Only the model calls are sent to the executor.
+        
+        Args:
+            post: Social media post to analyze
+            executor: Executor for model inference (the loop default if None)
+            match: Duplicate match already resolved against this processor's
+                deduplicator (looked up here if None)
             
-            if confidence < self.min_confidence:
-                sentiment_class = SentimentClass.UNCERTAIN
-            
-            # Calculate spam and shill probabilities
-            spam_prob = self._calculate_spam_probability(post, cleaned_text)
-            shill_prob = self._calculate_shill_probability(post, cleaned_text)
-            
-            # Calculate influence score
-            influence_score = self._calculate_influence_score(post)
-            
-            # Create sentiment analysis result
-            analysis = SentimentAnalysis(
-                post_id=str(hash(post.content)),
-                sentiment_class=sentiment_class,
-                sentiment_scores=sentiment_scores,
-                confidence=confidence,
-                key_phrases=key_phrases,
-                entities=entities,
-                spam_probability=spam_prob,
-                shill_probability=shill_prob,
-                influence_score=influence_score,
-                timestamp=post.timestamp
-            )
+        Returns:
+            Sentiment analysis results if processing successful
+        """
+        try:
+            prepared = self._prepare_post(post, match)
+            if prepared is None:
+                return None
             
-            # Update tracking data
-            self._update_tracking_data(post, analysis)
+            cleaned_text, tokens, match = prepared
+            if self._reusable_payload(tokens, match):
+                outputs = match.payload[1:]
+            else:
+                outputs = await asyncio.get_running_loop().run_in_executor(
+                    executor, self._run_models, cleaned_text, tokens, match
+                )
             
-            return analysis
+            return self._complete_post(post, prepared, outputs)
             
         except Exception as e:
             logger.error(f"Error processing post: {e}")
             return None
 
+    def process_scraped_post(self, post) -> Optional[SentimentAnalysis]:
+        """
+        Process a SocialPost emitted by the social media scraper, reusing the
+        duplicate match from the scraper's dedup stage when it has one.
+        """
+        return self.process_post(SocialMediaPost.from_scraped(post), post.duplicate)
+
+    async def process_scraped_post_async(
+        self,
+        post,
+        executor: Optional[Executor] = None
+    ) -> Optional[SentimentAnalysis]:
+        """Process a scraper SocialPost with model inference in an executor."""
+        return await self.process_post_async(
+            SocialMediaPost.from_scraped(post), executor, post.duplicate
+        )
+
+    def _prepare_post(
+        self,
+        post: SocialMediaPost,
+        match: Optional[DuplicateMatch] = None
+    ) -> Optional[Tuple[str, frozenset, DuplicateMatch]]:
+        """Clean the text and look it up in the deduplicator (event loop thread)."""
+        cleaned_text = self._preprocess_text(post.content)
+        if not cleaned_text:
+            return None
+        
+        tokens = self._extract_token_symbols(cleaned_text)
+        if match is None:
+            match = self.deduplicator.observe(cleaned_text, post.timestamp)
+        elif match.payload is None:
+            # Matched upstream before an earlier copy finished analysis
+            match = replace(match, payload=self.deduplicator.cached_payload(match.cluster_id))
+        return cleaned_text, tokens, match
+
+    @staticmethod
+    def _reusable_payload(tokens: frozenset, match: DuplicateMatch) -> bool:
+        """Whether a duplicate's cached model outputs apply to this post as is."""
+        return match.payload is not None and match.payload[0] == tokens
+
+    def _run_models(
+        self,
+        cleaned_text: str,
+        tokens: frozenset,
+        match: DuplicateMatch
+    ) -> Tuple[List[str], List[str], Dict[str, float]]:
+        """
+        Entities, key phrases and sentiment scores for a post. Reads no
+        mutable processor state, so it may run in a worker thread.
+        """
+        # Reuse model outputs for duplicates of a recently seen post. A
+        # template reposted for another token keeps the cached sentiment
+        # but has its entities extracted again, so mentions are credited
+        # to the tokens this post names
+        if match.payload is not None:
+            _, entities, key_phrases, sentiment_scores = match.payload
+            if not self._reusable_payload(tokens, match):
+                entities = self._extract_entities(cleaned_text)
+                key_phrases = self._extract_key_phrases(cleaned_text)
+            return entities, key_phrases, sentiment_scores
+        
+        # Extract key components
+        entities = self._extract_entities(cleaned_text)
+        key_phrases = self._extract_key_phrases(cleaned_text)
+        
+        # Perform sentiment analysis
+        return entities, key_phrases, self._analyze_sentiment(cleaned_text)
+
+    def _complete_post(
+        self,
+        post: SocialMediaPost,
+        prepared: Tuple[str, frozenset, DuplicateMatch],
+        outputs: Tuple[List[str], List[str], Dict[str, float]]
+    ) -> SentimentAnalysis:
+        """Score the model outputs and update tracking data (event loop thread)."""
+        cleaned_text, tokens, match = prepared
+        entities, key_phrases, sentiment_scores = outputs
+        if match.payload is None:
+            self.deduplicator.store(
+                match.cluster_id,
+                (tokens, entities, key_phrases, sentiment_scores)
+            )
+        
+        # Classify sentiment
+        sentiment_class, confidence = self._classify_sentiment(
+            sentiment_scores,
+            post.engagement,
+            entities
+        )
+        
+        if confidence < self.min_confidence:
+            sentiment_class = SentimentClass.UNCERTAIN
+        
+        # Calculate spam and shill probabilities
+        spam_prob = self._calculate_spam_probability(post, cleaned_text)
+        shill_prob = self._calculate_shill_probability(
+            post,
+            cleaned_text,
+            match.cluster_size
+        )
+        
+        # Calculate influence score
+        influence_score = self._calculate_influence_score(post)
+        
+        # Create sentiment analysis result
+        analysis = SentimentAnalysis(
+            post_id=str(hash(post.content)),
+            sentiment_class=sentiment_class,
+            sentiment_scores=sentiment_scores,
+            confidence=confidence,
+            key_phrases=key_phrases,
+            entities=list(entities),
+            spam_probability=spam_prob,
+            shill_probability=shill_prob,
+            influence_score=influence_score,
+            timestamp=post.timestamp,
+            duplicate_cluster_size=match.cluster_size
+        )
+        
+        # Update tracking data
+        self._update_tracking_data(post, analysis)
+        
+        return analysis
+
     def _preprocess_text(self, text: str) -> str:
         """Preprocess social media text for analysis."""
         try:
@@ -388,14 +585,8 @@ class SocialMediaNLPProcessor:
                 if ent.label_ in ['ORG', 'PRODUCT', 'PERSON']:
                     entities.add(ent.text)
             
-            # Extract crypto-specific entities
-            for token in self.crypto_lexicon['tokens']:
-                if token.lower() in text.lower():
-                    entities.add(token)
-            
-            # Extract cashtags
-            cashtags = re.findall(r'\$([A-Za-z0-9]+)', text)
-            entities.update(cashtags)
+            # Extract crypto-specific entities and cashtags
+            entities.update(self._extract_token_symbols(text))
             
             return list(entities)
             
@@ -403,6 +594,13 @@ class SocialMediaNLPProcessor:
             logger.error(f"Error extracting entities: {e}")
             return []
 
+    def _extract_token_symbols(self, text: str) -> frozenset:
+        """Lexicon tokens and cashtags named in the text."""
+        lowered = text.lower()
+        symbols = {token for token in self.crypto_lexicon['tokens'] if token.lower() in lowered}
+        symbols.update(re.findall(r'\$([A-Za-z0-9]+)', text))
+        return frozenset(symbols)
+
     def _extract_key_phrases(self, text: str) -> List[str]:
         """Extract key phrases from text."""
         try:
@@ -431,7 +629,7 @@ class SocialMediaNLPProcessor:
     def _update_tracking_data(self, post: SocialMediaPost, analysis: SentimentAnalysis) -> None:
         """Update tracking data with new post analysis."""
         try:
-            # Update sentiment history
+            # Update sentiment history and token mentions
             for entity in analysis.entities:
                 if self._is_token_entity(entity):
                     self.sentiment_history[entity].append(analysis)
@@ -439,13 +637,19 @@ class SocialMediaNLPProcessor:
                     # Maintain history size
                     if len(self.sentiment_history[entity]) > 1000:
                         self.sentiment_history[entity] = self.sentiment_history[entity][-1000:]
+                    
+                    self.mention_index.add_mention(
+                        token=entity,
+                        timestamp=post.timestamp,
+                        author=post.author,
+                        engagement=post.engagement,
+                        sentiment_class=analysis.sentiment_class.value,
+                        influence_score=analysis.influence_score
+                    )
             
             # Update author profile
             self._update_author_profile(post, analysis)
             
-            # Update token mentions
-            self._update_token_mentions(post, analysis)
-            
         except Exception as e:
             logger.error(f"Error updating tracking data: {e}")
 
@@ -600,80 +804,7 @@ class SocialMediaNLPProcessor:
     @staticmethod
     def _is_token_entity(entity: str) -> bool:
         """Check if an entity is a token symbol."""
-        return bool(re.match(r'^[A-Z0-9]{2,10}_spam_probability(self, post: SocialMediaPost, text: str) -> float:
-        """Calculate probability that a post is spam."""
-        try:
-            spam_indicators = [
-                len(re.findall(pattern, text))
-                for pattern in self.spam_patterns
-            ]
-            
-            # Calculate basic spam score
-            spam_score = sum([
-                # Repetitive patterns
-                min(1.0, sum(spam_indicators) / 5),
-                
-                # Too many hashtags
-                min(1.0, len(post.hashtags) / 10),
-                
-                # Too many URLs
-                min(1.0, len(post.urls) / 3),
-                
-                # ALL CAPS ratio
-                len(re.findall(r'[A-Z]{4,}', text)) / (len(text.split()) + 1),
-                
-                # Excessive punctuation
-                len(re.findall(r'[!?]{2,}', text)) / (len(text) + 1)
-            ]) / 5
-            
-            # Adjust based on author reputation
-            author_profile = self.author_profiles.get(post.author, {})
-            if author_profile:
-                reputation_factor = author_profile.get('spam_rate', 0.5)
-                spam_score = (spam_score + reputation_factor) / 2
-            
-            return min(1.0, spam_score)
-            
-        except Exception as e:
-            logger.error(f"Error calculating spam probability: {e}")
-            return 0.5
-
-    def _calculate_shill_probability(self, post: SocialMediaPost, text: str) -> float:
-        """Calculate probability that a post is shilling."""
-        try:
-            shill_indicators = [
-                # Excessive emojis
-                len(re.findall(r'[\U0001F300-\U0001F9FF]', text)) / (len(text) + 1),
-                
-                # Price/gain mentions
-                len(re.findall(r'(?i)(x1000|100x|\d+%|moon|pump)', text)) / (len(text.split()) + 1),
-                
-                # Urgency terms
-                len(re.findall(r'(?i)(hurry|fast|quick|soon|now|today)', text)) / (len(text.split()) + 1),
-                
-                # Multiple exclamations
-                len(re.findall(r'!{2,}', text)) / (len(text) + 1),
-                
-                # ALL CAPS words
-                len(re.findall(r'[A-Z]{4,}', text)) / (len(text.split()) + 1)
-            ]
-            
-            # Calculate base shill score
-            shill_score = sum(shill_indicators) / len(shill_indicators)
-            
-            # Adjust based on author history
-            author_profile = self.author_profiles.get(post.author, {})
-            if author_profile:
-                shill_factor = author_profile.get('shill_rate', 0.5)
-                shill_score = (shill_score + shill_factor) / 2
-            
-            return min(1.0, shill_score)
-            
-        except Exception as e:
-            logger.error(f"Error calculating shill probability: {e}")
-            return 0.5
-
-    def _calculate, entity))
+        return bool(re.match(r'^[A-Z0-9]{2,10}$', entity))
 
     @staticmethod
     def _load_crypto_lexicon() -> Dict:
@@ -713,111 +844,11 @@ class SocialMediaNLPProcessor:
         lines = text.split('\n')
         cleaned_lines = []
         for line in lines:
-            if not re.match(r'^(.)\1{4,}_spam_probability(self, post: SocialMediaPost, text: str) -> float:
-        """Calculate probability that a post is spam."""
-        try:
-            spam_indicators = [
-                len(re.findall(pattern, text))
-                for pattern in self.spam_patterns
-            ]
-            
-            # Calculate basic spam score
-            spam_score = sum([
-                # Repetitive patterns
-                min(1.0, sum(spam_indicators) / 5),
-                
-                # Too many hashtags
-                min(1.0, len(post.hashtags) / 10),
-                
-                # Too many URLs
-                min(1.0, len(post.urls) / 3),
-                
-                # ALL CAPS ratio
-                len(re.findall(r'[A-Z]{4,}', text)) / (len(text.split()) + 1),
-                
-                # Excessive punctuation
-                len(re.findall(r'[!?]{2,}', text)) / (len(text) + 1)
-            ]) / 5
-            
-            # Adjust based on author reputation
-            author_profile = self.author_profiles.get(post.author, {})
-            if author_profile:
-                reputation_factor = author_profile.get('spam_rate', 0.5)
-                spam_score = (spam_score + reputation_factor) / 2
-            
-            return min(1.0, spam_score)
-            
-        except Exception as e:
-            logger.error(f"Error calculating spam probability: {e}")
-            return 0.5
-
-    def _calculate_shill_probability(self, post: SocialMediaPost, text: str) -> float:
-        """Calculate probability that a post is shilling."""
-        try:
-            shill_indicators = [
-                # Excessive emojis
-                len(re.findall(r'[\U0001F300-\U0001F9FF]', text)) / (len(text) + 1),
-                
-                # Price/gain mentions
-                len(re.findall(r'(?i)(x1000|100x|\d+%|moon|pump)', text)) / (len(text.split()) + 1),
-                
-                # Urgency terms
-                len(re.findall(r'(?i)(hurry|fast|quick|soon|now|today)', text)) / (len(text.split()) + 1),
-                
-                # Multiple exclamations
-                len(re.findall(r'!{2,}', text)) / (len(text) + 1),
-                
-                # ALL CAPS words
-                len(re.findall(r'[A-Z]{4,}', text)) / (len(text.split()) + 1)
-            ]
-            
-            # Calculate base shill score
-            shill_score = sum(shill_indicators) / len(shill_indicators)
-            
-            # Adjust based on author history
-            author_profile = self.author_profiles.get(post.author, {})
-            if author_profile:
-                shill_factor = author_profile.get('shill_rate', 0.5)
-                shill_score = (shill_score + shill_factor) / 2
-            
-            return min(1.0, shill_score)
-            
-        except Exception as e:
-            logger.error(f"Error calculating shill probability: {e}")
-            return 0.5
-
-    def _calculate, line.strip()):
+            if not re.match(r'^(.)\1{4,}$', line.strip()):
                 cleaned_lines.append(line)
         return ' '.join(cleaned_lines)
 
-if __name__ == "__main__":
-    # Example usage
-    async def main():
-        processor = SocialMediaNLPProcessor()
-        
-        # Example social media post
-        post = SocialMediaPost(
-            platform="x",
-            content="$SOL is mooning! 🚀 Don't miss this incredible 100x opportunity! #Solana #DeFi",
-            timestamp=datetime.now(),
-            author="crypto_whale",
-            engagement={'likes': 100, 'retweets': 50, 'replies': 20},
-            mentions=['@solana'],
-            hashtags=['#Solana', '#DeFi'],
-            urls=[],
-            is_reply=False,
-            reply_to=None,
-            raw_data={}
-        )
-        
-        # Process post
-        analysis = processor.process_post(post)
-        if analysis:
-            print(f"Sentiment: {analysis.sentiment_class}")
-            print(f"Confidence: {analysis.confidence:.2f}")
-            print(f"Shill Probability: {analysis.shill_probability:.2f}")
-        
-    asyncio.run(main())_spam_probability(self, post: SocialMediaPost, text: str) -> float:
+    def _calculate_spam_probability(self, post: SocialMediaPost, text: str) -> float:
         """Calculate probability that a post is spam."""
         try:
             spam_indicators = [
@@ -855,7 +886,12 @@ if __name__ == "__main__":
             logger.error(f"Error calculating spam probability: {e}")
             return 0.5
 
-    def _calculate_shill_probability(self, post: SocialMediaPost, text: str) -> float:
+    def _calculate_shill_probability(
+        self,
+        post: SocialMediaPost,
+        text: str,
+        cluster_size: int = 1
+    ) -> float:
         """Calculate probability that a post is shilling."""
         try:
             shill_indicators = [
@@ -884,12 +920,19 @@ if __name__ == "__main__":
                 shill_factor = author_profile.get('shill_rate', 0.5)
                 shill_score = (shill_score + shill_factor) / 2
             
+            # Many copies of the same message within the window is a
+            # strong coordination signal on its own
+            if cluster_size > 1:
+                coordination_score = min(1.0, np.log10(cluster_size) / 2)
+                shill_score = max(shill_score, coordination_score)
+            
             return min(1.0, shill_score)
             
         except Exception as e:
             logger.error(f"Error calculating shill probability: {e}")
             return 0.5
 
+
     def _calculate_temporal_metrics(self, token: str) -> Dict[str, float]:
         """Calculate temporal metrics for token sentiment analysis."""
         try:
@@ -1013,28 +1056,6 @@ if __name__ == "__main__":
             logger.error(f"Error normalizing crypto terms: {e}")
             return text
 
-    def _update_token_mentions(self, post: SocialMediaPost, analysis: SentimentAnalysis) -> None:
-        """Update token mentions tracking data."""
-        try:
-            for entity in analysis.entities:
-                if self._is_token_entity(entity):
-                    mention_data = {
-                        'timestamp': post.timestamp,
-                        'sentiment_class': analysis.sentiment_class.value,
-                        'influence_score': analysis.influence_score,
-                        'author': post.author,
-                        'engagement': post.engagement
-                    }
-                    
-                    self.token_mentions[entity].append(mention_data)
-                    
-                    # Maintain history size
-                    if len(self.token_mentions[entity]) > 1000:
-                        self.token_mentions[entity] = self.token_mentions[entity][-1000:]
-                        
-        except Exception as e:
-            logger.error(f"Error updating token mentions: {e}")
-
     def _load_meme_patterns(self) -> Dict[str, List[str]]:
         """Load patterns for detecting meme-specific content."""
         return {
@@ -1075,60 +1096,56 @@ if __name__ == "__main__":
             logger.error(f"Error processing posts batch: {e}")
             return []
 
+    def get_dedup_stats(self) -> Dict:
+        """Get duplicate detection statistics."""
+        return self.deduplicator.get_stats()
+
     def get_trending_topics(self, timeframe: int = 3600) -> List[Dict]:
         """Get trending topics from recent analyses."""
         try:
-            now = datetime.now()
-            recent_mentions = []
-            
-            # Collect recent mentions across all tokens
-            for token, mentions in self.token_mentions.items():
-                token_mentions = [
-                    m for m in mentions
-                    if (now - m['timestamp']).total_seconds() < timeframe
-                ]
-                
-                if token_mentions:
-                    # Calculate engagement score
-                    total_engagement = sum(
-                        m['engagement'].get('likes', 0) +
-                        m['engagement'].get('retweets', 0) * 2 +
-                        m['engagement'].get('replies', 0) * 3
-                        for m in token_mentions
-                    )
-                    
-                    # Calculate weighted sentiment
-                    sentiment_score = sum(
-                        m['influence_score'] * (
-                            1 if m['sentiment_class'] in ['very_bullish', 'bullish']
-                            else -1 if m['sentiment_class'] in ['very_bearish', 'bearish']
-                            else 0
-                        )
-                        for m in token_mentions
-                    )
-                    
-                    recent_mentions.append({
-                        'token': token,
-                        'mention_count': len(token_mentions),
-                        'unique_authors': len(set(m['author'] for m in token_mentions)),
-                        'engagement_score': total_engagement,
-                        'sentiment_score': sentiment_score,
-                        'trending_score': (
-                            len(token_mentions) * 0.4 +
-                            total_engagement * 0.4 +
-                            abs(sentiment_score) * 0.2
-                        )
-                    })
-            
-            # Sort by trending score
-            trending = sorted(
-                recent_mentions,
-                key=lambda x: x['trending_score'],
-                reverse=True
-            )
-            
-            return trending[:10]  # Return top 10 trending topics
+            trending = self.mention_index.top_k(k=10, timeframe=timeframe)
+            
+            return [
+                {
+                    'token': stats.token,
+                    'mention_count': stats.mention_count,
+                    'unique_authors': stats.unique_authors,
+                    'engagement_score': stats.engagement_score,
+                    'sentiment_score': stats.sentiment_score,
+                    'trending_score': stats.trending_score
+                }
+                for stats in trending
+            ]
             
         except Exception as e:
             logger.error(f"Error getting trending topics: {e}")
-            return []
\ No newline at end of file
+            return []
+
+if __name__ == "__main__":
+    # Example usage
+    async def main():
+        processor = SocialMediaNLPProcessor.from_config()
+        
+        # Example social media post
+        post = SocialMediaPost(
+            platform="x",
+            content="$SOL is mooning! 🚀 Don't miss this incredible 100x opportunity! #Solana #DeFi",
+            timestamp=datetime.now(),
+            author="crypto_whale",
+            engagement={'likes': 100, 'retweets': 50, 'replies': 20},
+            mentions=['@solana'],
+            hashtags=['#Solana', '#DeFi'],
+            urls=[],
+            is_reply=False,
+            reply_to=None,
+            raw_data={}
+        )
+        
+        # Process post
+        analysis = processor.process_post(post)
+        if analysis:
+            print(f"Sentiment: {analysis.sentiment_class}")
+            print(f"Confidence: {analysis.confidence:.2f}")
+            print(f"Shill Probability: {analysis.shill_probability:.2f}")
+        
+    asyncio.run(main())
\ No newline at end of file
@@ -16,8 +16,10 @@ from typing import Dict, List, Optional, Set, Union
 import logging
 from collections import defaultdict, deque
 import json
+import re
 import torch
 import torch.nn as nn
+from scipy import sparse
 from scipy.special import softmax
 from sklearn.preprocessing import MinMaxScaler
 
@@ -28,6 +30,31 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Column order of sentiment score arrays
+SENTIMENT_CLASSES = ('positive', 'negative', 'neutral', 'uncertainty')
+
+COMPOUND_WEIGHTS = {
+    'positive': 1.0,
+    'negative': -1.0,
+    'neutral': 0.0,
+    'uncertainty': -0.5
+}
+
+MANIPULATION_PATTERN = re.compile('|'.join([
+    r'(?i:guaranteed|promise|definitely)',
+    r'(?i:pump.*dump|moon.*soon)',
+    r'(?i:get in now|don\'t miss|last chance)',
+    r'(?i:x1000|100x|\d{3,}x)',
+    r'🚀{3,}'  # Multiple rocket emojis
+]))
+
+SPAM_PATTERNS = {
+    'all_caps': re.compile(r'[A-Z]{4,}'),
+    'exclamations': re.compile(r'!{3,}'),
+    'repeated_chars': re.compile(r'(.)\1{4,}'),
+    'urls': re.compile(r'http[s]?://')
+}
+
 @dataclass
 class SentimentScore:
     """Comprehensive sentiment scoring result"""
@@ -41,6 +68,62 @@ class SentimentScore:
     metadata: Dict
     risk_flags: List[str] = field(default_factory=list)
 
+@dataclass
+class SentimentBatchResult:
+    """Columnar sentiment scoring result for a batch of texts"""
+    texts: List[str]
+    timestamp: datetime
+    compound_scores: np.ndarray   # (n,)
+    sentiment_scores: np.ndarray  # (n, len(SENTIMENT_CLASSES))
+    confidence: np.ndarray        # (n,)
+    context_features: List[Dict[str, float]]
+    token_scores: List[Dict[str, float]]
+    risk_flags: List[List[str]]
+    has_context: np.ndarray       # (n,) bool
+    has_market_data: np.ndarray   # (n,) bool
+    embedding_dim: int = 0
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    @classmethod
+    def empty(cls, timestamp: datetime) -> 'SentimentBatchResult':
+        """Result for an empty batch."""
+        return cls(
+            texts=[],
+            timestamp=timestamp,
+            compound_scores=np.zeros(0),
+            sentiment_scores=np.zeros((0, len(SENTIMENT_CLASSES))),
+            confidence=np.zeros(0),
+            context_features=[],
+            token_scores=[],
+            risk_flags=[],
+            has_context=np.zeros(0, dtype=bool),
+            has_market_data=np.zeros(0, dtype=bool)
+        )
+
+    def to_scores(self) -> List[SentimentScore]:
+        """Expand the batch into per-text SentimentScore records."""
+        return [
+            SentimentScore(
+                text=text,
+                timestamp=self.timestamp,
+                compound_score=float(self.compound_scores[i]),
+                sentiment_scores=dict(zip(SENTIMENT_CLASSES, self.sentiment_scores[i].tolist())),
+                confidence=float(self.confidence[i]),
+                context_features=self.context_features[i],
+                token_scores=self.token_scores[i],
+                metadata={
+                    'embedding_dim': self.embedding_dim,
+                    'text_length': len(text),
+                    'has_context': bool(self.has_context[i]),
+                    'has_market_data': bool(self.has_market_data[i])
+                },
+                risk_flags=self.risk_flags[i]
+            )
+            for i, text in enumerate(self.texts)
+        ]
+
 class CryptoSentimentScorer:
     """
     Advanced sentiment scorer for crypto social media content.
@@ -74,6 +157,7 @@ class CryptoSentimentScorer:
         # Sentiment lexicons
         self.crypto_lexicon = self._load_crypto_lexicon()
         self.emoji_lexicon = self._load_emoji_lexicon()
+        self._build_lexicon_matrix()
         
         # Data structures
         self.score_cache = deque(maxlen=max_cache_size)
@@ -108,94 +192,124 @@ class CryptoSentimentScorer:
             Detailed sentiment scoring result
         """
         try:
-            # Get text embedding
-            embedding = self.embedding_model.get_embedding(text)
+            batch = self.score_batch([text], [context], [market_data])
+            return batch.to_scores()[0]
+            
+        except Exception as e:
+            logger.error(f"Error scoring text: {e}")
+            raise
+
+    def score_batch(
+        self,
+        texts: List[str],
+        contexts: Optional[List[Optional[Dict]]] = None,
+        market_data: Optional[List[Optional[Dict]]] = None,
+        batch_size: int = 32
+    ) -> SentimentBatchResult:
+        """
+        Score a batch of texts with vectorized sentiment adjustments.
+        
+        Embeddings are generated in batched forward passes, lexicon adjustments
+        are applied as a sparse term-presence matrix product in log space, and
+        context/market adjustments as per-row multiplier arrays.
+        
+        Args:
+            texts: Texts to analyze
+            contexts: Optional context features per text
+            market_data: Optional market data per text
+            batch_size: Maximum texts per embedding forward pass
+            
+        Returns:
+            Columnar scoring result for the batch
+        """
+        try:
+            n = len(texts)
+            contexts = contexts if contexts is not None else [None] * n
+            market_data = market_data if market_data is not None else [None] * n
+            if len(contexts) != n or len(market_data) != n:
+                raise ValueError("contexts and market_data must align with texts")
+            
+            timestamp = datetime.now()
+            if n == 0:
+                return SentimentBatchResult.empty(timestamp)
+            
+            # Get text embeddings
+            embeddings = self.embedding_model.get_batch_embeddings(texts, batch_size=batch_size)
+            embedding_matrix = np.vstack([
+                np.asarray(e.embedding, dtype=np.float32).reshape(1, -1)
+                for e in embeddings
+            ])
             
             # Calculate base sentiment scores
-            base_scores = self._calculate_base_sentiment(embedding)
+            scores = self._calculate_base_sentiment(embedding_matrix)
             
             # Apply crypto-specific adjustments
-            crypto_scores = self._apply_crypto_adjustments(text, base_scores)
-            
-            # Analyze context if available
-            if context:
-                context_features = self._analyze_context(context)
-                crypto_scores = self._adjust_for_context(crypto_scores, context_features)
-            else:
-                context_features = {}
+            scores = self._apply_crypto_adjustments(texts, scores)
             
-            # Consider market data if available
-            if market_data:
-                market_impact = self._analyze_market_impact(market_data)
-                crypto_scores = self._adjust_for_market(crypto_scores, market_impact)
+            # Analyze context where available
+            has_context = np.array([bool(c) for c in contexts])
+            context_features = [
+                self._analyze_context(c) if c else {}
+                for c in contexts
+            ]
+            if has_context.any():
+                scores = self._adjust_for_context(scores, context_features, has_context)
+            
+            # Consider market data where available
+            has_market_data = np.array([bool(m) for m in market_data])
+            if has_market_data.any():
+                market_impact = [
+                    self._analyze_market_impact(m) if m else {}
+                    for m in market_data
+                ]
+                scores = self._adjust_for_market(scores, market_impact, has_market_data)
             
-            # Calculate confidence score
+            # Calculate confidence scores
             confidence = self._calculate_confidence(
-                embedding,
-                crypto_scores,
+                embedding_matrix,
+                scores,
                 context_features
             )
             
-            # Generate token-level scores
-            token_scores = self._score_tokens(text)
-            
-            # Calculate compound score
-            compound_score = self._calculate_compound_score(crypto_scores)
+            # Calculate compound scores
+            compound_scores = self._calculate_compound_score(scores)
             
             # Identify risk flags
-            risk_flags = self._identify_risk_flags(
-                text,
-                crypto_scores,
-                context_features
-            )
+            risk_flags = self._identify_risk_flags(texts, scores, context_features)
             
             # Create result
-            result = SentimentScore(
-                text=text,
-                timestamp=datetime.now(),
-                compound_score=compound_score,
-                sentiment_scores=crypto_scores,
+            result = SentimentBatchResult(
+                texts=list(texts),
+                timestamp=timestamp,
+                compound_scores=compound_scores,
+                sentiment_scores=scores,
                 confidence=confidence,
                 context_features=context_features,
-                token_scores=token_scores,
-                metadata={
-                    'embedding_dim': embedding.embedding.shape[-1],
-                    'text_length': len(text),
-                    'has_context': bool(context),
-                    'has_market_data': bool(market_data)
-                },
-                risk_flags=risk_flags
+                token_scores=[self._score_tokens(text) for text in texts],
+                risk_flags=risk_flags,
+                has_context=has_context,
+                has_market_data=has_market_data,
+                embedding_dim=embedding_matrix.shape[-1]
             )
             
             # Update cache and metrics
-            self._update_tracking(result)
+            self._update_tracking(result.to_scores())
             
             return result
             
         except Exception as e:
-            logger.error(f"Error scoring text: {e}")
+            logger.error(f"Error scoring batch: {e}")
             raise
 
-    def _calculate_base_sentiment(self, embedding) -> Dict[str, float]:
-        """Calculate base sentiment scores from embedding."""
+    def _calculate_base_sentiment(self, embeddings: np.ndarray) -> np.ndarray:
+        """Calculate base sentiment scores (n x classes) from stacked embeddings."""
         try:
-            # Convert embedding to tensor
-            if isinstance(embedding.embedding, np.ndarray):
-                embed_tensor = torch.from_numpy(embedding.embedding)
-            else:
-                embed_tensor = embedding.embedding
-            
             # Get classifier predictions
             with torch.no_grad():
-                logits = self.sentiment_classifier(embed_tensor)
-                probs = softmax(logits.numpy(), axis=-1)
+                logits = self.sentiment_classifier(torch.from_numpy(embeddings))
+                probs = softmax(logits.numpy().astype(np.float64), axis=-1)
             
-            return {
-                'positive': float(probs[0]),
-                'negative': float(probs[1]),
-                'neutral': float(probs[2]),
-                'uncertainty': float(probs[3])
-            }
+            return probs.reshape(len(embeddings), len(SENTIMENT_CLASSES))
             
         except Exception as e:
             logger.error(f"Error calculating base sentiment: {e}")
@@ -203,37 +317,87 @@ class CryptoSentimentScorer:
 
     def _apply_crypto_adjustments(
         self,
-        text: str,
-        base_scores: Dict[str, float]
-    ) -> Dict[str, float]:
-        """Apply crypto-specific adjustments to sentiment scores."""
+        texts: List[str],
+        scores: np.ndarray
+    ) -> np.ndarray:
+        """Apply crypto-specific lexicon adjustments to sentiment scores."""
         try:
-            scores = base_scores.copy()
-            
-            # Check for crypto-specific terms
-            for term, impact in self.crypto_lexicon.items():
-                if term.lower() in text.lower():
-                    scores['positive'] *= impact.get('positive', 1.0)
-                    scores['negative'] *= impact.get('negative', 1.0)
-                    scores['uncertainty'] *= impact.get('uncertainty', 1.0)
-            
-            # Check for emojis
-            for emoji, impact in self.emoji_lexicon.items():
-                if emoji in text:
-                    scores['positive'] *= impact.get('positive', 1.0)
-                    scores['negative'] *= impact.get('negative', 1.0)
+            presence = self._lexicon_presence(texts)
             
-            # Normalize scores
-            total = sum(scores.values())
-            if total > 0:
-                scores = {k: v/total for k, v in scores.items()}
+            # Multiplicative impacts compose additively in log space
+            log_multipliers = presence @ self._lexicon_log_impact
+            adjusted = scores * np.exp(log_multipliers)
             
-            return scores
+            return self._normalize_rows(adjusted)
             
         except Exception as e:
             logger.error(f"Error applying crypto adjustments: {e}")
             raise
 
+    def _lexicon_presence(self, texts: List[str]) -> sparse.csr_matrix:
+        """
+        Build the sparse (texts x lexicon terms) presence matrix.
+        
+        One overlapping regex scan per text collects term hit counts; the
+        substring closure then marks every term contained in a matched term,
+        which reproduces plain substring presence for each lexicon entry.
+        """
+        rows, cols = [], []
+        for row, text in enumerate(texts):
+            for match in self._lexicon_pattern.finditer(text.lower()):
+                rows.append(row)
+                cols.append(self._lexicon_index[match.group(1)])
+        
+        counts = sparse.csr_matrix(
+            (np.ones(len(rows)), (rows, cols)),
+            shape=(len(texts), len(self._lexicon_terms))
+        )
+        presence = counts @ self._lexicon_closure
+        presence.data = np.ones_like(presence.data)
+        return presence
+
+    def _build_lexicon_matrix(self) -> None:
+        """Compile lexicons into a term pattern and a log-impact matrix."""
+        log_impact = defaultdict(lambda: np.zeros(len(SENTIMENT_CLASSES)))
+        
+        # Crypto terms adjust positive, negative and uncertainty
+        for term, impact in self.crypto_lexicon.items():
+            for sentiment in ('positive', 'negative', 'uncertainty'):
+                log_impact[term.lower()][SENTIMENT_CLASSES.index(sentiment)] += \
+                    np.log(impact.get(sentiment, 1.0))
+        
+        # Emojis adjust positive and negative
+        for emoji, impact in self.emoji_lexicon.items():
+            for sentiment in ('positive', 'negative'):
+                log_impact[emoji.lower()][SENTIMENT_CLASSES.index(sentiment)] += \
+                    np.log(impact.get(sentiment, 1.0))
+        
+        self._lexicon_terms = sorted(log_impact, key=len, reverse=True)
+        self._lexicon_index = {term: i for i, term in enumerate(self._lexicon_terms)}
+        self._lexicon_log_impact = np.vstack([log_impact[t] for t in self._lexicon_terms])
+        
+        # Zero-width lookahead finds the longest term at every position
+        self._lexicon_pattern = re.compile(
+            '(?=(' + '|'.join(re.escape(t) for t in self._lexicon_terms) + '))'
+        )
+        
+        # closure[i, j] = 1 when term j occurs inside term i
+        self._lexicon_closure = sparse.csr_matrix(np.array([
+            [float(inner in outer) for inner in self._lexicon_terms]
+            for outer in self._lexicon_terms
+        ]))
+
+    @staticmethod
+    def _normalize_rows(scores: np.ndarray, mask: Optional[np.ndarray] = None) -> np.ndarray:
+        """Normalize each (masked) row to sum to one where its total is positive."""
+        totals = scores.sum(axis=1, keepdims=True)
+        valid = totals[:, 0] > 0
+        if mask is not None:
+            valid &= mask
+        scores = scores.copy()
+        scores[valid] /= totals[valid]
+        return scores
+
     def _analyze_context(self, context: Dict) -> Dict[str, float]:
         """Analyze contextual features for sentiment adjustment."""
         try:
@@ -271,37 +435,26 @@ class CryptoSentimentScorer:
 
     def _adjust_for_context(
         self,
-        scores: Dict[str, float],
-        context_features: Dict[str, float]
-    ) -> Dict[str, float]:
+        scores: np.ndarray,
+        context_features: List[Dict[str, float]],
+        mask: np.ndarray
+    ) -> np.ndarray:
         """Adjust sentiment scores based on context."""
         try:
-            adjusted_scores = scores.copy()
+            pos = SENTIMENT_CLASSES.index('positive')
+            neg = SENTIMENT_CLASSES.index('negative')
+            
+            temporal = np.array([f.get('temporal_factor', 0.0) for f in context_features])
+            influence = np.array([f.get('influence_score', 0.0) for f in context_features])
+            platform = np.array([f.get('platform_factor', 1.0) for f in context_features])
+            
+            adjusted = scores * ((1 + influence) * platform)[:, None]
             
             # Apply temporal adjustment
-            if 'temporal_factor' in context_features:
-                temporal_impact = context_features['temporal_factor']
-                adjusted_scores['positive'] *= (1 + temporal_impact)
-                adjusted_scores['negative'] *= (1 - temporal_impact)
-            
-            # Apply influence adjustment
-            if 'influence_score' in context_features:
-                influence_impact = context_features['influence_score']
-                for sentiment in adjusted_scores:
-                    adjusted_scores[sentiment] *= (1 + influence_impact)
-            
-            # Apply platform adjustment
-            if 'platform_factor' in context_features:
-                platform_impact = context_features['platform_factor']
-                for sentiment in adjusted_scores:
-                    adjusted_scores[sentiment] *= platform_impact
-            
-            # Normalize scores
-            total = sum(adjusted_scores.values())
-            if total > 0:
-                adjusted_scores = {k: v/total for k, v in adjusted_scores.items()}
-            
-            return adjusted_scores
+            adjusted[:, pos] *= (1 + temporal)
+            adjusted[:, neg] *= (1 - temporal)
+            
+            return self._normalize_rows(adjusted, mask)
             
         except Exception as e:
             logger.error(f"Error adjusting for context: {e}")
@@ -342,96 +495,81 @@ class CryptoSentimentScorer:
 
     def _adjust_for_market(
         self,
-        scores: Dict[str, float],
-        market_impact: Dict[str, float]
-    ) -> Dict[str, float]:
+        scores: np.ndarray,
+        market_impact: List[Dict[str, float]],
+        mask: np.ndarray
+    ) -> np.ndarray:
         """Adjust sentiment scores based on market data."""
         try:
-            adjusted_scores = scores.copy()
+            pos = SENTIMENT_CLASSES.index('positive')
+            neg = SENTIMENT_CLASSES.index('negative')
+            unc = SENTIMENT_CLASSES.index('uncertainty')
             
-            # Apply price impact
-            if 'price_impact' in market_impact:
-                price_factor = market_impact['price_impact']
-                adjusted_scores['positive'] *= (1 + max(0, price_factor))
-                adjusted_scores['negative'] *= (1 + max(0, -price_factor))
+            price = np.array([m.get('price_impact', 0.0) for m in market_impact])
+            volume = np.array([m.get('volume_impact', 0.0) for m in market_impact])
+            volatility = np.array([m.get('volatility_impact', 0.0) for m in market_impact])
             
-            # Apply volume impact
-            if 'volume_impact' in market_impact:
-                volume_factor = market_impact['volume_impact']
-                for sentiment in adjusted_scores:
-                    adjusted_scores[sentiment] *= (1 + abs(volume_factor))
+            adjusted = scores * (1 + np.abs(volume))[:, None]
             
-            # Apply volatility impact
-            if 'volatility_impact' in market_impact:
-                volatility_factor = market_impact['volatility_impact']
-                adjusted_scores['uncertainty'] *= (1 + volatility_factor)
+            # Apply price impact
+            adjusted[:, pos] *= (1 + np.maximum(0, price))
+            adjusted[:, neg] *= (1 + np.maximum(0, -price))
             
-            # Normalize scores
-            total = sum(adjusted_scores.values())
-            if total > 0:
-                adjusted_scores = {k: v/total for k, v in adjusted_scores.items()}
+            # Apply volatility impact
+            adjusted[:, unc] *= (1 + volatility)
             
-            return adjusted_scores
+            return self._normalize_rows(adjusted, mask)
             
         except Exception as e:
             logger.error(f"Error adjusting for market: {e}")
             raise
 
-    def _calculate_compound_score(self, scores: Dict[str, float]) -> float:
-        """Calculate compound sentiment score."""
+    def _calculate_compound_score(self, scores: np.ndarray) -> np.ndarray:
+        """Calculate compound sentiment scores."""
         try:
             # Weight different sentiment aspects
-            weights = {
-                'positive': 1.0,
-                'negative': -1.0,
-                'neutral': 0.0,
-                'uncertainty': -0.5
-            }
-            
-            # Calculate weighted sum
-            weighted_sum = sum(
-                scores.get(sentiment, 0) * weight
-                for sentiment, weight in weights.items()
-            )
+            weights = np.array([
+                COMPOUND_WEIGHTS[sentiment] for sentiment in SENTIMENT_CLASSES
+            ])
             
             # Normalize to [-1, 1]
-            return np.tanh(weighted_sum)
+            return np.tanh(scores @ weights)
             
         except Exception as e:
             logger.error(f"Error calculating compound score: {e}")
-            return 0.0
+            return np.zeros(len(scores))
 
     def _calculate_confidence(
         self,
-        embedding,
-        sentiment_scores: Dict[str, float],
-        context_features: Dict[str, float]
-    ) -> float:
-        """Calculate confidence score for sentiment analysis."""
+        embeddings: np.ndarray,
+        sentiment_scores: np.ndarray,
+        context_features: List[Dict[str, float]]
+    ) -> np.ndarray:
+        """Calculate confidence scores for sentiment analysis."""
         try:
-            confidence_factors = []
-            
             # Embedding quality
-            embedding_norm = np.linalg.norm(embedding.embedding)
-            confidence_factors.append(min(1.0, embedding_norm / 10))
+            embedding_quality = np.minimum(1.0, np.linalg.norm(embeddings, axis=1) / 10)
             
             # Sentiment decisiveness
-            sentiment_std = np.std(list(sentiment_scores.values()))
-            confidence_factors.append(sentiment_std)
+            decisiveness = np.std(sentiment_scores, axis=1)
             
             # Context reliability
-            if context_features:
-                context_reliability = np.mean(list(context_features.values()))
-                confidence_factors.append(context_reliability)
+            has_context = np.array([bool(f) for f in context_features])
+            reliability = np.array([
+                np.mean(list(f.values())) if f else 0.0
+                for f in context_features
+            ])
             
             # Calculate final confidence
-            confidence = np.mean(confidence_factors)
-            
-            return float(confidence)
+            return np.where(
+                has_context,
+                (embedding_quality + decisiveness + reliability) / 3,
+                (embedding_quality + decisiveness) / 2
+            )
             
         except Exception as e:
             logger.error(f"Error calculating confidence: {e}")
-            return 0.0
+            return np.zeros(len(sentiment_scores))
 
     def _score_tokens(self, text: str) -> Dict[str, float]:
         """Generate token-level sentiment scores."""
@@ -465,60 +603,41 @@ class CryptoSentimentScorer:
 
     def _identify_risk_flags(
         self,
-        text: str,
-        sentiment_scores: Dict[str, float],
-        context_features: Dict[str, float]
-    ) -> List[str]:
-        """Identify potential risk flags in sentiment analysis."""
+        texts: List[str],
+        sentiment_scores: np.ndarray,
+        context_features: List[Dict[str, float]]
+    ) -> List[List[str]]:
+        """Identify potential risk flags for each scored text."""
         try:
-            flags = []
+            temporal = np.array([f.get('temporal_factor', 0) for f in context_features])
+            influence = np.array([f.get('influence_score', 0) for f in context_features])
+            
+            # Threshold checks evaluated column-wise, in flag order
+            checks = [
+                ("EXTREME_POSITIVE", sentiment_scores[:, SENTIMENT_CLASSES.index('positive')] > 0.9),
+                ("EXTREME_NEGATIVE", sentiment_scores[:, SENTIMENT_CLASSES.index('negative')] > 0.9),
+                ("HIGH_UNCERTAINTY", sentiment_scores[:, SENTIMENT_CLASSES.index('uncertainty')] > 0.4),
+                ("POTENTIAL_MANIPULATION", np.array([self._has_manipulation_indicators(t) for t in texts])),
+                ("SPAM_LIKELY", np.array([self._has_spam_patterns(t) for t in texts])),
+                ("UNUSUAL_TIMING", temporal > 0.8),
+                ("HIGH_INFLUENCE", influence > 0.8)
+            ]
+            
+            flags = [[] for _ in texts]
+            for flag, mask in checks:
+                for row in np.flatnonzero(mask):
+                    flags[row].append(flag)
             
-            # Check extreme sentiment
-            if sentiment_scores['positive'] > 0.9:
-                flags.append("EXTREME_POSITIVE")
-            if sentiment_scores['negative'] > 0.9:
-                flags.append("EXTREME_NEGATIVE")
-                
-            # Check uncertainty
-            if sentiment_scores['uncertainty'] > 0.4:
-                flags.append("HIGH_UNCERTAINTY")
-                
-            # Check manipulation indicators
-            if self._has_manipulation_indicators(text):
-                flags.append("POTENTIAL_MANIPULATION")
-                
-            # Check spam patterns
-            if self._has_spam_patterns(text):
-                flags.append("SPAM_LIKELY")
-                
-            # Check context-based risks
-            if context_features:
-                if context_features.get('temporal_factor', 0) > 0.8:
-                    flags.append("UNUSUAL_TIMING")
-                if context_features.get('influence_score', 0) > 0.8:
-                    flags.append("HIGH_INFLUENCE")
-                    
             return flags
             
         except Exception as e:
             logger.error(f"Error identifying risk flags: {e}")
-            return []
+            return [[] for _ in texts]
 
     def _has_manipulation_indicators(self, text: str) -> bool:
         """Check for potential manipulation indicators in text."""
         try:
-            manipulation_patterns = [
-                r'(?i)(guaranteed|promise|definitely)',
-                r'(?i)(pump.*dump|moon.*soon)',
-                r'(?i)(get in now|don\'t miss|last chance)',
-                r'(?i)(x1000|100x|\d{3,}x)',
-                r'🚀{3,}'  # Multiple rocket emojis
-            ]
-            
-            return any(
-                re.search(pattern, text)
-                for pattern in manipulation_patterns
-            )
+            return MANIPULATION_PATTERN.search(text) is not None
             
         except Exception as e:
             logger.error(f"Error checking manipulation indicators: {e}")
@@ -528,10 +647,10 @@ class CryptoSentimentScorer:
         """Check for spam patterns in text."""
         try:
             spam_indicators = [
-                len(re.findall(r'[A-Z]{4,}', text)) > 2,  # Multiple all-caps words
-                len(re.findall(r'!{3,}', text)) > 2,      # Multiple exclamation marks
-                len(re.findall(r'(.)\\1{4,}', text)) > 0, # Repeated characters
-                len(re.findall(r'http[s]?://', text)) > 2 # Multiple URLs
+                len(SPAM_PATTERNS['all_caps'].findall(text)) > 2,     # Multiple all-caps words
+                len(SPAM_PATTERNS['exclamations'].findall(text)) > 2, # Multiple exclamation marks
+                SPAM_PATTERNS['repeated_chars'].search(text) is not None, # Repeated characters
+                len(SPAM_PATTERNS['urls'].findall(text)) > 2          # Multiple URLs
             ]
             
             return any(spam_indicators)
@@ -540,22 +659,24 @@ class CryptoSentimentScorer:
             logger.error(f"Error checking spam patterns: {e}")
             return False
 
-    def _update_tracking(self, result: SentimentScore) -> None:
-        """Update tracking metrics with new scoring result."""
+    def _update_tracking(self, results: List[SentimentScore]) -> None:
+        """Update tracking metrics with a batch of scoring results."""
         try:
             # Update score cache
-            self.score_cache.append(result)
+            self.score_cache.extend(results)
             
             # Update token stats
-            for token, score in result.token_scores.items():
-                self.token_stats[token]['sentiment_history'].append({
-                    'score': score,
-                    'timestamp': result.timestamp
-                })
+            for result in results:
+                for token, score in result.token_scores.items():
+                    self.token_stats[token]['sentiment_history'].append({
+                        'score': score,
+                        'timestamp': result.timestamp
+                    })
             
             # Update metrics
-            self.metrics['processing_time'].append(datetime.now())
-            self.metrics['confidence_scores'].append(result.confidence)
+            now = datetime.now()
+            self.metrics['processing_time'].extend([now] * len(results))
+            self.metrics['confidence_scores'].extend(r.confidence for r in results)
             
             # Maintain reasonable history size
             max_history = 1000
@@ -757,10 +878,9 @@ if __name__ == "__main__":
             "WAGMI! Diamond hands only! 💎 100x incoming! 🌙"
         ]
         
-        # Score texts
-        for text in texts:
-            score = sentiment_scorer.score_text(text)
-            print(f"\nText: {text}")
+        # Score texts in one batch
+        for score in sentiment_scorer.score_batch(texts).to_scores():
+            print(f"\nText: {score.text}")
             print(f"Compound Score: {score.compound_score:.3f}")
             print(f"Confidence: {score.confidence:.3f}")
             print(f"Risk Flags: {score.risk_flags}")
@@ -12,12 +12,13 @@ License: Proprietary
 import asyncio
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Set, Union, AsyncGenerator
+from typing import Callable, Dict, List, Optional, Set, Tuple, Union, AsyncGenerator
 import logging
 import json
 import aiohttp
 import re
-from collections import defaultdict, deque
+import time
+from collections import OrderedDict, defaultdict, deque
 import asyncio
 from urllib.parse import urlencode
 
@@ -26,6 +27,8 @@ from telethon import TelegramClient
 from discord import Client as DiscordClient
 from tweepy.asynchronous import AsyncClient as TwitterClient
 
+from .deduplicator import DuplicateMatch, PostDeduplicator
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -33,6 +36,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Sentinel passed down the pipeline queues once all producers are drained
+_END_OF_STREAM = object()
+
 @dataclass
 class SocialPost:
     """Standardized social media post data structure"""
@@ -49,6 +55,7 @@ class SocialPost:
     raw_data: Dict
     sentiment_hints: Dict[str, float] = field(default_factory=dict)
     metadata: Dict = field(default_factory=dict)
+    duplicate: Optional[DuplicateMatch] = None  # set by the dedup stage
 
 @dataclass
 class ScrapingConfig:
@@ -61,6 +68,69 @@ class ScrapingConfig:
     rate_limits: Dict[str, int]
     blacklisted_sources: Set[str]
     language_filter: Optional[List[str]]
+    burst_limits: Dict[str, int] = field(default_factory=dict)
+    shard_size: int = 5
+    queue_size: int = 1000
+    nlp_workers: int = 1
+
+class AsyncTokenBucket:
+    """
+    Asynchronous token bucket rate limiter.
+    Refills continuously at `rate` tokens per second up to `burst` tokens;
+    waiters are served in FIFO order.
+    """
+    
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        """
+        Initialize the token bucket.
+        
+        Args:
+            rate: Refill rate in tokens per second
+            burst: Bucket capacity, defaults to one second worth of tokens
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        
+        self.rate = float(rate)
+        self.capacity = float(burst if burst is not None else max(1.0, rate))
+        self._tokens = self.capacity
+        self._last_refill = time.monotonic()
+        self._lock = asyncio.Lock()
+        
+    async def acquire(self, tokens: float = 1.0) -> None:
+        """Wait until the requested number of tokens is available and consume them."""
+        if tokens > self.capacity:
+            raise ValueError("requested tokens exceed bucket capacity")
+        
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                await asyncio.sleep((tokens - self._tokens) / self.rate)
+                
+    @property
+    def available(self) -> float:
+        """Tokens currently available without waiting."""
+        self._refill()
+        return self._tokens
+                
+    def _refill(self) -> None:
+        """Add tokens accrued since the last refill."""
+        now = time.monotonic()
+        self._tokens = min(
+            self.capacity,
+            self._tokens + (now - self._last_refill) * self.rate
+        )
+        self._last_refill = now
+        
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+        
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        return False
 
 class SocialMediaScraper:
     """
@@ -75,7 +145,8 @@ class SocialMediaScraper:
         discord_credentials: Dict,
         config: ScrapingConfig,
         cache_size: int = 10000,
-        update_interval: int = 60
+        update_interval: int = 60,
+        dedup_window: int = 3600
     ):
         """
         Initialize the social media scraper.
@@ -87,9 +158,11 @@ class SocialMediaScraper:
             config: Scraping configuration parameters
             cache_size: Maximum size of post cache
             update_interval: Update interval in seconds
+            dedup_window: Sliding window in seconds for duplicate detection
         """
         self.config = config
         self.update_interval = update_interval
+        self.cache_size = cache_size
         
         # Initialize platform clients
         self.x_client = self._init_x_client(x_credentials)
@@ -103,9 +176,9 @@ class SocialMediaScraper:
             'discord': deque(maxlen=cache_size)
         }
         
-        # Rate limiting
+        # Rate limiting: one token bucket per platform
         self.rate_limiters = {
-            platform: self._create_rate_limiter(rate)
+            platform: AsyncTokenBucket(rate, config.burst_limits.get(platform))
             for platform, rate in config.rate_limits.items()
         }
         
@@ -116,6 +189,13 @@ class SocialMediaScraper:
         # Token mention tracking
         self.token_mentions = defaultdict(lambda: defaultdict(int))
         
+        # Duplicate tracking: re-polled post ids and copy-paste content waves
+        self.seen_post_ids: Dict[str, OrderedDict] = defaultdict(OrderedDict)
+        self.deduplicator = PostDeduplicator(
+            window_seconds=dedup_window,
+            max_observations=cache_size * 10
+        )
+        
         # Platform-specific parsers
         self.parsers = {
             'x': self._parse_x_post,
@@ -123,121 +203,306 @@ class SocialMediaScraper:
             'discord': self._parse_discord_message
         }
 
-    async def start_scraping(self) -> None:
-        """Start the main scraping loop."""
+    async def start_scraping(
+        self,
+        nlp_processor=None,
+        sink: Optional[Callable] = None
+    ) -> None:
+        """
+        Start the main scraping loop.
+        
+        Args:
+            nlp_processor: Optional processor exposing process_scraped_post_async
+            sink: Optional callback receiving (post, analysis) per emitted post
+        """
         try:
             logger.info("Starting social media scraping...")
             
             while True:
-                scraping_tasks = []
+                stats = await self.run_pipeline(nlp_processor, sink)
+                logger.info(
+                    f"Scraping cycle complete: {stats['posts_emitted']} posts "
+                    f"in {stats['elapsed_seconds']:.2f}s "
+                    f"({stats['posts_per_second']:.1f} posts/s)"
+                )
                 
-                # Create tasks for each enabled platform
-                if 'x' in self.config.platforms:
-                    scraping_tasks.append(self._scrape_x())
-                if 'telegram' in self.config.platforms:
-                    scraping_tasks.append(self._scrape_telegram())
-                if 'discord' in self.config.platforms:
-                    scraping_tasks.append(self._scrape_discord())
-                
-                # Run scraping tasks concurrently
-                results = await asyncio.gather(*scraping_tasks, return_exceptions=True)
-                
-                # Process results
-                for result in results:
-                    if isinstance(result, Exception):
-                        logger.error(f"Scraping error: {result}")
-                        
                 await asyncio.sleep(self.update_interval)
                 
         except Exception as e:
             logger.error(f"Error in main scraping loop: {e}")
             raise
 
-    async def _scrape_x(self) -> AsyncGenerator[SocialPost, None]:
-        """Scrape crypto-related posts from Twitter."""
+    async def run_pipeline(
+        self,
+        nlp_processor=None,
+        sink: Optional[Callable] = None
+    ) -> Dict:
+        """
+        Run one streaming scraping cycle.
+        
+        One producer task is started per platform and keyword/channel shard.
+        Posts flow through bounded queues into the filter, dedup and NLP
+        stages, so slow downstream stages apply backpressure to producers.
+        
+        Args:
+            nlp_processor: Optional processor exposing process_scraped_post_async;
+                its deduplicator replaces the scraper's, so each post is
+                clustered once and duplicates reuse the cached analysis
+            sink: Optional callback receiving (post, analysis) per emitted post
+            
+        Returns:
+            Cycle statistics including end-to-end throughput
+        """
+        started = time.perf_counter()
+        queue_size = self.config.queue_size
+        raw_queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        filtered_queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        nlp_queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        cycle = defaultdict(int)
+        
+        if getattr(nlp_processor, 'deduplicator', None) is not None:
+            self.deduplicator = nlp_processor.deduplicator
+        
+        producers = [
+            asyncio.create_task(self._run_producer(platform, source, raw_queue, cycle))
+            for platform, source in self._build_producers()
+        ]
+        workers = max(1, self.config.nlp_workers)
+        stages = [
+            asyncio.create_task(self._run_stage(
+                raw_queue, filtered_queue, self._filter_stage, cycle, 'filtered'
+            )),
+            asyncio.create_task(self._run_stage(
+                filtered_queue, nlp_queue, self._dedup_stage, cycle, 'deduplicated',
+                downstream_workers=workers
+            ))
+        ]
+        nlp_workers = [
+            asyncio.create_task(self._run_nlp_stage(nlp_queue, nlp_processor, sink, cycle))
+            for _ in range(workers)
+        ]
+        
         try:
-            async with self.rate_limiters['x']:
-                for keyword in self.config.keywords:
-                    query = self._build_x_query(keyword)
-                    
-                    async for tweet in self.x_client.search_recent_tweets(
-                        query=query,
-                        max_results=self.config.max_posts_per_query,
-                        tweet_fields=['created_at', 'public_metrics', 'entities']
-                    ):
-                        try:
-                            post = await self._parse_x_post(tweet)
-                            if post and self._should_process_post(post):
-                                self.post_cache['x'].append(post)
-                                self.metrics['x_posts_collected'] += 1
-                                yield post
-                                
-                        except Exception as e:
-                            logger.error(f"Error processing tweet: {e}")
-                            self.errors['x'].append(str(e))
-                            
-        except Exception as e:
-            logger.error(f"Error scraping Twitter: {e}")
-            raise
+            await asyncio.gather(*producers, return_exceptions=True)
+            await raw_queue.put(_END_OF_STREAM)
+            await asyncio.gather(*stages, *nlp_workers)
+            
+        finally:
+            for task in producers + stages + nlp_workers:
+                if not task.done():
+                    task.cancel()
+        
+        elapsed = time.perf_counter() - started
+        return {
+            'producers': len(producers),
+            'posts_scraped': cycle['scraped'],
+            'posts_filtered': cycle['filtered'],
+            'posts_deduplicated': cycle['deduplicated'],
+            'posts_emitted': cycle['emitted'],
+            'elapsed_seconds': elapsed,
+            'posts_per_second': cycle['emitted'] / elapsed if elapsed > 0 else 0.0
+        }
+
+    def _build_producers(self) -> List[Tuple[str, AsyncGenerator]]:
+        """Create one post source per enabled platform and shard."""
+        shard_size = max(1, self.config.shard_size)
+        producers = []
+        
+        if 'x' in self.config.platforms:
+            for shard in self._shard(self.config.keywords, shard_size):
+                producers.append(('x', self._scrape_x(shard)))
+        if 'telegram' in self.config.platforms:
+            for shard in self._shard(self._get_telegram_channels(), shard_size):
+                producers.append(('telegram', self._scrape_telegram(shard)))
+        if 'discord' in self.config.platforms:
+            channels = [
+                channel_id
+                for channel_ids in self._get_discord_channels().values()
+                for channel_id in channel_ids
+            ]
+            for shard in self._shard(channels, shard_size):
+                producers.append(('discord', self._scrape_discord(shard)))
+        
+        return producers
+
+    @staticmethod
+    def _shard(items: List, shard_size: int) -> List[List]:
+        """Split work items into shards of at most shard_size."""
+        items = list(items)
+        return [items[i:i + shard_size] for i in range(0, len(items), shard_size)]
 
-    async def _scrape_telegram(self) -> AsyncGenerator[SocialPost, None]:
-        """Scrape crypto-related messages from Telegram channels."""
+    async def _run_producer(
+        self,
+        platform: str,
+        source: AsyncGenerator,
+        outbound: asyncio.Queue,
+        cycle: Dict[str, int]
+    ) -> None:
+        """Drain a post source into the pipeline."""
         try:
-            async with self.rate_limiters['telegram']:
-                for channel in self._get_telegram_channels():
+            async for post in source:
+                cycle['scraped'] += 1
+                await outbound.put(post)
+                
+        except Exception as e:
+            logger.error(f"Scraping error on {platform}: {e}")
+            self.errors[platform].append(str(e))
+
+    async def _run_stage(
+        self,
+        inbound: asyncio.Queue,
+        outbound: asyncio.Queue,
+        stage: Callable[[SocialPost], bool],
+        cycle: Dict[str, int],
+        counter: str,
+        downstream_workers: int = 1
+    ) -> None:
+        """Forward posts accepted by a stage until the stream ends."""
+        while True:
+            post = await inbound.get()
+            if post is _END_OF_STREAM:
+                for _ in range(downstream_workers):
+                    await outbound.put(_END_OF_STREAM)
+                return
+            
+            if stage(post):
+                cycle[counter] += 1
+                await outbound.put(post)
+
+    def _filter_stage(self, post: SocialPost) -> bool:
+        """Filter stage: engagement, blacklist, language and token checks."""
+        return self._should_process_post(post)
+
+    def _dedup_stage(self, post: SocialPost) -> bool:
+        """Dedup stage: drop re-polled posts and annotate content duplicates."""
+        if not self._register_post(post):
+            return False
+        
+        self.post_cache[post.platform].append(post)
+        self.metrics[f'{post.platform}_posts_collected'] += 1
+        return True
+
+    async def _run_nlp_stage(
+        self,
+        inbound: asyncio.Queue,
+        nlp_processor,
+        sink: Optional[Callable],
+        cycle: Dict[str, int]
+    ) -> None:
+        """
+        NLP stage: analyze posts and hand them to the sink. The processor runs
+        model inference in the default executor and keeps its duplicate and
+        tracking state on the event loop thread, so workers share it safely.
+        """
+        while True:
+            post = await inbound.get()
+            if post is _END_OF_STREAM:
+                return
+            
+            try:
+                analysis = None
+                if nlp_processor is not None:
+                    analysis = await nlp_processor.process_scraped_post_async(post)
+                
+                if sink is not None:
+                    result = sink(post, analysis)
+                    if asyncio.iscoroutine(result):
+                        await result
+                
+                cycle['emitted'] += 1
+                
+            except Exception as e:
+                logger.error(f"Error in NLP stage: {e}")
+                self.errors['nlp'].append(str(e))
+
+    async def _scrape_x(
+        self,
+        keywords: Optional[List[str]] = None
+    ) -> AsyncGenerator[SocialPost, None]:
+        """Scrape crypto-related posts from Twitter for a keyword shard."""
+        for keyword in keywords if keywords is not None else self.config.keywords:
+            try:
+                await self.rate_limiters['x'].acquire()
+                query = self._build_x_query(keyword)
+                
+                async for tweet in self.x_client.search_recent_tweets(
+                    query=query,
+                    max_results=self.config.max_posts_per_query,
+                    tweet_fields=['created_at', 'public_metrics', 'entities']
+                ):
                     try:
-                        async for message in self.telegram_client.iter_messages(
-                            channel,
-                            limit=self.config.max_posts_per_query,
-                            search=self._build_telegram_query()
-                        ):
-                            try:
-                                post = await self._parse_telegram_message(message)
-                                if post and self._should_process_post(post):
-                                    self.post_cache['telegram'].append(post)
-                                    self.metrics['telegram_posts_collected'] += 1
-                                    yield post
-                                    
-                            except Exception as e:
-                                logger.error(f"Error processing Telegram message: {e}")
-                                self.errors['telegram'].append(str(e))
-                                
+                        post = await self._parse_x_post(tweet)
+                        if post:
+                            yield post
+                            
                     except Exception as e:
-                        logger.error(f"Error scraping Telegram channel {channel}: {e}")
+                        logger.error(f"Error processing tweet: {e}")
+                        self.errors['x'].append(str(e))
                         
-        except Exception as e:
-            logger.error(f"Error scraping Telegram: {e}")
-            raise
+            except Exception as e:
+                logger.error(f"Error scraping Twitter for '{keyword}': {e}")
+                self.errors['x'].append(str(e))
 
-    async def _scrape_discord(self) -> AsyncGenerator[SocialPost, None]:
-        """Scrape crypto-related messages from Discord channels."""
-        try:
-            async with self.rate_limiters['discord']:
-                for guild_id, channel_ids in self._get_discord_channels().items():
-                    for channel_id in channel_ids:
-                        try:
-                            channel = self.discord_client.get_channel(channel_id)
-                            async for message in channel.history(
-                                limit=self.config.max_posts_per_query
-                            ):
-                                try:
-                                    if self._matches_discord_filters(message):
-                                        post = await self._parse_discord_message(message)
-                                        if post and self._should_process_post(post):
-                                            self.post_cache['discord'].append(post)
-                                            self.metrics['discord_posts_collected'] += 1
-                                            yield post
-                                            
-                                except Exception as e:
-                                    logger.error(f"Error processing Discord message: {e}")
-                                    self.errors['discord'].append(str(e))
-                                    
-                        except Exception as e:
-                            logger.error(f"Error scraping Discord channel {channel_id}: {e}")
+    async def _scrape_telegram(
+        self,
+        channels: Optional[List] = None
+    ) -> AsyncGenerator[SocialPost, None]:
+        """Scrape crypto-related messages from a shard of Telegram channels."""
+        for channel in channels if channels is not None else self._get_telegram_channels():
+            try:
+                await self.rate_limiters['telegram'].acquire()
+                
+                async for message in self.telegram_client.iter_messages(
+                    channel,
+                    limit=self.config.max_posts_per_query,
+                    search=self._build_telegram_query()
+                ):
+                    try:
+                        post = await self._parse_telegram_message(message)
+                        if post:
+                            yield post
                             
-        except Exception as e:
-            logger.error(f"Error scraping Discord: {e}")
-            raise
+                    except Exception as e:
+                        logger.error(f"Error processing Telegram message: {e}")
+                        self.errors['telegram'].append(str(e))
+                        
+            except Exception as e:
+                logger.error(f"Error scraping Telegram channel {channel}: {e}")
+                self.errors['telegram'].append(str(e))
+
+    async def _scrape_discord(
+        self,
+        channel_ids: Optional[List] = None
+    ) -> AsyncGenerator[SocialPost, None]:
+        """Scrape crypto-related messages from a shard of Discord channels."""
+        if channel_ids is None:
+            channel_ids = [
+                channel_id
+                for ids in self._get_discord_channels().values()
+                for channel_id in ids
+            ]
+        
+        for channel_id in channel_ids:
+            try:
+                await self.rate_limiters['discord'].acquire()
+                channel = self.discord_client.get_channel(channel_id)
+                
+                async for message in channel.history(
+                    limit=self.config.max_posts_per_query
+                ):
+                    try:
+                        if self._matches_discord_filters(message):
+                            post = await self._parse_discord_message(message)
+                            if post:
+                                yield post
+                                
+                    except Exception as e:
+                        logger.error(f"Error processing Discord message: {e}")
+                        self.errors['discord'].append(str(e))
+                        
+            except Exception as e:
+                logger.error(f"Error scraping Discord channel {channel_id}: {e}")
+                self.errors['discord'].append(str(e))
 
     async def _parse_x_post(self, tweet: Dict) -> Optional[SocialPost]:
         """Parse Twitter post into standardized format."""
@@ -378,27 +643,45 @@ class SocialMediaScraper:
             logger.error(f"Error checking post processing criteria: {e}")
             return False
 
-    @staticmethod
-    async def _create_rate_limiter(rate: int):
-        """Create rate limiter context manager."""
-        lock = asyncio.Lock()
-        last_request = datetime.now()
-        interval = 1 / rate  # seconds per request
-        
-        class RateLimiter:
-            async def __aenter__(self):
-                async with lock:
-                    nonlocal last_request
-                    now = datetime.now()
-                    elapsed = (now - last_request).total_seconds()
-                    if elapsed < interval:
-                        await asyncio.sleep(interval - elapsed)
-                    last_request = datetime.now()
-                    
-            async def __aexit__(self, exc_type, exc_val, exc_tb):
-                pass
-                
-        return RateLimiter()
+    def _register_post(self, post: SocialPost) -> bool:
+        """
+        Register a post with duplicate tracking.
+        
+        Posts already seen by id (re-polled across scraping cycles) are
+        rejected. Content duplicates are kept, since they count towards
+        token and author statistics, but are annotated with their cluster
+        so downstream stages can reuse cached analysis.
+        
+        Returns:
+            True if the post is new and should be emitted
+        """
+        try:
+            seen = self.seen_post_ids[post.platform]
+            if post.post_id in seen:
+                seen.move_to_end(post.post_id)
+                self.metrics[f'{post.platform}_reposted_skipped'] += 1
+                return False
+            
+            seen[post.post_id] = True
+            if len(seen) > self.cache_size:
+                seen.popitem(last=False)
+            
+            match = self.deduplicator.observe(post.content, post.timestamp)
+            post.metadata['duplicate_cluster'] = match.cluster_id
+            post.metadata['duplicate_cluster_size'] = match.cluster_size
+            post.metadata['is_duplicate'] = match.is_duplicate
+            post.duplicate = match
+            if match.is_duplicate:
+                self.metrics[f'{post.platform}_duplicates'] += 1
+            
+            for token in post.token_references:
+                self.token_mentions[token][post.platform] += 1
+            
+            return True
+            
+        except Exception as e:
+            logger.error(f"Error registering post: {e}")
+            return True
 
     def get_scraping_stats(self) -> Dict:
         """Get current scraping statistics."""
@@ -412,7 +695,8 @@ class SocialMediaScraper:
                 platform: len(cache)
                 for platform, cache in self.post_cache.items()
             },
-            "token_mentions": dict(self.token_mentions)
+            "token_mentions": dict(self.token_mentions),
+            "deduplication": self.deduplicator.get_stats()
         }
 
 if __name__ == "__main__":
@@ -425,6 +709,7 @@ if __name__ == "__main__":
             platforms=["x", "telegram", "discord"],
             min_engagement=10,
             max_posts_per_query=100,
+            rate_limits={"x": 5, "telegram": 2, "discord": 2},
             blacklisted_sources=set([
                 "known_spam_account1",
                 "known_bot_account2"
@@ -460,13 +745,17 @@ if __name__ == "__main__":
             update_interval=60
         )
         
-        # Start scraping
+        def print_post(post, analysis):
+            print(f"New {post.platform} post: {post.content[:100]}...")
+            print(f"Engagement: {post.engagement}")
+            print(f"Token references: {post.token_references}")
+            print(f"Duplicate cluster size: {post.metadata.get('duplicate_cluster_size')}")
+            print("-" * 50)
+        
+        # Run a single scraping cycle
         try:
-            async for post in scraper._scrape_x():
-                print(f"New Twitter post: {post.content[:100]}...")
-                print(f"Engagement: {post.engagement}")
-                print(f"Token references: {post.token_references}")
-                print("-" * 50)
+            stats = await scraper.run_pipeline(sink=print_post)
+            print(f"Throughput: {stats['posts_per_second']:.1f} posts/s")
                 
         except Exception as e:
             print(f"Error during scraping: {e}")
@@ -8,9 +8,38 @@ including LSTM-based prediction and flash crash detection.
 Author: KADES Team
 License: Proprietary"""
 
-from .lstm_predictor import LSTMPredictor
-from .volatility_calculator import VolatilityCalculator
-from .flash_crash_detector import FlashCrashDetector
+from typing import TYPE_CHECKING
+from src._lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .lstm_predictor import LSTMPredictor
+    from .volatility_calculator import VolatilityCalculator
+    from .flash_crash_detector import FlashCrashDetector
+    from .window_aggregates import MARKET_TICK_DTYPE, MarketRing, RollingStats, TickWindowAggregator
+    from .streaming_indicators import StreamingIndicators
+    from .ohlcv_bars import BAR_DTYPE, BarAggregator, BarSeries
+    from .lstm_backends import LSTMInferenceBackend, create_lstm_backend
+    from .feature_store import RollingFeatureStore
+    from .training import MemmapWindowDataset, VolatilityTrainer
+    from .return_buffer import LogReturnBuffer
+    from .volatility_estimators import ESTIMATORS, GARCHParams, VolatilityEngine, fit_garch_batch
+    from .time_series_history import TimeSeriesHistory
+
+_LAZY_IMPORTS = {
+    '.lstm_predictor': ['LSTMPredictor'],
+    '.volatility_calculator': ['VolatilityCalculator'],
+    '.flash_crash_detector': ['FlashCrashDetector'],
+    '.window_aggregates': ['MARKET_TICK_DTYPE', 'MarketRing', 'RollingStats', 'TickWindowAggregator'],
+    '.streaming_indicators': ['StreamingIndicators'],
+    '.ohlcv_bars': ['BAR_DTYPE', 'BarAggregator', 'BarSeries'],
+    '.lstm_backends': ['LSTMInferenceBackend', 'create_lstm_backend'],
+    '.feature_store': ['RollingFeatureStore'],
+    '.training': ['MemmapWindowDataset', 'VolatilityTrainer'],
+    '.return_buffer': ['LogReturnBuffer'],
+    '.volatility_estimators': ['ESTIMATORS', 'GARCHParams', 'VolatilityEngine', 'fit_garch_batch'],
+    '.time_series_history': ['TimeSeriesHistory'],
+}
+__getattr__, __dir__ = lazy_exports(__name__, _LAZY_IMPORTS)
 
 __version__ = '1.0.0'
 __author__ = 'KADES Team'
@@ -20,6 +49,25 @@ __all__ = [
     'LSTMPredictor',
     'VolatilityCalculator',
     'FlashCrashDetector',
+    'MARKET_TICK_DTYPE',
+    'MarketRing',
+    'RollingStats',
+    'TickWindowAggregator',
+    'StreamingIndicators',
+    'BAR_DTYPE',
+    'BarAggregator',
+    'BarSeries',
+    'LSTMInferenceBackend',
+    'create_lstm_backend',
+    'RollingFeatureStore',
+    'MemmapWindowDataset',
+    'VolatilityTrainer',
+    'LogReturnBuffer',
+    'ESTIMATORS',
+    'GARCHParams',
+    'VolatilityEngine',
+    'fit_garch_batch',
+    'TimeSeriesHistory',
 ]
 
 # Model configuration
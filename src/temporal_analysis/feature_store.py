@@ -0,0 +1,203 @@
+"""
+Kinetic Anomaly Detection Engine System (KADES)
+Rolling Feature Store Module
+
+This module implements a per-token rolling feature store for the LSTM
+volatility predictor. Each update appends one observation, maintains the
+24-period rolling features incrementally and writes the scaled feature row
+into a mirrored float32 ring, so the latest sequence_length rows are always
+available as a contiguous zero-copy view laid out as the model expects.
+
+Author: KADES Team
+License: Proprietary
+"""
+
+from typing import Dict, Optional
+import logging
+import math
+
+import numpy as np
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Raw observation fields, matching the predictor's input DataFrame columns
+OBSERVATION_FIELDS = [
+    'price', 'volume',
+    'sentiment_score', 'engagement_score', 'spam_probability',
+    'accumulation_score', 'distribution_score', 'whale_count',
+    'avg_transaction_size', 'coordination_score'
+]
+
+# Model feature layout (price, sentiment and whale blocks)
+FEATURE_NAMES = [
+    'returns', 'volatility', 'volume_ratio', 'volume_std_zscore',
+    'sentiment_score', 'sentiment_ma', 'sentiment_std', 'engagement_ratio', 'spam_probability',
+    'accumulation_ratio', 'distribution_ratio', 'whale_count', 'avg_transaction_size',
+    'coordination_score'
+]
+
+# Columns of the rolling window
+_RETURNS, _VOLUME, _SENTIMENT, _ENGAGEMENT, _ACCUMULATION, _DISTRIBUTION = range(6)
+
+class RollingFeatureStore:
+    """
+    Incremental feature rows for a single token.
+
+    Rolling means and sample standard deviations over `window` periods are kept
+    as running sums, re-derived exactly every `window` updates to bound drift.
+    The volume-std z-score uses running (expanding) moments, since a z-score
+    over the full series is not defined incrementally. Features that are not
+    yet defined are NaN, as in the pandas pipeline.
+    """
+
+    def __init__(
+        self,
+        sequence_length: int = 100,
+        window: int = 24,
+        scale: Optional[np.ndarray] = None,
+        offset: Optional[np.ndarray] = None
+    ):
+        """
+        Initialize the store.
+
+        Args:
+            sequence_length: Rows in the model input window
+            window: Periods for the rolling features
+            scale: Per-feature scale applied to raw features (MinMaxScaler.scale_)
+            offset: Per-feature offset added after scaling (MinMaxScaler.min_)
+        """
+        self.sequence_length = sequence_length
+        self.window = window
+        self.num_features = len(FEATURE_NAMES)
+        self.scale = np.ones(self.num_features) if scale is None else np.asarray(scale, dtype=np.float64)
+        self.offset = np.zeros(self.num_features) if offset is None else np.asarray(offset, dtype=np.float64)
+
+        # Every row is written twice, at i and i + sequence_length, so the
+        # latest sequence_length rows are always contiguous
+        self.buffer = np.full((2 * sequence_length, self.num_features), np.nan, dtype=np.float32)
+        self.head = 0   # next write position in [0, sequence_length)
+        self.count = 0  # observations appended
+
+        # Rolling window of the inputs to the rolling features
+        self._values = np.zeros((window, 6))
+        self._sums = np.zeros(6)
+        self._squares = np.zeros(6)
+        self._last_price: Optional[float] = None
+
+        # Expanding moments of the rolling volume std
+        self._vstd_count = 0
+        self._vstd_mean = 0.0
+        self._vstd_m2 = 0.0
+
+    def __len__(self) -> int:
+        return min(self.count, self.sequence_length)
+
+    def window_view(self) -> np.ndarray:
+        """Latest rows, oldest first, as a contiguous view of the ring."""
+        rows = len(self)
+        end = self.head + self.sequence_length
+        return self.buffer[end - rows:end]
+
+    def append(self, observation: Dict[str, float]) -> np.ndarray:
+        """
+        Fold one observation into the rolling state and write its feature row.
+
+        Args:
+            observation: Values for every field in OBSERVATION_FIELDS
+
+        Returns:
+            The scaled feature row (a view into the ring)
+        """
+        price = float(observation['price'])
+        returns = price / self._last_price - 1 if self._last_price else math.nan
+        self._last_price = price
+
+        values = np.array([
+            0.0 if math.isnan(returns) else returns,
+            observation['volume'],
+            observation['sentiment_score'],
+            observation['engagement_score'],
+            observation['accumulation_score'],
+            observation['distribution_score']
+        ], dtype=np.float64)
+
+        slot = self.count % self.window
+        evicted = self._values[slot].copy()
+        self._values[slot] = values
+        self.count += 1
+
+        if self.count % self.window == 0:
+            self._sums = self._values.sum(axis=0)
+            self._squares = np.square(self._values).sum(axis=0)
+        else:
+            self._sums += values - evicted
+            self._squares += values * values - evicted * evicted
+
+        raw = self._feature_row(observation, values, returns)
+        row = (raw * self.scale + self.offset).astype(np.float32)
+
+        self.buffer[self.head] = row
+        self.buffer[self.head + self.sequence_length] = row
+        written = self.buffer[self.head + self.sequence_length]
+        self.head = (self.head + 1) % self.sequence_length
+        return written
+
+    def set_scaling(self, scale: np.ndarray, offset: np.ndarray) -> None:
+        """Replace the feature scaling, rescaling rows already in the ring."""
+        scale = np.asarray(scale, dtype=np.float64)
+        offset = np.asarray(offset, dtype=np.float64)
+        raw = (self.buffer - self.offset) / self.scale
+        self.buffer[:] = raw * scale + offset
+        self.scale, self.offset = scale, offset
+
+    def _feature_row(self, observation: Dict[str, float], values: np.ndarray, returns: float) -> np.ndarray:
+        """Raw (unscaled) feature row for the latest observation."""
+        n = self.window
+        full = self.count >= n
+        means = self._sums / n
+        with np.errstate(invalid='ignore', divide='ignore'):
+            stds = np.sqrt(np.maximum(self._squares - self._sums * means, 0.0) / (n - 1))
+
+            # Returns start one observation late
+            volatility = stds[_RETURNS] if self.count > n else math.nan
+            volume_ratio = values[_VOLUME] / means[_VOLUME] if full else math.nan
+            volume_std = stds[_VOLUME] if full else math.nan
+            volume_zscore = self._volume_std_zscore(volume_std)
+
+            row = np.array([
+                returns,
+                volatility,
+                volume_ratio,
+                volume_zscore,
+                values[_SENTIMENT],
+                means[_SENTIMENT] if full else math.nan,
+                stds[_SENTIMENT] if full else math.nan,
+                values[_ENGAGEMENT] / means[_ENGAGEMENT] if full else math.nan,
+                observation['spam_probability'],
+                values[_ACCUMULATION] / means[_ACCUMULATION] if full else math.nan,
+                values[_DISTRIBUTION] / means[_DISTRIBUTION] if full else math.nan,
+                observation['whale_count'],
+                observation['avg_transaction_size'],
+                observation['coordination_score']
+            ], dtype=np.float64)
+        return row
+
+    def _volume_std_zscore(self, volume_std: float) -> float:
+        """Z-score of the rolling volume std against its expanding moments."""
+        if math.isnan(volume_std):
+            return math.nan
+
+        self._vstd_count += 1
+        delta = volume_std - self._vstd_mean
+        self._vstd_mean += delta / self._vstd_count
+        self._vstd_m2 += delta * (volume_std - self._vstd_mean)
+
+        std = math.sqrt(self._vstd_m2 / self._vstd_count)
+        if std == 0:
+            return math.nan
+        return (volume_std - self._vstd_mean) / std
@@ -12,12 +12,22 @@ License: Proprietary
 import numpy as np
 import pandas as pd
 from dataclasses import dataclass, field
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple, Union
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple, Union
 import logging
 from collections import defaultdict, deque
+from itertools import islice
 from scipy.stats import zscore
 import warnings
+import json
+
+from .window_aggregates import (
+    MARKET_TICK_DTYPE,
+    MarketRing,
+    RollingStats,
+    TickWindowAggregator,
+    WindowStats
+)
 warnings.filterwarnings('ignore')
 
 # Configure logging
@@ -68,7 +78,9 @@ class FlashCrashDetector:
         },
         volume_threshold: float = 3.0,  # 3x normal volume
         update_interval: int = 5,       # 5 seconds
-        min_data_points: int = 100
+        min_data_points: int = 100,
+        history_size: int = 10000,
+        batch_slots: int = 512
     ):
         """
         Initialize the flash crash detector.
@@ -79,16 +91,19 @@ class FlashCrashDetector:
             volume_threshold: Volume surge threshold multiplier
             update_interval: Update interval in seconds
             min_data_points: Minimum data points for analysis
+            history_size: Ticks retained per token for baselines and windows
+            batch_slots: Ticks retained per token by the batched market ring
         """
         self.time_windows = time_windows
         self.price_thresholds = price_thresholds
         self.volume_threshold = volume_threshold
         self.update_interval = update_interval
         self.min_data_points = min_data_points
+        self.history_size = history_size
         
         # Data structures
         self.market_conditions: Dict[str, deque] = defaultdict(
-            lambda: deque(maxlen=10000)
+            lambda: deque(maxlen=history_size)
         )
         self.alerts: Dict[str, List[FlashCrashAlert]] = defaultdict(list)
         self.recovery_tracking: Dict[str, Dict] = defaultdict(dict)
@@ -97,6 +112,22 @@ class FlashCrashDetector:
         self.price_baselines: Dict[str, Dict] = defaultdict(dict)
         self.volume_baselines: Dict[str, Dict] = defaultdict(dict)
         
+        # Incremental aggregates, updated once per tick
+        self.window_aggregates: Dict[str, TickWindowAggregator] = defaultdict(
+            lambda: TickWindowAggregator(self.time_windows, capacity=history_size)
+        )
+        self.price_stats: Dict[str, RollingStats] = defaultdict(
+            lambda: RollingStats(history_size)
+        )
+        self.volume_stats: Dict[str, RollingStats] = defaultdict(
+            lambda: RollingStats(history_size)
+        )
+        
+        # Batched multi-token state for monitor_markets
+        self.market_ring = MarketRing(slots=batch_slots)
+        self.token_registry: List[str] = []
+        self.token_ids: Dict[str, int] = {}
+        
         # Feature windows for pattern recognition
         self.pattern_windows: Dict[str, deque] = defaultdict(
             lambda: deque(maxlen=1000)
@@ -150,34 +181,242 @@ class FlashCrashDetector:
             logger.error(f"Error monitoring market: {e}")
             return None
 
+    async def monitor_markets(
+        self,
+        conditions: np.ndarray
+    ) -> List[FlashCrashAlert]:
+        """
+        Monitor many tokens at once for flash crash conditions.
+        
+        Ticks are written into a 2-D (tokens x slots) ring and drawdown,
+        volume-surge and liquidity-impact thresholds are evaluated for every
+        touched token with array operations; alert objects are only built for
+        tokens that trip. This path keeps its own ring, separate from the
+        per-token state used by monitor_market.
+        
+        Args:
+            conditions: Structured array of MARKET_TICK_DTYPE, or a 2-D array
+                with columns (token_id, price, volume, liquidity, ts); token ids
+                come from register_tokens and ts is in epoch seconds
+            
+        Returns:
+            Flash crash alerts for tokens that tripped a threshold
+        """
+        try:
+            ticks = self._as_market_ticks(conditions)
+            touched = self.market_ring.append(ticks)
+            if len(touched) == 0:
+                return []
+            
+            # Tokens with enough history
+            touched = touched[self.market_ring.counts[touched] >= self.min_data_points]
+            if len(touched) == 0:
+                return []
+            
+            metrics = self._evaluate_windows(touched)
+            
+            # First window (in configured order) that trips per token
+            tripped = metrics['severity'] > 0
+            alerting = np.flatnonzero(tripped.any(axis=0))
+            first_window = np.argmax(tripped, axis=0)
+            
+            alerts = []
+            for column in alerting:
+                alert = self._build_batch_alert(metrics, column, first_window[column])
+                self._update_recovery_tracking(alert.token_address, alert)
+                self.alerts[alert.token_address].append(alert)
+                alerts.append(alert)
+            
+            # Update recovery metrics for tokens being monitored
+            alerted = set(alerting.tolist())
+            for column, token_id in enumerate(touched):
+                token_address = self.token_registry[token_id]
+                if column not in alerted and token_address in self.recovery_tracking:
+                    self._monitor_recovery(token_address, MarketCondition(
+                        price=float(metrics['price'][column]),
+                        volume=float(metrics['volume'][column]),
+                        liquidity=float(metrics['liquidity'][column]),
+                        volatility=0.0,
+                        sentiment_score=0.0,
+                        timestamp=datetime.fromtimestamp(metrics['ts'][column])
+                    ))
+            
+            return alerts
+            
+        except Exception as e:
+            logger.error(f"Error monitoring markets: {e}")
+            return []
+
+    def register_tokens(self, token_addresses: Sequence[str]) -> np.ndarray:
+        """Get (assigning if needed) ring token ids for token addresses."""
+        ids = []
+        for token_address in token_addresses:
+            token_id = self.token_ids.get(token_address)
+            if token_id is None:
+                token_id = self.token_ids[token_address] = len(self.token_registry)
+                self.token_registry.append(token_address)
+            ids.append(token_id)
+        self.market_ring.ensure_rows(len(self.token_registry))
+        return np.array(ids, dtype=np.int64)
+
+    def _as_market_ticks(self, conditions: np.ndarray) -> np.ndarray:
+        """Coerce batch input to a MARKET_TICK_DTYPE structured array."""
+        conditions = np.asarray(conditions)
+        if conditions.dtype.names is None:
+            conditions = np.atleast_2d(conditions)
+            ticks = np.empty(len(conditions), dtype=MARKET_TICK_DTYPE)
+            for i, name in enumerate(MARKET_TICK_DTYPE.names):
+                ticks[name] = conditions[:, i]
+        else:
+            ticks = conditions.astype(MARKET_TICK_DTYPE, copy=False)
+        
+        if len(ticks) and ticks['token_id'].max() >= len(self.token_registry):
+            raise ValueError("Unknown token id, register tokens first")
+        return ticks
+
+    def _evaluate_windows(self, rows: np.ndarray) -> Dict[str, np.ndarray]:
+        """Evaluate every configured window for the given ring rows."""
+        ring = self.market_ring
+        ts = ring.ts[rows]
+        prices = ring.price[rows]
+        volumes = ring.volume[rows]
+        liquidity = ring.liquidity[rows]
+        
+        columns = np.arange(len(rows))
+        latest = ring.latest_slots(rows)
+        now = ts[columns, latest]
+        current_price = prices[columns, latest]
+        current_volume = volumes[columns, latest]
+        current_liquidity = liquidity[columns, latest]
+        
+        shape = (len(self.time_windows), len(rows))
+        price_change = np.zeros(shape)
+        volume_surge = np.zeros(shape)
+        liquidity_impact = np.zeros(shape)
+        starts = np.zeros(shape, dtype=np.int64)
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            for k, window in enumerate(self.time_windows):
+                # NaN timestamps of unwritten slots never satisfy the mask
+                in_window = ts >= (now - window)[:, None]
+                start = np.argmin(np.where(in_window, ts, np.inf), axis=1)
+                count = in_window.sum(axis=1)
+                
+                start_price = prices[columns, start]
+                price_change[k] = np.where(
+                    start_price > 0, (current_price - start_price) / start_price, 0.0
+                )
+                
+                baseline_volume = (
+                    np.where(in_window, volumes, 0.0).sum(axis=1) - current_volume
+                ) / np.maximum(count - 1, 1)
+                volume_surge[k] = np.where(
+                    (count > 1) & (baseline_volume != 0),
+                    current_volume / baseline_volume,
+                    0.0
+                )
+                
+                start_liquidity = liquidity[columns, start]
+                liquidity_impact[k] = np.where(
+                    start_liquidity != 0,
+                    (current_liquidity - start_liquidity) / start_liquidity,
+                    0.0
+                )
+                starts[k] = start
+        
+        severity = np.select(
+            [
+                price_change <= self.price_thresholds['critical'],
+                price_change <= self.price_thresholds['severe'],
+                price_change <= self.price_thresholds['warning']
+            ],
+            [3, 2, 1],
+            default=0
+        )
+        
+        return {
+            'rows': rows,
+            'ts': now,
+            'price': current_price,
+            'volume': current_volume,
+            'liquidity': current_liquidity,
+            'price_change': price_change,
+            'volume_surge': volume_surge,
+            'liquidity_impact': liquidity_impact,
+            'starts': starts,
+            'severity': severity
+        }
+
+    def _build_batch_alert(
+        self,
+        metrics: Dict[str, np.ndarray],
+        column: int,
+        window_index: int
+    ) -> FlashCrashAlert:
+        """Build the alert for one tripped token of a batch evaluation."""
+        row = metrics['rows'][column]
+        window = self.time_windows[window_index]
+        price_change = float(metrics['price_change'][window_index, column])
+        volume_surge = float(metrics['volume_surge'][window_index, column])
+        liquidity_impact = float(metrics['liquidity_impact'][window_index, column])
+        
+        # Window ticks in time order, for pattern checks
+        ts = self.market_ring.ts[row]
+        in_window = np.flatnonzero(ts >= metrics['ts'][column] - window)
+        in_window = in_window[np.argsort(ts[in_window])]
+        prices = self.market_ring.price[row, in_window]
+        volumes = self.market_ring.volume[row, in_window]
+        
+        warnings = self._threshold_warnings(price_change, volume_surge, liquidity_impact)
+        if self._detect_price_volume_manipulation(prices, volumes):
+            warnings.append("POTENTIAL_MANIPULATION")
+        
+        return FlashCrashAlert(
+            token_address=self.token_registry[row],
+            timestamp=datetime.now(),
+            severity=('WARNING', 'SEVERE', 'CRITICAL')[metrics['severity'][window_index, column] - 1],
+            price_change=price_change,
+            time_frame=window,
+            volume_surge=volume_surge,
+            liquidity_impact=liquidity_impact,
+            warning_signals=warnings,
+            contributing_factors={
+                'price_impact': min(1.0, abs(price_change)),
+                'volume_impact': min(1.0, volume_surge / 5.0),
+                'liquidity_impact': min(1.0, abs(liquidity_impact))
+            }
+        )
+
     def _check_flash_crash_conditions(
         self,
         token_address: str
     ) -> Optional[FlashCrashAlert]:
         """Check for flash crash conditions across time windows."""
         try:
-            conditions = list(self.market_conditions[token_address])
-            current_price = conditions[-1].price
+            aggregator = self.window_aggregates[token_address]
+            current = self.market_conditions[token_address][-1]
             
             for window in self.time_windows:
-                # Get window data
-                window_data = self._get_window_data(conditions, window)
-                if not window_data:
+                # Get window aggregates
+                stats = aggregator.stats(window)
+                if stats is None or stats.start_price <= 0:
                     continue
                 
                 # Calculate price change
-                start_price = window_data[0].price
-                price_change = (current_price - start_price) / start_price
-                
-                # Check volume surge
-                volume_surge = self._calculate_volume_surge(window_data)
-                
-                # Check liquidity impact
-                liquidity_impact = self._calculate_liquidity_impact(window_data)
+                price_change = (current.price - stats.start_price) / stats.start_price
                 
                 # Check against thresholds
                 severity = self._determine_severity(price_change)
                 if severity:
+                    # Check volume surge
+                    volume_surge = self._calculate_volume_surge(stats, current.volume)
+                    
+                    # Check liquidity impact
+                    liquidity_impact = self._calculate_liquidity_impact(stats, current.liquidity)
+                    
+                    # Materialize the window only for alert details
+                    window_data = self._get_window_data(token_address, stats.count)
+                    
                     # Generate warning signals
                     warnings = self._generate_warning_signals(
                         price_change,
@@ -228,12 +467,14 @@ class FlashCrashDetector:
 
     def _calculate_volume_surge(
         self,
-        window_data: List[MarketCondition]
+        stats: WindowStats,
+        current_volume: float
     ) -> float:
-        """Calculate volume surge multiple."""
+        """Calculate volume surge multiple against the rest of the window."""
         try:
-            current_volume = window_data[-1].volume
-            baseline_volume = np.mean([d.volume for d in window_data[:-1]])
+            if stats.count < 2:
+                return 0.0
+            baseline_volume = (stats.volume_sum - current_volume) / (stats.count - 1)
             
             if baseline_volume == 0:
                 return 0.0
@@ -246,12 +487,12 @@ class FlashCrashDetector:
 
     def _calculate_liquidity_impact(
         self,
-        window_data: List[MarketCondition]
+        stats: WindowStats,
+        end_liquidity: float
     ) -> float:
         """Calculate liquidity impact of price movement."""
         try:
-            start_liquidity = window_data[0].liquidity
-            end_liquidity = window_data[-1].liquidity
+            start_liquidity = stats.start_liquidity
             
             if start_liquidity == 0:
                 return 0.0
@@ -271,25 +512,7 @@ class FlashCrashDetector:
     ) -> List[str]:
         """Generate warning signals based on market conditions."""
         try:
-            warnings = []
-            
-            # Price-based warnings
-            if price_change <= -0.5:
-                warnings.append("EXTREME_PRICE_DROP")
-            elif price_change <= -0.3:
-                warnings.append("SEVERE_PRICE_DROP")
-                
-            # Volume-based warnings
-            if volume_surge >= 5.0:
-                warnings.append("EXTREME_VOLUME_SURGE")
-            elif volume_surge >= 3.0:
-                warnings.append("HIGH_VOLUME_SURGE")
-                
-            # Liquidity-based warnings
-            if liquidity_impact <= -0.5:
-                warnings.append("SEVERE_LIQUIDITY_LOSS")
-            elif liquidity_impact <= -0.3:
-                warnings.append("SIGNIFICANT_LIQUIDITY_LOSS")
+            warnings = self._threshold_warnings(price_change, volume_surge, liquidity_impact)
                 
             # Pattern-based warnings
             if self._detect_manipulation_pattern(window_data):
@@ -306,6 +529,35 @@ class FlashCrashDetector:
             logger.error(f"Error generating warning signals: {e}")
             return ["ERROR_GENERATING_WARNINGS"]
 
+    def _threshold_warnings(
+        self,
+        price_change: float,
+        volume_surge: float,
+        liquidity_impact: float
+    ) -> List[str]:
+        """Generate price, volume and liquidity threshold warnings."""
+        warnings = []
+        
+        # Price-based warnings
+        if price_change <= -0.5:
+            warnings.append("EXTREME_PRICE_DROP")
+        elif price_change <= -0.3:
+            warnings.append("SEVERE_PRICE_DROP")
+            
+        # Volume-based warnings
+        if volume_surge >= 5.0:
+            warnings.append("EXTREME_VOLUME_SURGE")
+        elif volume_surge >= 3.0:
+            warnings.append("HIGH_VOLUME_SURGE")
+            
+        # Liquidity-based warnings
+        if liquidity_impact <= -0.5:
+            warnings.append("SEVERE_LIQUIDITY_LOSS")
+        elif liquidity_impact <= -0.3:
+            warnings.append("SIGNIFICANT_LIQUIDITY_LOSS")
+        
+        return warnings
+
     def _analyze_contributing_factors(
         self,
         window_data: List[MarketCondition],
@@ -354,6 +606,19 @@ class FlashCrashDetector:
             prices = np.array([d.price for d in window_data])
             volumes = np.array([d.volume for d in window_data])
             
+            return self._detect_price_volume_manipulation(prices, volumes)
+            
+        except Exception as e:
+            logger.error(f"Error detecting manipulation pattern: {e}")
+            return False
+
+    def _detect_price_volume_manipulation(
+        self,
+        prices: np.ndarray,
+        volumes: np.ndarray
+    ) -> bool:
+        """Detect manipulation patterns in aligned price and volume sequences."""
+        try:
             # Check for pump and dump pattern
             price_changes = np.diff(prices) / prices[:-1]
             volume_changes = np.diff(volumes) / volumes[:-1]
@@ -498,6 +763,18 @@ class FlashCrashDetector:
         try:
             self.market_conditions[token_address].append(condition)
             
+            # Advance incremental window aggregates and baselines
+            self.window_aggregates[token_address].push(
+                condition.timestamp.timestamp(),
+                condition.price,
+                condition.volume,
+                condition.liquidity,
+                condition.volatility,
+                condition.sentiment_score
+            )
+            self.price_stats[token_address].push(condition.price)
+            self.volume_stats[token_address].push(condition.volume)
+            
             # Update pattern windows
             self._update_pattern_windows(token_address, condition)
             
@@ -522,24 +799,22 @@ class FlashCrashDetector:
             logger.error(f"Error updating pattern windows: {e}")
 
     def _update_baselines(self, token_address: str) -> None:
-        """Update statistical baselines."""
+        """Update statistical baselines from the rolling statistics."""
         try:
-            conditions = list(self.market_conditions[token_address])
-            
             # Update price baselines
-            prices = [c.price for c in conditions]
+            prices = self.price_stats[token_address]
             self.price_baselines[token_address] = {
-                'mean': float(np.mean(prices)),
-                'std': float(np.std(prices)),
-                'median': float(np.median(prices))
+                'mean': prices.mean,
+                'std': prices.std,
+                'median': prices.median
             }
             
             # Update volume baselines
-            volumes = [c.volume for c in conditions]
+            volumes = self.volume_stats[token_address]
             self.volume_baselines[token_address] = {
-                'mean': float(np.mean(volumes)),
-                'std': float(np.std(volumes)),
-                'median': float(np.median(volumes))
+                'mean': volumes.mean,
+                'std': volumes.std,
+                'median': volumes.median
             }
             
         except Exception as e:
@@ -547,18 +822,15 @@ class FlashCrashDetector:
 
     def _get_window_data(
         self,
-        conditions: List[MarketCondition],
-        window: int
+        token_address: str,
+        count: int
     ) -> List[MarketCondition]:
-        """Get market conditions for specific time window."""
+        """Get the most recent `count` market conditions, oldest first."""
         try:
-            current_time = conditions[-1].timestamp
-            window_start = current_time - timedelta(seconds=window)
-            
-            return [
-                c for c in conditions
-                if c.timestamp >= window_start
-            ]
+            conditions = self.market_conditions[token_address]
+            window_data = list(islice(reversed(conditions), count))
+            window_data.reverse()
+            return window_data
             
         except Exception as e:
             logger.error(f"Error getting window data: {e}")
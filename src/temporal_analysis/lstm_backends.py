@@ -0,0 +1,205 @@
+"""
+Kinetic Anomaly Detection Engine System (KADES)
+LSTM Inference Backends Module
+
+This module implements pluggable CPU inference backends for the LSTM
+volatility model. Batches of feature windows can run eagerly, as a traced
+TorchScript graph or through ONNX Runtime, optionally with int8 dynamic
+quantization of the LSTM and linear layers.
+
+Author: KADES Team
+License: Proprietary
+"""
+
+import torch
+import torch.nn as nn
+from abc import ABC, abstractmethod
+from typing import Dict, Optional
+import numpy as np
+import logging
+import os
+import tempfile
+from src.sentiment_analysis.inference_backends import (
+    SUPPORTED_BACKENDS,
+    quantize_linear_layers,
+    quantize_onnx_model,
+    torchscript_exporter
+)
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+class PredictionHead(nn.Module):
+    """Wraps the LSTM model so the exported graph returns predictions only"""
+
+    def __init__(self, model: nn.Module):
+        super().__init__()
+        self.model = model
+
+    def forward(self, x: torch.Tensor) -> torch.Tensor:
+        predictions, _ = self.model(x)
+        return predictions
+
+class LSTMInferenceBackend(ABC):
+    """Interface shared by all LSTM inference backends"""
+
+    name = 'base'
+
+    @abstractmethod
+    def predict(self, windows: torch.Tensor) -> torch.Tensor:
+        """Map a (batch, sequence_length, features) float32 tensor to (batch, outputs) predictions."""
+
+    def describe(self) -> Dict:
+        """Describe the backend configuration."""
+        return {'backend': self.name, 'quantized': getattr(self, 'quantize', False)}
+
+class EagerLSTMBackend(LSTMInferenceBackend):
+    """Eager PyTorch execution, optionally with int8 dynamic quantization"""
+
+    name = 'eager'
+
+    def __init__(self, model: nn.Module, quantize: bool = False):
+        self.quantize = quantize
+        self.head = PredictionHead(model)
+        if quantize:
+            self.head = quantize_lstm_layers(self.head)
+
+    @torch.no_grad()
+    def predict(self, windows: torch.Tensor) -> torch.Tensor:
+        # Eval mode is set per call since the wrapped model may be trained in place
+        self.head.eval()
+        return self.head(windows)
+
+class TorchScriptLSTMBackend(LSTMInferenceBackend):
+    """Traced and frozen TorchScript graph for CPU inference"""
+
+    name = 'torchscript'
+
+    def __init__(
+        self,
+        model: nn.Module,
+        sequence_length: int,
+        input_size: int,
+        quantize: bool = False,
+        export_dir: Optional[str] = None
+    ):
+        self.quantize = quantize
+        head = PredictionHead(model).eval().cpu()
+        if quantize:
+            head = quantize_lstm_layers(head)
+
+        with torch.no_grad():
+            traced = torch.jit.trace(head, torch.zeros(2, sequence_length, input_size))
+        self.graph = torch.jit.freeze(traced)
+
+        if export_dir:
+            os.makedirs(export_dir, exist_ok=True)
+            suffix = '_int8' if quantize else ''
+            torch.jit.save(self.graph, os.path.join(export_dir, f'volatility_lstm{suffix}.pt'))
+
+    @torch.no_grad()
+    def predict(self, windows: torch.Tensor) -> torch.Tensor:
+        return self.graph(windows.cpu())
+
+class ONNXLSTMBackend(LSTMInferenceBackend):
+    """ONNX Runtime execution of the exported LSTM graph"""
+
+    name = 'onnx'
+
+    def __init__(
+        self,
+        model: nn.Module,
+        sequence_length: int,
+        input_size: int,
+        quantize: bool = False,
+        export_dir: Optional[str] = None,
+        num_threads: Optional[int] = None
+    ):
+        try:
+            import onnxruntime as ort
+        except ImportError as e:
+            raise ImportError(
+                "The 'onnx' inference backend requires onnxruntime; "
+                "install it or select the 'eager' or 'torchscript' backend"
+            ) from e
+
+        self.quantize = quantize
+        self.export_dir = export_dir or tempfile.mkdtemp(prefix='kades_lstm_onnx_')
+        os.makedirs(self.export_dir, exist_ok=True)
+
+        model_path = os.path.join(self.export_dir, 'volatility_lstm.onnx')
+        head = PredictionHead(model).eval().cpu()
+        with torch.no_grad():
+            torch.onnx.export(
+                head,
+                (torch.zeros(2, sequence_length, input_size),),
+                model_path,
+                input_names=['windows'],
+                output_names=['predictions'],
+                dynamic_axes={'windows': {0: 'batch'}, 'predictions': {0: 'batch'}},
+                opset_version=14,
+                **torchscript_exporter()
+            )
+
+        if quantize:
+            model_path = quantize_onnx_model(model_path)
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+
+        self.session = ort.InferenceSession(model_path, options, providers=['CPUExecutionProvider'])
+
+    def predict(self, windows: torch.Tensor) -> torch.Tensor:
+        (predictions,) = self.session.run(
+            None,
+            {'windows': windows.detach().cpu().numpy().astype(np.float32, copy=False)}
+        )
+        return torch.from_numpy(predictions)
+
+def quantize_lstm_layers(module: nn.Module) -> nn.Module:
+    """Apply int8 dynamic quantization to the LSTM and Linear layers of a CPU module."""
+    return quantize_linear_layers(module, (nn.LSTM, nn.Linear))
+
+def create_lstm_backend(
+    name: str,
+    model: nn.Module,
+    sequence_length: int,
+    input_size: int,
+    quantize: bool = False,
+    export_dir: Optional[str] = None,
+    num_threads: Optional[int] = None
+) -> LSTMInferenceBackend:
+    """
+    Build an inference backend for the LSTM volatility model.
+
+    The unquantized eager backend runs the live model; the other backends
+    capture the weights at build time and must be rebuilt after training.
+
+    Args:
+        name: One of 'eager', 'torchscript' or 'onnx'
+        model: LSTMModel instance
+        sequence_length: Window length used for tracing/export
+        input_size: Features per time step
+        quantize: Apply int8 dynamic quantization (CPU only)
+        export_dir: Directory for exported graphs
+        num_threads: Intra-op threads for ONNX Runtime
+
+    Returns:
+        Configured LSTMInferenceBackend
+    """
+    if name not in SUPPORTED_BACKENDS:
+        raise ValueError(f"Unknown inference backend '{name}', expected one of {SUPPORTED_BACKENDS}")
+
+    if name == 'eager':
+        return EagerLSTMBackend(model, quantize=quantize)
+    if name == 'torchscript':
+        return TorchScriptLSTMBackend(model, sequence_length, input_size,
+                                      quantize=quantize, export_dir=export_dir)
+    return ONNXLSTMBackend(model, sequence_length, input_size, quantize=quantize,
+                           export_dir=export_dir, num_threads=num_threads)
@@ -14,7 +14,9 @@ import pandas as pd
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple, Union
 import logging
+from collections import defaultdict
 from dataclasses import dataclass
+import asyncio
 import json
 
 import torch
@@ -24,6 +26,9 @@ from torch.utils.data import Dataset, DataLoader
 from sklearn.preprocessing import MinMaxScaler
 from scipy.stats import zscore
 
+from .feature_store import RollingFeatureStore
+from .lstm_backends import LSTMInferenceBackend, create_lstm_backend
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -31,6 +36,12 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Model input layout: price, sentiment and whale feature blocks
+PRICE_FEATURES = 4
+SENTIMENT_FEATURES = 5
+WHALE_FEATURES = 5
+INPUT_SIZE = PRICE_FEATURES + SENTIMENT_FEATURES + WHALE_FEATURES
+
 @dataclass
 class PredictionResult:
     """Results from volatility prediction"""
@@ -148,25 +159,21 @@ class VolatilityDataset(Dataset):
         whale_data: np.ndarray,
         sequence_length: int
     ):
-        self.price_data = torch.FloatTensor(price_data)
-        self.sentiment_data = torch.FloatTensor(sentiment_data)
-        self.whale_data = torch.FloatTensor(whale_data)
+        # Combine features once; samples are views into this tensor
+        self.features = torch.FloatTensor(
+            np.concatenate((price_data, sentiment_data, whale_data), axis=1)
+        )
         self.sequence_length = sequence_length
 
     def __len__(self) -> int:
-        return len(self.price_data) - self.sequence_length
+        return len(self.features) - self.sequence_length
 
     def __getitem__(self, idx: int) -> Tuple[torch.Tensor, torch.Tensor]:
         """Get sequence of data and target."""
-        x_price = self.price_data[idx:idx + self.sequence_length]
-        x_sentiment = self.sentiment_data[idx:idx + self.sequence_length]
-        x_whale = self.whale_data[idx:idx + self.sequence_length]
-        
-        # Combine features
-        x = torch.cat((x_price, x_sentiment, x_whale), dim=1)
+        x = self.features[idx:idx + self.sequence_length]
         
         # Target is the next timeframe's volatility
-        y = self.price_data[idx + self.sequence_length, 0]
+        y = self.features[idx + self.sequence_length, 0]
         
         return x, y
 
@@ -181,7 +188,10 @@ class VolatilityPredictor:
         sequence_length: int = 100,
         prediction_window: int = 24,  # Hours
         update_interval: int = 300,  # 5 minutes
-        confidence_threshold: float = 0.7
+        confidence_threshold: float = 0.7,
+        backend: str = 'eager',
+        quantize: bool = False,
+        max_batch_size: int = 128
     ):
         """
         Initialize the volatility predictor.
@@ -191,11 +201,15 @@ class VolatilityPredictor:
             prediction_window: Future window to predict in hours
             update_interval: Update interval in seconds
             confidence_threshold: Minimum confidence for predictions
+            backend: Inference backend ('eager', 'torchscript' or 'onnx')
+            quantize: Run inference with int8 dynamic quantization (CPU only)
+            max_batch_size: Maximum windows per forward pass
         """
         self.sequence_length = sequence_length
         self.prediction_window = prediction_window
         self.update_interval = update_interval
         self.confidence_threshold = confidence_threshold
+        self.max_batch_size = max_batch_size
         
         # Initialize scalers
         self.price_scaler = MinMaxScaler()
@@ -204,12 +218,17 @@ class VolatilityPredictor:
         
         # Initialize model
         self.model = LSTMModel(
-            input_size=15,  # Combined features
+            input_size=INPUT_SIZE,  # Combined features
             hidden_size=64,
             num_layers=2,
             output_size=1
         )
         
+        # Inference backend over the model
+        self.backend_name = backend
+        self.quantize = quantize
+        self.backend: LSTMInferenceBackend = self.build_backend()
+        
         # Initialize optimizer
         self.optimizer = optim.Adam(self.model.parameters())
         self.criterion = nn.MSELoss()
@@ -224,6 +243,32 @@ class VolatilityPredictor:
         
         # Warning signals tracking
         self.active_warnings: Dict[str, List[str]] = defaultdict(list)
+        
+        # Latest multi-token predictions
+        self.token_predictions: Dict[str, PredictionResult] = {}
+        
+        # Per-token rolling feature rows for streaming updates
+        self.feature_stores: Dict[str, RollingFeatureStore] = defaultdict(
+            lambda: RollingFeatureStore(
+                sequence_length=self.sequence_length,
+                window=24,
+                **self._feature_scaling()
+            )
+        )
+
+    def build_backend(self) -> LSTMInferenceBackend:
+        """
+        (Re)build the inference backend from the current model weights.
+        Call after training when using a torchscript, onnx or quantized backend.
+        """
+        self.backend = create_lstm_backend(
+            self.backend_name,
+            self.model,
+            sequence_length=self.sequence_length,
+            input_size=INPUT_SIZE,
+            quantize=self.quantize
+        )
+        return self.backend
 
     async def update_prediction(
         self,
@@ -254,25 +299,7 @@ class VolatilityPredictor:
             # Make prediction
             prediction = self._make_prediction(X_combined)
             
-            # Calculate confidence
-            confidence = self._calculate_prediction_confidence(prediction, X_combined)
-            
-            # Analyze contributing factors
-            factors = self._analyze_contributing_factors(X_combined)
-            
-            # Generate warning signals
-            warnings = self._generate_warning_signals(prediction, factors)
-            
-            # Create prediction result
-            result = PredictionResult(
-                timestamp=datetime.now(),
-                predicted_volatility=float(prediction),
-                confidence_score=confidence,
-                contributing_factors=factors,
-                risk_level=self._calculate_risk_level(prediction, confidence),
-                warning_signals=warnings,
-                supporting_metrics=self._calculate_supporting_metrics(X_combined)
-            )
+            result = self._build_result(prediction, X_combined)
             
             # Update tracking
             self.prediction_history.append(result)
@@ -284,6 +311,165 @@ class VolatilityPredictor:
             logger.error(f"Error updating prediction: {e}")
             raise
 
+    async def update_predictions(
+        self,
+        token_data: Dict[str, Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]]
+    ) -> Dict[str, PredictionResult]:
+        """
+        Predict volatility for many tokens with batched forward passes.
+        
+        Args:
+            token_data: Token address -> (price_data, sentiment_data, whale_data)
+            
+        Returns:
+            Prediction result per token
+        """
+        try:
+            features = {}
+            for token_address, (price_data, sentiment_data, whale_data) in token_data.items():
+                features[token_address] = np.concatenate((
+                    self._preprocess_price_data(price_data),
+                    self._preprocess_sentiment_data(sentiment_data),
+                    self._preprocess_whale_data(whale_data)
+                ), axis=1)
+            
+            predictions = self.predict_batch(features)
+            
+            results = {
+                token_address: self._build_result(predictions[token_address], X_combined)
+                for token_address, X_combined in features.items()
+            }
+            self.token_predictions.update(results)
+            return results
+            
+        except Exception as e:
+            logger.error(f"Error updating batch predictions: {e}")
+            raise
+
+    async def update_token_predictions(
+        self,
+        observations: Dict[str, Dict[str, float]]
+    ) -> Dict[str, PredictionResult]:
+        """
+        Append one observation per token to its feature store and predict
+        every updated token from the stored windows.
+        
+        Args:
+            observations: Token address -> values for each OBSERVATION_FIELDS entry
+            
+        Returns:
+            Prediction result per token
+        """
+        try:
+            for token_address, observation in observations.items():
+                self.feature_stores[token_address].append(observation)
+            
+            windows = {
+                token_address: self.feature_stores[token_address].window_view()
+                for token_address in observations
+            }
+            predictions = self.predict_batch(windows)
+            
+            results = {
+                token_address: self._build_result(predictions[token_address], X_combined)
+                for token_address, X_combined in windows.items()
+            }
+            self.token_predictions.update(results)
+            return results
+            
+        except Exception as e:
+            logger.error(f"Error updating token predictions: {e}")
+            raise
+
+    def _feature_scaling(self) -> Dict[str, np.ndarray]:
+        """Per-feature scale/offset from the fitted scalers (identity if unfitted)."""
+        scale, offset = [], []
+        for scaler, width in (
+            (self.price_scaler, PRICE_FEATURES),
+            (self.sentiment_scaler, SENTIMENT_FEATURES),
+            (self.whale_scaler, WHALE_FEATURES)
+        ):
+            if hasattr(scaler, 'scale_'):
+                scale.append(scaler.scale_)
+                offset.append(scaler.min_)
+            else:
+                scale.append(np.ones(width))
+                offset.append(np.zeros(width))
+        return {'scale': np.concatenate(scale), 'offset': np.concatenate(offset)}
+
+    def _sync_feature_scaling(self) -> None:
+        """Apply newly fitted scalers to existing feature stores."""
+        scaling = self._feature_scaling()
+        for store in self.feature_stores.values():
+            store.set_scaling(scaling['scale'], scaling['offset'])
+
+    def predict_batch(self, features: Dict[str, np.ndarray]) -> Dict[str, float]:
+        """
+        Predict volatility for many tokens from their combined feature matrices.
+        
+        The latest sequence_length rows of every token are stacked into one
+        (tokens, sequence_length, features) tensor and run in forward passes
+        of up to max_batch_size windows. Tokens with shorter histories are
+        grouped by window length.
+        
+        Args:
+            features: Token address -> (time steps, INPUT_SIZE) feature matrix
+            
+        Returns:
+            Predicted volatility per token
+        """
+        try:
+            groups: Dict[int, List[str]] = defaultdict(list)
+            for token_address, X in features.items():
+                groups[min(len(X), self.sequence_length)].append(token_address)
+            
+            predictions = {}
+            for length, tokens in groups.items():
+                if len(tokens) == 1:
+                    # Single window: pass the (possibly zero-copy) view through
+                    windows = np.asarray(features[tokens[0]][-length:], dtype=np.float32)[np.newaxis]
+                else:
+                    windows = np.stack([
+                        features[token_address][-length:] for token_address in tokens
+                    ]).astype(np.float32, copy=False)
+                outputs = self._predict_windows(windows)
+                predictions.update(zip(tokens, outputs.tolist()))
+            
+            return predictions
+            
+        except Exception as e:
+            logger.error(f"Error making batch predictions: {e}")
+            raise
+
+    def _predict_windows(self, windows: np.ndarray) -> np.ndarray:
+        """Run (batch, length, features) windows through the backend in chunks."""
+        outputs = []
+        for start in range(0, len(windows), self.max_batch_size):
+            chunk = torch.from_numpy(np.ascontiguousarray(windows[start:start + self.max_batch_size]))
+            outputs.append(self.backend.predict(chunk)[:, 0].cpu().numpy())
+        return np.concatenate(outputs)
+
+    def _build_result(self, prediction: float, X_combined: np.ndarray) -> PredictionResult:
+        """Assemble a prediction result from a model output and its features."""
+        # Calculate confidence
+        confidence = self._calculate_prediction_confidence(prediction, X_combined)
+        
+        # Analyze contributing factors
+        factors = self._analyze_contributing_factors(X_combined)
+        
+        # Generate warning signals
+        warnings = self._generate_warning_signals(prediction, factors)
+        
+        return PredictionResult(
+            timestamp=datetime.now(),
+            predicted_volatility=float(prediction),
+            confidence_score=confidence,
+            contributing_factors=factors,
+            risk_level=self._calculate_risk_level(prediction, confidence),
+            warning_signals=warnings,
+            supporting_metrics=self._calculate_supporting_metrics(X_combined)
+        )
+
     def _preprocess_price_data(self, price_data: pd.DataFrame) -> np.ndarray:
         """Preprocess price and volume data."""
         try:
@@ -312,6 +498,7 @@ class VolatilityPredictor:
             if not hasattr(self, 'price_scaler_fitted'):
                 self.price_scaler.fit(features)
                 self.price_scaler_fitted = True
+                self._sync_feature_scaling()
                 
             return self.price_scaler.transform(features)
             
@@ -345,6 +532,7 @@ class VolatilityPredictor:
             if not hasattr(self, 'sentiment_scaler_fitted'):
                 self.sentiment_scaler.fit(features)
                 self.sentiment_scaler_fitted = True
+                self._sync_feature_scaling()
                 
             return self.sentiment_scaler.transform(features)
             
@@ -375,6 +563,7 @@ class VolatilityPredictor:
             if not hasattr(self, 'whale_scaler_fitted'):
                 self.whale_scaler.fit(features)
                 self.whale_scaler_fitted = True
+                self._sync_feature_scaling()
                 
             return self.whale_scaler.transform(features)
             
@@ -385,15 +574,11 @@ class VolatilityPredictor:
     def _make_prediction(self, X: np.ndarray) -> float:
         """Make volatility prediction."""
         try:
-            # Prepare input sequence
-            sequence = torch.FloatTensor(X[-self.sequence_length:]).unsqueeze(0)
+            # Prepare input sequence (no copy for float32 store views)
+            sequence = np.asarray(X[-self.sequence_length:], dtype=np.float32)[np.newaxis]
             
             # Make prediction
-            self.model.eval()
-            with torch.no_grad():
-                prediction, _ = self.model(sequence)
-            
-            return prediction.item()
+            return float(self._predict_windows(sequence)[0])
             
         except Exception as e:
             logger.error(f"Error making prediction: {e}")
@@ -16,7 +16,12 @@ from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 import logging
-from collections import defaultdict, deque
+from collections import defaultdict
+import json
+
+from .ohlcv_bars import BarAggregator
+from .streaming_indicators import StreamingIndicators
+from .time_series_history import TimeSeriesHistory
 
 # Configure logging
 logging.basicConfig(
@@ -49,7 +54,10 @@ class MomentumTracker:
         rsi_periods: int = 14,
         macd_params: Tuple[int, int, int] = (12, 26, 9),
         volume_ma_periods: int = 20,
-        update_interval: int = 60  # seconds
+        update_interval: int = 60,  # seconds
+        history_size: int = 500,
+        partial_bars: bool = False,
+        signal_history_size: int = 1000
     ):
         """
         Initialize the momentum tracker.
@@ -60,18 +68,32 @@ class MomentumTracker:
             macd_params: (fast, slow, signal) periods for MACD
             volume_ma_periods: Periods for volume moving average
             update_interval: Update interval in seconds
+            history_size: Closed bars retained per timeframe
+            partial_bars: Also evaluate indicators on the in-progress bar
+                on every tick instead of only when a bar closes
+            signal_history_size: Momentum signals retained per token
         """
         self.timeframes = timeframes
         self.rsi_periods = rsi_periods
         self.macd_fast, self.macd_slow, self.macd_signal = macd_params
         self.volume_ma_periods = volume_ma_periods
         self.update_interval = update_interval
+        self.history_size = history_size
+        self.partial_bars = partial_bars
+        
+        # OHLCV bars per token, coarser timeframes built from finer ones
+        self.bars: Dict[str, BarAggregator] = defaultdict(
+            lambda: BarAggregator(timeframes, capacity=history_size)
+        )
         
-        # Data structures
-        self.price_history: Dict[str, Dict[str, deque]] = defaultdict(
-            lambda: {tf: deque(maxlen=500) for tf in timeframes}
+        # Incremental indicator state per (token, timeframe), fed closed bars
+        self.indicator_state: Dict[str, Dict[str, StreamingIndicators]] = defaultdict(
+            lambda: {tf: self._create_indicator_state() for tf in timeframes}
+        )
+        self.signal_history_size = signal_history_size
+        self.momentum_signals: Dict[str, TimeSeriesHistory] = defaultdict(
+            lambda: TimeSeriesHistory.for_dataclass(MomentumSignal, capacity=signal_history_size)
         )
-        self.momentum_signals: Dict[str, List[MomentumSignal]] = defaultdict(list)
         
         # Technical indicator history
         self.indicator_history: Dict[str, Dict] = defaultdict(
@@ -105,8 +127,8 @@ class MomentumTracker:
             Dict of momentum signals per timeframe if significant changes detected
         """
         try:
-            # Update price history
-            self._update_price_history(
+            # Roll the tick into bars
+            closed = self._update_price_history(
                 token_address,
                 current_price,
                 current_volume,
@@ -115,6 +137,11 @@ class MomentumTracker:
             
             signals = {}
             for timeframe in self.timeframes:
+                # Indicators only change when a bar closes, unless the
+                # in-progress bar is evaluated as well
+                if not self.partial_bars and timeframe not in closed:
+                    continue
+                
                 # Calculate technical indicators
                 indicators = self._calculate_indicators(
                     token_address,
@@ -130,10 +157,7 @@ class MomentumTracker:
                 
                 if signal:
                     signals[timeframe] = signal
-                    self.momentum_signals[token_address].append(signal)
-            
-            # Clean up old signals
-            self._cleanup_old_signals(token_address)
+                    self.momentum_signals[token_address].append_record(signal)
             
             return signals if signals else None
             
@@ -144,45 +168,85 @@ class MomentumTracker:
     def _calculate_indicators(
         self,
         token_address: str,
-        timeframe: str
+        timeframe: str,
+        include_partial: Optional[bool] = None
     ) -> Dict:
-        """Calculate technical indicators for momentum analysis."""
+        """
+        Read technical indicators from the streaming state.
+        
+        Args:
+            token_address: Token address
+            timeframe: Timeframe to read
+            include_partial: Treat the in-progress bar as the latest bar;
+                defaults to the tracker's partial_bars setting
+        """
         try:
-            price_data = list(self.price_history[token_address][timeframe])
-            if len(price_data) < self.macd_slow:
-                return {}
-            
-            # Calculate RSI
-            prices = [p['price'] for p in price_data]
-            rsi = self._calculate_rsi(prices)
+            if include_partial is None:
+                include_partial = self.partial_bars
             
-            # Calculate MACD
-            macd, signal, hist = self._calculate_macd(prices)
+            state = self.indicator_state[token_address][timeframe]
+            partial = (
+                self.bars[token_address].partial_bar(timeframe)
+                if include_partial else None
+            )
+            if partial is not None:
+                # Preview only; the bar is folded into the state when it closes
+                return state.preview(partial[4], partial[5])
             
-            # Calculate volume trend
-            volumes = [p['volume'] for p in price_data]
-            volume_trend = self._calculate_volume_trend(volumes)
+            indicators = state.snapshot()
+            if not indicators:
+                return {}
             
             # Store indicator values
-            self.indicator_history[token_address]['rsi'][timeframe].append(rsi)
-            self.indicator_history[token_address]['macd'][timeframe].append(
-                (macd[-1], signal[-1], hist[-1])
-            )
+            self.indicator_history[token_address]['rsi'][timeframe].append(indicators['rsi'])
+            self.indicator_history[token_address]['macd'][timeframe].append(indicators['macd'])
             self.indicator_history[token_address]['volume_trend'][timeframe].append(
-                volume_trend
+                indicators['volume_trend']
             )
             
+            return indicators
+            
+        except Exception as e:
+            logger.error(f"Error calculating indicators: {e}")
+            return {}
+
+    def _calculate_indicators_batch(
+        self,
+        prices: List[float],
+        volumes: List[float]
+    ) -> Dict:
+        """
+        Recompute technical indicators from a full price/volume history.
+        
+        Reference implementation for the streaming state; the two agree on
+        the same history (up to the truncation of older data).
+        """
+        try:
+            if len(prices) < self.macd_slow:
+                return {}
+            
+            macd, signal, hist = self._calculate_macd(prices)
+            
             return {
-                'rsi': rsi,
-                'macd': (macd[-1], signal[-1], hist[-1]),
-                'volume_trend': volume_trend,
+                'rsi': self._calculate_rsi(prices),
+                'macd': (float(macd[-1]), float(signal[-1]), float(hist[-1])),
+                'volume_trend': self._calculate_volume_trend(volumes),
                 'price_trend': self._calculate_price_trend(prices)
             }
             
         except Exception as e:
-            logger.error(f"Error calculating indicators: {e}")
+            logger.error(f"Error calculating batch indicators: {e}")
             return {}
 
+    def _create_indicator_state(self) -> StreamingIndicators:
+        """Create streaming indicator state with the tracker's parameters."""
+        return StreamingIndicators(
+            rsi_periods=self.rsi_periods,
+            macd_params=(self.macd_fast, self.macd_slow, self.macd_signal),
+            volume_ma_periods=self.volume_ma_periods,
+            trend_window=self.history_size - 1
+        )
+
     def _analyze_momentum(
         self,
         token_address: str,
@@ -243,7 +307,7 @@ class MomentumTracker:
             return None
 
     def _calculate_rsi(self, prices: List[float]) -> float:
-        """Calculate Relative Strength Index."""
+        """Calculate Relative Strength Index with Wilder smoothing."""
         try:
             if len(prices) < self.rsi_periods + 1:
                 return 50.0
@@ -255,9 +319,13 @@ class MomentumTracker:
             gains = np.maximum(changes, 0)
             losses = np.absolute(np.minimum(changes, 0))
             
-            # Calculate average gains and losses
-            avg_gain = np.mean(gains[-self.rsi_periods:])
-            avg_loss = np.mean(losses[-self.rsi_periods:])
+            # Seed with the simple average, then apply Wilder smoothing
+            n = self.rsi_periods
+            avg_gain = np.mean(gains[:n])
+            avg_loss = np.mean(losses[:n])
+            for gain, loss in zip(gains[n:], losses[n:]):
+                avg_gain = (avg_gain * (n - 1) + gain) / n
+                avg_loss = (avg_loss * (n - 1) + loss) / n
             
             if avg_loss == 0:
                 return 100.0
@@ -340,20 +408,13 @@ class MomentumTracker:
             macd_momentum = np.sign(hist) * min(1.0, abs(hist / signal)) if signal != 0 else 0
             
             # Combine indicators with weights
-            strength = abs(
-                rsi_momentum * 0.3 +
-                macd_momentum * 0.3 +
-                volume_trend * 0.2 +
-                price_trend * 0.2
-            )
-            
-            # Determine direction
             weighted_direction = (
                 rsi_momentum * 0.3 +
                 macd_momentum * 0.3 +
                 volume_trend * 0.2 +
                 price_trend * 0.2
             )
+            strength = abs(weighted_direction)
             
             if weighted_direction > 0:
                 direction = 'bullish'
@@ -429,7 +490,7 @@ class MomentumTracker:
             confidence_factors.append(momentum_strength)
             
             # Calculate final confidence
-            return float(np.mean(confidence_factors))
+            return float(sum(confidence_factors) / len(confidence_factors))
             
         except Exception as e:
             logger.error(f"Error calculating confidence: {e}")
@@ -478,30 +539,48 @@ class MomentumTracker:
         price: float,
         volume: float,
         timestamp: datetime
-    ) -> None:
-        """Update price history for all timeframes."""
+    ) -> List[str]:
+        """
+        Roll a tick into the token's bars and feed closed bars to the
+        indicator state.
+        
+        Returns:
+            Timeframes whose bar closed on this tick
+        """
         try:
-            # Add data point to all timeframes
-            for timeframe in self.timeframes:
-                self.price_history[token_address][timeframe].append({
-                    'price': price,
-                    'volume': volume,
-                    'timestamp': timestamp
-                })
+            aggregator = self.bars[token_address]
+            closed = aggregator.update(timestamp.timestamp(), price, volume)
+            
+            states = self.indicator_state[token_address]
+            for timeframe in closed:
+                series = aggregator.series[timeframe]
+                bar = series.bars[series.head - 1]
+                states[timeframe].update(float(bar['close']), float(bar['volume']))
+            
+            return closed
                 
         except Exception as e:
             logger.error(f"Error updating price history: {e}")
+            return []
 
-    def _cleanup_old_signals(self, token_address: str) -> None:
-        """Clean up old momentum signals."""
-        try:
-            # Keep only last 1000 signals
-            if len(self.momentum_signals[token_address]) > 1000:
-                self.momentum_signals[token_address] = \
-                    self.momentum_signals[token_address][-1000:]
-                    
-        except Exception as e:
-            logger.error(f"Error cleaning up signals: {e}")
+    def get_bars(
+        self,
+        token_address: str,
+        timeframe: str,
+        include_partial: bool = False
+    ) -> np.ndarray:
+        """
+        Get OHLCV bars for a token and timeframe, oldest first.
+        
+        Args:
+            token_address: Token address
+            timeframe: Timeframe label
+            include_partial: Append the in-progress bar if there is one
+            
+        Returns:
+            Structured array with ts, open, high, low, close, volume and ticks
+        """
+        return self.bars[token_address].bars(timeframe, include_partial)
 
     def get_momentum_analysis(self, token_address: str) -> Dict:
         """Get comprehensive momentum analysis for a token."""
@@ -532,15 +611,13 @@ class MomentumTracker:
     ) -> Optional[Dict]:
         """Get latest momentum signal for a specific timeframe."""
         try:
-            signals = [
-                signal for signal in self.momentum_signals[token_address]
-                if signal.timeframe == timeframe
-            ]
+            history = self.momentum_signals[token_address]
+            matches = np.flatnonzero(history.column('timeframe') == timeframe)
             
-            if not signals:
+            if not len(matches):
                 return None
                 
-            latest = signals[-1]
+            latest = history[int(matches[-1])]
             return {
                 "signal_type": latest.signal_type,
                 "strength": latest.strength,
@@ -0,0 +1,250 @@
+"""
+Kinetic Anomaly Detection Engine System (KADES)
+OHLCV Bars Module
+
+This module implements incremental OHLCV bar aggregation for multiple
+timeframes. Ticks are rolled into bars of the finest timeframes as they
+arrive; coarser timeframes are built from the closed bars of the finer
+ones, and closed bars are stored in compact NumPy ring buffers.
+
+Author: KADES Team
+License: Proprietary
+"""
+
+from typing import Dict, List, Optional, Tuple
+import logging
+import re
+
+import numpy as np
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Closed bar record; ts is the bucket start in epoch seconds
+BAR_DTYPE = np.dtype([
+    ('ts', 'f8'),
+    ('open', 'f8'),
+    ('high', 'f8'),
+    ('low', 'f8'),
+    ('close', 'f8'),
+    ('volume', 'f8'),
+    ('ticks', 'u4'),
+])
+
+TIMEFRAME_UNITS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400, 'w': 604800}
+
+Bar = Tuple[float, float, float, float, float, float, int]
+
+def timeframe_seconds(timeframe: str) -> int:
+    """
+    Convert a timeframe label such as '5m', '4h' or '1d' to seconds.
+
+    Raises:
+        ValueError: If the label is not <count><unit> with a known unit
+    """
+    match = re.fullmatch(r'(\d+)([smhdw])', timeframe)
+    if not match or int(match.group(1)) == 0:
+        raise ValueError(f"Invalid timeframe: {timeframe}")
+    return int(match.group(1)) * TIMEFRAME_UNITS[match.group(2)]
+
+class BarSeries:
+    """
+    Closed bars of one timeframe in a NumPy ring plus the in-progress bar.
+    The ring grows by doubling up to its capacity, then overwrites the oldest.
+    """
+
+    __slots__ = (
+        'timeframe', 'seconds', 'capacity', 'bars', 'head', 'count',
+        'start', 'open', 'high', 'low', 'close', 'volume', 'ticks'
+    )
+
+    def __init__(self, timeframe: str, capacity: int, initial_size: int = 64):
+        """
+        Initialize the series.
+
+        Args:
+            timeframe: Timeframe label
+            capacity: Maximum closed bars retained
+            initial_size: Initial ring allocation
+        """
+        self.timeframe = timeframe
+        self.seconds = timeframe_seconds(timeframe)
+        self.capacity = capacity
+        self.bars = np.zeros(min(capacity, initial_size), dtype=BAR_DTYPE)
+        self.head = 0   # next write position
+        self.count = 0
+
+        # In-progress bar; start is None when no bar is open
+        self.start: Optional[float] = None
+        self.open = self.high = self.low = self.close = 0.0
+        self.volume = 0.0
+        self.ticks = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    @property
+    def nbytes(self) -> int:
+        return self.bars.nbytes
+
+    def bucket(self, ts: float) -> float:
+        """Start of the bucket containing ts."""
+        return float(ts // self.seconds * self.seconds)
+
+    def fold(self, start: float, open_: float, high: float, low: float,
+             close: float, volume: float, ticks: int) -> None:
+        """
+        Merge a tick or finer bar into the in-progress bar. start is only used
+        to open a new bar; data arriving for an older bucket is folded into
+        the open one.
+        """
+        if self.start is None:
+            self.start = start
+            self.open, self.high, self.low = open_, high, low
+            self.close, self.volume, self.ticks = close, volume, ticks
+            return
+
+        if high > self.high:
+            self.high = high
+        if low < self.low:
+            self.low = low
+        self.close = close
+        self.volume += volume
+        self.ticks += ticks
+
+    def close_bar(self) -> Bar:
+        """Move the in-progress bar into the ring and return it."""
+        bar = (self.start, self.open, self.high, self.low,
+               self.close, self.volume, self.ticks)
+
+        if self.count == len(self.bars) and self.count < self.capacity:
+            grown = np.zeros(min(self.capacity, 2 * len(self.bars)), dtype=BAR_DTYPE)
+            grown[:self.count] = self.bars
+            self.bars = grown
+            self.head = self.count
+
+        self.bars[self.head] = bar
+        self.head = (self.head + 1) % len(self.bars)
+        self.count = min(self.count + 1, self.capacity)
+        self.start = None
+        return bar
+
+    def partial(self) -> Optional[Bar]:
+        """The in-progress bar, if any."""
+        if self.start is None:
+            return None
+        return (self.start, self.open, self.high, self.low,
+                self.close, self.volume, self.ticks)
+
+    def closed(self) -> np.ndarray:
+        """Closed bars oldest first (a view unless the ring has wrapped)."""
+        if self.count < len(self.bars):
+            return self.bars[:self.count]
+        return np.concatenate((self.bars[self.head:], self.bars[:self.head]))
+
+class BarAggregator:
+    """
+    Multi-timeframe OHLCV bar builder for a single token.
+
+    Each timeframe is built from the coarsest finer timeframe that divides it
+    evenly, or directly from ticks when there is none, so a tick only touches
+    the finest bars and coarser bars are updated once per finer bar close.
+    Buckets are aligned to the epoch and empty buckets produce no bar.
+    """
+
+    def __init__(self, timeframes: List[str], capacity: int = 500):
+        """
+        Initialize the aggregator.
+
+        Args:
+            timeframes: Timeframe labels to build
+            capacity: Closed bars retained per timeframe
+        """
+        self.series: Dict[str, BarSeries] = {
+            tf: BarSeries(tf, capacity) for tf in timeframes
+        }
+        # Finest first so finer closes are folded in before coarser checks
+        self._order = sorted(self.series.values(), key=lambda s: s.seconds)
+
+        self.sources: Dict[str, Optional[str]] = {}
+        self._derived: Dict[str, List[BarSeries]] = {tf: [] for tf in timeframes}
+        for i, series in enumerate(self._order):
+            source = next(
+                (finer for finer in reversed(self._order[:i])
+                 if finer.seconds < series.seconds and series.seconds % finer.seconds == 0),
+                None
+            )
+            self.sources[series.timeframe] = source.timeframe if source is not None else None
+            if source is not None:
+                self._derived[source.timeframe].append(series)
+        self._tick_series = [
+            s for s in self._order if self.sources[s.timeframe] is None
+        ]
+
+    @property
+    def nbytes(self) -> int:
+        return sum(series.nbytes for series in self.series.values())
+
+    def update(self, ts: float, price: float, volume: float) -> List[str]:
+        """
+        Fold a tick into the bars.
+
+        Args:
+            ts: Tick time in epoch seconds
+            price: Trade price
+            volume: Trade volume
+
+        Returns:
+            Timeframes whose bar closed on this tick
+        """
+        closed = []
+        for series in self._order:
+            if series.start is not None and ts >= series.start + series.seconds:
+                bar = series.close_bar()
+                closed.append(series.timeframe)
+                for coarser in self._derived[series.timeframe]:
+                    coarser.fold(coarser.bucket(bar[0]), *bar[1:])
+
+        for series in self._tick_series:
+            series.fold(series.bucket(ts), price, price, price, price, volume, 1)
+
+        return closed
+
+    def partial_bar(self, timeframe: str) -> Optional[Bar]:
+        """
+        The in-progress bar of a timeframe including data still held in its
+        finer source bars.
+        """
+        bar = self.series[timeframe].partial()
+        source = self.sources[timeframe]
+        if source is None:
+            return bar
+
+        pending = self.partial_bar(source)
+        if pending is None:
+            return bar
+        if bar is None:
+            return (self.series[timeframe].bucket(pending[0]),) + pending[1:]
+
+        start, open_, high, low, _, volume, ticks = bar
+        return (start, open_, max(high, pending[2]), min(low, pending[3]),
+                pending[4], volume + pending[5], ticks + pending[6])
+
+    def bars(self, timeframe: str, include_partial: bool = False) -> np.ndarray:
+        """
+        Bars of a timeframe oldest first.
+
+        Args:
+            timeframe: Timeframe label
+            include_partial: Append the in-progress bar if there is one
+        """
+        closed = self.series[timeframe].closed()
+        if include_partial:
+            partial = self.partial_bar(timeframe)
+            if partial is not None:
+                return np.concatenate((closed, np.array([partial], dtype=BAR_DTYPE)))
+        return closed
@@ -0,0 +1,272 @@
+"""
+Kinetic Anomaly Detection Engine System (KADES)
+Log-Return Buffer Module
+
+This module implements a per-token float64 ring of prices and log-returns
+for the volatility calculator. Each tick is folded in once: the log-return is
+taken against the previous price and every configured window keeps running
+sums of returns and squared returns plus monotonic-deque high/low, while
+exponentially weighted return means are kept per span. All volatility reads
+are O(1) in the history length.
+
+Author: KADES Team
+License: Proprietary
+"""
+
+from typing import Dict, List, Optional, Tuple
+from collections import deque
+import logging
+import math
+
+import numpy as np
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+class _ReturnWindow:
+    """Running aggregates over the returns of the last `size` prices"""
+    __slots__ = ('size', 'return_sum', 'return_sq', 'max_seqs', 'min_seqs')
+
+    def __init__(self, size: int):
+        self.size = size
+        self.return_sum = 0.0
+        self.return_sq = 0.0
+        self.max_seqs = deque()  # decreasing prices
+        self.min_seqs = deque()  # increasing prices
+
+class LogReturnBuffer:
+    """
+    Fixed-capacity ring of prices, log-returns, volumes and timestamps.
+
+    A window of `w` prices covers the `w - 1` returns between them; the whole
+    ring is tracked as a window of `capacity` prices, which additionally
+    counts up/down moves and the moments of tick intervals and log-volume
+    changes. Running sums are re-derived exactly every `capacity` updates to
+    bound floating point drift.
+    """
+
+    def __init__(
+        self,
+        window_sizes: List[int],
+        ewm_spans: Dict[str, int],
+        capacity: int = 10000
+    ):
+        """
+        Initialize the buffer.
+
+        Args:
+            window_sizes: Window lengths in ticks
+            ewm_spans: Named spans for exponentially weighted return means
+            capacity: Maximum number of ticks retained
+        """
+        self.capacity = capacity
+        self.prices = np.zeros(capacity)
+        self.returns = np.zeros(capacity)     # log(p[i] / p[i-1]), 0 for the first tick
+        self.volumes = np.zeros(capacity)
+        self.timestamps = np.zeros(capacity)  # POSIX seconds
+        self.count = 0
+
+        self._windows: Dict[int, _ReturnWindow] = {
+            w: _ReturnWindow(min(w, capacity)) for w in window_sizes
+        }
+        self._full = _ReturnWindow(capacity)
+        self._ups = 0
+        self._downs = 0
+        self._interval_sum = 0.0
+        self._interval_sq = 0.0
+        self._volume_change_sum = 0.0
+        self._volume_change_sq = 0.0
+
+        # Adjusted EWM (pandas adjust=True): weighted sum and total weight
+        self._ewm = {
+            name: [2.0 / (span + 1), 0.0, 0.0] for name, span in ewm_spans.items()
+        }
+
+    def __len__(self) -> int:
+        return min(self.count, self.capacity)
+
+    def append(self, timestamp: float, price: float, volume: float = 0.0) -> None:
+        """
+        Fold one tick into the ring and every aggregate.
+
+        Args:
+            timestamp: Tick time in POSIX seconds
+            price: Positive token price
+            volume: Trading volume (0 when unknown)
+        """
+        cap = self.capacity
+        seq = self.count
+        slot = seq % cap
+
+        if seq:
+            prev = (seq - 1) % cap
+            log_return = math.log(price / self.prices[prev])
+            interval = timestamp - self.timestamps[prev]
+            volume_change = math.log1p(volume) - math.log1p(self.volumes[prev])
+        else:
+            log_return = interval = volume_change = 0.0
+
+        # The oldest retained tick drops out of the ring: its return, interval
+        # and volume change no longer lie between two retained ticks
+        if seq >= cap:
+            self._drop_full(seq + 1 - cap)
+
+        self.prices[slot] = price
+        self.returns[slot] = log_return
+        self.volumes[slot] = volume
+        self.timestamps[slot] = timestamp
+        self.count = seq + 1
+
+        if seq:
+            full = self._full
+            full.return_sum += log_return
+            full.return_sq += log_return * log_return
+            self._ups += log_return > 0
+            self._downs += log_return < 0
+            self._interval_sum += interval
+            self._interval_sq += interval * interval
+            self._volume_change_sum += volume_change
+            self._volume_change_sq += volume_change * volume_change
+
+            for state in self._ewm.values():
+                decay = 1.0 - state[0]
+                state[1] = state[1] * decay + log_return
+                state[2] = state[2] * decay + 1.0
+
+        prices = self.prices
+        for window in self._windows.values():
+            # Return of the oldest price in the window leaves the window
+            first = seq + 1 - window.size
+            if first >= 1:
+                evicted = self.returns[first % cap]
+                window.return_sum -= evicted
+                window.return_sq -= evicted * evicted
+            if seq:
+                window.return_sum += log_return
+                window.return_sq += log_return * log_return
+
+            max_seqs = window.max_seqs
+            while max_seqs and max_seqs[0] < first:
+                max_seqs.popleft()
+            while max_seqs and prices[max_seqs[-1] % cap] <= price:
+                max_seqs.pop()
+            max_seqs.append(seq)
+
+            min_seqs = window.min_seqs
+            while min_seqs and min_seqs[0] < first:
+                min_seqs.popleft()
+            while min_seqs and prices[min_seqs[-1] % cap] >= price:
+                min_seqs.pop()
+            min_seqs.append(seq)
+
+        if self.count % cap == 0:
+            self._resync()
+
+    @property
+    def first_price(self) -> float:
+        return float(self.prices[(self.count - len(self)) % self.capacity])
+
+    @property
+    def last_price(self) -> float:
+        return float(self.prices[(self.count - 1) % self.capacity])
+
+    @property
+    def last_return(self) -> float:
+        return float(self.returns[(self.count - 1) % self.capacity])
+
+    def return_std(self, window: Optional[int] = None) -> float:
+        """
+        Population standard deviation of log-returns (matches np.std).
+
+        Args:
+            window: Configured window size, or None for the whole ring
+
+        Returns:
+            Standard deviation, 0.0 before the first return
+        """
+        state = self._full if window is None else self._windows[window]
+        n = min(len(self), state.size) - 1
+        if n <= 0:
+            return 0.0
+        mean = state.return_sum / n
+        return math.sqrt(max(0.0, state.return_sq / n - mean * mean))
+
+    def price_range(self, window: int) -> Tuple[float, float]:
+        """High and low price over the last `window` ticks."""
+        state = self._windows[window]
+        cap = self.capacity
+        return (
+            float(self.prices[state.max_seqs[0] % cap]),
+            float(self.prices[state.min_seqs[0] % cap])
+        )
+
+    def ewm_mean(self, name: str) -> float:
+        """Exponentially weighted mean of log-returns for a named span."""
+        _, weighted_sum, weight = self._ewm[name]
+        return weighted_sum / weight if weight else 0.0
+
+    def direction_counts(self) -> Tuple[int, int]:
+        """Number of up and down moves across the ring."""
+        return self._ups, self._downs
+
+    def interval_moments(self) -> Tuple[float, float]:
+        """Mean and population std of the intervals between ticks."""
+        return self._moments(self._interval_sum, self._interval_sq)
+
+    def volume_change_std(self) -> float:
+        """Population std of log(1 + volume) changes across the ring."""
+        return self._moments(self._volume_change_sum, self._volume_change_sq)[1]
+
+    def ordered(self, column: str = 'prices') -> np.ndarray:
+        """Retained values of a column, oldest first (a copy)."""
+        values = getattr(self, column)
+        n = len(self)
+        start = (self.count - n) % self.capacity
+        return np.roll(values, -start)[:n] if n == self.capacity else values[start:start + n].copy()
+
+    def _moments(self, total: float, squares: float) -> Tuple[float, float]:
+        n = len(self) - 1
+        if n <= 0:
+            return 0.0, 0.0
+        mean = total / n
+        return mean, math.sqrt(max(0.0, squares / n - mean * mean))
+
+    def _drop_full(self, seq: int) -> None:
+        """Remove the deltas of tick `seq`, which became the oldest tick."""
+        slot = seq % self.capacity
+        prev = (seq - 1) % self.capacity
+        log_return = self.returns[slot]
+        interval = self.timestamps[slot] - self.timestamps[prev]
+        volume_change = math.log1p(self.volumes[slot]) - math.log1p(self.volumes[prev])
+
+        full = self._full
+        full.return_sum -= log_return
+        full.return_sq -= log_return * log_return
+        self._ups -= log_return > 0
+        self._downs -= log_return < 0
+        self._interval_sum -= interval
+        self._interval_sq -= interval * interval
+        self._volume_change_sum -= volume_change
+        self._volume_change_sq -= volume_change * volume_change
+
+    def _resync(self) -> None:
+        """Recompute running sums exactly from the ring."""
+        returns = self.ordered('returns')[1:]
+        intervals = np.diff(self.ordered('timestamps'))
+        volume_changes = np.diff(np.log1p(self.ordered('volumes')))
+
+        self._full.return_sum = math.fsum(returns)
+        self._full.return_sq = math.fsum(returns * returns)
+        self._interval_sum = math.fsum(intervals)
+        self._interval_sq = math.fsum(intervals * intervals)
+        self._volume_change_sum = math.fsum(volume_changes)
+        self._volume_change_sq = math.fsum(volume_changes * volume_changes)
+
+        for window in self._windows.values():
+            tail = returns[len(returns) - window.size + 1:] if window.size > 1 else returns[:0]
+            window.return_sum = math.fsum(tail)
+            window.return_sq = math.fsum(tail * tail)
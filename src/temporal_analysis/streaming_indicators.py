@@ -0,0 +1,301 @@
+"""
+Kinetic Anomaly Detection Engine System (KADES)
+Streaming Indicators Module
+
+This module implements O(1) per-update technical indicator state for momentum
+tracking: Wilder-smoothed RSI, running EMAs for MACD and its signal line,
+rolling volume averages and a rolling OLS slope of log returns. Results match
+the batch indicator functions of MomentumTracker on the same history.
+
+Author: KADES Team
+License: Proprietary
+"""
+
+from typing import Dict, Optional, Tuple
+from collections import deque
+import logging
+import math
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+class StreamingIndicators:
+    """
+    Incremental indicator state for a single (token, timeframe) series.
+    Every update is O(1) amortized regardless of the series length.
+    """
+
+    __slots__ = (
+        'rsi_periods', 'macd_fast', 'macd_slow', 'macd_signal',
+        'volume_ma_periods', 'recent_volume_periods', 'trend_window',
+        'count', '_last_price', '_last_log_price',
+        '_rsi_changes', '_gain_sum', '_loss_sum', '_avg_gain', '_avg_loss',
+        '_alpha_fast', '_alpha_slow', '_alpha_signal',
+        '_ema_fast', '_ema_slow', '_ema_signal',
+        '_volumes', '_volume_sum', '_recent_volume_sum',
+        '_returns', '_return_sum', '_return_index_sum', '_return_start', '_trend_updates'
+    )
+
+    def __init__(
+        self,
+        rsi_periods: int = 14,
+        macd_params: Tuple[int, int, int] = (12, 26, 9),
+        volume_ma_periods: int = 20,
+        trend_window: int = 499,
+        recent_volume_periods: int = 5
+    ):
+        """
+        Initialize indicator state.
+
+        Args:
+            rsi_periods: Periods for Wilder RSI smoothing
+            macd_params: (fast, slow, signal) EMA periods for MACD
+            volume_ma_periods: Periods for the volume moving average
+            trend_window: Number of most recent log returns in the trend regression
+            recent_volume_periods: Periods for the recent volume average
+        """
+        self.rsi_periods = rsi_periods
+        self.macd_fast, self.macd_slow, self.macd_signal = macd_params
+        self.volume_ma_periods = volume_ma_periods
+        self.recent_volume_periods = recent_volume_periods
+        self.trend_window = trend_window
+
+        self.count = 0
+        self._last_price: Optional[float] = None
+        self._last_log_price = 0.0
+
+        # Wilder RSI
+        self._rsi_changes = 0
+        self._gain_sum = 0.0
+        self._loss_sum = 0.0
+        self._avg_gain = 0.0
+        self._avg_loss = 0.0
+
+        # MACD EMAs (seeded with the first value, like ewm(adjust=False))
+        self._alpha_fast = 2 / (self.macd_fast + 1)
+        self._alpha_slow = 2 / (self.macd_slow + 1)
+        self._alpha_signal = 2 / (self.macd_signal + 1)
+        self._ema_fast = 0.0
+        self._ema_slow = 0.0
+        self._ema_signal = 0.0
+
+        # Volume averages
+        self._volumes: deque = deque(maxlen=max(volume_ma_periods, recent_volume_periods))
+        self._volume_sum = 0.0
+        self._recent_volume_sum = 0.0
+
+        # Rolling OLS of log returns against their position in the window
+        self._returns: deque = deque()
+        self._return_sum = 0.0
+        self._return_index_sum = 0.0  # sum of absolute index * return
+        self._return_start = 0        # absolute index of the oldest return
+        self._trend_updates = 0
+
+    def update(self, price: float, volume: float) -> None:
+        """Fold a new (price, volume) observation into every indicator."""
+        if self._last_price is not None:
+            (self._rsi_changes, self._gain_sum, self._loss_sum,
+             self._avg_gain, self._avg_loss) = self._next_rsi(price)
+            log_price = math.log(price)
+            self._update_trend(log_price - self._last_log_price)
+            self._last_log_price = log_price
+        else:
+            self._last_log_price = math.log(price)
+
+        self._ema_fast, self._ema_slow, self._ema_signal = self._next_emas(price)
+        self._update_volume(volume)
+        self._last_price = price
+        self.count += 1
+
+    def snapshot(self) -> Dict:
+        """Current indicator values, empty until enough data for MACD."""
+        if self.count < self.macd_slow:
+            return {}
+        return {
+            'rsi': self.rsi,
+            'macd': self.macd,
+            'volume_trend': self.volume_trend,
+            'price_trend': self.price_trend
+        }
+
+    def preview(self, price: float, volume: float) -> Dict:
+        """
+        Indicator values as if (price, volume) were the next observation,
+        without changing the state. Used to evaluate an in-progress bar.
+        """
+        if self.count + 1 < self.macd_slow:
+            return {}
+
+        if self._last_price is None:
+            return self.snapshot()
+
+        rsi_changes, _, _, avg_gain, avg_loss = self._next_rsi(price)
+        ema_fast, ema_slow, ema_signal = self._next_emas(price)
+
+        # Volume sums with the pending observation
+        volumes = self._volumes
+        size = len(volumes)
+        volume_sum = self._volume_sum + volume
+        recent_volume_sum = self._recent_volume_sum + volume
+        if size >= self.volume_ma_periods:
+            volume_sum -= volumes[-self.volume_ma_periods]
+        if size >= self.recent_volume_periods:
+            recent_volume_sum -= volumes[-self.recent_volume_periods]
+
+        # Trend sums with the pending log return
+        log_return = math.log(price) - self._last_log_price
+        n = len(self._returns)
+        return_sum = self._return_sum + log_return
+        return_index_sum = self._return_index_sum + (self._return_start + n) * log_return
+        return_start = self._return_start
+        if n + 1 > self.trend_window:
+            evicted = self._returns[0]
+            return_sum -= evicted
+            return_index_sum -= return_start * evicted
+            return_start += 1
+        else:
+            n += 1
+
+        macd_line = ema_fast - ema_slow
+        return {
+            'rsi': self._rsi_value(rsi_changes, avg_gain, avg_loss),
+            'macd': (macd_line, ema_signal, macd_line - ema_signal),
+            'volume_trend': self._volume_trend_value(
+                min(size + 1, volumes.maxlen), volume_sum, recent_volume_sum
+            ),
+            'price_trend': self._price_trend_value(n, return_sum, return_index_sum, return_start)
+        }
+
+    @property
+    def rsi(self) -> float:
+        return self._rsi_value(self._rsi_changes, self._avg_gain, self._avg_loss)
+
+    @property
+    def macd(self) -> Tuple[float, float, float]:
+        """(MACD line, signal line, histogram)"""
+        macd_line = self._ema_fast - self._ema_slow
+        return macd_line, self._ema_signal, macd_line - self._ema_signal
+
+    @property
+    def volume_trend(self) -> float:
+        return self._volume_trend_value(
+            len(self._volumes), self._volume_sum, self._recent_volume_sum
+        )
+
+    @property
+    def price_trend(self) -> float:
+        return self._price_trend_value(
+            len(self._returns), self._return_sum, self._return_index_sum, self._return_start
+        )
+
+    def _rsi_value(self, changes: int, avg_gain: float, avg_loss: float) -> float:
+        if changes < self.rsi_periods:
+            return 50.0
+        if avg_loss == 0:
+            return 100.0
+        rs = avg_gain / avg_loss
+        return float(100 - (100 / (1 + rs)))
+
+    def _volume_trend_value(self, size: int, volume_sum: float, recent_volume_sum: float) -> float:
+        if size < self.volume_ma_periods:
+            return 0.0
+
+        volume_ma = volume_sum / self.volume_ma_periods
+        if volume_ma == 0:
+            return 0.0
+
+        recent_volume = recent_volume_sum / self.recent_volume_periods
+        trend_strength = (recent_volume - volume_ma) / volume_ma
+        return float(min(1.0, max(-1.0, trend_strength)))
+
+    @staticmethod
+    def _price_trend_value(n: int, return_sum: float, return_index_sum: float,
+                           return_start: int) -> float:
+        if n < 2:
+            return 0.0
+
+        # Least squares slope with x = 0..n-1 across the window
+        sum_x = n * (n - 1) / 2
+        sum_xx = (n - 1) * n * (2 * n - 1) / 6
+        sum_xy = return_index_sum - return_start * return_sum
+        slope = (n * sum_xy - sum_x * return_sum) / (n * sum_xx - sum_x * sum_x)
+        return float(math.tanh(slope * 100))
+
+    def _next_rsi(self, price: float) -> Tuple[int, float, float, float, float]:
+        """RSI accumulators after a move to price from the last observation."""
+        change = price - self._last_price
+        gain = change if change > 0 else 0.0
+        loss = -change if change < 0 else 0.0
+        n = self.rsi_periods
+        changes = self._rsi_changes + 1
+        gain_sum, loss_sum = self._gain_sum, self._loss_sum
+        avg_gain, avg_loss = self._avg_gain, self._avg_loss
+
+        if changes < n:
+            gain_sum += gain
+            loss_sum += loss
+        elif changes == n:
+            # Seed Wilder smoothing with the simple average
+            avg_gain = (gain_sum + gain) / n
+            avg_loss = (loss_sum + loss) / n
+        else:
+            avg_gain = (avg_gain * (n - 1) + gain) / n
+            avg_loss = (avg_loss * (n - 1) + loss) / n
+
+        return changes, gain_sum, loss_sum, avg_gain, avg_loss
+
+    def _next_emas(self, price: float) -> Tuple[float, float, float]:
+        """MACD fast/slow and signal EMAs after observing price."""
+        if self.count == 0:
+            return price, price, 0.0
+        ema_fast = self._ema_fast + self._alpha_fast * (price - self._ema_fast)
+        ema_slow = self._ema_slow + self._alpha_slow * (price - self._ema_slow)
+        ema_signal = self._ema_signal + self._alpha_signal * (
+            (ema_fast - ema_slow) - self._ema_signal
+        )
+        return ema_fast, ema_slow, ema_signal
+
+    def _update_volume(self, volume: float) -> None:
+        volumes = self._volumes
+        size = len(volumes)
+
+        if size >= self.volume_ma_periods:
+            self._volume_sum -= volumes[-self.volume_ma_periods]
+        if size >= self.recent_volume_periods:
+            self._recent_volume_sum -= volumes[-self.recent_volume_periods]
+
+        volumes.append(volume)
+        self._volume_sum += volume
+        self._recent_volume_sum += volume
+
+        # Periodically re-derive sums to bound floating point drift
+        if self.count % self.volume_ma_periods == 0:
+            recent = list(volumes)
+            self._volume_sum = math.fsum(recent[-self.volume_ma_periods:])
+            self._recent_volume_sum = math.fsum(recent[-self.recent_volume_periods:])
+
+    def _update_trend(self, log_return: float) -> None:
+        index = self._return_start + len(self._returns)
+        self._returns.append(log_return)
+        self._return_sum += log_return
+        self._return_index_sum += index * log_return
+
+        if len(self._returns) > self.trend_window:
+            evicted = self._returns.popleft()
+            self._return_sum -= evicted
+            self._return_index_sum -= self._return_start * evicted
+            self._return_start += 1
+
+        # Periodically re-derive sums (rebasing indices to zero) to bound
+        # floating point drift and cancellation in the index-weighted sum
+        self._trend_updates += 1
+        if self._trend_updates % self.trend_window == 0:
+            self._return_start = 0
+            self._return_sum = math.fsum(self._returns)
+            self._return_index_sum = math.fsum(
+                i * r for i, r in enumerate(self._returns)
+            )
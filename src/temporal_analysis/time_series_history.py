@@ -0,0 +1,380 @@
+"""
+Kinetic Anomaly Detection Engine System (KADES)
+Time Series History Module
+
+This module implements the bounded history kept per token by the scoring
+and temporal components. Records are stored column-wise in a fixed-capacity
+ring: the timestamp and numeric fields in NumPy arrays, other
+fields (dicts, lists, strings) in parallel object arrays, one array per
+field. Appending never copies existing records, the oldest record is
+overwritten once the ring is full, and reads support timestamp range queries, downsampling into fixed
+intervals and, optionally, the numeric fields of evicted records spilled to
+an append-only file on disk.
+
+Author: KADES Team
+License: Proprietary
+"""
+
+import dataclasses
+import logging
+import os
+from datetime import datetime, tzinfo
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+import numpy as np
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+DOWNSAMPLE_AGGREGATES = ['first', 'last', 'mean', 'min', 'max', 'sum']
+
+# Dataclass field types stored in numeric columns; everything else is an object column
+NUMERIC_TYPES = {float: np.float64, int: np.int64, bool: np.bool_}
+
+Timestamp = Union[datetime, float, int]
+
+class TimeSeriesHistory:
+    """
+    Fixed-capacity columnar ring of timestamped records.
+
+    Reads return records oldest first. Range queries use binary search over
+    the timestamps while records arrive in timestamp order and fall back to
+    a scan otherwise. Indexing and slicing (history[-1], history[-100:])
+    rebuild records of `record_type`, so the history can stand in for the
+    list it replaces.
+    """
+
+    def __init__(
+        self,
+        fields: Dict[str, Any],
+        capacity: int = 1000,
+        record_type: Optional[type] = None,
+        time_field: str = 'timestamp',
+        initial_size: int = 64,
+        spill_path: Optional[str] = None,
+        spill_chunk: int = 256
+    ):
+        """
+        Initialize the history.
+
+        Args:
+            fields: Field name -> NumPy dtype, or `object` for fields kept as
+                Python objects (the time field is implicit)
+            capacity: Maximum records retained in memory
+            record_type: Class rebuilt from a record's fields on read (a
+                dataclass, or dict)
+            time_field: Name of the timestamp field of records
+            initial_size: Initial ring allocation; grows by doubling
+            spill_path: Append evicted records' numeric fields to this file
+            spill_chunk: Evicted records buffered per write to the spill file
+        """
+        if capacity < 1:
+            raise ValueError(f"History capacity must be positive, got {capacity}")
+        if time_field in fields:
+            raise ValueError(f"Field '{time_field}' is the time field and cannot be declared")
+
+        self.capacity = capacity
+        self.record_type = record_type or dict
+        self.time_field = time_field
+        self.numeric_fields = [name for name, dtype in fields.items() if dtype is not object]
+        self.object_fields = [name for name, dtype in fields.items() if dtype is object]
+        self.dtype = np.dtype(
+            [(time_field, np.float64)] + [(name, fields[name]) for name in self.numeric_fields]
+        )
+
+        size = min(capacity, initial_size)
+        self._columns = {name: np.zeros(size, dtype=self.dtype[name]) for name in self.dtype.names}
+        self._objects = {name: np.empty(size, dtype=object) for name in self.object_fields}
+        self._size = size
+        self.head = 0   # next write position
+        self.count = 0
+        self.sorted = True  # records were appended in timestamp order
+        self._last_ts = -np.inf
+        self._tz: Optional[tzinfo] = None
+        self._returns_datetime = False
+
+        self.spill_path = spill_path
+        self.spilled = 0
+        self._spill_buffer = np.zeros(spill_chunk, dtype=self.dtype) if spill_path else None
+        self._spill_pending = 0
+
+    @classmethod
+    def for_dataclass(cls, record_type: type, capacity: int = 1000, **kwargs) -> 'TimeSeriesHistory':
+        """History whose columns are the fields of a dataclass; float/int/bool fields become numeric columns."""
+        time_field = kwargs.get('time_field', 'timestamp')
+        fields = {
+            field.name: NUMERIC_TYPES.get(field.type, object)
+            for field in dataclasses.fields(record_type)
+            if field.name != time_field
+        }
+        return cls(fields, capacity=capacity, record_type=record_type, **kwargs)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self[:])
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        if isinstance(index, slice):
+            return self._records(self._slots(np.arange(self.count)[index]))
+        if not -self.count <= index < self.count:
+            raise IndexError("history index out of range")
+        return self._records(self._slots(np.array([index % self.count])))[0]
+
+    @property
+    def nbytes(self) -> int:
+        return sum(column.nbytes for column in self._columns.values()) + \
+            sum(column.nbytes for column in self._objects.values())
+
+    def append(self, timestamp: Timestamp, **values: Any) -> None:
+        """
+        Append a record, overwriting the oldest one when the ring is full.
+
+        Args:
+            timestamp: datetime or epoch seconds
+            **values: Field values; missing numeric fields are stored as 0
+                and missing object fields as None
+        """
+        self._write(self._to_seconds(timestamp), values)
+
+    def append_record(self, record: Any) -> None:
+        """Append a dataclass instance or dict with a `time_field` entry."""
+        values = record if isinstance(record, dict) else vars(record)
+        self._write(self._to_seconds(values[self.time_field]), values)
+
+    def column(self, name: str) -> np.ndarray:
+        """One field of every retained record, oldest first."""
+        array = self._objects[name] if name in self._objects else self._columns[name]
+        return self._chronological(array, 0, self.count)
+
+    def range(
+        self,
+        start: Optional[Timestamp] = None,
+        end: Optional[Timestamp] = None,
+        include_spilled: bool = False
+    ) -> np.ndarray:
+        """
+        Numeric fields of the records with start <= timestamp <= end.
+
+        Args:
+            start: Lower bound (inclusive), None for unbounded
+            end: Upper bound (inclusive), None for unbounded
+            include_spilled: Also return matching records from the spill file
+
+        Returns:
+            Structured array with the time field (epoch seconds) and the
+            numeric fields, oldest first
+        """
+        data = self._structured(self._range_positions(start, end))
+        if include_spilled and self.spill_path:
+            data = np.concatenate((self._spilled_range(start, end), data))
+        return data
+
+    def records(self, start: Optional[Timestamp] = None, end: Optional[Timestamp] = None) -> List[Any]:
+        """Records (as `record_type`) with start <= timestamp <= end, oldest first."""
+        positions = self._range_positions(start, end)
+        if isinstance(positions, slice):
+            positions = np.arange(self.count)[positions]
+        return self._records(self._slots(positions))
+
+    def downsample(
+        self,
+        interval: float,
+        how: Union[str, Dict[str, str]] = 'last',
+        start: Optional[Timestamp] = None,
+        end: Optional[Timestamp] = None,
+        include_spilled: bool = False
+    ) -> np.ndarray:
+        """
+        Aggregate the numeric fields into fixed intervals.
+
+        Args:
+            interval: Bucket length in seconds; buckets are aligned to the epoch
+            how: Aggregate for every field, or per field (default 'last'),
+                from DOWNSAMPLE_AGGREGATES
+            start: Lower bound (inclusive)
+            end: Upper bound (inclusive)
+            include_spilled: Include records from the spill file
+
+        Returns:
+            Structured array with the bucket start, 'count' and each numeric
+            field (as float64), one row per non-empty bucket
+        """
+        if interval <= 0:
+            raise ValueError(f"Downsampling interval must be positive, got {interval}")
+        aggregates = how if isinstance(how, dict) else {name: how for name in self.numeric_fields}
+        for aggregate in aggregates.values():
+            if aggregate not in DOWNSAMPLE_AGGREGATES:
+                raise ValueError(f"Unknown aggregate '{aggregate}', expected one of {DOWNSAMPLE_AGGREGATES}")
+
+        data = self.range(start, end, include_spilled)
+        if not self.sorted:
+            data = data[np.argsort(data[self.time_field], kind='stable')]
+
+        out_dtype = np.dtype(
+            [(self.time_field, np.float64), ('count', np.int64)]
+            + [(name, np.float64) for name in self.numeric_fields]
+        )
+        if len(data) == 0:
+            return np.zeros(0, dtype=out_dtype)
+
+        buckets = np.floor(data[self.time_field] / interval).astype(np.int64)
+        starts = np.concatenate(([0], np.flatnonzero(buckets[1:] != buckets[:-1]) + 1))
+        ends = np.append(starts[1:], len(data))
+
+        out = np.zeros(len(starts), dtype=out_dtype)
+        out[self.time_field] = buckets[starts] * interval
+        out['count'] = ends - starts
+        for name in self.numeric_fields:
+            values = data[name].astype(np.float64)
+            aggregate = aggregates.get(name, 'last')
+            if aggregate == 'first':
+                out[name] = values[starts]
+            elif aggregate == 'last':
+                out[name] = values[ends - 1]
+            elif aggregate == 'min':
+                out[name] = np.minimum.reduceat(values, starts)
+            elif aggregate == 'max':
+                out[name] = np.maximum.reduceat(values, starts)
+            else:
+                sums = np.add.reduceat(values, starts)
+                out[name] = sums / out['count'] if aggregate == 'mean' else sums
+        return out
+
+    def flush(self) -> None:
+        """Write buffered evicted records to the spill file."""
+        if not self._spill_pending:
+            return
+        try:
+            with open(self.spill_path, 'ab') as spill_file:
+                self._spill_buffer[:self._spill_pending].tofile(spill_file)
+            self.spilled += self._spill_pending
+            self._spill_pending = 0
+        except OSError as e:
+            logger.error(f"Error spilling history to {self.spill_path}: {e}")
+
+    def _write(self, ts: float, values: Dict[str, Any]) -> None:
+        if self.count == self._size and self.count < self.capacity:
+            self._grow()
+
+        slot = self.head
+        if self.count == self.capacity and self.spill_path:
+            self._spill(slot)
+
+        self._columns[self.time_field][slot] = ts
+        for name in self.numeric_fields:
+            self._columns[name][slot] = values.get(name, 0)
+        for name, column in self._objects.items():
+            column[slot] = values.get(name)
+
+        self.head = (slot + 1) % self._size
+        self.count = min(self.count + 1, self.capacity)
+        if ts < self._last_ts:
+            self.sorted = False
+        else:
+            self._last_ts = ts
+
+    def _spill(self, slot: int) -> None:
+        row = self._spill_buffer[self._spill_pending:self._spill_pending + 1]
+        for name, column in self._columns.items():
+            row[name] = column[slot]
+        self._spill_pending += 1
+        if self._spill_pending == len(self._spill_buffer):
+            self.flush()
+
+    def _spilled_range(self, start: Optional[Timestamp], end: Optional[Timestamp]) -> np.ndarray:
+        parts = []
+        if os.path.exists(self.spill_path) and os.path.getsize(self.spill_path):
+            parts.append(np.memmap(self.spill_path, dtype=self.dtype, mode='r'))
+        parts.append(self._spill_buffer[:self._spill_pending])
+        data = np.concatenate(parts)
+        ts = data[self.time_field]
+        mask = np.ones(len(data), dtype=bool)
+        if start is not None:
+            mask &= ts >= self._to_seconds(start, remember=False)
+        if end is not None:
+            mask &= ts <= self._to_seconds(end, remember=False)
+        return data[mask]
+
+    def _slots(self, positions: np.ndarray) -> np.ndarray:
+        """Ring slots of chronological positions (0 is the oldest record)."""
+        oldest = self.head if self.count == self._size else 0
+        return (oldest + positions) % self._size
+
+    def _chronological(self, column: np.ndarray, first: int, last: int) -> np.ndarray:
+        """Chronological positions [first, last) of a column, without a gather."""
+        oldest = self.head if self.count == self._size else 0
+        low, high = oldest + first, oldest + last
+        if high <= self._size:
+            return column[low:high].copy()
+        if low >= self._size:
+            return column[low - self._size:high - self._size].copy()
+        return np.concatenate((column[low:], column[:high - self._size]))
+
+    def _range_positions(
+        self,
+        start: Optional[Timestamp],
+        end: Optional[Timestamp]
+    ) -> Union[slice, np.ndarray]:
+        """Chronological positions of the records in [start, end]: a slice while sorted."""
+        if start is None and end is None:
+            return slice(0, self.count)
+
+        ts = self._chronological(self._columns[self.time_field], 0, self.count)
+        low = -np.inf if start is None else self._to_seconds(start, remember=False)
+        high = np.inf if end is None else self._to_seconds(end, remember=False)
+        if self.sorted:
+            return slice(int(np.searchsorted(ts, low, side='left')), int(np.searchsorted(ts, high, side='right')))
+        return np.flatnonzero((ts >= low) & (ts <= high))
+
+    def _structured(self, positions: Union[slice, np.ndarray]) -> np.ndarray:
+        """Time and numeric fields at chronological positions as one structured array."""
+        if isinstance(positions, slice):
+            columns = {
+                name: self._chronological(column, positions.start, max(positions.start, positions.stop))
+                for name, column in self._columns.items()
+            }
+        else:
+            slots = self._slots(positions)
+            columns = {name: column[slots] for name, column in self._columns.items()}
+        data = np.empty(len(columns[self.time_field]), dtype=self.dtype)
+        for name, values in columns.items():
+            data[name] = values
+        return data
+
+    def _records(self, slots: np.ndarray) -> List[Any]:
+        timestamps = self._columns[self.time_field][slots].tolist()
+        if self._returns_datetime:
+            timestamps = [datetime.fromtimestamp(ts, self._tz) for ts in timestamps]
+        columns = [timestamps] + [self._columns[name][slots].tolist() for name in self.numeric_fields]
+        columns += [self._objects[name][slots].tolist() for name in self.object_fields]
+        names = [self.time_field] + self.numeric_fields + self.object_fields
+        if dataclasses.is_dataclass(self.record_type):
+            # Positional construction in the dataclass' own field order
+            by_name = dict(zip(names, columns))
+            ordered = [by_name[field.name] for field in dataclasses.fields(self.record_type)]
+            return [self.record_type(*values) for values in zip(*ordered)]
+        return [self.record_type(zip(names, values)) for values in zip(*columns)]
+
+    def _to_seconds(self, timestamp: Timestamp, remember: bool = True) -> float:
+        if isinstance(timestamp, datetime):
+            if remember and not self._returns_datetime:
+                self._returns_datetime = True
+                self._tz = timestamp.tzinfo
+            return timestamp.timestamp()
+        return float(timestamp)
+
+    def _grow(self) -> None:
+        size = min(self.capacity, 2 * self._size)
+        for columns in (self._columns, self._objects):
+            for name, column in columns.items():
+                grown = np.zeros(size, dtype=column.dtype)
+                grown[:self.count] = column
+                columns[name] = grown
+        self._size = size
+        self.head = self.count
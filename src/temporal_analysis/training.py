@@ -0,0 +1,356 @@
+"""
+Kinetic Anomaly Detection Engine System (KADES)
+Volatility Model Training Module
+
+This module implements the offline training pipeline for the LSTM volatility
+predictor. Training windows are strided views over memory-mapped historical
+feature arrays, batches are gathered with a single fancy-index per batch in
+multi-worker DataLoaders, and the trainer supports gradient accumulation and
+checkpoint/resume of the model, optimizer and feature scaler state.
+
+Author: KADES Team
+License: Proprietary
+"""
+
+import numpy as np
+from typing import Dict, List, Optional, Sequence, Tuple
+import logging
+import os
+import time
+
+import torch
+import torch.nn as nn
+from torch.utils.data import BatchSampler, DataLoader, Dataset, RandomSampler, SequentialSampler
+
+from .lstm_predictor import VolatilityPredictor
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+SCALER_ATTRIBUTES = ['min_', 'scale_', 'data_min_', 'data_max_', 'data_range_', 'n_samples_seen_']
+
+def save_feature_array(path: str, features: np.ndarray) -> None:
+    """
+    Save a (time steps, features) float32 array for memory-mapped training.
+    Rows should already be scaled and past the rolling-feature warm-up.
+    """
+    np.save(path, np.ascontiguousarray(features, dtype=np.float32))
+
+class MemmapWindowDataset(Dataset):
+    """
+    Training windows over memory-mapped feature arrays.
+
+    Each .npy file holds one token's (time steps, features) history. Sample i
+    is the window of sequence_length rows starting at its offset, and the
+    target is target_column of the following row; windows never span files.
+    Indexing with a list of indices returns a whole batch gathered from the
+    strided window views, so a BatchSampler can feed the DataLoader directly.
+    """
+
+    def __init__(self, paths: Sequence[str], sequence_length: int, target_column: int = 0):
+        """
+        Initialize the dataset.
+
+        Args:
+            paths: .npy feature files, one per token history
+            sequence_length: Rows per input window
+            target_column: Feature column of the next row used as target
+        """
+        self.paths = list(paths)
+        self.sequence_length = sequence_length
+        self.target_column = target_column
+
+        # Only shapes are read here; arrays are mapped lazily in each worker
+        lengths = []
+        for path in self.paths:
+            shape = np.load(path, mmap_mode='r').shape
+            lengths.append(max(0, shape[0] - sequence_length))
+        self.offsets = np.concatenate(([0], np.cumsum(lengths))).astype(np.int64)
+        self._arrays: Optional[List[np.ndarray]] = None
+        self._windows: Optional[List[np.ndarray]] = None
+
+    def __len__(self) -> int:
+        return int(self.offsets[-1])
+
+    def __getstate__(self) -> Dict:
+        # Ship paths to workers, not mapped arrays (which would be copied)
+        state = self.__dict__.copy()
+        state['_arrays'] = None
+        state['_windows'] = None
+        return state
+
+    def _open(self) -> None:
+        self._arrays = [np.load(path, mmap_mode='r') for path in self.paths]
+        self._windows = [
+            np.lib.stride_tricks.sliding_window_view(
+                array, self.sequence_length, axis=0
+            ).transpose(0, 2, 1)  # (windows, sequence_length, features)
+            for array in self._arrays
+        ]
+
+    def __getitem__(self, index) -> Tuple[torch.Tensor, torch.Tensor]:
+        """
+        Get one sample, or a batch when index is a list of indices.
+
+        Returns:
+            (windows, targets) with shapes (L, F) and () for a single index,
+            (B, L, F) and (B,) for a list
+        """
+        if self._windows is None:
+            self._open()
+
+        if np.isscalar(index):
+            x, y = self._gather(np.array([index], dtype=np.int64))
+            return x[0], y[0]
+        return self._gather(np.asarray(index, dtype=np.int64))
+
+    def _gather(self, indices: np.ndarray) -> Tuple[torch.Tensor, torch.Tensor]:
+        """Copy the windows and targets for global sample indices."""
+        files = np.searchsorted(self.offsets, indices, side='right') - 1
+        local = indices - self.offsets[files]
+
+        x = np.empty((len(indices), self.sequence_length, self._arrays[0].shape[1]), dtype=np.float32)
+        y = np.empty(len(indices), dtype=np.float32)
+        for file_index in np.unique(files):
+            mask = files == file_index
+            starts = local[mask]
+            x[mask] = self._windows[file_index][starts]
+            y[mask] = self._arrays[file_index][starts + self.sequence_length, self.target_column]
+
+        return torch.from_numpy(x), torch.from_numpy(y)
+
+class VolatilityTrainer:
+    """
+    CPU training loop for the LSTM volatility model with gradient
+    accumulation, multi-worker data loading and checkpoint/resume.
+    """
+
+    def __init__(
+        self,
+        predictor: VolatilityPredictor,
+        checkpoint_dir: Optional[str] = None,
+        batch_size: int = 256,
+        accumulation_steps: int = 1,
+        num_workers: int = 2,
+        max_grad_norm: Optional[float] = 1.0,
+        num_threads: Optional[int] = None
+    ):
+        """
+        Initialize the trainer.
+
+        Args:
+            predictor: Predictor whose model, optimizer, criterion and scalers are trained
+            checkpoint_dir: Directory for checkpoints (disabled if None)
+            batch_size: Samples per micro-batch
+            accumulation_steps: Micro-batches per optimizer step
+            num_workers: DataLoader worker processes
+            max_grad_norm: Gradient clipping norm (disabled if None)
+            num_threads: torch intra-op threads
+        """
+        if accumulation_steps < 1:
+            raise ValueError("accumulation_steps must be at least 1")
+
+        self.predictor = predictor
+        self.model = predictor.model
+        self.optimizer = predictor.optimizer
+        self.criterion = predictor.criterion
+        self.checkpoint_dir = checkpoint_dir
+        self.batch_size = batch_size
+        self.accumulation_steps = accumulation_steps
+        self.num_workers = num_workers
+        self.max_grad_norm = max_grad_norm
+
+        if num_threads:
+            torch.set_num_threads(num_threads)
+
+        self.epoch = 0
+        self.global_step = 0
+        self.history: List[Dict] = []
+
+    def train(
+        self,
+        train_dataset: Dataset,
+        epochs: int,
+        val_dataset: Optional[Dataset] = None,
+        resume: bool = True
+    ) -> List[Dict]:
+        """
+        Train for a number of epochs, resuming from the latest checkpoint.
+
+        Args:
+            train_dataset: Dataset supporting list indexing (MemmapWindowDataset)
+            epochs: Total epochs to reach, including resumed ones
+            val_dataset: Optional validation dataset
+            resume: Load the latest checkpoint if one exists
+
+        Returns:
+            Per-epoch metrics
+        """
+        try:
+            if resume and self.checkpoint_dir:
+                latest = os.path.join(self.checkpoint_dir, 'latest.pt')
+                if os.path.exists(latest):
+                    self.load_checkpoint(latest)
+
+            train_loader = self._make_loader(train_dataset, shuffle=True)
+            val_loader = self._make_loader(val_dataset, shuffle=False) if val_dataset else None
+
+            while self.epoch < epochs:
+                metrics = self._train_epoch(train_loader)
+                if val_loader is not None:
+                    metrics['validation_loss'] = self.evaluate(val_loader)
+                    self.predictor.model_metrics['validation_loss'].append(metrics['validation_loss'])
+                self.predictor.model_metrics['training_loss'].append(metrics['training_loss'])
+
+                self.epoch += 1
+                metrics['epoch'] = self.epoch
+                self.history.append(metrics)
+                logger.info(
+                    f"Epoch {self.epoch}/{epochs}: loss {metrics['training_loss']:.6f}, "
+                    f"{metrics['samples_per_second']:.0f} samples/s"
+                )
+
+                if self.checkpoint_dir:
+                    self.save_checkpoint()
+
+            # Traced/exported backends captured the old weights
+            self.predictor.build_backend()
+            return self.history
+
+        except Exception as e:
+            logger.error(f"Error training volatility model: {e}")
+            raise
+
+    def _make_loader(self, dataset: Dataset, shuffle: bool) -> DataLoader:
+        """DataLoader that fetches whole batches through list indexing."""
+        sampler = RandomSampler(dataset) if shuffle else SequentialSampler(dataset)
+        return DataLoader(
+            dataset,
+            sampler=BatchSampler(sampler, batch_size=self.batch_size, drop_last=False),
+            batch_size=None,
+            num_workers=self.num_workers,
+            persistent_workers=self.num_workers > 0,
+            prefetch_factor=4 if self.num_workers > 0 else None
+        )
+
+    def _train_epoch(self, loader: DataLoader) -> Dict:
+        """Run one epoch with gradient accumulation."""
+        self.model.train()
+        self.optimizer.zero_grad(set_to_none=True)
+
+        total_loss = 0.0
+        samples = 0
+        pending = 0
+        started = time.perf_counter()
+
+        for x, y in loader:
+            predictions, _ = self.model(x)
+            loss = self.criterion(predictions[:, 0], y)
+            (loss / self.accumulation_steps).backward()
+
+            total_loss += loss.item() * len(y)
+            samples += len(y)
+            pending += 1
+
+            if pending == self.accumulation_steps:
+                self._optimizer_step()
+                pending = 0
+
+        # Apply leftover accumulated gradients
+        if pending:
+            self._optimizer_step()
+
+        elapsed = time.perf_counter() - started
+        return {
+            'training_loss': total_loss / samples if samples else 0.0,
+            'samples': samples,
+            'seconds': elapsed,
+            'samples_per_second': samples / elapsed if elapsed > 0 else 0.0
+        }
+
+    def _optimizer_step(self) -> None:
+        if self.max_grad_norm:
+            nn.utils.clip_grad_norm_(self.model.parameters(), self.max_grad_norm)
+        self.optimizer.step()
+        self.optimizer.zero_grad(set_to_none=True)
+        self.global_step += 1
+
+    @torch.no_grad()
+    def evaluate(self, loader: DataLoader) -> float:
+        """Mean loss over a loader."""
+        self.model.eval()
+        total_loss = 0.0
+        samples = 0
+        for x, y in loader:
+            predictions, _ = self.model(x)
+            total_loss += self.criterion(predictions[:, 0], y).item() * len(y)
+            samples += len(y)
+        return total_loss / samples if samples else 0.0
+
+    def save_checkpoint(self, path: Optional[str] = None) -> str:
+        """
+        Save model, optimizer, feature scaler and progress state.
+        The write is atomic and also updates latest.pt.
+        """
+        os.makedirs(self.checkpoint_dir, exist_ok=True)
+        path = path or os.path.join(self.checkpoint_dir, f'checkpoint_epoch{self.epoch:04d}.pt')
+
+        state = {
+            'epoch': self.epoch,
+            'global_step': self.global_step,
+            'model': self.model.state_dict(),
+            'optimizer': self.optimizer.state_dict(),
+            'scalers': {
+                name: _scaler_state(getattr(self.predictor, f'{name}_scaler'))
+                for name in ('price', 'sentiment', 'whale')
+            },
+            'history': self.history,
+            'rng_state': torch.get_rng_state()
+        }
+
+        temporary = f"{path}.tmp"
+        torch.save(state, temporary)
+        os.replace(temporary, path)
+
+        latest = os.path.join(self.checkpoint_dir, 'latest.pt')
+        if os.path.abspath(path) != os.path.abspath(latest):
+            torch.save(state, f"{latest}.tmp")
+            os.replace(f"{latest}.tmp", latest)
+        return path
+
+    def load_checkpoint(self, path: str) -> None:
+        """Restore model, optimizer, feature scaler and progress state."""
+        state = torch.load(path, map_location='cpu')
+
+        self.model.load_state_dict(state['model'])
+        self.optimizer.load_state_dict(state['optimizer'])
+        for name, scaler_state in state['scalers'].items():
+            if scaler_state:
+                _load_scaler_state(getattr(self.predictor, f'{name}_scaler'), scaler_state)
+                setattr(self.predictor, f'{name}_scaler_fitted', True)
+        self.predictor._sync_feature_scaling()
+
+        self.epoch = state['epoch']
+        self.global_step = state['global_step']
+        self.history = list(state['history'])
+        torch.set_rng_state(state['rng_state'])
+        logger.info(f"Resumed from {path} at epoch {self.epoch}")
+
+def _scaler_state(scaler) -> Dict[str, torch.Tensor]:
+    """Fitted MinMaxScaler attributes as tensors (empty if unfitted)."""
+    if not hasattr(scaler, 'scale_'):
+        return {}
+    state = {name: torch.as_tensor(np.asarray(getattr(scaler, name))) for name in SCALER_ATTRIBUTES}
+    state['feature_range'] = torch.tensor(scaler.feature_range, dtype=torch.float64)
+    return state
+
+def _load_scaler_state(scaler, state: Dict[str, torch.Tensor]) -> None:
+    for name in SCALER_ATTRIBUTES:
+        value = state[name].numpy()
+        setattr(scaler, name, value.item() if value.ndim == 0 else value)
+    scaler.feature_range = tuple(state['feature_range'].tolist())
+    scaler.n_features_in_ = len(scaler.scale_)
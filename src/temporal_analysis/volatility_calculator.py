@@ -15,8 +15,17 @@ from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple, Union
 import logging
-from collections import defaultdict, deque
+from collections import defaultdict
 from scipy.stats import norm
+from .return_buffer import LogReturnBuffer
+from .ohlcv_bars import BarAggregator, timeframe_seconds
+from .time_series_history import TimeSeriesHistory
+from .volatility_estimators import (
+    ESTIMATORS,
+    VolatilityEngine,
+    garman_klass_volatility,
+    parkinson_volatility
+)
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -52,7 +61,12 @@ class VolatilityCalculator:
         window_sizes: List[int] = [5, 15, 30, 60, 120],  # minutes
         vol_threshold: float = 0.5,
         update_interval: int = 60,  # seconds
-        min_data_points: int = 30
+        min_data_points: int = 30,
+        history_size: int = 10000,
+        metrics_history_size: int = 1000,
+        estimator: str = 'realized',
+        bar_timeframe: str = '5m',
+        engine: Optional[VolatilityEngine] = None
     ):
         """
         Initialize the volatility calculator.
@@ -62,21 +76,24 @@ class VolatilityCalculator:
             vol_threshold: Threshold for volatility warnings
             update_interval: Update interval in seconds
             min_data_points: Minimum points required for calculation
+            history_size: Ticks retained per token
+            metrics_history_size: VolatilityMetrics retained per token
+            estimator: Default estimator for realized volatility, one of ESTIMATORS
+            bar_timeframe: OHLC bar timeframe for the range estimators
+            engine: EWMA/GARCH engine (a default one is created if omitted)
         """
+        if estimator not in ESTIMATORS:
+            raise ValueError(f"Unknown volatility estimator '{estimator}', expected one of {ESTIMATORS}")
+
         self.window_sizes = window_sizes
         self.vol_threshold = vol_threshold
         self.update_interval = update_interval
         self.min_data_points = min_data_points
-        
-        # Data structures
-        self.price_history: Dict[str, deque] = defaultdict(
-            lambda: deque(maxlen=10000)
-        )
-        self.volatility_history: Dict[str, List[VolatilityMetrics]] = defaultdict(list)
-        
-        # Tracking metrics
-        self.metrics = defaultdict(list)
-        self.alerts = defaultdict(list)
+        self.history_size = history_size
+        self.estimator = estimator
+        self.bar_timeframe = bar_timeframe
+        self.engine = engine or VolatilityEngine()
+        self._last_refit: Optional[datetime] = None
         
         # Statistical parameters
         self.ewm_spans = {
@@ -84,6 +101,21 @@ class VolatilityCalculator:
             'medium': 72,  # 6 hours
             'long': 288    # 24 hours
         }
+        
+        # Data structures
+        self.price_history: Dict[str, LogReturnBuffer] = defaultdict(
+            lambda: LogReturnBuffer(self.window_sizes, self.ewm_spans, capacity=self.history_size)
+        )
+        self.volatility_history: Dict[str, TimeSeriesHistory] = defaultdict(
+            lambda: TimeSeriesHistory.for_dataclass(VolatilityMetrics, capacity=metrics_history_size)
+        )
+        self.bars: Dict[str, BarAggregator] = defaultdict(
+            lambda: BarAggregator([self.bar_timeframe])
+        )
+        
+        # Tracking metrics
+        self.metrics = defaultdict(list)
+        self.alerts = defaultdict(list)
 
     def calculate_volatility(
         self,
@@ -92,7 +124,8 @@ class VolatilityCalculator:
         timestamp: datetime,
         volume: Optional[float] = None,
         liquidity_data: Optional[Dict] = None,
-        sentiment_data: Optional[Dict] = None
+        sentiment_data: Optional[Dict] = None,
+        estimator: Optional[str] = None
     ) -> VolatilityMetrics:
         """
         Calculate comprehensive volatility metrics.
@@ -104,26 +137,40 @@ class VolatilityCalculator:
             volume: Trading volume (optional)
             liquidity_data: Liquidity pool data (optional)
             sentiment_data: Sentiment metrics (optional)
+            estimator: Realized volatility estimator, defaults to the configured one
             
         Returns:
             VolatilityMetrics containing calculation results
         """
         try:
+            estimator = estimator or self.estimator
+            if estimator not in ESTIMATORS:
+                raise ValueError(f"Unknown volatility estimator '{estimator}'")
+            
             # Update price history
-            self._update_price_history(token_address, current_price, timestamp)
+            self._update_price_history(token_address, current_price, timestamp, volume)
             
             # Check minimum data points
             if len(self.price_history[token_address]) < self.min_data_points:
                 logger.warning(f"Insufficient data points for {token_address}")
                 return self._generate_default_metrics(token_address, timestamp)
             
+            # Refit due GARCH models in one batch at most every update interval
+            if estimator == 'garch':
+                if self._last_refit is None or (timestamp - self._last_refit).total_seconds() >= self.update_interval:
+                    self.refit_volatility_models()
+                    self._last_refit = timestamp
+                elif self.engine.garch_params(token_address) is None:
+                    self.refit_volatility_models([token_address])
+            
             # Calculate basic volatility metrics
-            realized_vol = self._calculate_realized_volatility(token_address)
+            realized_vol = self._estimate_volatility(token_address, estimator)
             historical_vol = self._calculate_historical_volatility(token_address)
             implied_vol = self._calculate_implied_volatility(
                 token_address,
                 volume,
-                liquidity_data
+                liquidity_data,
+                base_vol=realized_vol
             )
             
             # Calculate relative volatility
@@ -176,7 +223,7 @@ class VolatilityCalculator:
             )
             
             # Update history
-            self.volatility_history[token_address].append(metrics)
+            self.volatility_history[token_address].append_record(metrics)
             
             # Update tracking metrics
             self._update_metrics(metrics)
@@ -190,14 +237,8 @@ class VolatilityCalculator:
     def _calculate_realized_volatility(self, token_address: str) -> float:
         """Calculate realized volatility using returns standard deviation."""
         try:
-            # Get price data
-            prices = np.array([p['price'] for p in self.price_history[token_address]])
-            
-            # Calculate returns
-            returns = np.diff(np.log(prices))
-            
             # Calculate annualized volatility
-            volatility = np.std(returns) * np.sqrt(365 * 24 * 60)
+            volatility = self.price_history[token_address].return_std() * np.sqrt(365 * 24 * 60)
             
             return float(volatility)
             
@@ -205,19 +246,73 @@ class VolatilityCalculator:
             logger.error(f"Error calculating realized volatility: {e}")
             return 0.0
 
+    def _estimate_volatility(self, token_address: str, estimator: str) -> float:
+        """Annualized volatility from the selected estimator."""
+        try:
+            if estimator == 'realized':
+                return self._calculate_realized_volatility(token_address)
+            
+            if estimator == 'ewma':
+                return self.engine.ewma_volatility(token_address) * np.sqrt(365 * 24 * 60)
+            
+            if estimator == 'garch':
+                return self.engine.garch_volatility(token_address) * np.sqrt(365 * 24 * 60)
+            
+            # Range estimators over closed bars, or the open bar before the first close
+            bars = self.bars[token_address].bars(self.bar_timeframe)
+            if not len(bars):
+                bars = self.bars[token_address].bars(self.bar_timeframe, include_partial=True)
+            if not len(bars):
+                return 0.0
+            
+            if estimator == 'parkinson':
+                per_bar = parkinson_volatility(bars['high'], bars['low'])
+            else:
+                per_bar = garman_klass_volatility(bars['open'], bars['high'], bars['low'], bars['close'])
+            
+            bars_per_year = 365 * 24 * 3600 / timeframe_seconds(self.bar_timeframe)
+            return float(per_bar * np.sqrt(bars_per_year))
+            
+        except Exception as e:
+            logger.error(f"Error estimating {estimator} volatility: {e}")
+            return 0.0
+
+    def refit_volatility_models(self, token_addresses: Optional[List[str]] = None) -> Dict:
+        """
+        Refit GARCH models for tokens that are due, in one vectorized batch.
+        
+        Args:
+            token_addresses: Tokens to fit (defaults to every token due for a refit)
+            
+        Returns:
+            Fitted GARCHParams per token
+        """
+        try:
+            tokens = self.engine.pending_fits() if token_addresses is None else token_addresses
+            returns = {
+                token: self.price_history[token].ordered('returns')[1:]
+                for token in tokens
+                if token in self.price_history
+            }
+            return self.engine.fit(returns)
+            
+        except Exception as e:
+            logger.error(f"Error refitting volatility models: {e}")
+            return {}
+
     def _calculate_historical_volatility(self, token_address: str) -> float:
         """Calculate historical volatility using Parkinson's High-Low range."""
         try:
             # Get high-low data for each window
+            history = self.price_history[token_address]
             highs = []
             lows = []
             
-            for window in self.window_sizes:
-                window_data = list(self.price_history[token_address])[-window:]
-                if window_data:
-                    prices = [d['price'] for d in window_data]
-                    highs.append(max(prices))
-                    lows.append(min(prices))
+            if len(history):
+                for window in self.window_sizes:
+                    high, low = history.price_range(window)
+                    highs.append(high)
+                    lows.append(low)
             
             if not highs or not lows:
                 return 0.0
@@ -238,12 +333,14 @@ class VolatilityCalculator:
         self,
         token_address: str,
         volume: Optional[float],
-        liquidity_data: Optional[Dict]
+        liquidity_data: Optional[Dict],
+        base_vol: Optional[float] = None
     ) -> float:
         """Calculate implied volatility using market data."""
         try:
             # Base volatility from price movement
-            base_vol = self._calculate_realized_volatility(token_address)
+            if base_vol is None:
+                base_vol = self._calculate_realized_volatility(token_address)
             
             # Adjust for volume if available
             if volume is not None:
@@ -446,19 +543,12 @@ class VolatilityCalculator:
     def _calculate_price_momentum(self, token_address: str) -> float:
         """Calculate price momentum indicator."""
         try:
-            prices = [p['price'] for p in self.price_history[token_address]]
-            if len(prices) < 2:
+            history = self.price_history[token_address]
+            if len(history) < 2:
                 return 0.0
 
-            # Calculate returns
-            returns = np.diff(np.log(prices))
-            
-            # Calculate exponential weights for different time spans
-            weights = {
-                'short': pd.Series(returns).ewm(span=self.ewm_spans['short']).mean().iloc[-1],
-                'medium': pd.Series(returns).ewm(span=self.ewm_spans['medium']).mean().iloc[-1],
-                'long': pd.Series(returns).ewm(span=self.ewm_spans['long']).mean().iloc[-1]
-            }
+            # Exponentially weighted mean returns for different time spans
+            weights = {name: history.ewm_mean(name) for name in self.ewm_spans}
             
             # Combine weighted momentum
             momentum = (
@@ -480,20 +570,13 @@ class VolatilityCalculator:
     ) -> float:
         """Calculate volume volatility."""
         try:
-            # Get recent volumes
-            volumes = [
-                current_volume,
-                *[entry.get('volume', 0) for entry in self.price_history[token_address]]
-            ]
-            
-            if len(volumes) < 2:
+            # The current volume was recorded with the latest tick
+            history = self.price_history[token_address]
+            if len(history) < 2:
                 return 0.0
 
-            # Calculate log changes
-            vol_changes = np.diff(np.log(np.array(volumes) + 1))
-            
-            # Calculate volatility
-            return float(np.std(vol_changes))
+            # Volatility of log volume changes
+            return float(history.volume_change_std())
             
         except Exception as e:
             logger.error(f"Error calculating volume volatility: {e}")
@@ -543,17 +626,13 @@ class VolatilityCalculator:
     def _calculate_trend_strength(self, token_address: str) -> float:
         """Calculate trend strength indicator."""
         try:
-            prices = [p['price'] for p in self.price_history[token_address]]
-            if len(prices) < self.min_data_points:
+            history = self.price_history[token_address]
+            if len(history) < self.min_data_points:
                 return 0.0
 
-            # Calculate price changes
-            changes = np.diff(prices)
-            
             # Calculate directional consistency
-            positive_changes = np.sum(changes > 0)
-            negative_changes = np.sum(changes < 0)
-            total_changes = len(changes)
+            positive_changes, negative_changes = history.direction_counts()
+            total_changes = len(history) - 1
             
             if total_changes == 0:
                 return 0.0
@@ -562,7 +641,7 @@ class VolatilityCalculator:
             consistency = max(positive_changes, negative_changes) / total_changes
             
             # Calculate trend magnitude
-            magnitude = abs(prices[-1] - prices[0]) / prices[0]
+            magnitude = abs(history.last_price - history.first_price) / history.first_price
             
             # Combine metrics
             trend_strength = (consistency * 0.7 + magnitude * 0.3)
@@ -658,16 +737,16 @@ class VolatilityCalculator:
         """Calculate quality score for available data."""
         try:
             # Check data quantity
-            data_points = len(self.price_history[token_address])
+            history = self.price_history[token_address]
+            data_points = len(history)
             quantity_score = min(1.0, data_points / self.min_data_points)
             
             # Check data consistency
-            timestamps = [p['timestamp'] for p in self.price_history[token_address]]
-            if len(timestamps) < 2:
+            if data_points < 2:
                 return quantity_score
                 
-            time_diffs = np.diff([t.timestamp() for t in timestamps])
-            consistency_score = 1 - min(1.0, np.std(time_diffs) / np.mean(time_diffs))
+            mean_interval, std_interval = history.interval_moments()
+            consistency_score = 1 - min(1.0, std_interval / mean_interval)
             
             return float((quantity_score + consistency_score) / 2)
             
@@ -721,14 +800,17 @@ class VolatilityCalculator:
         self,
         token_address: str,
         price: float,
-        timestamp: datetime
+        timestamp: datetime,
+        volume: Optional[float] = None
     ) -> None:
-        """Update price history for a token."""
+        """Update price history, estimator state and OHLC bars for a token."""
         try:
-            self.price_history[token_address].append({
-                'price': price,
-                'timestamp': timestamp
-            })
+            history = self.price_history[token_address]
+            ts = timestamp.timestamp()
+            history.append(ts, price, volume or 0.0)
+            if len(history) > 1:
+                self.engine.update(token_address, history.last_return)
+            self.bars[token_address].update(ts, price, volume or 0.0)
         except Exception as e:
             logger.error(f"Error updating price history: {e}")
 
@@ -0,0 +1,395 @@
+"""
+Kinetic Anomaly Detection Engine System (KADES)
+Window Aggregates Module
+
+This module implements incremental windowed aggregates for tick streams:
+a time-indexed ring of ticks with per-window rolling sums and monotonic-deque
+min/max, and a bounded rolling mean/std/median. Every update is O(1) amortized
+(O(log n) for the median), independent of the history length. A 2-D market
+ring (tokens x slots) supports batched multi-token updates.
+
+Author: KADES Team
+License: Proprietary
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+from collections import deque
+import numpy as np
+import heapq
+import logging
+import math
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Columns of a batched market tick array
+MARKET_TICK_DTYPE = np.dtype([
+    ('token_id', np.int64),
+    ('price', np.float64),
+    ('volume', np.float64),
+    ('liquidity', np.float64),
+    ('ts', np.float64)
+])
+
+@dataclass
+class WindowStats:
+    """Aggregates over the ticks of a single time window"""
+    window: int  # seconds
+    count: int
+    start_price: float
+    high: float
+    low: float
+    volume_sum: float
+    start_liquidity: float
+    start_volatility: float
+    sentiment_sum: float
+
+class _WindowState:
+    """Running state of one time window over the tick ring"""
+    __slots__ = ('seconds', 'start', 'volume_sum', 'sentiment_sum', 'max_seqs', 'min_seqs')
+
+    def __init__(self, seconds: int):
+        self.seconds = seconds
+        self.start = 0          # sequence number of the oldest tick in the window
+        self.volume_sum = 0.0
+        self.sentiment_sum = 0.0
+        self.max_seqs = deque() # decreasing prices
+        self.min_seqs = deque() # increasing prices
+
+class TickWindowAggregator:
+    """
+    Time-indexed ring of ticks with incremental per-window aggregates.
+    Ticks must arrive in timestamp order; each window covers the ticks with
+    timestamp >= latest timestamp - window seconds, capped at `capacity` ticks.
+    """
+
+    def __init__(self, windows: List[int], capacity: int = 10000):
+        """
+        Initialize the aggregator.
+
+        Args:
+            windows: Window lengths in seconds
+            capacity: Maximum number of ticks retained in the ring
+        """
+        self.capacity = capacity
+        self._ts = [0.0] * capacity
+        self._price = [0.0] * capacity
+        self._volume = [0.0] * capacity
+        self._liquidity = [0.0] * capacity
+        self._volatility = [0.0] * capacity
+        self._sentiment = [0.0] * capacity
+        self._next_seq = 0
+        self._windows: Dict[int, _WindowState] = {w: _WindowState(w) for w in windows}
+
+    def __len__(self) -> int:
+        return min(self._next_seq, self.capacity)
+
+    def push(
+        self,
+        ts: float,
+        price: float,
+        volume: float,
+        liquidity: float,
+        volatility: float,
+        sentiment: float
+    ) -> None:
+        """Append a tick and advance every window."""
+        cap = self.capacity
+        seq = self._next_seq
+        oldest = seq + 1 - cap
+
+        # Evict before the ring slot of the oldest tick is overwritten
+        for state in self._windows.values():
+            self._evict(state, ts - state.seconds, oldest, seq)
+
+        slot = seq % cap
+        self._ts[slot] = ts
+        self._price[slot] = price
+        self._volume[slot] = volume
+        self._liquidity[slot] = liquidity
+        self._volatility[slot] = volatility
+        self._sentiment[slot] = sentiment
+        self._next_seq = seq + 1
+
+        prices = self._price
+        for state in self._windows.values():
+            state.volume_sum += volume
+            state.sentiment_sum += sentiment
+
+            max_seqs = state.max_seqs
+            while max_seqs and prices[max_seqs[-1] % cap] <= price:
+                max_seqs.pop()
+            max_seqs.append(seq)
+
+            min_seqs = state.min_seqs
+            while min_seqs and prices[min_seqs[-1] % cap] >= price:
+                min_seqs.pop()
+            min_seqs.append(seq)
+
+        # Periodically re-derive running sums to bound floating point drift
+        if self._next_seq % cap == 0:
+            self._resync()
+
+    def stats(self, window: int) -> Optional[WindowStats]:
+        """Get aggregates for a configured window, None before the first tick."""
+        state = self._windows[window]
+        count = self._next_seq - state.start
+        if count <= 0:
+            return None
+
+        cap = self.capacity
+        start = state.start % cap
+        return WindowStats(
+            window=window,
+            count=count,
+            start_price=self._price[start],
+            high=self._price[state.max_seqs[0] % cap],
+            low=self._price[state.min_seqs[0] % cap],
+            volume_sum=state.volume_sum,
+            start_liquidity=self._liquidity[start],
+            start_volatility=self._volatility[start],
+            sentiment_sum=state.sentiment_sum
+        )
+
+    def _evict(self, state: _WindowState, cutoff: float, oldest: int, seq: int) -> None:
+        """Drop ticks that left the window by time or by ring capacity."""
+        cap = self.capacity
+        start = state.start
+        while start < seq and (start < oldest or self._ts[start % cap] < cutoff):
+            slot = start % cap
+            state.volume_sum -= self._volume[slot]
+            state.sentiment_sum -= self._sentiment[slot]
+            start += 1
+
+        if start == seq:
+            state.volume_sum = 0.0
+            state.sentiment_sum = 0.0
+        state.start = start
+
+        while state.max_seqs and state.max_seqs[0] < start:
+            state.max_seqs.popleft()
+        while state.min_seqs and state.min_seqs[0] < start:
+            state.min_seqs.popleft()
+
+    def _resync(self) -> None:
+        """Recompute running sums exactly from the ring."""
+        cap = self.capacity
+        for state in self._windows.values():
+            slots = [seq % cap for seq in range(state.start, self._next_seq)]
+            state.volume_sum = math.fsum(self._volume[s] for s in slots)
+            state.sentiment_sum = math.fsum(self._sentiment[s] for s in slots)
+
+class RollingStats:
+    """
+    Mean, standard deviation and median over the last `capacity` values.
+    The median uses two heaps with lazy deletion (O(log n) per update).
+    """
+
+    def __init__(self, capacity: int = 10000):
+        """
+        Initialize rolling statistics.
+
+        Args:
+            capacity: Number of most recent values covered
+        """
+        self.capacity = capacity
+        self._values: deque = deque()
+        self._sum = 0.0
+        self._sum_sq = 0.0
+        self._updates = 0
+
+        # Max-heap (negated) of the lower half, min-heap of the upper half
+        self._low: List[float] = []
+        self._high: List[float] = []
+        self._low_size = 0
+        self._high_size = 0
+        self._delayed: Dict[float, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def push(self, value: float) -> None:
+        """Add a value, evicting the oldest beyond capacity."""
+        self._values.append(value)
+        self._sum += value
+        self._sum_sq += value * value
+        self._insert(value)
+
+        if len(self._values) > self.capacity:
+            evicted = self._values.popleft()
+            self._sum -= evicted
+            self._sum_sq -= evicted * evicted
+            self._remove(evicted)
+
+        self._updates += 1
+        if self._updates % self.capacity == 0:
+            self._resync()
+
+    @property
+    def mean(self) -> float:
+        n = len(self._values)
+        return self._sum / n if n else 0.0
+
+    @property
+    def std(self) -> float:
+        """Population standard deviation (matches np.std)."""
+        n = len(self._values)
+        if not n:
+            return 0.0
+        mean = self._sum / n
+        return math.sqrt(max(0.0, self._sum_sq / n - mean * mean))
+
+    @property
+    def median(self) -> float:
+        if not self._values:
+            return 0.0
+        if self._low_size > self._high_size:
+            return -self._low[0]
+        return (-self._low[0] + self._high[0]) / 2
+
+    def _insert(self, value: float) -> None:
+        if not self._low or value <= -self._low[0]:
+            heapq.heappush(self._low, -value)
+            self._low_size += 1
+        else:
+            heapq.heappush(self._high, value)
+            self._high_size += 1
+        self._rebalance()
+
+    def _remove(self, value: float) -> None:
+        self._delayed[value] = self._delayed.get(value, 0) + 1
+        if value <= -self._low[0]:
+            self._low_size -= 1
+            if value == -self._low[0]:
+                self._prune(self._low, negated=True)
+        else:
+            self._high_size -= 1
+            if self._high and value == self._high[0]:
+                self._prune(self._high, negated=False)
+        self._rebalance()
+
+    def _rebalance(self) -> None:
+        if self._low_size > self._high_size + 1:
+            heapq.heappush(self._high, -heapq.heappop(self._low))
+            self._low_size -= 1
+            self._high_size += 1
+            self._prune(self._low, negated=True)
+        elif self._low_size < self._high_size:
+            heapq.heappush(self._low, -heapq.heappop(self._high))
+            self._high_size -= 1
+            self._low_size += 1
+            self._prune(self._high, negated=False)
+
+    def _prune(self, heap: List[float], negated: bool) -> None:
+        """Pop lazily deleted values off the top of a heap."""
+        while heap:
+            value = -heap[0] if negated else heap[0]
+            pending = self._delayed.get(value)
+            if not pending:
+                break
+            if pending == 1:
+                del self._delayed[value]
+            else:
+                self._delayed[value] = pending - 1
+            heapq.heappop(heap)
+
+    def _resync(self) -> None:
+        """Recompute sums exactly and rebuild the heaps without stale entries."""
+        self._sum = math.fsum(self._values)
+        self._sum_sq = math.fsum(v * v for v in self._values)
+
+        ordered = sorted(self._values)
+        half = (len(ordered) + 1) // 2
+        self._low = [-v for v in ordered[:half]]
+        self._high = ordered[half:]
+        heapq.heapify(self._low)
+        heapq.heapify(self._high)
+        self._low_size = len(self._low)
+        self._high_size = len(self._high)
+        self._delayed = {}
+
+class MarketRing:
+    """
+    Two-dimensional tick ring (tokens x slots) of float64 columns.
+    Rows are token ids; each row holds the token's last `slots` ticks.
+    Unwritten slots carry a NaN timestamp so window masks exclude them.
+    """
+
+    def __init__(self, slots: int = 512, initial_tokens: int = 1024):
+        """
+        Initialize the ring.
+
+        Args:
+            slots: Ticks retained per token
+            initial_tokens: Initial number of token rows (grows on demand)
+        """
+        self.slots = slots
+        self.ts = np.full((initial_tokens, slots), np.nan)
+        self.price = np.zeros((initial_tokens, slots))
+        self.volume = np.zeros((initial_tokens, slots))
+        self.liquidity = np.zeros((initial_tokens, slots))
+        self.counts = np.zeros(initial_tokens, dtype=np.int64)
+
+    @property
+    def num_rows(self) -> int:
+        return self.ts.shape[0]
+
+    def ensure_rows(self, num_tokens: int) -> None:
+        """Grow the ring (doubling) to hold at least `num_tokens` rows."""
+        if num_tokens <= self.num_rows:
+            return
+
+        rows = self.num_rows
+        while rows < num_tokens:
+            rows *= 2
+        extra = rows - self.num_rows
+        self.ts = np.vstack([self.ts, np.full((extra, self.slots), np.nan)])
+        self.price = np.vstack([self.price, np.zeros((extra, self.slots))])
+        self.volume = np.vstack([self.volume, np.zeros((extra, self.slots))])
+        self.liquidity = np.vstack([self.liquidity, np.zeros((extra, self.slots))])
+        self.counts = np.concatenate([self.counts, np.zeros(extra, dtype=np.int64)])
+
+    def append(self, ticks: np.ndarray) -> np.ndarray:
+        """
+        Append a batch of ticks (MARKET_TICK_DTYPE), possibly several per token.
+
+        Returns:
+            Sorted array of token ids touched by the batch
+        """
+        if len(ticks) == 0:
+            return np.zeros(0, dtype=np.int64)
+
+        token_ids = ticks['token_id'].astype(np.int64)
+        self.ensure_rows(int(token_ids.max()) + 1)
+
+        # Group ticks per token in timestamp order
+        order = np.lexsort((ticks['ts'], token_ids))
+        ticks = ticks[order]
+        token_ids = token_ids[order]
+
+        starts = np.flatnonzero(np.r_[True, token_ids[1:] != token_ids[:-1]])
+        sizes = np.diff(np.r_[starts, len(token_ids)])
+        rank = np.arange(len(token_ids)) - np.repeat(starts, sizes)
+
+        # Only the newest `slots` ticks per token survive the batch
+        keep = rank >= np.repeat(sizes, sizes) - self.slots
+        rows = token_ids[keep]
+        cols = (self.counts[rows] + rank[keep]) % self.slots
+
+        self.ts[rows, cols] = ticks['ts'][keep]
+        self.price[rows, cols] = ticks['price'][keep]
+        self.volume[rows, cols] = ticks['volume'][keep]
+        self.liquidity[rows, cols] = ticks['liquidity'][keep]
+
+        touched = token_ids[starts]
+        self.counts[touched] += sizes
+        return touched
+
+    def latest_slots(self, rows: np.ndarray) -> np.ndarray:
+        """Column holding the newest tick of each row."""
+        return (self.counts[rows] - 1) % self.slots
@@ -8,9 +8,20 @@ including accumulation patterns and whale wallet profiling.
 Author: KADES Team
 License: Proprietary"""
 
-from .whale_tracker import WhaleTracker
-from .accumulation_analyzer import AccumulationAnalyzer
-from .pattern_recognizer import PatternRecognizer
+from typing import TYPE_CHECKING
+from src._lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .whale_tracker import WhaleTracker
+    from .accumulation_analyzer import AccumulationAnalyzer
+    from .pattern_recognizer import PatternRecognizer
+
+_LAZY_IMPORTS = {
+    '.whale_tracker': ['WhaleTracker'],
+    '.accumulation_analyzer': ['AccumulationAnalyzer'],
+    '.pattern_recognizer': ['PatternRecognizer'],
+}
+__getattr__, __dir__ = lazy_exports(__name__, _LAZY_IMPORTS)
 
 __version__ = '1.0.0'
 __author__ = 'KADES Team'
@@ -0,0 +1,1123 @@
+""" Kinetic Anomaly Detection Engine System (KADES)
+
+API Test Suite
+
+This module implements testing for the API support components,
+including request coalescing, the Redis cache layer, rate limiting and
+the analysis routes.
+
+Author: KADES Team
+License: Proprietary """
+
+import unittest
+from unittest.mock import patch
+import asyncio
+import time
+import numpy as np
+import orjson
+from fastapi import BackgroundTasks, HTTPException
+
+from src.api import WS_CONFIG, routes
+from src.api.request_coalescing import SingleFlight
+from src.api.cache import AnalysisCache, CacheCodec
+from src.api.broadcast import BroadcastEngine
+from src.api.subscriptions import BufferedEvent, ReplayBuffer, Subscription, SubscriptionIndex
+from src.api.websocket import AnomalyEvent, EventRiskScore, WebSocketManager
+from src.api.rate_limiter import (
+    RateLimiter, MemoryBackend, RedisBackend, RateLimitStrategy, STRATEGIES, get_strategy, token_bucket_step
+)
+
+try:
+    from lupa import lua51
+except ImportError:
+    lua51 = None
+
+
+def strategy_script(strategy):
+    """Run a strategy's Python twin in place of its Lua script"""
+    def run(redis, keys, args):
+        limits = {'rate': float(args[0]), 'burst': float(args[1])}
+        decision, redis.hashes[keys[0]] = strategy.step(
+            redis.hashes.get(keys[0]), limits, float(args[2]), int(args[3])
+        )
+        return [decision.granted, str(decision.remaining), str(decision.reset_after), str(decision.retry_after)]
+    return run
+
+
+SCRIPTS = {cls.script: strategy_script(cls()) for cls in STRATEGIES.values()}
+
+
+class FakeAsyncRedis:
+    """In-memory stand-in for redis.asyncio.Redis (fakeredis-style) with expiry"""
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.store = {}
+        self.hashes = {}
+        self.commands = []
+
+    async def ping(self):
+        return True
+
+    async def get(self, key):
+        self.commands.append(('GET', 1))
+        value, expires = self.store.get(key, (None, 0))
+        return value if expires > self.clock() else None
+
+    async def set(self, key, value, ex=None):
+        self.store[key] = (value, self.clock() + ex if ex else float('inf'))
+
+    def register_script(self, source):
+        return FakeScript(self, SCRIPTS[source])
+
+    async def mget(self, keys):
+        self.commands.append(('MGET', len(keys)))
+        now = self.clock()
+        return [
+            value if value is not None and expires > now else None
+            for value, expires in (self.store.get(key, (None, 0)) for key in keys)
+        ]
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    async def close(self):
+        pass
+
+
+class FakeScript:
+    def __init__(self, redis, handler):
+        self.redis = redis
+        self.handler = handler
+
+    async def __call__(self, keys=(), args=()):
+        # Scripts run atomically: no await between read and write
+        self.redis.commands.append(('EVALSHA', 1))
+        return self.handler(self.redis, list(keys), list(args))
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.queued = []
+
+    def set(self, key, value, ex=None):
+        self.queued.append((key, value, ex))
+
+    async def execute(self):
+        self.redis.commands.append(('PIPELINE', len(self.queued)))
+        now = self.redis.clock()
+        for key, value, ex in self.queued:
+            self.redis.store[key] = (value, now + ex if ex else float('inf'))
+        return [True] * len(self.queued)
+
+
+class LuaRedis:
+    """
+    Runs the rate limit scripts in Lua 5.1, the interpreter embedded in Redis,
+    over an in-memory keyspace. Arguments and replies are converted as Redis
+    converts them: redis-py sends floats with repr, Lua numbers passed to
+    redis.call become strings with 14 significant digits, and numbers in a
+    reply are truncated to integers.
+    """
+
+    def __init__(self):
+        self.lua = lua51.LuaRuntime()
+        self.store = {}
+        self.lua.globals().redis = self.lua.table_from({'call': self.call})
+
+    def register_script(self, source):
+        async def run(keys=(), args=()):
+            globals_ = self.lua.globals()
+            globals_.KEYS = self.lua.table_from([str(key) for key in keys])
+            globals_.ARGV = self.lua.table_from([repr(arg) if isinstance(arg, float) else str(arg) for arg in args])
+            reply = self.lua.execute(source)
+            return [value if isinstance(value, str) else int(value) for value in reply.values()]
+        return run
+
+    @staticmethod
+    def _arg(value):
+        if isinstance(value, str):
+            return value
+        return '%.14g' % value
+
+    def _reply(self, values):
+        return self.lua.table_from([False if value is None else value for value in values])
+
+    def call(self, command, key, *args):
+        args = [self._arg(arg) for arg in args]
+        command = command.upper()
+        if command == 'GET':
+            return self.store.get(key, False)
+        if command == 'SET':
+            self.store[key] = args[0]
+        elif command == 'HMGET':
+            fields = self.store.get(key, {})
+            return self._reply([fields.get(name) for name in args])
+        elif command == 'HSET':
+            fields = self.store.setdefault(key, {})
+            fields.update(zip(args[::2], args[1::2]))
+        elif command == 'INCRBY':
+            self.store[key] = str(int(self.store.get(key, 0)) + int(args[0]))
+            return int(self.store[key])
+        elif command == 'ZADD':
+            self.store.setdefault(key, {})[args[1]] = float(args[0])
+        elif command == 'ZCARD':
+            return len(self.store.get(key, {}))
+        elif command == 'ZREMRANGEBYSCORE':
+            members = self.store.get(key, {})
+            for member in [m for m, score in members.items() if score <= float(args[1])]:
+                del members[member]
+        elif command == 'ZRANGE':
+            ranked = sorted(self.store.get(key, {}).items(), key=lambda item: (item[1], item[0]))
+            start, stop = int(args[0]), int(args[1])
+            stop = len(ranked) + stop if stop < 0 else stop
+            start = len(ranked) + start if start < 0 else start
+            return self._reply([
+                value for member, score in ranked[start:stop + 1] for value in (member, '%.17g' % score)
+            ])
+        elif command != 'PEXPIRE':
+            raise ValueError(f"Unsupported command {command}")
+        return 'OK'
+
+
+class FakeWebSocket:
+    """Records frames; sends block while `gate` is cleared"""
+
+    def __init__(self, fail=False):
+        self.frames = []
+        self.fail = fail
+        self.gate = asyncio.Event()
+        self.gate.set()
+        self.client_state = None
+
+    async def accept(self):
+        pass
+
+    async def close(self):
+        pass
+
+    async def send_text(self, frame):
+        if self.fail:
+            raise ConnectionResetError("client went away")
+        await self.gate.wait()
+        self.frames.append(frame)
+
+
+class TestSingleFlight(unittest.TestCase):
+    def setUp(self):
+        self.flights = SingleFlight()
+        self.calls = 0
+
+    async def slow_compute(self, value):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        return value
+
+    def test_concurrent_calls_share_one_execution(self):
+        async def run():
+            return await asyncio.gather(*(
+                self.flights.do(('TOKEN', 3600), lambda: self.slow_compute(42))
+                for _ in range(10)
+            ))
+
+        results = asyncio.run(run())
+        self.assertEqual(results, [42] * 10)
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(self.flights.stats, {'calls': 10, 'executions': 1})
+        self.assertEqual(len(self.flights), 0)
+
+    def test_distinct_keys_and_later_calls_execute(self):
+        async def run():
+            first = await asyncio.gather(
+                self.flights.do(('A', 3600), lambda: self.slow_compute('a')),
+                self.flights.do(('A', 60), lambda: self.slow_compute('a60'))
+            )
+            second = await self.flights.do(('A', 3600), lambda: self.slow_compute('again'))
+            return first, second
+
+        first, second = asyncio.run(run())
+        self.assertEqual(first, ['a', 'a60'])
+        self.assertEqual(second, 'again')
+        self.assertEqual(self.calls, 3)
+
+    def test_errors_propagate_to_every_waiter(self):
+        async def failing():
+            await asyncio.sleep(0.01)
+            raise ValueError("upstream down")
+
+        async def run():
+            return await asyncio.gather(
+                *(self.flights.do('key', failing) for _ in range(3)),
+                return_exceptions=True
+            )
+
+        results = asyncio.run(run())
+        self.assertTrue(all(isinstance(r, ValueError) for r in results))
+        self.assertFalse(self.flights.in_flight('key'))
+
+    def test_cancelled_waiter_does_not_cancel_shared_call(self):
+        async def run():
+            first = asyncio.ensure_future(self.flights.do('key', lambda: self.slow_compute(7)))
+            second = asyncio.ensure_future(self.flights.do('key', lambda: self.slow_compute(8)))
+            await asyncio.sleep(0)
+            first.cancel()
+            return await second
+
+        self.assertEqual(asyncio.run(run()), 7)
+        self.assertEqual(self.calls, 1)
+
+    def test_last_cancelled_waiter_cancels_shared_call(self):
+        started = asyncio.Event()
+        cancelled = []
+
+        async def blocked():
+            started.set()
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+
+        async def run():
+            waiters = [asyncio.ensure_future(self.flights.do('key', blocked)) for _ in range(2)]
+            await started.wait()
+            for waiter in waiters:
+                waiter.cancel()
+            await asyncio.gather(*waiters, return_exceptions=True)
+            await asyncio.sleep(0)
+            return list(cancelled)
+
+        self.assertEqual(asyncio.run(run()), [True])
+        self.assertFalse(self.flights.in_flight('key'))
+
+
+class TestAnalysisCache(unittest.TestCase):
+    def setUp(self):
+        self.now = 1000.0
+        self.redis = FakeAsyncRedis(lambda: self.now)
+        self.cache = AnalysisCache(
+            self.redis,
+            ttls={'default': 300, 'alerts': 60},
+            stale_ttl=30,
+            clock=lambda: self.now
+        )
+        self.computed = []
+
+    async def compute(self, key):
+        self.computed.append(key)
+        await asyncio.sleep(0)
+        return {'token': key, 'score': np.float64(0.5), 'values': np.arange(3)}
+
+    def test_codec_round_trip(self):
+        for serializer in ('orjson', 'msgpack'):
+            try:
+                codec = CacheCodec(serializer)
+            except ImportError:
+                continue
+            value, stored_at = codec.decode(codec.encode({'risk': np.float32(0.25), 'n': [1, 2]}, 12.5))
+            self.assertEqual(value, {'risk': 0.25, 'n': [1, 2]})
+            self.assertEqual(stored_at, 12.5)
+        with self.assertRaises(ValueError):
+            CacheCodec('pickle')
+
+    def test_multi_get_is_pipelined(self):
+        async def run():
+            await self.cache.set_many('alerts', {'A': [1], 'B': [2], 'C': [3]})
+            return await self.cache.get_many('alerts', ['A', 'B', 'C', 'D'])
+
+        values = asyncio.run(run())
+        self.assertEqual(values, {'A': [1], 'B': [2], 'C': [3]})
+        self.assertEqual(self.redis.commands, [('PIPELINE', 3), ('MGET', 4)])
+        self.assertEqual(self.cache.stats['misses'], 1)
+
+    def test_family_ttls(self):
+        async def run():
+            await self.cache.set('alerts', 'A', 1)
+            await self.cache.set('analysis_cache', 'A', 2)
+            self.now += 100
+            return await self.cache.get('alerts', 'A'), await self.cache.get('analysis_cache', 'A')
+
+        # alerts expired after 60s + 30s stale window, the default family lives 300s
+        self.assertEqual(asyncio.run(run()), (None, 2))
+
+    def test_misses_are_computed_once(self):
+        async def run():
+            return await asyncio.gather(*(
+                self.cache.get_or_compute('alerts', 'A', lambda: self.compute('A'))
+                for _ in range(5)
+            ))
+
+        results = asyncio.run(run())
+        self.assertEqual(self.computed, ['A'])
+        self.assertTrue(all(r is results[0] for r in results))
+        cached = asyncio.run(self.cache.get('alerts', 'A'))
+        self.assertEqual(cached, {'token': 'A', 'score': 0.5, 'values': [0, 1, 2]})
+
+    def test_stale_while_revalidate(self):
+        async def run():
+            await self.cache.set('alerts', 'A', 'old')
+            self.now += 70  # past the 60s TTL, inside the stale window
+            served = await self.cache.get_many_or_compute('alerts', ['A', 'B'], self.compute)
+            stale_value = served['A']
+            await asyncio.gather(*self.cache._refreshes)
+            return stale_value, served['B'], await self.cache.get('alerts', 'A')
+
+        stale_value, computed, refreshed = asyncio.run(run())
+        self.assertEqual(stale_value, 'old')
+        self.assertEqual(computed['token'], 'B')
+        self.assertEqual(refreshed['token'], 'A')
+        self.assertEqual(sorted(self.computed), ['A', 'B'])
+        self.assertEqual(self.cache.stats['stale_hits'], 1)
+        self.assertEqual(self.cache.stats['refreshes'], 1)
+
+    def test_prefetch_leaves_misses_to_caller(self):
+        async def run():
+            await self.cache.set('alerts', 'A', 'cached')
+            prefetched = await self.cache.get_many_or_refresh('alerts', ['A', 'B'], self.compute)
+            computed = await asyncio.gather(
+                self.cache.compute('alerts', 'B', lambda: self.compute('B')),
+                self.cache.compute('alerts', 'B', lambda: self.compute('B'))
+            )
+            return prefetched, computed, await self.cache.get('alerts', 'B')
+
+        prefetched, computed, stored = asyncio.run(run())
+        self.assertEqual(prefetched, {'A': 'cached'})
+        self.assertIs(computed[0], computed[1])
+        self.assertEqual(self.computed, ['B'])
+        self.assertEqual(stored['token'], 'B')
+
+
+class TestRateLimiter(unittest.TestCase):
+    def setUp(self):
+        self.redis = FakeAsyncRedis(time.time)
+
+    def make_limiter(self, **kwargs):
+        kwargs.setdefault('strategy', 'token_bucket')
+        limiter = RateLimiter("redis://localhost:6379/0", **kwargs)
+        asyncio.run(limiter.initialize(self.redis))
+        return limiter
+
+    def test_token_bucket_step(self):
+        self.assertEqual(token_bucket_step(None, None, 1.0, 5, 100.0), (1, 4.0, 100.0))
+        self.assertEqual(token_bucket_step(0.5, 100.0, 1.0, 5, 101.0, requested=3), (1, 0.5, 101.0))
+        # Clock skew never moves the bucket timestamp backwards
+        self.assertEqual(token_bucket_step(2.0, 105.0, 1.0, 5, 101.0), (1, 1.0, 105.0))
+
+    def test_single_round_trip_per_decision(self):
+        limiter = self.make_limiter()  # basic tier default: rate 1/s, burst 5
+
+        async def run():
+            return [await limiter.check_rate_limit('key', '/analyze') for _ in range(7)]
+
+        decisions = asyncio.run(run())
+        self.assertEqual([allowed for allowed, _ in decisions], [True] * 5 + [False] * 2)
+        self.assertEqual(decisions[0][1]['limit'], 5)
+        self.assertEqual(decisions[4][1]['remaining'], 0)
+
+        # One tier lookup, then one script call per request
+        self.assertEqual(self.redis.commands, [('GET', 1)] + [('EVALSHA', 1)] * 7)
+
+    def test_concurrent_requests_are_atomic(self):
+        limiter = self.make_limiter()
+
+        async def run():
+            return await asyncio.gather(*(limiter.check_rate_limit('key', '/analyze') for _ in range(20)))
+
+        self.assertEqual(sum(allowed for allowed, _ in asyncio.run(run())), 5)
+
+    def test_refill_and_tier_cache(self):
+        limiter = self.make_limiter(tier_cache_ttl=60)
+        asyncio.run(self.redis.set('tier:key', 'premium'))  # rate 5/s, burst 20
+        now = time.time()
+
+        async def burst(count):
+            return sum([(await limiter.check_rate_limit('key', '/analyze'))[0] for _ in range(count)])
+
+        with patch('src.api.rate_limiter.time.time', return_value=now):
+            self.assertEqual(asyncio.run(burst(25)), 20)
+        with patch('src.api.rate_limiter.time.time', return_value=now + 1):
+            self.assertEqual(asyncio.run(burst(10)), 5)
+
+        # A tier change is picked up once the cached entry is invalidated
+        asyncio.run(self.redis.set('tier:key', 'basic'))
+        limiter.invalidate_tier('key')
+        self.assertEqual(asyncio.run(limiter._get_tier_limits('key')), limiter.rate_limits['basic'])
+
+    def test_local_pre_admission(self):
+        limiter = self.make_limiter(local_batch=3, local_lease=10.0)
+
+        async def run():
+            return [(await limiter.check_rate_limit('key', '/analyze'))[0] for _ in range(6)]
+
+        now = time.time()
+        with patch('src.api.rate_limiter.time.time', return_value=now):
+            self.assertEqual(asyncio.run(run()), [True] * 5 + [False])
+        # Reservations of 3 and 2 tokens; the empty bucket then denies locally
+        self.assertEqual(self.redis.commands.count(('EVALSHA', 1)), 2)
+
+        # Once a token can have refilled, the next request asks Redis again
+        with patch('src.api.rate_limiter.time.time', return_value=now + 1.5):
+            self.assertTrue(asyncio.run(limiter.check_rate_limit('key', '/analyze'))[0])
+        self.assertEqual(self.redis.commands.count(('EVALSHA', 1)), 3)
+
+    def test_expired_leases_and_tiers_swept(self):
+        limiter = self.make_limiter(local_batch=3, local_lease=1.0, tier_cache_ttl=5, sweep_interval=4)
+
+        async def run(keys):
+            return [(await limiter.check_rate_limit(key, '/analyze'))[0] for key in keys]
+
+        now, started = time.time(), time.monotonic()
+        with patch('src.api.rate_limiter.time.time', return_value=now):
+            self.assertEqual(asyncio.run(run('abc')), [True] * 3)
+        self.assertEqual(sorted(limiter._tier_cache), ['a', 'b', 'c'])
+        self.assertEqual(len(limiter._leases), 3)
+
+        # The fourth decision sweeps the idle keys' leases and cached tiers
+        with patch('src.api.rate_limiter.time.time', return_value=now + 100), \
+                patch('src.api.rate_limiter.time.monotonic', return_value=started + 100):
+            self.assertEqual(asyncio.run(run('d')), [True])
+        self.assertEqual(list(limiter._tier_cache), ['d'])
+        self.assertEqual([key.split(':')[1] for key in limiter._leases], ['d'])
+
+
+class TestRateLimitStrategies(unittest.TestCase):
+    limits = {'rate': 1.0, 'burst': 5}
+
+    def decide(self, backend, strategy, times):
+        async def run():
+            return [
+                await backend.acquire(strategy, 'bucket:key:/analyze', self.limits, now, 1)
+                for now in times
+            ]
+        return asyncio.run(run())
+
+    def backends(self):
+        return [MemoryBackend(), RedisBackend(FakeAsyncRedis(time.time))]
+
+    def test_burst_then_deny(self):
+        for name in STRATEGIES:
+            for backend in self.backends():
+                decisions = self.decide(backend, get_strategy(name), [100.0 + 0.01 * i for i in range(7)])
+                self.assertEqual([d.granted for d in decisions], [1] * 5 + [0] * 2, (name, backend.name))
+                self.assertEqual(int(decisions[4].remaining), 0)
+                self.assertGreater(decisions[5].retry_after, 0)
+
+    def test_retry_after_admits(self):
+        for name in STRATEGIES:
+            strategy = get_strategy(name)
+            backend = MemoryBackend()
+            decisions = self.decide(backend, strategy, [100.0 + 0.01 * i for i in range(6)])
+            retry_at = 100.05 + decisions[-1].retry_after
+            later = self.decide(backend, strategy, [retry_at - 0.01, retry_at + 1e-6])
+            self.assertEqual([d.granted for d in later], [0, 1], name)
+
+    def test_window_strategies_limit_requests_per_window(self):
+        # Window strategies admit `burst` requests per burst / rate seconds
+        times = [100.0 + 0.5 * i for i in range(40)]
+        for name in ('sliding_window_log', 'sliding_window_counter'):
+            decisions = self.decide(MemoryBackend(), get_strategy(name), times)
+            admitted = [t for t, d in zip(times, decisions) if d.granted]
+            for t in admitted:
+                in_window = [u for u in admitted if t - 5.0 < u <= t]
+                self.assertLessEqual(len(in_window), 5, name)
+
+    def test_strategy_selection(self):
+        self.assertEqual(get_strategy('sliding_window').name, 'sliding_window_counter')
+        with self.assertRaises(TypeError):
+            RateLimitStrategy()
+        with self.assertRaises(ValueError):
+            get_strategy('leaky')
+        with self.assertRaises(ValueError):
+            RateLimiter(None, backend='disk')
+
+    def test_memory_backend_without_redis(self):
+        limiter = RateLimiter(None, strategy='gcra', backend='memory')
+        asyncio.run(limiter.initialize())
+        self.assertTrue(limiter.initialized)
+
+        async def run():
+            return [(await limiter.check_rate_limit('key', '/analyze'))[0] for _ in range(7)]
+
+        # Without Redis every key uses the basic tier (burst 5)
+        self.assertEqual(asyncio.run(run()), [True] * 5 + [False] * 2)
+
+    def test_memory_backend_sweeps_idle_keys(self):
+        backend = MemoryBackend(sweep_interval=3)
+        strategy = get_strategy('gcra')
+
+        async def run():
+            for i, now in enumerate([100.0, 100.0, 200.0]):
+                await backend.acquire(strategy, f'key{i}', self.limits, now)
+
+        asyncio.run(run())
+        self.assertEqual(len(backend), 1)
+
+
+
+@unittest.skipUnless(lua51, "lupa is not installed")
+class TestRateLimitScripts(unittest.TestCase):
+    """The Lua scripts against their in-process twins, at epoch timestamps"""
+
+    def decide(self, backend, strategy, limits, times):
+        async def run():
+            return [
+                await backend.acquire(strategy, 'bucket:key:/analyze', limits, now, requested)
+                for now, requested in times
+            ]
+        return asyncio.run(run())
+
+    def test_scripts_match_python_twins(self):
+        rng = np.random.RandomState(3)
+        for limits in ({'rate': 1.0, 'burst': 5}, {'rate': 250.0, 'burst': 20}):
+            steps = np.cumsum(rng.exponential(0.5 / limits['rate'], 300))
+            times = [(1760000000.0 + step, int(rng.randint(1, 4))) for step in steps]
+            for name in STRATEGIES:
+                strategy = get_strategy(name)
+                expected = self.decide(MemoryBackend(), strategy, limits, times)
+                actual = self.decide(RedisBackend(LuaRedis()), strategy, limits, times)
+                self.assertEqual([d.granted for d in actual], [d.granted for d in expected], name)
+                self.assertTrue(any(d.granted for d in expected) and not all(d.granted for d in expected))
+                for got, want in zip(actual, expected):
+                    for field in ('remaining', 'reset_after', 'retry_after'):
+                        self.assertAlmostEqual(getattr(got, field), getattr(want, field), delta=1e-9,
+                                               msg=(name, limits, field))
+
+    def test_timestamps_round_trip(self):
+        redis = LuaRedis()
+        now = 1760000000.0123456
+        decisions = self.decide(RedisBackend(redis), get_strategy('gcra'), {'rate': 250.0, 'burst': 20},
+                                [(now, 1), (now, 1)])
+        self.assertEqual(float(redis.store['bucket:key:/analyze']), now + 1 / 250.0 + 1 / 250.0)
+        # The second decision reads back the stored theoretical arrival time
+        self.assertAlmostEqual(decisions[1].reset_after, 2 / 250.0, delta=1e-6)
+
+
+class TestBroadcastEngine(unittest.TestCase):
+    def run_engine(self, scenario, **kwargs):
+        async def run():
+            engine = BroadcastEngine(**kwargs)
+            try:
+                return await scenario(engine)
+            finally:
+                await engine.close()
+        return asyncio.run(run())
+
+    @staticmethod
+    async def drain():
+        for _ in range(5):
+            await asyncio.sleep(0)
+
+    @staticmethod
+    def alert(token, n):
+        return {'type': 'anomaly_alert', 'data': {'token_address': token, 'n': n}}
+
+    def test_serialized_once_and_slow_client_does_not_block(self):
+        fast = [FakeWebSocket() for _ in range(3)]
+        slow = FakeWebSocket()
+        slow.gate.clear()
+
+        async def scenario(engine):
+            for ws in fast + [slow]:
+                engine.register(ws)
+            queued = [engine.publish(self.alert('A', n)) for n in range(3)]
+            await self.drain()
+            return queued
+
+        self.assertEqual(self.run_engine(scenario), [4, 4, 4])
+        for ws in fast:
+            self.assertEqual(len(ws.frames), 3)
+            # Every client got the same encoded frame objects
+            self.assertTrue(all(a is b for a, b in zip(ws.frames, fast[0].frames)))
+        self.assertEqual(slow.frames, [])
+
+    def test_drop_oldest(self):
+        slow = FakeWebSocket()
+        slow.gate.clear()
+
+        async def scenario(engine):
+            channel = engine.register(slow)
+            engine.publish(self.alert('A', 0))
+            await self.drain()  # frame 0 is now in flight
+            for n in range(1, 5):
+                engine.publish(self.alert('A', n))
+            slow.gate.set()
+            await self.drain()
+            return channel.stats
+
+        stats = self.run_engine(scenario, max_queue=2)
+        self.assertEqual([orjson.loads(f)['data']['n'] for f in slow.frames], [0, 3, 4])
+        self.assertEqual(stats['dropped'], 2)
+
+    def test_coalesce_by_token(self):
+        slow = FakeWebSocket()
+        slow.gate.clear()
+
+        async def scenario(engine):
+            channel = engine.register(slow)
+            engine.publish(self.alert('X', 0), key='X')
+            await self.drain()
+            for token, n in [('A', 1), ('B', 2), ('A', 3)]:
+                engine.publish(self.alert(token, n), key=token)
+            slow.gate.set()
+            await self.drain()
+            return channel.stats
+
+        stats = self.run_engine(scenario, max_queue=8, policy='coalesce')
+        # A's newer alert took the place of the queued one
+        self.assertEqual([orjson.loads(f)['data']['n'] for f in slow.frames], [0, 3, 2])
+        self.assertEqual(stats['coalesced'], 1)
+
+    def test_disconnect_policy_and_failed_sends(self):
+        slow = FakeWebSocket()
+        slow.gate.clear()
+        broken = FakeWebSocket(fail=True)
+        disconnected = []
+
+        async def on_disconnect(ws):
+            disconnected.append(ws)
+
+        async def scenario(engine):
+            engine.register(slow)
+            engine.register(broken)
+            for n in range(4):
+                engine.publish(self.alert('A', n))
+                await self.drain()
+            return len(engine), engine.stats['disconnected']
+
+        clients, count = self.run_engine(
+            scenario, max_queue=1, policy='disconnect', on_disconnect=on_disconnect
+        )
+        self.assertEqual((clients, count), (0, 2))
+        self.assertEqual(set(disconnected), {slow, broken})
+
+    def test_replies_bounded_and_sent_first(self):
+        slow = FakeWebSocket()
+        slow.gate.clear()
+
+        async def scenario(engine):
+            channel = engine.register(slow)
+            engine.publish(self.alert('A', 0))
+            await self.drain()  # frame 0 is now in flight
+            engine.publish(self.alert('A', 1))
+            accepted = [engine.send(slow, orjson.dumps({'type': 'reply', 'n': n}).decode()) for n in range(5)]
+            room = engine.reply_room(slow)
+            slow.gate.set()
+            await self.drain()
+            return accepted, room, channel.stats
+
+        accepted, room, stats = self.run_engine(scenario, max_queue=4, reply_reserve=3)
+        self.assertEqual(accepted, [True, True, True, False, False])
+        self.assertEqual((room, stats['rejected']), (0, 2))
+        messages = [orjson.loads(f) for f in slow.frames]
+        self.assertEqual(
+            [(m['type'], m.get('n', m.get('data', {}).get('n'))) for m in messages],
+            [('anomaly_alert', 0), ('reply', 0), ('reply', 1), ('reply', 2), ('anomaly_alert', 1)]
+        )
+
+    def test_unknown_policy(self):
+        with self.assertRaises(ValueError):
+            BroadcastEngine(policy='block')
+
+
+
+class TestSubscriptions(unittest.TestCase):
+    def test_index_matches_brute_force(self):
+        rng = np.random.default_rng(5)
+        tokens, types = ['A', 'B', 'C'], ['pump', 'dump', 'whale']
+        index = SubscriptionIndex()
+        subscriptions = {}
+        for subscriber in range(200):
+            subscription = Subscription.from_message({
+                'tokens': list(rng.choice(tokens, rng.integers(1, 3), replace=False)) if rng.random() < 0.7 else None,
+                'anomaly_types': list(rng.choice(types, rng.integers(1, 3), replace=False)) if rng.random() < 0.5 else None,
+                'min_risk': float(rng.choice([0.0, 0.5, 0.8]))
+            })
+            index.subscribe(subscriber, subscription)
+            subscriptions[subscriber] = subscription
+        for subscriber in range(0, 200, 3):
+            index.unsubscribe(subscriber)
+            del subscriptions[subscriber]
+
+        for token in tokens + ['D']:
+            for anomaly_type in types:
+                for risk in (0.1, 0.5, 0.9):
+                    expected = {s for s, sub in subscriptions.items() if sub.matches(token, anomaly_type, risk)}
+                    matched = index.match(token, anomaly_type, risk)
+                    self.assertEqual(len(matched), len(expected))
+                    self.assertEqual(set(matched), expected)
+
+    def test_invalid_subscription(self):
+        for message in ({'min_risk': 2}, {'tokens': [1]}, {'anomaly_types': 'x', 'min_risk': True}):
+            with self.assertRaises(ValueError):
+                Subscription.from_message(message)
+        self.assertIsNone(Subscription.from_message({'tokens': ['*']}).tokens)
+
+    def test_replay_buffer(self):
+        buffer = ReplayBuffer(capacity=3)
+        for event_id in range(1, 6):
+            buffer.append(BufferedEvent(event_id, 'A', 'pump', 0.9, str(event_id)))
+
+        events, gap = buffer.since(3)
+        self.assertEqual(([e.event_id for e in events], gap), ([4, 5], False))
+        self.assertEqual(buffer.since(5), ([], False))
+        # Events 2 and 3 fell out of the buffer; an id from before a restart
+        for last_event_id in (1, 9):
+            events, gap = buffer.since(last_event_id)
+            self.assertEqual(([e.event_id for e in events], gap), ([3, 4, 5], True))
+
+
+class TestWebSocketManager(unittest.TestCase):
+    @staticmethod
+    def event(token, anomaly_type, risk):
+        return AnomalyEvent(token, risk, anomaly_type, 1700000000, {})
+
+    @staticmethod
+    async def drain():
+        for _ in range(5):
+            await asyncio.sleep(0)
+
+    def run_manager(self, scenario, **kwargs):
+        async def run():
+            manager = WebSocketManager("wss://localhost", **{'replay_size': 10, **kwargs})
+            try:
+                return await scenario(manager)
+            finally:
+                await manager.stop()
+        return asyncio.run(run())
+
+    def test_subscription_filtering(self):
+        everything, filtered = FakeWebSocket(), FakeWebSocket()
+
+        async def scenario(manager):
+            await manager.connect(everything)
+            await manager.connect(filtered)
+            await manager.handle_client_message(filtered, orjson.dumps({
+                'action': 'subscribe', 'tokens': ['A'], 'min_risk': 0.8
+            }))
+            counts = [
+                await manager.broadcast_anomaly(self.event(token, 'pump', risk))
+                for token, risk in [('A', 0.9), ('A', 0.5), ('B', 0.95)]
+            ]
+            await self.drain()
+            return counts
+
+        self.assertEqual(self.run_manager(scenario), [2, 1, 1])
+        messages = [orjson.loads(f) for f in filtered.frames]
+        self.assertEqual(messages[0]['type'], 'subscribed')
+        self.assertEqual([m['event_id'] for m in messages[1:]], [1])
+        self.assertEqual(len(everything.frames), 3)
+
+    def test_resume_after_reconnect(self):
+        first, second = FakeWebSocket(), FakeWebSocket()
+
+        async def scenario(manager):
+            await manager.connect(first)
+            await manager.broadcast_anomaly(self.event('A', 'pump', 0.9))
+            await self.drain()
+            last_seen = orjson.loads(first.frames[-1])['event_id']
+            await manager.disconnect(first)
+
+            for token in ('A', 'B', 'A'):
+                await manager.broadcast_anomaly(self.event(token, 'pump', 0.9))
+            await manager.connect(second)
+            await manager.handle_client_message(second, orjson.dumps({
+                'action': 'subscribe', 'tokens': ['A'], 'last_event_id': last_seen
+            }))
+            await self.drain()
+
+        self.run_manager(scenario)
+        messages = [orjson.loads(f) for f in second.frames]
+        self.assertEqual([m['type'] for m in messages], ['subscribed', 'replay', 'anomaly_alert', 'anomaly_alert'])
+        self.assertEqual(messages[1], {'type': 'replay', 'gap': False, 'count': 2, 'last_event_id': 4})
+        self.assertEqual([m['event_id'] for m in messages[2:]], [2, 4])
+
+    def test_bad_messages_get_errors(self):
+        client = FakeWebSocket()
+
+        async def scenario(manager):
+            await manager.connect(client)
+            for text in ('not json', '[1]', '{"action": "dance"}', '{"action": "resume"}'):
+                await manager.handle_client_message(client, text)
+            await self.drain()
+
+        self.run_manager(scenario)
+        self.assertEqual([orjson.loads(f)['type'] for f in client.frames], ['error'] * 4)
+
+    def test_replay_truncated_to_reserve_and_rate_limited(self):
+        client = FakeWebSocket()
+
+        async def scenario(manager):
+            for token in 'ABCDEF':
+                await manager.broadcast_anomaly(self.event(token, 'pump', 0.9))
+            await manager.connect(client)
+            for _ in range(2):
+                await manager.handle_client_message(client, orjson.dumps({
+                    'action': 'resume', 'last_event_id': 0
+                }))
+                await self.drain()
+
+        self.run_manager(scenario, reply_reserve=4, replay_interval=60.0)
+        messages = [orjson.loads(f) for f in client.frames]
+        self.assertEqual(messages[0], {'type': 'replay', 'gap': True, 'count': 3, 'last_event_id': 6})
+        self.assertEqual([m['event_id'] for m in messages[1:4]], [4, 5, 6])
+        self.assertEqual(messages[4]['type'], 'error')
+        self.assertIn('rate limited', messages[4]['detail'])
+        self.assertEqual(len(messages), 5)
+
+    def test_from_config_reaches_broadcast_engine(self):
+        client = FakeWebSocket()
+        config = {**WS_CONFIG, 'send_queue_size': 8, 'slow_consumer_policy': 'coalesce'}
+
+        async def run():
+            manager = WebSocketManager.from_config("wss://localhost", config)
+            try:
+                await manager.connect(client)
+                return manager.broadcaster, manager.broadcaster.channels[client]
+            finally:
+                await manager.stop()
+
+        engine, channel = asyncio.run(run())
+        self.assertEqual((engine.max_queue, engine.policy), (8, 'coalesce'))
+        self.assertEqual((channel.max_queue, channel.policy), (8, 'coalesce'))
+
+    def test_from_config_sets_replay_limits(self):
+        config = {**WS_CONFIG, 'replay_size': 2, 'reply_reserve': 5, 'replay_interval': 30.0}
+
+        async def run():
+            manager = WebSocketManager.from_config("wss://localhost", config)
+            try:
+                for token in 'ABC':
+                    await manager.broadcast_anomaly(self.event(token, 'pump', 0.9))
+                return manager
+            finally:
+                await manager.stop()
+
+        manager = asyncio.run(run())
+        self.assertEqual(len(manager.replay), 2)
+        self.assertEqual(manager.broadcaster.reply_reserve, 5)
+        self.assertEqual(manager.replay_interval, 30.0)
+
+    def test_reply_reserve_default_from_ws_config(self):
+        async def run():
+            manager = WebSocketManager("wss://localhost")
+            await manager.stop()
+            return manager.broadcaster.reply_reserve
+
+        self.assertEqual(asyncio.run(run()), WS_CONFIG['reply_reserve'])
+        self.assertEqual(BroadcastEngine().reply_reserve, WS_CONFIG['reply_reserve'])
+
+    def test_high_risk_program_event_is_broadcast(self):
+        client = FakeWebSocket()
+        notification = {'params': {'result': {
+            'context': {'slot': 7},
+            'value': {'pubkey': 'Mint111', 'account': {'lamports': 1}}
+        }}}
+
+        async def scenario(manager):
+            await manager.connect(client)
+            scores = iter([
+                None,
+                EventRiskScore(0.5, 'liquidity', {'liquidity': 0.5}),
+                EventRiskScore(0.9, 'pump', {'volume': 0.9})
+            ])
+
+            async def score(event):
+                return next(scores)
+
+            manager._calculate_risk_score = score
+            for _ in range(3):
+                await manager._process_solana_event(notification)
+            await self.drain()
+
+        self.run_manager(scenario)
+        messages = [orjson.loads(f) for f in client.frames]
+        self.assertEqual(len(messages), 1)
+        self.assertEqual(messages[0]['data']['token_address'], 'Mint111')
+        self.assertEqual(messages[0]['data']['anomaly_type'], 'pump')
+
+
+if __name__ == '__main__':
+    unittest.main()
+
+
+class FakeAnalyses:
+    """Chain, sentiment and market analyses with per-token delays and failures"""
+
+    KINDS = ('chain', 'sentiment', 'market')
+
+    def __init__(self):
+        self.delays = {}
+        self.failures = set()
+        self.calls = []
+        self.cancelled = set()
+        self.active = 0
+        self.max_active = 0
+
+    def routes(self):
+        """Replacements for the routes module's analysis functions"""
+        async def calculate_metrics(chain_data, sentiment_data, market_data):
+            return {'sources': [chain_data['source'], sentiment_data['source'], market_data['source']]}
+
+        async def assess_risks(metrics, market_data):
+            return {'overall_risk_score': 0.5}
+
+        async def generate_alerts(token_address):
+            return []
+
+        return {
+            '_get_chain_analysis': self.analysis('chain'),
+            '_get_sentiment_analysis': self.analysis('sentiment'),
+            '_get_market_analysis': self.analysis('market'),
+            '_calculate_metrics': calculate_metrics,
+            '_assess_risks': assess_risks,
+            '_generate_alerts': generate_alerts
+        }
+
+    def analysis(self, kind):
+        async def run(token_address, timeframe):
+            self.calls.append((kind, token_address))
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+            try:
+                await asyncio.sleep(self.delays.get(token_address, 0))
+            except asyncio.CancelledError:
+                self.cancelled.add(token_address)
+                raise
+            finally:
+                self.active -= 1
+            if kind == 'chain' and token_address in self.failures:
+                raise RuntimeError(f"chain analysis failed for {token_address}")
+            return {'source': kind, 'token': token_address}
+        return run
+
+    def tokens(self, kind='chain'):
+        return [token for call_kind, token in self.calls if call_kind == kind]
+
+
+class RoutesTestCase(unittest.TestCase):
+    """Routes over a fake cache and fake analyses"""
+
+    def setUp(self):
+        self.redis = FakeAsyncRedis(time.time)
+        self.cache = AnalysisCache(self.redis)
+        self.analyses = FakeAnalyses()
+        patcher = patch.multiple(routes, cache=self.cache, **self.analyses.routes())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def cached_analyses(self, tokens):
+        return asyncio.run(self.cache.get_many('analysis_cache', tokens))
+
+
+class TestAnalyzeToken(RoutesTestCase):
+    def analyze(self, token_address, timeframe=routes.CACHE_TIMEFRAME):
+        """Response of POST /analyze, then the analyses after its background tasks ran"""
+        async def run():
+            background_tasks = BackgroundTasks()
+            response = await routes.analyze_token(
+                routes.TokenAnalysisRequest(token_address=token_address, timeframe=timeframe),
+                background_tasks
+            )
+            computed = list(self.analyses.calls)
+            await background_tasks()
+            return response, computed
+
+        return asyncio.run(run())
+
+    def test_analyses_run_concurrently(self):
+        self.analyses.delays = {'A': 0.01}
+        response, _ = self.analyze('A')
+        # Chain, sentiment and market analyses were all in flight at once
+        self.assertEqual(self.analyses.max_active, 3)
+        self.assertEqual(response.token_address, 'A')
+        self.assertEqual(response.metrics, {'sources': list(FakeAnalyses.KINDS)})
+
+    def test_cache_refresh_reuses_computed_analysis(self):
+        _, computed = self.analyze('A')
+        self.assertEqual(len(computed), 3)
+        # The background refresh stored the analysis without computing it again
+        self.assertEqual(self.analyses.calls, computed)
+        cached = self.cached_analyses(['A'])['A']
+        self.assertEqual(cached['market_data'], {'source': 'market', 'token': 'A'})
+
+    def test_cache_refresh_computes_cached_timeframe(self):
+        _, computed = self.analyze('A', timeframe=60)
+        self.assertEqual(len(computed), 3)
+        # A different timeframe cannot be cached as is
+        self.assertEqual(len(self.analyses.calls), 6)
+        self.assertIn('A', self.cached_analyses(['A']))
+
+
+class TestBatchAnalysis(RoutesTestCase):
+
+    def stream(self, tokens, disconnect_after=None):
+        """NDJSON lines of a batch response, plus the tokens cancelled before returning"""
+        async def run():
+            response = await routes.analyze_tokens_batch(
+                routes.BatchAnalysisRequest(token_addresses=tokens)
+            )
+            self.assertEqual(response.media_type, 'application/x-ndjson')
+            lines = []
+            async for chunk in response.body_iterator:
+                self.assertTrue(chunk.endswith(b'\n'))
+                lines.append(orjson.loads(chunk))
+                if len(lines) == disconnect_after:
+                    break
+            # Starlette closes the body iterator when the client goes away
+            await response.body_iterator.aclose()
+            await asyncio.sleep(0.01)
+            return lines, set(self.analyses.cancelled)
+
+        return asyncio.run(run())
+
+    def test_tokens_deduplicated(self):
+        lines, _ = self.stream(['A', 'B', 'A', 'C', 'B'])
+        self.assertEqual(sorted(line['token_address'] for line in lines), ['A', 'B', 'C'])
+        self.assertEqual(sorted(self.analyses.tokens()), ['A', 'B', 'C'])
+        self.assertEqual(set(self.cached_analyses(['A', 'B', 'C'])), {'A', 'B', 'C'})
+
+    def test_token_cap(self):
+        over_cap = routes.BatchAnalysisRequest(
+            token_addresses=[f"T{i}" for i in range(routes.BATCH_MAX_TOKENS + 1)]
+        )
+        with self.assertRaises(HTTPException) as raised:
+            asyncio.run(routes.analyze_tokens_batch(over_cap))
+        self.assertEqual(raised.exception.status_code, 400)
+
+        with self.assertRaises(HTTPException):
+            asyncio.run(routes.analyze_tokens_batch(routes.BatchAnalysisRequest(token_addresses=[])))
+
+        # The cap counts distinct tokens
+        at_cap = routes.BatchAnalysisRequest(
+            token_addresses=[f"T{i}" for i in range(routes.BATCH_MAX_TOKENS)] * 2
+        )
+        response = asyncio.run(routes.analyze_tokens_batch(at_cap))
+        self.assertEqual(response.status_code, 200)
+
+    def test_failed_tokens_stream_error_lines(self):
+        self.analyses.failures = {'BAD'}
+        lines, _ = self.stream(['A', 'BAD', 'B'])
+        by_token = {line['token_address']: line for line in lines}
+        self.assertEqual(by_token['BAD'], {'token_address': 'BAD', 'error': 'chain analysis failed for BAD'})
+        for token in ('A', 'B'):
+            self.assertEqual(by_token[token]['metrics'], {'sources': list(FakeAnalyses.KINDS)})
+            self.assertEqual(by_token[token]['risk_assessment'], {'overall_risk_score': 0.5})
+        # Only successful analyses are cached
+        self.assertEqual(set(self.cached_analyses(['A', 'BAD', 'B'])), {'A', 'B'})
+
+    def test_streams_in_completion_order(self):
+        self.analyses.delays = {'A': 0.03, 'B': 0.01, 'C': 0.02}
+        lines, _ = self.stream(['A', 'B', 'C'])
+        self.assertEqual([line['token_address'] for line in lines], ['B', 'C', 'A'])
+
+    def test_client_disconnect_cancels_outstanding_work(self):
+        self.analyses.delays = {'SLOW': 10, 'QUEUED': 10}
+        with patch.object(routes, 'BATCH_CONCURRENCY', 1):
+            lines, cancelled = self.stream(['FAST', 'SLOW', 'QUEUED'], disconnect_after=1)
+        self.assertEqual([line['token_address'] for line in lines], ['FAST'])
+        self.assertEqual(cancelled, {'SLOW'})
+        # QUEUED was waiting for a concurrency slot and never started
+        self.assertEqual(self.analyses.tokens(), ['FAST', 'SLOW'])
+        self.assertFalse(routes.analysis_flights.in_flight(('SLOW', routes.CACHE_TIMEFRAME)))
+        self.assertEqual(self.cached_analyses(['FAST', 'SLOW']), {})
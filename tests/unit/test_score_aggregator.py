@@ -15,6 +15,7 @@ import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 from src.score_aggregator.metric_calculator import MetricCalculator
+from src.score_aggregator.metric_store import MetricStore
 from src.score_aggregator.risk_scorer import RiskScorer
 from src.score_aggregator.index_generator import IndexGenerator, IndexComponent, IndexState
 
@@ -225,10 +226,9 @@ class TestIndexGenerator(unittest.TestCase):
         self.assertEqual(perf_metrics['current_value'], current_value)
 
         # With history
-        self.generator.performance_history[index_name] = [
-            {'value': 900, 'timestamp': datetime.now() - timedelta(hours=2)},
-            {'value': 950, 'timestamp': datetime.now() - timedelta(hours=1)}
-        ]
+        history = self.generator.performance_history[index_name]
+        history.append(datetime.now() - timedelta(hours=2), value=900)
+        history.append(datetime.now() - timedelta(hours=1), value=950)
         
         perf_metrics = self.generator._calculate_performance(index_name, current_value)
         self.assertIn('returns_mean', perf_metrics)
@@ -255,5 +255,108 @@ class TestIndexGenerator(unittest.TestCase):
         self.assertTrue(all(0 <= v <= 1 for v in risk_metrics.values()))
 
 
+class TestMetricStore(unittest.TestCase):
+    def setUp(self):
+        self.store = MetricStore(columns=['a', 'b'], series=['x', 'y', 'z'], window=5, capacity=2)
+        self.rng = np.random.default_rng(0)
+
+    def test_rolling_correlation_matches_pearsonr(self):
+        from scipy.stats import pearsonr
+
+        rows = self.store.rows_for(['t0', 't1', 't2'])
+        history = []
+        for _ in range(23):
+            values = self.rng.random((3, 3))
+            history.append(values)
+            self.store.append(rows, values)
+        window = np.array(history[-5:])
+        correlations = self.store.correlations(rows)
+        for i in range(3):
+            for j in (1, 2):
+                expected = pearsonr(window[:, i, 0], window[:, i, j])[0]
+                self.assertAlmostEqual(correlations[i, j - 1], expected, places=10)
+
+    def test_correlation_undefined_for_short_or_constant_series(self):
+        rows = self.store.rows_for(['t0'])
+        self.store.append(rows, np.array([[0.5, 0.1, 0.2]]))
+        self.assertTrue(np.isnan(self.store.correlations(rows)).all())
+        for value in (0.2, 0.3, 0.4):
+            self.store.append(rows, np.array([[value, 0.1, value]]))
+        correlations = self.store.correlations(rows)[0]
+        self.assertTrue(np.isnan(correlations[0]))
+        self.assertAlmostEqual(correlations[1], np.corrcoef([0.5, 0.2, 0.3, 0.4], [0.2, 0.2, 0.3, 0.4])[0, 1])
+
+    def test_recent_is_right_aligned(self):
+        rows = self.store.rows_for(['t0', 't1'])
+        for step in range(7):
+            self.store.append(rows[:1 + (step >= 5)], np.full((1 + (step >= 5), 3), float(step)))
+        values, available = self.store.recent(rows, 3)
+        np.testing.assert_array_equal(available, [3, 2])
+        np.testing.assert_array_equal(values[0], [4.0, 5.0, 6.0])
+        np.testing.assert_array_equal(values[1, -2:], [5.0, 6.0])
+
+    def test_rows_grow_past_capacity(self):
+        rows = self.store.rows_for([f"t{i}" for i in range(10)])
+        self.assertEqual(len(self.store), 10)
+        self.assertEqual(self.store.smoothed.shape[0], 10)
+        np.testing.assert_array_equal(self.store.rows_for(['t3', 't11']), [3, 10])
+
+
+class TestMetricCalculatorBatch(unittest.IsolatedAsyncioTestCase):
+    def _inputs(self, rng, count):
+        return (
+            [{'transaction_volume': v, 'whale_activity': w, 'liquidity': 4e5, 'data_points': 120}
+             for v, w in zip(rng.uniform(0, 2e6, count), rng.random(count))],
+            [{'sentiment_score': s, 'social_volume': 300, 'confidence': 0.8} for s in rng.uniform(-1, 1, count)],
+            [{'volatility': v, 'price_momentum': p, 'volume_profile': 0.5}
+             for v, p in zip(rng.random(count), rng.uniform(-1, 1, count))]
+        )
+
+    async def test_batch_matches_per_token_calls(self):
+        rng = np.random.default_rng(1)
+        tokens = ['A', 'B', 'A', 'C']
+        batched, sequential = MetricCalculator(), MetricCalculator()
+        for _ in range(6):
+            chain, sentiment, market = self._inputs(rng, len(tokens))
+            results = await batched.calculate_metrics_batch(tokens, chain, sentiment, market)
+            for i, token in enumerate(tokens):
+                expected = await sequential.calculate_metrics(token, chain[i], sentiment[i], market[i])
+                self.assertEqual(results[i].token_address, token)
+                self.assertAlmostEqual(results[i].composite_score, expected.composite_score)
+                self.assertAlmostEqual(results[i].confidence, expected.confidence)
+                self.assertEqual(results[i].chain_metrics.keys(), expected.chain_metrics.keys())
+                if expected.trend_analysis is None:
+                    self.assertIsNone(results[i].trend_analysis)
+                else:
+                    self.assertEqual(results[i].trend_analysis.direction, expected.trend_analysis.direction)
+                    self.assertAlmostEqual(results[i].trend_analysis.momentum, expected.trend_analysis.momentum)
+        self.assertEqual(len(batched.metric_history['A']), 12)
+
+    async def test_smoothing_and_composite(self):
+        calculator = MetricCalculator(smoothing_factor=0.5)
+        chain = {'transaction_volume': 500_000, 'whale_activity': 0.7, 'liquidity': 250_000}
+        first = await calculator.calculate_metrics('T', chain, {}, {})
+        self.assertAlmostEqual(first.chain_metrics['transaction_volume'], 0.5)
+        self.assertAlmostEqual(first.composite_score, 0.4 * (0.5 + 0.7 + 0.5) / 3)
+        self.assertIsNone(first.trend_analysis)
+
+        second = await calculator.calculate_metrics('T', {**chain, 'transaction_volume': 3_000_000}, {}, {})
+        self.assertAlmostEqual(second.chain_metrics['transaction_volume'], 0.75)
+
+    async def test_trend_uses_previous_scores(self):
+        calculator = MetricCalculator(smoothing_factor=1.0)
+        for volume in (0, 1e6, 1e6):
+            result = await calculator.calculate_metrics('T', {'transaction_volume': volume}, {}, {})
+        trend = result.trend_analysis
+        self.assertEqual(trend.direction, 'up')
+        self.assertAlmostEqual(trend.strength, 0.4 / 3)
+        self.assertAlmostEqual(trend.correlation['chain'], 1.0)
+        self.assertTrue(np.isnan(trend.correlation['market']))
+
+    async def test_mismatched_lengths_rejected(self):
+        with self.assertRaises(ValueError):
+            await MetricCalculator().calculate_metrics_batch(['A', 'B'], [{}], [{}], [{}])
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -8,6 +8,7 @@ including social media scraping, NLP processing, and cross-platform sentiment ag
 Author: KADES
 Team License: Proprietary """
 
+import asyncio
 import unittest
 from unittest.mock import Mock, patch
 import pytest
@@ -15,8 +16,15 @@ import numpy as np
 from src.sentiment_analysis.social_scraper import SocialScraper
 from src.sentiment_analysis.nlp_processor import NLPProcessor
 from src.sentiment_analysis.sentiment_scorer import SentimentScorer
+from src.sentiment_analysis.sentiment_scorer import CryptoSentimentScorer, SENTIMENT_CLASSES
 from src.sentiment_analysis.embedding_models import CryptoEmbeddingModel
 from src.sentiment_analysis.social_momentum_analyzer import SocialMomentumAnalyzer
+from src.sentiment_analysis.deduplicator import PostDeduplicator
+from src.sentiment_analysis.social_scraper import AsyncTokenBucket
+from src.sentiment_analysis.mention_index import HyperLogLog, TokenMentionIndex
+from src.sentiment_analysis.inference_backends import InferenceBackend, create_backend, load_inference_config
+from src.sentiment_analysis.model_registry import ModelRegistry
+from datetime import datetime, timedelta
 
 class TestSocialScraper(unittest.TestCase):
     def setUp(self):
@@ -254,5 +262,559 @@ class TestSentimentScorer(unittest.TestCase):
         self.assertIn('confidence_score', aggregate)
         self.assertTrue(0 <= aggregate['overall_sentiment'] <= 1)
 
+class TestPostDeduplicator(unittest.TestCase):
+    def setUp(self):
+        self.dedup = PostDeduplicator(window_seconds=600)
+        self.now = datetime(2024, 1, 1, 12, 0, 0)
+        self.shill = "Don't miss $BONK presale now, next 100x gem launching today on solana"
+
+    def test_exact_duplicate_reuses_payload(self):
+        first = self.dedup.observe(self.shill, self.now)
+        self.assertFalse(first.is_duplicate)
+        self.dedup.store(first.cluster_id, {'cached': True})
+
+        second = self.dedup.observe(self.shill.upper() + " #ad", self.now)
+        self.assertTrue(second.is_duplicate)
+        self.assertTrue(second.is_exact)
+        self.assertEqual(second.cluster_id, first.cluster_id)
+        self.assertEqual(second.payload, {'cached': True})
+        self.assertEqual(second.cluster_size, 2)
+
+    def test_near_duplicate_joins_cluster(self):
+        first = self.dedup.observe(self.shill, self.now)
+        variant = self.shill + " for real"
+        second = self.dedup.observe(variant, self.now)
+        self.assertTrue(second.is_duplicate)
+        self.assertFalse(second.is_exact)
+        self.assertEqual(second.cluster_id, first.cluster_id)
+        self.assertGreaterEqual(second.similarity, self.dedup.threshold)
+
+    def test_distinct_posts_not_clustered(self):
+        first = self.dedup.observe(self.shill, self.now)
+        other = self.dedup.observe("Liquidity pulled from the pool, looks like a rug to me", self.now)
+        self.assertFalse(other.is_duplicate)
+        self.assertNotEqual(first.cluster_id, other.cluster_id)
+
+    def test_sliding_window_expiry(self):
+        first = self.dedup.observe(self.shill, self.now)
+        self.dedup.store(first.cluster_id, {'cached': True})
+        later = self.dedup.observe(self.shill, self.now + timedelta(seconds=601))
+        self.assertFalse(later.is_duplicate)
+        self.assertIsNone(later.payload)
+        self.assertEqual(later.cluster_size, 1)
+        self.assertEqual(self.dedup.get_stats()['active_clusters'], 1)
+
+class TestNLPProcessorDuplicateReuse(unittest.TestCase):
+    """Near-duplicate posts reuse the model outputs but credit their own tokens"""
+
+    def setUp(self):
+        from src.sentiment_analysis.nlp_processor import SocialMediaNLPProcessor
+
+        self.sentiment_calls = 0
+
+        def sentiment(texts):
+            self.sentiment_calls += 1
+            return [{'label': 'POSITIVE', 'score': 0.9}]
+
+        vader = Mock()
+        vader.polarity_scores.return_value = {'neg': 0.0, 'neu': 0.4, 'pos': 0.6, 'compound': 0.7}
+        nlp = Mock(return_value=Mock(ents=[], noun_chunks=[]))
+
+        registry = ModelRegistry()
+        registry.install({
+            'models': {
+                'sentiment:finiteautomata/bertweet-base-sentiment-analysis:eager:fp32': sentiment,
+                'vader': vader,
+                'spacy:en_core_web_sm': nlp
+            },
+            'stats': {}
+        })
+        self.processor = SocialMediaNLPProcessor(model_registry=registry)
+        self.template = (
+            "{} is the next big thing, the chart looks amazing and the community keeps "
+            "growing every single day, devs are shipping and whales are loading up quietly"
+        )
+
+    def post(self, content):
+        from src.sentiment_analysis.nlp_processor import SocialMediaPost
+        return SocialMediaPost(
+            platform='x', content=content, timestamp=datetime(2026, 1, 1), author='author',
+            engagement={'likes': 10}, mentions=[], hashtags=[], urls=[], is_reply=False,
+            reply_to=None, raw_data={}
+        )
+
+    @staticmethod
+    def mentions(processor, token):
+        stats = processor.mention_index.get_window_stats(token, 3600, now=datetime(2026, 1, 1))
+        return stats.mention_count if stats else 0
+
+    def test_template_for_another_token_credits_that_token(self):
+        first = self.processor.process_post(self.post(self.template.format('$SOL')))
+        second = self.processor.process_post(self.post(self.template.format('$BONK')))
+
+        self.assertEqual(second.duplicate_cluster_size, 2)
+        self.assertEqual(self.sentiment_calls, 1)
+        self.assertEqual(second.sentiment_scores, first.sentiment_scores)
+        self.assertIn('SOL', first.entities)
+        self.assertIn('BONK', second.entities)
+        self.assertNotIn('SOL', second.entities)
+        self.assertEqual(self.mentions(self.processor, 'BONK'), 1)
+        self.assertEqual(self.mentions(self.processor, 'SOL'), 1)
+
+    def test_exact_repost_reuses_entities(self):
+        self.processor.process_post(self.post(self.template.format('$SOL')))
+        self.processor.nlp.reset_mock()
+        repost = self.processor.process_post(self.post(self.template.format('$SOL')))
+
+        self.assertEqual(self.sentiment_calls, 1)
+        self.processor.nlp.assert_not_called()
+        self.assertEqual(self.mentions(self.processor, 'SOL'), 2)
+        self.assertIn('SOL', repost.entities)
+
+    def test_scraped_posts_reuse_the_scraper_match(self):
+        from src.sentiment_analysis.social_scraper import SocialPost
+
+        posts = []
+        for post_id in ('1', '2'):
+            post = SocialPost(
+                platform='x', post_id=post_id, content=self.template.format('$SOL'), author='author',
+                timestamp=datetime(2026, 1, 1), engagement={'likes': 10}, mentions=[], hashtags=[],
+                urls=[], token_references=['SOL'], raw_data={}
+            )
+            # Both copies are clustered by the dedup stage before either is analyzed
+            post.duplicate = self.processor.deduplicator.observe(post.content, post.timestamp)
+            posts.append(post)
+        analyses = [self.processor.process_scraped_post(post) for post in posts]
+
+        self.assertEqual(self.processor.deduplicator.metrics['observed'], 2)
+        self.assertEqual(self.sentiment_calls, 1)
+        self.assertEqual(analyses[1].duplicate_cluster_size, 2)
+        self.assertEqual(analyses[1].sentiment_scores, analyses[0].sentiment_scores)
+
+    def test_async_workers_keep_state_updates_on_loop_thread(self):
+        import threading
+        from concurrent.futures import ThreadPoolExecutor
+
+        threads = {'state': set(), 'models': set()}
+        processor = self.processor
+        for name in ('_prepare_post', '_complete_post'):
+            original = getattr(processor, name)
+            def record(*args, _original=original):
+                threads['state'].add(threading.get_ident())
+                return _original(*args)
+            setattr(processor, name, record)
+        run_models = processor._run_models
+        def record_models(*args):
+            threads['models'].add(threading.get_ident())
+            return run_models(*args)
+        processor._run_models = record_models
+
+        contents = [self.template.format(f"${token}") for token in ('SOL', 'BONK', 'WEN', 'SOL')]
+        contents += [f"post number {i} about $JUP with entirely different wording" for i in range(8)]
+
+        async def run():
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                analyses = await asyncio.gather(*(
+                    processor.process_post_async(self.post(content), executor) for content in contents
+                ))
+            return analyses, threading.get_ident()
+
+        analyses, loop_thread = asyncio.run(run())
+        self.assertTrue(all(analysis is not None for analysis in analyses))
+        self.assertEqual(threads['state'], {loop_thread})
+        self.assertNotIn(loop_thread, threads['models'])
+        self.assertEqual(self.mentions(processor, 'JUP'), 8)
+        self.assertEqual(self.mentions(processor, 'SOL'), 2)
+        self.assertEqual(analyses[3].duplicate_cluster_size, 4)
+
+class TestAsyncTokenBucket(unittest.IsolatedAsyncioTestCase):
+    async def test_burst_is_immediate(self):
+        bucket = AsyncTokenBucket(rate=1.0, burst=5)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        for _ in range(5):
+            await bucket.acquire()
+        self.assertLess(loop.time() - start, 0.05)
+        self.assertLess(bucket.available, 1.0)
+
+    async def test_refill_rate_limits_after_burst(self):
+        bucket = AsyncTokenBucket(rate=50.0, burst=1)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        for _ in range(6):
+            await bucket.acquire()
+        # 5 refills at 50 tokens/s
+        self.assertGreaterEqual(loop.time() - start, 0.09)
+
+    async def test_rejects_oversized_request(self):
+        bucket = AsyncTokenBucket(rate=10.0, burst=2)
+        with self.assertRaises(ValueError):
+            await bucket.acquire(3)
+
+class TestTokenMentionIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = TokenMentionIndex(retention=24 * 3600, default_window=3600)
+        self.now = datetime(2024, 1, 1, 12, 0, 0)
+        rng = np.random.RandomState(7)
+        self.mentions = []
+        for i in range(2000):
+            mention = {
+                'token': ['SOL', 'BONK', 'WEN', 'JUP'][rng.randint(4)],
+                'timestamp': self.now - timedelta(seconds=int(rng.randint(0, 6 * 3600))),
+                'author': f"user{rng.randint(300)}",
+                'engagement': {'likes': int(rng.randint(50)), 'retweets': int(rng.randint(10)), 'replies': 1},
+                'sentiment_class': ['bullish', 'bearish', 'neutral'][rng.randint(3)],
+                'influence_score': float(rng.rand())
+            }
+            self.mentions.append(mention)
+            self.index.add_mention(**mention)
+
+    def _naive(self, token, timeframe):
+        window_start = (int(self.now.timestamp()) // 60 - (timeframe // 60 - 1)) * 60
+        rows = [
+            m for m in self.mentions
+            if m['token'] == token and m['timestamp'].timestamp() >= window_start
+        ]
+        sign = {'bullish': 1, 'bearish': -1}
+        return (
+            len(rows),
+            sum(m['engagement']['likes'] + m['engagement']['retweets'] * 2 + m['engagement']['replies'] * 3 for m in rows),
+            sum(m['influence_score'] * sign.get(m['sentiment_class'], 0) for m in rows),
+            len({m['author'] for m in rows})
+        )
+
+    def test_window_stats_match_naive_scan(self):
+        for timeframe in (300, 3600, 4 * 3600):
+            stats = self.index.get_window_stats('SOL', timeframe, now=self.now)
+            count, engagement, sentiment, authors = self._naive('SOL', timeframe)
+            self.assertEqual(stats.mention_count, count)
+            self.assertAlmostEqual(stats.engagement_score, engagement)
+            self.assertAlmostEqual(stats.sentiment_score, sentiment)
+            self.assertLess(abs(stats.unique_authors - authors), max(3, 0.1 * authors))
+
+    def test_top_k_matches_full_scan(self):
+        heap_top = self.index.top_k(k=3, timeframe=3600, now=self.now)
+        scan_top = sorted(
+            (self.index.get_window_stats(t, 3600, now=self.now) for t in self.index.tokens),
+            key=lambda s: s.trending_score,
+            reverse=True
+        )[:3]
+        self.assertEqual([s.token for s in heap_top], [s.token for s in scan_top])
+
+    def scan_top(self, index, k, now):
+        stats = [index.get_window_stats(t, 3600, now=now) for t in index.tokens]
+        stats = [s for s in stats if s is not None]
+        return [s.token for s in sorted(stats, key=lambda s: s.trending_score, reverse=True)[:k]]
+
+    def mention(self, index, token, minutes_ago, sentiment_class='neutral', influence_score=0.0):
+        index.add_mention(token, self.now - timedelta(minutes=minutes_ago), 'author', {},
+                          sentiment_class, influence_score)
+
+    def test_top_k_with_mixed_sign_influence(self):
+        index = TokenMentionIndex(retention=24 * 3600, default_window=3600)
+        # Opposite influences cancel over A's full hour but not in the last 45 minutes
+        self.mention(index, 'A', 50, 'bearish', 10.0)
+        self.mention(index, 'A', 0, 'bullish', 10.0)
+        for _ in range(3):
+            self.mention(index, 'B', 0)
+        now = self.now + timedelta(minutes=15)
+        self.assertEqual([s.token for s in index.top_k(k=1, now=now)], self.scan_top(index, 1, now))
+        self.assertEqual(self.scan_top(index, 1, now), ['A'])
+
+    def test_top_k_before_latest_mention_scans(self):
+        index = TokenMentionIndex(retention=24 * 3600, default_window=3600)
+        for _ in range(5):
+            self.mention(index, 'B', 200)
+        self.mention(index, 'B', 100)
+        for _ in range(2):
+            self.mention(index, 'C', 100)
+            self.mention(index, 'D', 195)
+        earlier = self.now - timedelta(minutes=190)
+        self.assertEqual([s.token for s in index.top_k(k=1, now=earlier)], ['B'])
+        self.assertEqual(self.scan_top(index, 1, earlier), ['B'])
+
+    def test_top_k_drops_tokens_that_cooled_off(self):
+        index = TokenMentionIndex(retention=24 * 3600, default_window=3600)
+        for _ in range(20):
+            self.mention(index, 'OLD', 300)
+        self.mention(index, 'NEW', 0)
+        self.assertEqual([s.token for s in index.top_k(k=1, now=self.now)], ['NEW'])
+        live = {token for _, token, version in index._heap if version == index._versions[token]}
+        self.assertNotIn('OLD', live)
+        # A new mention brings the token back
+        for _ in range(2):
+            self.mention(index, 'OLD', 0)
+        self.assertEqual([s.token for s in index.top_k(k=1, now=self.now)], ['OLD'])
+
+    def test_negative_influence_clamped(self):
+        index = TokenMentionIndex(retention=24 * 3600, default_window=3600)
+        index.add_mention('A', self.now, 'author', {'likes': -50}, 'bullish', -5.0)
+        stats = index.get_window_stats('A', 3600, now=self.now)
+        self.assertEqual((stats.engagement_score, stats.sentiment_score), (0.0, 0.0))
+
+    def test_hyperloglog_estimate(self):
+        hll = HyperLogLog(precision=10)
+        for i in range(5000):
+            hll.add(f"author-{i}")
+        self.assertLess(abs(hll.count() - 5000) / 5000, 0.1)
+
+class TestInferenceConfig(unittest.TestCase):
+    def write_config(self, text):
+        import os
+        import tempfile
+        directory = tempfile.mkdtemp()
+        path = os.path.join(directory, 'config.yml')
+        with open(path, 'w') as f:
+            f.write(text)
+        return path
+
+    def test_production_selects_quantized_onnx(self):
+        settings = load_inference_config('config/production.yml')
+        self.assertEqual((settings['backend'], settings['quantize']), ('onnx', True))
+
+    def test_default_is_eager(self):
+        settings = load_inference_config('config/default.yml')
+        self.assertEqual(settings, {'backend': 'eager', 'quantize': False, 'export_dir': './models/exported'})
+
+    def test_missing_section_falls_back_to_eager(self):
+        settings = load_inference_config(self.write_config("models:\n  lstm: {}\n"))
+        self.assertEqual(settings, {'backend': 'eager', 'quantize': False, 'export_dir': None})
+
+    def test_unknown_backend_rejected(self):
+        path = self.write_config("models:\n  sentiment:\n    inference:\n      backend: tensorrt\n")
+        with self.assertRaises(ValueError):
+            load_inference_config(path)
+
+    def test_processor_uses_configured_backend(self):
+        from src.sentiment_analysis.nlp_processor import SocialMediaNLPProcessor
+        with patch.object(SocialMediaNLPProcessor, '__init__', return_value=None) as init:
+            SocialMediaNLPProcessor.from_config('config/production.yml', min_confidence=0.9)
+        init.assert_called_once_with(inference_backend='onnx', quantize=True, min_confidence=0.9)
+
+    def test_backend_interface_is_abstract(self):
+        with self.assertRaises(TypeError):
+            InferenceBackend()
+
+class TestInferenceBackends(unittest.TestCase):
+    """Accuracy drift of exported/quantized backends against eager execution"""
+
+    def setUp(self):
+        import torch
+        import torch.nn as nn
+        from transformers import DistilBertConfig, DistilBertModel
+
+        torch.manual_seed(0)
+        self.dim = 64
+        config = DistilBertConfig(
+            vocab_size=500, dim=self.dim, n_layers=2, n_heads=4, hidden_dim=128
+        )
+        self.base_model = DistilBertModel(config).eval()
+        self.token_scorer = nn.Sequential(
+            nn.Linear(self.dim, 32), nn.ReLU(), nn.Linear(32, 1)
+        ).eval()
+        self.domain_adapter = nn.Sequential(
+            nn.Linear(self.dim, self.dim), nn.LayerNorm(self.dim), nn.ReLU(),
+            nn.Dropout(0.1), nn.Linear(self.dim, self.dim)
+        ).eval()
+        self.input_ids = torch.randint(0, 500, (4, 24))
+        self.attention_mask = torch.ones_like(self.input_ids)
+        self.attention_mask[2:, 18:] = 0
+
+    def _embed(self, backend):
+        import torch
+        token_embeddings, token_scores = backend.encode(self.input_ids, self.attention_mask)
+        weights = torch.softmax(token_scores, dim=-1)
+        pooled = torch.sum(token_embeddings * weights.unsqueeze(-1), dim=1)
+        return backend.adapt(pooled).numpy()
+
+    def _backend(self, name, quantize=False):
+        return create_backend(
+            name, self.base_model, self.token_scorer, self.domain_adapter,
+            embedding_dim=self.dim, quantize=quantize
+        )
+
+    def _assert_close(self, reference, candidate, min_cosine):
+        cosine = np.sum(reference * candidate, axis=1) / (
+            np.linalg.norm(reference, axis=1) * np.linalg.norm(candidate, axis=1)
+        )
+        self.assertGreaterEqual(cosine.min(), min_cosine)
+
+    def test_eager_is_deterministic(self):
+        backend = self._backend('eager')
+        np.testing.assert_allclose(self._embed(backend), self._embed(backend))
+
+    def test_torchscript_matches_eager(self):
+        reference = self._embed(self._backend('eager'))
+        self._assert_close(reference, self._embed(self._backend('torchscript')), 0.9999)
+
+    def test_onnx_matches_eager(self):
+        pytest.importorskip('onnxruntime')
+        reference = self._embed(self._backend('eager'))
+        self._assert_close(reference, self._embed(self._backend('onnx')), 0.9999)
+
+    def test_int8_drift_within_tolerance(self):
+        reference = self._embed(self._backend('eager'))
+        self._assert_close(reference, self._embed(self._backend('eager', quantize=True)), 0.98)
+        self._assert_close(reference, self._embed(self._backend('torchscript', quantize=True)), 0.98)
+
+    def test_unknown_backend_rejected(self):
+        with self.assertRaises(ValueError):
+            self._backend('tensorrt')
+
+class TestCryptoSentimentScorerBatch(unittest.TestCase):
+    """Vectorized batch scoring against per-text scoring"""
+
+    def setUp(self):
+        import torch.nn as nn
+
+        class StubEmbedding:
+            def __init__(self, text):
+                seed = sum(ord(c) for c in text)
+                self.embedding = np.random.RandomState(seed).randn(1, 16).astype(np.float32)
+
+        class StubEmbeddingModel:
+            def get_batch_embeddings(self, texts, batch_size=32):
+                return [StubEmbedding(text) for text in texts]
+
+        self.embed = lambda text: StubEmbedding(text).embedding
+        classifier = nn.Linear(16, len(SENTIMENT_CLASSES))
+        with patch.object(CryptoSentimentScorer, '_init_sentiment_classifier',
+                          create=True, return_value=classifier), \
+             patch.object(CryptoSentimentScorer, '_init_context_analyzer',
+                          create=True, return_value=None):
+            self.scorer = CryptoSentimentScorer(StubEmbeddingModel())
+
+        self.texts = [
+            "WAGMI frens, to the moon 🚀",
+            "massive dump incoming, pure fud 📉",
+            "hodl and chill",
+            "guaranteed 100x, get in now!!! 🚀🚀🚀",
+            "nothing to see here"
+        ]
+
+    def reference_scores(self, text, market):
+        """Per-text scoring with a substring check per lexicon term and per-factor market adjustments"""
+        import torch
+        from scipy.special import softmax
+
+        with torch.no_grad():
+            logits = self.scorer.sentiment_classifier(torch.from_numpy(self.embed(text)))
+        scores = dict(zip(SENTIMENT_CLASSES, softmax(logits.numpy().astype(np.float64)[0])))
+
+        for term, impact in {**self.scorer.crypto_lexicon, **self.scorer.emoji_lexicon}.items():
+            if term.lower() in text.lower():
+                for sentiment in ('positive', 'negative', 'uncertainty'):
+                    scores[sentiment] *= impact.get(sentiment, 1.0)
+        total = sum(scores.values())
+        scores = {k: v / total for k, v in scores.items()}
+
+        price = np.tanh(market['price_change'] / 100)
+        scores['positive'] *= 1 + max(0, price)
+        scores['negative'] *= 1 + max(0, -price)
+        for sentiment in scores:
+            scores[sentiment] *= 1 + abs(np.clip(market['volume_change'] / 1000, -1, 1))
+        scores['uncertainty'] *= 1 + np.clip(market['volatility'] / 100, 0, 1)
+        total = sum(scores.values())
+        return np.array([scores[k] / total for k in SENTIMENT_CLASSES])
+
+    def test_batch_matches_per_text_reference(self):
+        market = {'price_change': -20, 'volume_change': 300, 'volatility': 50}
+        batch = self.scorer.score_batch(self.texts, market_data=[market] * len(self.texts))
+        self.assertEqual(len(batch), len(self.texts))
+
+        compound = {'positive': 1.0, 'negative': -1.0, 'neutral': 0.0, 'uncertainty': -0.5}
+        weights = np.array([compound[k] for k in SENTIMENT_CLASSES])
+        for i, text in enumerate(self.texts):
+            expected = self.reference_scores(text, market)
+            np.testing.assert_allclose(batch.sentiment_scores[i], expected, rtol=1e-6)
+            self.assertAlmostEqual(batch.compound_scores[i], np.tanh(expected @ weights), places=6)
+            quality = min(1.0, np.linalg.norm(self.embed(text)) / 10)
+            self.assertAlmostEqual(batch.confidence[i], (quality + np.std(expected)) / 2, places=6)
+
+        self.assertIn('POTENTIAL_MANIPULATION', batch.risk_flags[3])
+        self.assertNotIn('POTENTIAL_MANIPULATION', batch.risk_flags[4])
+
+    def test_lexicon_multipliers_by_hand(self):
+        # "wagmi" and "🚀" scale positive by 1.4 * 1.5; "fud" scales negative
+        # by 1.3 and uncertainty by 1.5; neutral is untouched
+        uniform = np.full((3, len(SENTIMENT_CLASSES)), 0.25)
+        adjusted = self.scorer._apply_crypto_adjustments(["wagmi 🚀", "pure fud", "hello"], uniform)
+        pos, neg, neu, unc = (SENTIMENT_CLASSES.index(k) for k in ('positive', 'negative', 'neutral', 'uncertainty'))
+        np.testing.assert_allclose(adjusted[0, [pos, neg, neu, unc]], np.array([2.1, 1, 1, 1]) / 5.1)
+        np.testing.assert_allclose(adjusted[1, [pos, neg, neu, unc]], np.array([1, 1.3, 1, 1.5]) / 4.8)
+        np.testing.assert_allclose(adjusted[2], 0.25)
+
+    def test_lexicon_presence_matches_substring_check(self):
+        terms = self.scorer._lexicon_terms
+        presence = self.scorer._lexicon_presence(self.texts).toarray()
+        for i, text in enumerate(self.texts):
+            expected = [float(term in text.lower()) for term in terms]
+            np.testing.assert_array_equal(presence[i], expected)
+
+    def test_lexicon_adjusts_scores(self):
+        base = self.scorer._calculate_base_sentiment(np.ones((2, 16), dtype=np.float32))
+        adjusted = self.scorer._apply_crypto_adjustments(["moon 🚀", "plain text"], base)
+        positive = SENTIMENT_CLASSES.index('positive')
+        self.assertGreater(adjusted[0, positive], adjusted[1, positive])
+
+    def test_manipulation_flags(self):
+        batch = self.scorer.score_batch(self.texts)
+        self.assertIn("POTENTIAL_MANIPULATION", batch.risk_flags[3])
+        self.assertNotIn("POTENTIAL_MANIPULATION", batch.risk_flags[4])
+
+    def test_tracking_updated_in_bulk(self):
+        self.scorer.score_batch(self.texts)
+        self.assertEqual(len(self.scorer.score_cache), len(self.texts))
+        self.assertEqual(len(self.scorer.metrics['confidence_scores']), len(self.texts))
+        self.assertIn('hodl', self.scorer.token_stats)
+
+    def test_empty_batch(self):
+        self.assertEqual(len(self.scorer.score_batch([])), 0)
+
+class TestModelRegistry(unittest.TestCase):
+    def setUp(self):
+        import torch.nn as nn
+
+        self.loads = 0
+        self.warmups = 0
+
+        def loader():
+            self.loads += 1
+            return nn.Linear(16, 4)
+
+        def warmup(model):
+            self.warmups += 1
+
+        self.registry = ModelRegistry()
+        self.registry.register('linear', loader, warmup)
+
+    def test_loads_and_warms_once(self):
+        first = self.registry.get('linear')
+        self.assertIs(self.registry.get('linear'), first)
+        self.assertEqual((self.loads, self.warmups), (1, 1))
+
+    def test_stats_recorded(self):
+        self.registry.preload()
+        stats = self.registry.stats['linear']
+        self.assertEqual(stats.tensor_bytes, (16 * 4 + 4) * 4)
+        self.assertGreaterEqual(stats.load_seconds, 0.0)
+        self.assertFalse(stats.shared)
+        self.assertEqual(self.registry.report()[0]['key'], 'linear')
+
+    def test_unknown_key_rejected(self):
+        with self.assertRaises(KeyError):
+            self.registry.get('missing')
+
+    def test_export_shares_weights(self):
+        model = self.registry.get('linear')
+        exported = self.registry.export()
+        self.assertTrue(model.weight.is_shared())
+        self.assertTrue(self.registry.stats['linear'].shared)
+
+        worker_registry = ModelRegistry()
+        worker_registry.install(exported)
+        self.assertIs(worker_registry.get('linear'), model)
+        self.assertEqual(self.loads, 1)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -17,9 +17,29 @@ import pandas as pd
 from datetime import datetime, timedelta
 
 from src.temporal_analysis.lstm_predictor import LSTMPredictor
+from src.temporal_analysis.lstm_predictor import INPUT_SIZE, VolatilityPredictor
+from src.temporal_analysis.feature_store import OBSERVATION_FIELDS, RollingFeatureStore
+from src.temporal_analysis.training import MemmapWindowDataset, VolatilityTrainer, save_feature_array
 from src.temporal_analysis.volatility_calculator import VolatilityCalculator
-from src.temporal_analysis.flash_crash_detector import FlashCrashDetector
-from src.temporal_analysis.momentum_tracker import MomentumTracker
+from src.temporal_analysis.return_buffer import LogReturnBuffer
+from src.temporal_analysis.volatility_estimators import (
+    VolatilityEngine,
+    ewma_variance,
+    fit_garch_batch,
+    garman_klass_volatility,
+    parkinson_volatility
+)
+from src.temporal_analysis.flash_crash_detector import FlashCrashDetector, MarketCondition
+from src.temporal_analysis.window_aggregates import (
+    MARKET_TICK_DTYPE,
+    MarketRing,
+    RollingStats,
+    TickWindowAggregator
+)
+from src.temporal_analysis.momentum_tracker import MomentumTracker, MomentumSignal
+from src.temporal_analysis.time_series_history import TimeSeriesHistory
+from src.temporal_analysis.streaming_indicators import StreamingIndicators
+from src.temporal_analysis.ohlcv_bars import BarAggregator, timeframe_seconds
 
 
 class TestLSTMPredictor(unittest.TestCase):
@@ -53,6 +73,238 @@ class TestLSTMPredictor(unittest.TestCase):
         self.assertTrue(len(history['loss']) > 0)
 
 
+class TestBatchedVolatilityPredictor(unittest.TestCase):
+    """Multi-token batched inference against per-token forward passes"""
+
+    def setUp(self):
+        import torch
+        torch.manual_seed(0)
+        self.predictor = VolatilityPredictor(sequence_length=20, max_batch_size=8)
+        rng = np.random.RandomState(1)
+        self.features = {
+            f"TOKEN{i}": rng.rand(30, INPUT_SIZE).astype(np.float32) for i in range(20)
+        }
+
+    def test_batch_matches_single_predictions(self):
+        predictions = self.predictor.predict_batch(self.features)
+        self.assertEqual(set(predictions), set(self.features))
+        for token, X in self.features.items():
+            self.assertAlmostEqual(predictions[token], self.predictor._make_prediction(X), places=5)
+
+    def test_short_histories_grouped_by_length(self):
+        features = dict(self.features)
+        features['SHORT'] = np.random.rand(12, INPUT_SIZE).astype(np.float32)
+        predictions = self.predictor.predict_batch(features)
+        self.assertAlmostEqual(
+            predictions['SHORT'], self.predictor._make_prediction(features['SHORT']), places=5
+        )
+
+    def test_update_predictions_per_token(self):
+        import asyncio
+        rng = np.random.RandomState(2)
+        n = 60
+        token_data = {}
+        for token in ('A', 'B', 'C'):
+            token_data[token] = (
+                pd.DataFrame({'price': 100 + rng.randn(n).cumsum(), 'volume': rng.rand(n) * 1000}),
+                pd.DataFrame({
+                    'sentiment_score': rng.randn(n),
+                    'engagement_score': rng.rand(n) + 0.1,
+                    'spam_probability': rng.rand(n)
+                }),
+                pd.DataFrame({
+                    'accumulation_score': rng.rand(n) + 0.1,
+                    'distribution_score': rng.rand(n) + 0.1,
+                    'whale_count': rng.randint(0, 100, n),
+                    'avg_transaction_size': rng.rand(n) * 10000,
+                    'coordination_score': rng.rand(n)
+                })
+            )
+        results = asyncio.run(self.predictor.update_predictions(token_data))
+        self.assertEqual(set(results), {'A', 'B', 'C'})
+        self.assertEqual(set(self.predictor.token_predictions), {'A', 'B', 'C'})
+        for result in results.values():
+            self.assertIsInstance(result.predicted_volatility, float)
+
+    def test_torchscript_backend_matches_eager(self):
+        import torch
+        torch.manual_seed(0)
+        traced = VolatilityPredictor(sequence_length=20, backend='torchscript')
+        eager = self.predictor.predict_batch(self.features)
+        for token, value in traced.predict_batch(self.features).items():
+            self.assertAlmostEqual(value, eager[token], places=5)
+
+    def test_onnx_backend_matches_eager(self):
+        import os
+        import torch
+        pytest.importorskip('onnxruntime')
+        torch.manual_seed(0)
+        exported = VolatilityPredictor(sequence_length=20, backend='onnx')
+        self.assertTrue(os.path.exists(os.path.join(exported.backend.export_dir, 'volatility_lstm.onnx')))
+        eager = self.predictor.predict_batch(self.features)
+        # Exported with a batch of 2; the graph must accept the full chunk of 8
+        for token, value in exported.predict_batch(self.features).items():
+            self.assertAlmostEqual(value, eager[token], places=5)
+
+    def test_backend_interface_is_abstract(self):
+        from src.temporal_analysis.lstm_backends import LSTMInferenceBackend
+        with self.assertRaises(TypeError):
+            LSTMInferenceBackend()
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            VolatilityPredictor(backend='tensorrt')
+
+class TestRollingFeatureStore(unittest.TestCase):
+    """Incremental feature rows against the pandas preprocessing formulas"""
+
+    def setUp(self):
+        rng = np.random.RandomState(4)
+        n = 300
+        self.frame = pd.DataFrame({
+            'price': 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n))),
+            'volume': rng.lognormal(6, 0.5, n),
+            'sentiment_score': rng.randn(n),
+            'engagement_score': rng.rand(n) + 0.1,
+            'spam_probability': rng.rand(n),
+            'accumulation_score': rng.rand(n) + 0.1,
+            'distribution_score': rng.rand(n) + 0.1,
+            'whale_count': rng.randint(0, 100, n).astype(float),
+            'avg_transaction_size': rng.rand(n) * 10000,
+            'coordination_score': rng.rand(n)
+        })
+
+    def _reference(self) -> np.ndarray:
+        f = self.frame
+        returns = f['price'].pct_change()
+        volume_std = f['volume'].rolling(24).std()
+        return np.column_stack([
+            returns,
+            returns.rolling(24).std(),
+            f['volume'] / f['volume'].rolling(24).mean(),
+            (volume_std - volume_std.expanding().mean()) / volume_std.expanding().std(ddof=0),
+            f['sentiment_score'],
+            f['sentiment_score'].rolling(24).mean(),
+            f['sentiment_score'].rolling(24).std(),
+            f['engagement_score'] / f['engagement_score'].rolling(24).mean(),
+            f['spam_probability'],
+            f['accumulation_score'] / f['accumulation_score'].rolling(24).mean(),
+            f['distribution_score'] / f['distribution_score'].rolling(24).mean(),
+            f['whale_count'],
+            f['avg_transaction_size'],
+            f['coordination_score']
+        ])
+
+    def test_rows_match_pandas(self):
+        store = RollingFeatureStore(sequence_length=50)
+        rows = [store.append(row).copy() for row in self.frame[OBSERVATION_FIELDS].to_dict('records')]
+        reference = self._reference()
+        self.assertEqual(reference.shape[1], INPUT_SIZE)
+        np.testing.assert_allclose(np.array(rows), reference, rtol=1e-5, atol=1e-6)
+        np.testing.assert_allclose(store.window_view(), reference[-50:], rtol=1e-5, atol=1e-6)
+
+    def test_window_is_zero_copy(self):
+        store = RollingFeatureStore(sequence_length=50)
+        for i, row in enumerate(self.frame[OBSERVATION_FIELDS].to_dict('records')[:130]):
+            store.append(row)
+            view = store.window_view()
+            self.assertEqual(len(view), min(i + 1, 50))
+            self.assertTrue(np.shares_memory(view, store.buffer))
+            self.assertTrue(view.flags['C_CONTIGUOUS'])
+            self.assertEqual(view.dtype, np.float32)
+
+    def test_rescaling_existing_rows(self):
+        store = RollingFeatureStore(sequence_length=50)
+        for row in self.frame[OBSERVATION_FIELDS].to_dict('records')[:80]:
+            store.append(row)
+        raw = store.window_view().copy()
+        scale, offset = np.full(INPUT_SIZE, 2.0), np.full(INPUT_SIZE, -1.0)
+        store.set_scaling(scale, offset)
+        np.testing.assert_allclose(store.window_view(), raw * 2 - 1, rtol=1e-6)
+
+    def test_predictor_streaming_updates(self):
+        import asyncio
+        predictor = VolatilityPredictor(sequence_length=30)
+        records = self.frame[OBSERVATION_FIELDS].to_dict('records')
+        # Long enough that the window is past the rolling warm-up rows
+        for step in range(70):
+            results = asyncio.run(predictor.update_token_predictions(
+                {'A': records[step], 'B': records[-step - 1]}
+            ))
+        self.assertEqual(set(results), {'A', 'B'})
+        window = predictor.feature_stores['A'].window_view()
+        self.assertAlmostEqual(
+            results['A'].predicted_volatility, predictor._make_prediction(window), places=5
+        )
+
+class TestVolatilityTraining(unittest.TestCase):
+    """Memory-mapped windows, gradient accumulation and checkpoint/resume"""
+
+    def setUp(self):
+        import tempfile
+        self.tmpdir = tempfile.TemporaryDirectory()
+        rng = np.random.RandomState(6)
+        self.arrays = [rng.rand(n, INPUT_SIZE).astype(np.float32) for n in (40, 25, 60)]
+        self.paths = []
+        for i, array in enumerate(self.arrays):
+            path = f"{self.tmpdir.name}/token{i}.npy"
+            save_feature_array(path, array)
+            self.paths.append(path)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_windows_match_slices(self):
+        dataset = MemmapWindowDataset(self.paths, sequence_length=10, target_column=1)
+        self.assertEqual(len(dataset), 30 + 15 + 50)
+
+        expected = [
+            (array[i:i + 10], array[i + 10, 1])
+            for array in self.arrays for i in range(len(array) - 10)
+        ]
+        indices = [0, 29, 30, 44, 45, 94, 3]
+        x, y = dataset[indices]
+        self.assertEqual(tuple(x.shape), (len(indices), 10, INPUT_SIZE))
+        for row, index in enumerate(indices):
+            np.testing.assert_array_equal(x[row].numpy(), expected[index][0])
+            self.assertEqual(y[row].item(), expected[index][1])
+
+        x_single, y_single = dataset[44]
+        np.testing.assert_array_equal(x_single.numpy(), expected[44][0])
+
+    def test_train_with_accumulation_and_resume(self):
+        import torch
+        torch.manual_seed(0)
+        dataset = MemmapWindowDataset(self.paths, sequence_length=10)
+        checkpoints = f"{self.tmpdir.name}/checkpoints"
+
+        predictor = VolatilityPredictor(sequence_length=10)
+        trainer = VolatilityTrainer(predictor, checkpoint_dir=checkpoints, batch_size=16,
+                                    accumulation_steps=2, num_workers=0)
+        history = trainer.train(dataset, epochs=2, val_dataset=dataset)
+        self.assertEqual([m['epoch'] for m in history], [1, 2])
+        self.assertTrue(all(m['samples'] == len(dataset) for m in history))
+        self.assertTrue(all(m['samples_per_second'] > 0 for m in history))
+        # 95 samples in 6 micro-batches of 16 -> 3 optimizer steps per epoch
+        self.assertEqual(trainer.global_step, 6)
+
+        resumed_predictor = VolatilityPredictor(sequence_length=10)
+        resumed = VolatilityTrainer(resumed_predictor, checkpoint_dir=checkpoints, batch_size=16,
+                                    accumulation_steps=2, num_workers=0)
+        resumed.load_checkpoint(f"{checkpoints}/latest.pt")
+        self.assertEqual((resumed.epoch, resumed.global_step), (2, 6))
+        for name, tensor in predictor.model.state_dict().items():
+            self.assertTrue(torch.equal(tensor, resumed_predictor.model.state_dict()[name]))
+
+        history = resumed.train(dataset, epochs=3)
+        self.assertEqual([m['epoch'] for m in history], [1, 2, 3])
+
+    def test_multi_worker_loader(self):
+        dataset = MemmapWindowDataset(self.paths, sequence_length=10)
+        trainer = VolatilityTrainer(VolatilityPredictor(sequence_length=10), batch_size=32, num_workers=2)
+        history = trainer.train(dataset, epochs=1)
+        self.assertEqual(history[0]['samples'], len(dataset))
+
 class TestVolatilityCalculator(unittest.TestCase):
     def setUp(self):
         self.calculator = VolatilityCalculator(
@@ -82,6 +334,168 @@ class TestVolatilityCalculator(unittest.TestCase):
         self.assertTrue(realized_vol.between(0, 1).all())
 
 
+class TestLogReturnBuffer(unittest.TestCase):
+    """Incremental log-return aggregates against brute-force recomputation"""
+
+    def setUp(self):
+        self.rng = np.random.RandomState(11)
+        self.spans = {'short': 12, 'medium': 72}
+
+    def test_aggregates_match_numpy(self):
+        buffer = LogReturnBuffer([5, 20, 60], self.spans, capacity=50)
+        prices, volumes, stamps = [], [], []
+        price, ts = 100.0, 0.0
+        for _ in range(400):
+            price *= np.exp(self.rng.randn() * 0.02)
+            ts += self.rng.exponential(60.0)
+            volume = float(self.rng.rand() * 1000)
+            buffer.append(ts, price, volume)
+            prices.append(price)
+            volumes.append(volume)
+            stamps.append(ts)
+
+            retained = np.array(prices[-50:])
+            returns = np.diff(np.log(retained))
+            self.assertEqual(len(buffer), len(retained))
+            if len(returns):
+                self.assertAlmostEqual(buffer.return_std(), np.std(returns), places=9)
+                self.assertEqual(buffer.direction_counts(), (np.sum(returns > 0), np.sum(returns < 0)))
+                mean_interval, std_interval = buffer.interval_moments()
+                self.assertAlmostEqual(mean_interval, np.mean(np.diff(stamps[-50:])), places=6)
+                self.assertAlmostEqual(std_interval, np.std(np.diff(stamps[-50:])), places=5)
+                self.assertAlmostEqual(
+                    buffer.volume_change_std(),
+                    np.std(np.diff(np.log1p(volumes[-50:]))),
+                    places=9
+                )
+            for window in (5, 20, 60):
+                tail = retained[-window:]
+                self.assertEqual(buffer.price_range(window), (tail.max(), tail.min()))
+                expected = np.std(np.diff(np.log(tail))) if len(tail) > 1 else 0.0
+                self.assertAlmostEqual(buffer.return_std(window), expected, places=9)
+
+        np.testing.assert_array_equal(buffer.ordered(), prices[-50:])
+        self.assertEqual(buffer.first_price, prices[-50])
+        self.assertEqual(buffer.last_price, prices[-1])
+
+    def test_ewm_matches_pandas(self):
+        buffer = LogReturnBuffer([5], self.spans, capacity=1000)
+        prices = 100 * np.exp(np.cumsum(self.rng.randn(300) * 0.01))
+        for i, price in enumerate(prices):
+            buffer.append(float(i), float(price))
+
+        returns = pd.Series(np.diff(np.log(prices)))
+        for name, span in self.spans.items():
+            self.assertAlmostEqual(buffer.ewm_mean(name), returns.ewm(span=span).mean().iloc[-1])
+
+    def test_calculator_reads_buffer(self):
+        calculator = VolatilityCalculator(window_sizes=[5, 15], min_data_points=10, metrics_history_size=20)
+        start = datetime(2024, 1, 1)
+        prices = 100 * np.exp(np.cumsum(self.rng.randn(60) * 0.01))
+        for i, price in enumerate(prices):
+            metrics = calculator.calculate_volatility('TOKEN', float(price), start + timedelta(minutes=i))
+
+        self.assertAlmostEqual(
+            metrics.realized_volatility,
+            np.std(np.diff(np.log(prices))) * np.sqrt(365 * 24 * 60)
+        )
+        self.assertEqual(len(calculator.volatility_history['TOKEN']), 20)
+        analysis = calculator.get_volatility_analysis('TOKEN')
+        self.assertAlmostEqual(analysis['confidence_metrics']['data_quality'], 1.0)
+
+class TestVolatilityEstimators(unittest.TestCase):
+    """EWMA, GARCH(1,1) and range estimators"""
+
+    def setUp(self):
+        self.rng = np.random.RandomState(17)
+
+    def simulate_garch(self, tokens, length, omega=1e-6, alpha=0.08, beta=0.9):
+        returns = np.zeros((tokens, length))
+        variance = np.full(tokens, omega / (1 - alpha - beta))
+        for t in range(length):
+            returns[:, t] = np.sqrt(variance) * self.rng.randn(tokens)
+            variance = omega + alpha * returns[:, t] ** 2 + beta * variance
+        return returns
+
+    def test_garch_batch_recovers_parameters(self):
+        returns = self.simulate_garch(8, 2000)
+        returns[0, :500] = np.nan  # shorter series are left-padded
+        params, next_variance = fit_garch_batch(returns)
+
+        self.assertAlmostEqual(np.mean([p.alpha for p in params]), 0.08, delta=0.03)
+        self.assertAlmostEqual(np.mean([p.beta for p in params]), 0.9, delta=0.05)
+        self.assertTrue(all(p.persistence < 1 for p in params))
+        self.assertTrue(np.all(next_variance > 0))
+
+        # Jointly fitted tokens match individual fits
+        single, single_variance = fit_garch_batch(returns[1:2])
+        self.assertAlmostEqual(params[1].alpha, single[0].alpha, places=2)
+        self.assertAlmostEqual(params[1].beta, single[0].beta, places=2)
+
+    def test_engine_filters_and_warm_refits(self):
+        returns = self.simulate_garch(3, 600)
+        engine = VolatilityEngine(refit_interval=100, min_fit_points=50)
+        tokens = ['A', 'B', 'C']
+        for t in range(500):
+            for token, value in zip(tokens, returns[:, t]):
+                engine.update(token, value)
+
+        self.assertEqual(engine.pending_fits(), tokens)
+        fitted = engine.fit({token: returns[i, :500] for i, token in enumerate(tokens)})
+        self.assertEqual(set(fitted), set(tokens))
+        self.assertEqual(engine.pending_fits(), [])
+
+        # Filtering forward matches the GARCH recursion
+        params = fitted['A']
+        variance = engine.garch_volatility('A') ** 2
+        for value in returns[0, 500:]:
+            engine.update('A', value)
+            variance = params.omega + params.alpha * value ** 2 + params.beta * variance
+        self.assertAlmostEqual(engine.garch_volatility('A') ** 2, variance)
+        self.assertTrue(engine.needs_fit('A'))
+        self.assertFalse(engine.needs_fit('B'))
+
+        # EWMA state matches the batch recursion
+        self.assertAlmostEqual(engine.ewma_volatility('B') ** 2, ewma_variance(returns[1, :500])[0])
+
+    def test_range_estimators(self):
+        open_ = 100 + self.rng.rand(2, 50)
+        close = 100 + self.rng.rand(2, 50)
+        high = np.maximum(open_, close) + self.rng.rand(2, 50)
+        low = np.minimum(open_, close) - self.rng.rand(2, 50)
+        high[1, :10] = low[1, :10] = np.nan
+
+        log_range = np.log(high[0] / low[0])
+        log_body = np.log(close[0] / open_[0])
+        self.assertAlmostEqual(
+            parkinson_volatility(high, low)[0],
+            np.sqrt(np.mean(log_range ** 2) / (4 * np.log(2)))
+        )
+        self.assertAlmostEqual(
+            garman_klass_volatility(open_, high, low, close)[0],
+            np.sqrt(np.mean(0.5 * log_range ** 2 - (2 * np.log(2) - 1) * log_body ** 2))
+        )
+        self.assertFalse(np.isnan(parkinson_volatility(high, low)[1]))
+
+    def test_calculator_estimator_selection(self):
+        with self.assertRaises(ValueError):
+            VolatilityCalculator(estimator='unknown')
+
+        calculator = VolatilityCalculator(window_sizes=[5, 15], min_data_points=10, bar_timeframe='5m')
+        start = datetime(2024, 1, 1)
+        prices = 100 * np.exp(np.cumsum(self.rng.randn(200) * 0.01))
+        for i, price in enumerate(prices):
+            calculator._update_price_history('TOKEN', float(price), start + timedelta(minutes=i), 10.0)
+
+        last = start + timedelta(minutes=len(prices))
+        estimates = {
+            estimator: calculator.calculate_volatility('TOKEN', float(prices[-1]), last, estimator=estimator)
+            for estimator in ('realized', 'ewma', 'garch', 'parkinson', 'garman_klass')
+        }
+        for estimator, metrics in estimates.items():
+            self.assertGreater(metrics.realized_volatility, 0, estimator)
+        self.assertIsNotNone(calculator.engine.garch_params('TOKEN'))
+
 class TestFlashCrashDetector(unittest.TestCase):
     def setUp(self):
         self.detector = FlashCrashDetector(
@@ -166,13 +580,14 @@ class TestMomentumTracker(unittest.TestCase):
                 self.assertIn('confidence', signal.__dict__)
 
     def test_calculate_indicators(self):
-        # Add some historical data
-        for i in range(30):
+        # Add some historical data; 1h indicators need macd_slow closed bars
+        start = self.test_data['timestamp'] - timedelta(hours=40)
+        for i in range(40 * 12):
             self.tracker._update_price_history(
                 self.test_data['token_address'],
                 self.test_data['price'] * (1 + np.random.normal(0, 0.02)),
                 self.test_data['volume'] * (1 + np.random.normal(0, 0.1)),
-                self.test_data['timestamp'] - timedelta(minutes=i*5)
+                start + timedelta(minutes=i*5)
             )
 
         indicators = self.tracker._calculate_indicators(
@@ -209,5 +624,389 @@ class TestMomentumTracker(unittest.TestCase):
         self.assertIsInstance(warnings, list)
         self.assertTrue(all(isinstance(w, str) for w in warnings))
 
+class TestTimeSeriesHistory(unittest.TestCase):
+    """Ring history against the list it replaces"""
+
+    def setUp(self):
+        self.start = datetime(2026, 1, 1)
+
+    def make_signal(self, minute, timeframe='5m'):
+        return MomentumSignal(
+            token_address='TOKEN',
+            timestamp=self.start + timedelta(minutes=minute),
+            signal_type='bullish',
+            strength=minute / 100,
+            confidence=0.8,
+            supporting_metrics={'rsi': float(minute)},
+            timeframe=timeframe
+        )
+
+    def test_ring_matches_trimmed_list(self):
+        history = TimeSeriesHistory.for_dataclass(MomentumSignal, capacity=50, initial_size=8)
+        expected = []
+        for minute in range(120):
+            signal = self.make_signal(minute, '5m' if minute % 2 else '1h')
+            history.append_record(signal)
+            expected = (expected + [signal])[-50:]
+            self.assertEqual(len(history), len(expected))
+
+        self.assertEqual(history[:], expected)
+        self.assertEqual(history[-10:], expected[-10:])
+        self.assertEqual(history[0], expected[0])
+        self.assertEqual(history[-1], expected[-1])
+        self.assertEqual(list(history.column('timeframe')), [s.timeframe for s in expected])
+        with self.assertRaises(IndexError):
+            history[50]
+
+    def test_range_and_downsample(self):
+        history = TimeSeriesHistory({'value': np.float64}, capacity=100)
+        for minute in range(60):
+            history.append(self.start + timedelta(minutes=minute), value=float(minute))
+
+        window = history.range(self.start + timedelta(minutes=10), self.start + timedelta(minutes=19))
+        np.testing.assert_array_equal(window['value'], np.arange(10, 20))
+        self.assertEqual(len(history.records(end=self.start + timedelta(minutes=4))), 5)
+
+        bars = history.downsample(600, how={'value': 'mean'})
+        np.testing.assert_array_equal(bars['count'], [10] * 6)
+        np.testing.assert_allclose(bars['value'], np.arange(6) * 10 + 4.5)
+        self.assertEqual(bars['timestamp'][0], self.start.timestamp())
+        with self.assertRaises(ValueError):
+            history.downsample(600, how='median')
+
+    def test_out_of_order_records(self):
+        history = TimeSeriesHistory({'value': np.float64}, capacity=10)
+        for ts in [5, 1, 4, 2, 3]:
+            history.append(ts, value=ts * 10)
+        self.assertFalse(history.sorted)
+        np.testing.assert_array_equal(np.sort(history.range(2, 4)['value']), [20, 30, 40])
+        np.testing.assert_array_equal(history.downsample(1)['timestamp'], [1, 2, 3, 4, 5])
+
+    def test_spill_keeps_evicted_records(self):
+        import os
+        import tempfile
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'history.bin')
+            history = TimeSeriesHistory({'value': np.float64}, capacity=20, spill_path=path, spill_chunk=8)
+            for ts in range(100):
+                history.append(ts, value=ts)
+            history.flush()
+
+            self.assertEqual(len(history), 20)
+            self.assertEqual(history.spilled, 80)
+            np.testing.assert_array_equal(history.range(include_spilled=True)['value'], np.arange(100))
+            np.testing.assert_array_equal(history.range(30, 90, include_spilled=True)['value'], np.arange(30, 91))
+
+class TestStreamingIndicators(unittest.TestCase):
+    def setUp(self):
+        self.tracker = MomentumTracker(timeframes=['5m'], history_size=120)
+        rng = np.random.RandomState(3)
+        self.prices = list(100 * np.exp(np.cumsum(rng.normal(0, 0.01, 600))))
+        self.volumes = list(rng.lognormal(8, 1, 600))
+
+    def test_empty_until_macd_slow(self):
+        state = StreamingIndicators(macd_params=(12, 26, 9))
+        for price, volume in zip(self.prices[:25], self.volumes[:25]):
+            state.update(price, volume)
+            self.assertEqual(state.snapshot(), {})
+        state.update(self.prices[25], self.volumes[25])
+        self.assertIn('rsi', state.snapshot())
+
+    def test_matches_batch_indicators(self):
+        from collections import deque
+        state = StreamingIndicators(trend_window=119)
+        history = deque(maxlen=120)
+        for i, (price, volume) in enumerate(zip(self.prices, self.volumes)):
+            state.update(price, volume)
+            history.append((price, volume))
+            streaming = state.snapshot()
+            batch = self.tracker._calculate_indicators_batch(
+                [p for p, _ in history], [v for _, v in history]
+            )
+            if i < 25:
+                self.assertEqual(streaming, {})
+                continue
+            self.assertAlmostEqual(streaming['volume_trend'], batch['volume_trend'], places=9)
+            self.assertAlmostEqual(streaming['price_trend'], batch['price_trend'], places=9)
+            # RSI and MACD are recursive over the full stream; once the
+            # history is full the batch path only sees the retained window
+            if i < len(history):
+                self.assertAlmostEqual(streaming['rsi'], batch['rsi'], places=9)
+                np.testing.assert_allclose(streaming['macd'], batch['macd'], atol=1e-9)
+
+    def test_preview_matches_update(self):
+        state = StreamingIndicators(trend_window=50)
+        for price, volume in zip(self.prices[:300], self.volumes[:300]):
+            preview = state.preview(price, volume)
+            state.update(price, volume)
+            expected = state.snapshot()
+            self.assertEqual(preview.keys(), expected.keys())
+            for key in expected:
+                np.testing.assert_allclose(preview[key], expected[key], rtol=1e-9, atol=1e-12)
+
+    def test_wilder_rsi(self):
+        state = StreamingIndicators(rsi_periods=3)
+        for price in [10.0, 11.0, 12.0, 11.0, 13.0]:
+            state.update(price, 1.0)
+        # Seed: gains (1, 1, 0) / 3, losses (0, 0, 1) / 3; then Wilder step with +2
+        avg_gain = ((2 / 3) * 2 + 2) / 3
+        avg_loss = ((1 / 3) * 2 + 0) / 3
+        self.assertAlmostEqual(state.rsi, 100 - 100 / (1 + avg_gain / avg_loss))
+        batch_rsi = MomentumTracker(rsi_periods=3)._calculate_rsi([10.0, 11.0, 12.0, 11.0, 13.0])
+        self.assertAlmostEqual(state.rsi, batch_rsi)
+
+class TestOHLCVBars(unittest.TestCase):
+    """Bar aggregation against pandas resampling of the raw ticks"""
+
+    def setUp(self):
+        rng = np.random.RandomState(5)
+        self.start = datetime(2024, 1, 1).timestamp()
+        self.ts = self.start + np.cumsum(rng.exponential(40.0, 5000))
+        self.prices = 100 * np.exp(np.cumsum(rng.normal(0, 0.002, 5000)))
+        self.volumes = rng.lognormal(3, 1, 5000)
+
+    def _resample(self, seconds, upto):
+        frame = pd.DataFrame({
+            'price': self.prices[:upto], 'volume': self.volumes[:upto]
+        }, index=pd.to_datetime(self.ts[:upto], unit='s'))
+        grouped = frame.groupby((self.ts[:upto] // seconds) * seconds)
+        bars = grouped['price'].agg(['first', 'max', 'min', 'last'])
+        bars['volume'] = grouped['volume'].sum()
+        bars['ticks'] = grouped.size()
+        return bars
+
+    def test_closed_bars_match_resample(self):
+        aggregator = BarAggregator(['5m', '15m', '1h', '4h'], capacity=1000)
+        for ts, price, volume in zip(self.ts, self.prices, self.volumes):
+            aggregator.update(ts, price, volume)
+
+        self.assertEqual(aggregator.sources, {'5m': None, '15m': '5m', '1h': '15m', '4h': '1h'})
+        for timeframe in ('5m', '15m', '1h', '4h'):
+            expected = self._resample(timeframe_seconds(timeframe), len(self.ts))
+            closed = aggregator.bars(timeframe)
+            # The last bucket is still in progress
+            expected_closed = expected.iloc[:-1]
+            np.testing.assert_allclose(closed['ts'], expected_closed.index.values)
+            np.testing.assert_allclose(closed['open'], expected_closed['first'])
+            np.testing.assert_allclose(closed['high'], expected_closed['max'])
+            np.testing.assert_allclose(closed['low'], expected_closed['min'])
+            np.testing.assert_allclose(closed['close'], expected_closed['last'])
+            np.testing.assert_allclose(closed['volume'], expected_closed['volume'])
+            np.testing.assert_array_equal(closed['ticks'], expected_closed['ticks'])
+
+            partial = aggregator.bars(timeframe, include_partial=True)[-1]
+            self.assertEqual(partial['ts'], expected.index[-1])
+            self.assertAlmostEqual(partial['high'], expected['max'].iloc[-1])
+            self.assertAlmostEqual(partial['low'], expected['min'].iloc[-1])
+            self.assertAlmostEqual(partial['close'], expected['last'].iloc[-1])
+            self.assertAlmostEqual(partial['volume'], expected['volume'].iloc[-1])
+
+    def test_ring_keeps_latest_bars(self):
+        aggregator = BarAggregator(['5m'], capacity=100)
+        for ts, price, volume in zip(self.ts, self.prices, self.volumes):
+            aggregator.update(ts, price, volume)
+        expected = self._resample(300, len(self.ts)).iloc[:-1]
+        closed = aggregator.bars('5m')
+        self.assertEqual(len(closed), 100)
+        np.testing.assert_allclose(closed['ts'], expected.index.values[-100:])
+        np.testing.assert_allclose(closed['close'], expected['last'].values[-100:])
+
+    def test_invalid_timeframe(self):
+        with self.assertRaises(ValueError):
+            timeframe_seconds('5x')
+
+    def test_tracker_runs_indicators_on_closed_bars(self):
+        import asyncio
+        tracker = MomentumTracker(timeframes=['5m', '1h'], history_size=200)
+        closes = {'5m': [], '1h': []}
+        for ts, price, volume in zip(self.ts, self.prices, self.volumes):
+            closed = tracker._update_price_history('TOKEN', price, volume, datetime.fromtimestamp(ts))
+            for timeframe in closed:
+                closes[timeframe].append(tracker.get_bars('TOKEN', timeframe)[-1]['close'])
+
+        for timeframe in ('5m', '1h'):
+            bars = tracker.get_bars('TOKEN', timeframe)
+            np.testing.assert_allclose(closes[timeframe][-len(bars):], bars['close'])
+            expected = tracker._calculate_indicators_batch(list(bars['close']), list(bars['volume']))
+            actual = tracker._calculate_indicators('TOKEN', timeframe)
+            self.assertAlmostEqual(actual['volume_trend'], expected['volume_trend'])
+            if len(closes[timeframe]) <= 200:
+                self.assertAlmostEqual(actual['rsi'], expected['rsi'])
+
+        # Partial mode previews the in-progress bar without committing it
+        before = tracker.indicator_state['TOKEN']['1h'].count
+        partial = tracker._calculate_indicators('TOKEN', '1h', include_partial=True)
+        self.assertEqual(tracker.indicator_state['TOKEN']['1h'].count, before)
+        bars = tracker.get_bars('TOKEN', '1h', include_partial=True)
+        expected = tracker._calculate_indicators_batch(list(bars['close']), list(bars['volume']))
+        self.assertAlmostEqual(partial['volume_trend'], expected['volume_trend'])
+
+        # A tick inside the current bar produces no closed-bar signals
+        last = datetime.fromtimestamp(self.ts[-1])
+        self.assertIsNone(asyncio.run(tracker.update_momentum('TOKEN', 100.0, 1.0, last)))
+
+class TestWindowAggregates(unittest.TestCase):
+    """Incremental window aggregates against brute-force recomputation"""
+
+    def setUp(self):
+        self.rng = np.random.RandomState(3)
+
+    def test_rolling_stats_match_numpy(self):
+        stats = RollingStats(capacity=50)
+        values = []
+        for i in range(2000):
+            # Mix duplicates and continuous values to exercise lazy deletion
+            value = float(self.rng.randint(0, 20)) if i % 2 else self.rng.randn()
+            stats.push(value)
+            values.append(value)
+            window = values[-50:]
+            self.assertAlmostEqual(stats.median, np.median(window))
+            self.assertAlmostEqual(stats.mean, np.mean(window))
+            self.assertAlmostEqual(stats.std, np.std(window), places=6)
+
+    def test_tick_windows_match_brute_force(self):
+        aggregator = TickWindowAggregator([5, 20, 60], capacity=40)
+        ticks = []
+        ts = 0.0
+        for _ in range(2000):
+            ts += self.rng.exponential(1.0)
+            price, volume = self.rng.rand() * 10 + 1, self.rng.rand()
+            aggregator.push(ts, price, volume, 1.0, 0.2, 0.0)
+            ticks.append((ts, price, volume))
+
+            retained = ticks[-40:]
+            for window in (5, 20, 60):
+                expected = [t for t in retained if t[0] >= ts - window]
+                stats = aggregator.stats(window)
+                self.assertEqual(stats.count, len(expected))
+                self.assertEqual(stats.start_price, expected[0][1])
+                self.assertEqual(stats.high, max(t[1] for t in expected))
+                self.assertEqual(stats.low, min(t[1] for t in expected))
+                self.assertAlmostEqual(stats.volume_sum, sum(t[2] for t in expected))
+
+    def test_detector_alert_matches_window_scan(self):
+        import asyncio
+        detector = FlashCrashDetector(min_data_points=10, history_size=500)
+        start = datetime(2024, 1, 1)
+        price = 100.0
+        alerts = 0
+        for i in range(600):
+            price *= 0.85 if i % 97 == 0 else 1 + self.rng.randn() * 0.01
+            condition = MarketCondition(
+                price=price,
+                volume=self.rng.rand() * 1000 + 1,
+                liquidity=self.rng.rand() * 1e5 + 1,
+                volatility=0.2,
+                sentiment_score=0.0,
+                timestamp=start + timedelta(seconds=2 * i)
+            )
+            alert = asyncio.run(detector.monitor_market('TOKEN', condition))
+            if alert is None:
+                continue
+
+            alerts += 1
+            history = list(detector.market_conditions['TOKEN'])
+            window = [
+                c for c in history
+                if c.timestamp >= condition.timestamp - timedelta(seconds=alert.time_frame)
+            ]
+            self.assertAlmostEqual(
+                alert.price_change, (price - window[0].price) / window[0].price
+            )
+            self.assertAlmostEqual(
+                alert.volume_surge,
+                window[-1].volume / np.mean([c.volume for c in window[:-1]])
+            )
+            self.assertAlmostEqual(
+                detector.price_baselines['TOKEN']['median'],
+                np.median([c.price for c in history])
+            )
+        self.assertGreater(alerts, 0)
+
+class TestBatchMarketMonitor(unittest.TestCase):
+    """Batched multi-token sweep against per-token monitoring"""
+
+    def setUp(self):
+        self.rng = np.random.RandomState(5)
+        self.tokens = [f"TOKEN{i}" for i in range(20)]
+
+    def test_ring_keeps_newest_ticks_per_token(self):
+        ring = MarketRing(slots=4, initial_tokens=2)
+        ticks = np.zeros(7, dtype=MARKET_TICK_DTYPE)
+        ticks['token_id'] = [0, 1, 0, 0, 0, 0, 3]
+        ticks['ts'] = [1, 1, 2, 3, 4, 5, 1]
+        ticks['price'] = ticks['ts'] * 10
+
+        touched = ring.append(ticks)
+        np.testing.assert_array_equal(touched, [0, 1, 3])
+        self.assertGreaterEqual(ring.num_rows, 4)
+        self.assertEqual(sorted(ring.price[0]), [20.0, 30.0, 40.0, 50.0])
+        self.assertEqual(ring.price[0, ring.latest_slots(np.array([0]))[0]], 50.0)
+
+    def test_batch_alerts_match_per_token_monitoring(self):
+        import asyncio
+        scalar = FlashCrashDetector(min_data_points=10)
+        batch = FlashCrashDetector(min_data_points=10)
+        ids = batch.register_tokens(self.tokens)
+
+        start = datetime(2024, 1, 1).timestamp()
+        prices = np.full(len(self.tokens), 100.0)
+        compared = 0
+        for step in range(200):
+            returns = self.rng.randn(len(self.tokens)) * 0.01
+            returns[self.rng.rand(len(self.tokens)) < 0.02] = -0.3
+            prices *= 1 + returns
+            volumes = self.rng.rand(len(self.tokens)) * 1000 + 1
+            liquidity = self.rng.rand(len(self.tokens)) * 1e5 + 1
+            ts = start + 2 * step + self.rng.rand(len(self.tokens))
+
+            conditions = np.column_stack([ids, prices, volumes, liquidity, ts])
+            batch_alerts = {
+                a.token_address: a
+                for a in asyncio.run(batch.monitor_markets(conditions))
+            }
+            for i, token in enumerate(self.tokens):
+                expected = asyncio.run(scalar.monitor_market(token, MarketCondition(
+                    price=prices[i], volume=volumes[i], liquidity=liquidity[i],
+                    volatility=0.2, sentiment_score=0.0,
+                    timestamp=datetime.fromtimestamp(ts[i])
+                )))
+                actual = batch_alerts.get(token)
+                self.assertEqual(expected is None, actual is None)
+                if expected is not None:
+                    compared += 1
+                    self.assertEqual(expected.severity, actual.severity)
+                    self.assertEqual(expected.time_frame, actual.time_frame)
+                    self.assertAlmostEqual(expected.price_change, actual.price_change)
+                    self.assertAlmostEqual(expected.volume_surge, actual.volume_surge)
+                    self.assertAlmostEqual(expected.liquidity_impact, actual.liquidity_impact)
+        self.assertGreater(compared, 0)
+
+    def test_only_tripping_tokens_alert(self):
+        import asyncio
+        detector = FlashCrashDetector(min_data_points=5)
+        ids = detector.register_tokens(self.tokens)
+
+        ticks = np.zeros(len(ids), dtype=MARKET_TICK_DTYPE)
+        ticks['token_id'] = ids
+        ticks['volume'] = 100.0
+        ticks['liquidity'] = 1e5
+        for step in range(10):
+            ticks['ts'] = step
+            ticks['price'] = 100.0
+            if step == 9:
+                ticks['price'][:5] = 60.0  # 40% drop for five tokens
+            alerts = asyncio.run(detector.monitor_markets(ticks))
+
+        self.assertEqual(sorted(a.token_address for a in alerts), self.tokens[:5])
+        self.assertTrue(all(a.severity == 'CRITICAL' for a in alerts))
+
+    def test_unknown_token_id_rejected(self):
+        import asyncio
+        detector = FlashCrashDetector()
+        detector.register_tokens(self.tokens[:2])
+        alerts = asyncio.run(detector.monitor_markets(np.array([[5, 1.0, 1.0, 1.0, 0.0]])))
+        self.assertEqual(alerts, [])
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file